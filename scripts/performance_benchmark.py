@@ -22,12 +22,13 @@ import sys
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Sequence, Tuple
 
 # 프로젝트 루트를 Python path에 추가
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from utils.unified_cache_manager import UnifiedCacheManager, get_cache_manager
+from core.cache_manager import MemoryCacheBackend
 from api.clients.base_api_client import RealtimeMonitoringMixin
 from core.error_handler_advanced import (
     RetryStrategy, FallbackStrategy, ApplicationError, 
@@ -84,6 +85,7 @@ class PerformanceBenchmark:
         
         benchmarks = [
             ("cache_performance", self.benchmark_cache_performance),
+            ("memory_cache_scaling", self.benchmark_memory_cache_scaling),
             ("monitoring_performance", self.benchmark_monitoring_performance), 
             ("error_recovery_performance", self.benchmark_error_recovery),
             ("packet_analysis_performance", self.benchmark_packet_analysis),
@@ -171,6 +173,59 @@ class PerformanceBenchmark:
             "improvement_factor": round(200 / avg_read_time, 2) if avg_read_time > 0 else 0
         }
 
+    def benchmark_memory_cache_scaling(
+        self,
+        sizes: Sequence[int] = (1_000, 10_000, 100_000, 1_000_000),
+        operations: int = 20_000,
+    ) -> Dict[str, Any]:
+        """인메모리 캐시 계층 확장성 벤치마크 (가득 찬 1k ~ 1M 항목 캐시에서 set/get 지연 시간이 일정한지 확인)"""
+        results = {}
+        for size in sizes:
+            cache = MemoryCacheBackend(max_size=size)
+            for i in range(size):
+                cache.set(f"key_{i}", i, ttl=3600)
+
+            # 가득 찬 상태의 set: 매 호출마다 LRU 제거 발생
+            start = time.perf_counter()
+            for i in range(operations):
+                cache.set(f"new_{i}", i, ttl=3600)
+            set_us = (time.perf_counter() - start) / operations * 1_000_000
+
+            # 남아 있는 최근 키 조회 (히트)
+            live = min(size, operations)
+            start = time.perf_counter()
+            for i in range(operations):
+                cache.get(f"new_{operations - 1 - i % live}")
+            get_us = (time.perf_counter() - start) / operations * 1_000_000
+
+            stats = cache.stats()
+            results[str(size)] = {
+                "set_us": round(set_us, 3),
+                "get_us": round(get_us, 3),
+                "evictions": stats["evictions"],
+                "hit_rate": round(stats["hit_rate"], 3),
+                "shards": stats["shards"],
+            }
+            del cache
+
+        set_values = [r["set_us"] for r in results.values()]
+        get_values = [r["get_us"] for r in results.values()]
+        set_ratio = max(set_values) / min(set_values)
+        get_ratio = max(get_values) / min(get_values)
+        # O(1) 연산이면 항목 수가 1000배로 늘어도 지연 시간은 캐시 미스 영향 정도만 증가
+        target_met = set_ratio <= 3.0 and get_ratio <= 3.0
+
+        return {
+            "status": "passed" if target_met else "failed",
+            "metrics": {
+                "by_size": results,
+                "set_latency_ratio_max_min": round(set_ratio, 2),
+                "get_latency_ratio_max_min": round(get_ratio, 2),
+                "operations_per_size": operations,
+            },
+            "target_met": target_met,
+        }
+
     def benchmark_monitoring_performance(self) -> Dict[str, Any]:
         """실시간 모니터링 성능 벤치마크"""
         
@@ -889,6 +944,12 @@ class PerformanceBenchmark:
 def main():
     """메인 실행 함수"""
     benchmark = PerformanceBenchmark()
+
+    # 인메모리 캐시 확장성만 실행: python scripts/performance_benchmark.py --cache-scaling
+    if "--cache-scaling" in sys.argv[1:]:
+        result = benchmark.benchmark_memory_cache_scaling()
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        return 0 if result["target_met"] else 1
     
     try:
         # 모든 벤치마크 실행
@@ -4,6 +4,7 @@
 """
 
 from .advanced_analytics import AdvancedAnalytics
+from .batch_simulator import BatchTrafficSimulator, CompiledPathEvaluator
 from .components import DataLoader, PathTracer, PolicyAnalyzer, RuleValidator, SessionManager
 from .fixed_path_analyzer import FixedPathAnalyzer
 from .visualizer import PathVisualizer
@@ -15,6 +16,8 @@ __all__ = [
     "DataLoader",
     "SessionManager",
     "AdvancedAnalytics",
+    "BatchTrafficSimulator",
+    "CompiledPathEvaluator",
     "FixedPathAnalyzer",
     "PathVisualizer",
 ]
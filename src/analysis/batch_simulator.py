@@ -0,0 +1,297 @@
+"""
+일괄 트래픽 시뮬레이션
+대량의 플로우(ITSM 변경 요청, FAZ 트래픽 로그 등)를 한 번에 분석하고
+결과를 NDJSON으로 스트리밍합니다.
+
+동일한 (src, dst, port, protocol) 튜플은 한 번만 평가하며, 고유 플로우는 청크 단위로
+프로세스 풀에 분배됩니다. 분석기(및 미리 계산된 정책/라우팅 인덱스)는 워커 초기화 시
+한 번만 전달되어 워커 간에 공유됩니다.
+"""
+
+import csv
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.unified_logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+
+# 워커 프로세스별 분석기 (초기화 함수에서 설정)
+_worker_analyzer = None
+
+
+def normalize_flow(flow):
+    """
+    플로우를 (src_ip, dst_ip, port, protocol) 튜플로 정규화
+
+    Args:
+        flow (dict | tuple | list): src/dst/port/protocol 정보를 가진 플로우
+
+    Returns:
+        tuple: 정규화된 플로우 튜플
+
+    Raises:
+        ValueError: 필수 필드가 없거나 포트가 숫자가 아닌 경우
+    """
+    if isinstance(flow, dict):
+        src_ip = flow.get("src_ip", flow.get("src"))
+        dst_ip = flow.get("dst_ip", flow.get("dst"))
+        port = flow.get("port", flow.get("dst_port"))
+        protocol = flow.get("protocol", "tcp")
+    else:
+        values = list(flow) + [None] * (4 - len(flow))
+        src_ip, dst_ip, port, protocol = values[:4]
+
+    if not src_ip or not dst_ip:
+        raise ValueError(f"출발지/목적지 IP가 필요합니다: {flow}")
+
+    if port in (None, ""):
+        port = None
+    else:
+        try:
+            port = int(port)
+        except (TypeError, ValueError):
+            raise ValueError(f"잘못된 포트: {port}")
+
+    return str(src_ip).strip(), str(dst_ip).strip(), port, str(protocol or "tcp").strip().lower()
+
+
+def read_flows(path):
+    """
+    파일에서 플로우를 순차적으로 읽기 (.csv는 헤더가 있는 CSV, 그 외는 NDJSON)
+
+    Args:
+        path (str): 플로우 파일 경로
+
+    Yields:
+        dict: 플로우 레코드
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.lower().endswith(".csv"):
+            yield from csv.DictReader(f)
+            return
+
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def write_ndjson(records, stream):
+    """
+    레코드를 NDJSON 형식으로 스트림에 기록
+
+    Args:
+        records (iterable): 기록할 레코드
+        stream: 쓰기 가능한 텍스트 스트림
+
+    Returns:
+        int: 기록한 레코드 수
+    """
+    count = 0
+    for record in records:
+        stream.write(json.dumps(record, ensure_ascii=False, default=str))
+        stream.write("\n")
+        count += 1
+    return count
+
+
+def _init_worker(analyzer):
+    """워커 프로세스 초기화: 공유 분석기 설정"""
+    global _worker_analyzer
+    _worker_analyzer = analyzer
+
+
+def _evaluate_flow(analyzer, flow):
+    src_ip, dst_ip, port, protocol = flow
+    record = {"src_ip": src_ip, "dst_ip": dst_ip, "port": port, "protocol": protocol}
+    try:
+        record["result"] = analyzer.analyze_path(src_ip, dst_ip, port, protocol)
+    except Exception as e:
+        record["error"] = str(e)
+    return record
+
+
+def _evaluate_chunk(flows):
+    """워커 프로세스에서 플로우 청크 평가"""
+    return [_evaluate_flow(_worker_analyzer, flow) for flow in flows]
+
+
+class CompiledPathEvaluator:
+    """
+    DataLoader의 컴파일된 정책 인덱스와 라우팅 인덱스로 플로우를 평가하는 분석기
+
+    analyze_path 인터페이스를 제공하므로 BatchTrafficSimulator에 그대로 사용할 수 있습니다.
+    """
+
+    def __init__(self, ruleset, routing_index, firewall_id="default"):
+        """
+        평가기 초기화
+
+        Args:
+            ruleset (CompiledRuleset): 컴파일된 정책 집합 (없으면 None)
+            routing_index (RoutingIndex): 라우팅 인덱스 (없으면 None)
+            firewall_id (str): 방화벽 식별자
+        """
+        self.ruleset = ruleset
+        self.routing_index = routing_index
+        self.firewall_id = firewall_id
+
+    @classmethod
+    def from_data_loader(cls, data_loader, firewall_id="default"):
+        """
+        DataLoader에 로드된 방화벽 데이터로 평가기 생성
+
+        Raises:
+            ValueError: 방화벽의 정책 또는 라우팅 테이블이 로드되지 않음 (모든 플로우가 거부로 평가되는 것을 방지)
+        """
+        ruleset = data_loader.get_compiled_ruleset(firewall_id)
+        routing_index = data_loader.get_routing_index(firewall_id)
+        if ruleset is None or routing_index is None:
+            missing = "정책" if ruleset is None else "라우팅 테이블"
+            loaded = ", ".join(data_loader.get_firewall_ids()) or "없음"
+            raise ValueError(f"방화벽 '{firewall_id}'의 {missing} 데이터가 없습니다 (로드된 방화벽: {loaded})")
+        return cls(ruleset, routing_index, firewall_id)
+
+    def analyze_path(self, src_ip, dst_ip, port=None, protocol="tcp"):
+        """
+        플로우의 정책 판정과 라우팅 결과 반환
+
+        Returns:
+            dict: 허용 여부, 매치 정책, 라우트 정보
+        """
+        policy = self.ruleset.first_match(src_ip, dst_ip, port, protocol) if self.ruleset else None
+        action = policy.get("action", "deny").lower() if policy else "deny"
+
+        route = None
+        if self.routing_index is not None:
+            try:
+                route = self.routing_index.best_route(dst_ip)
+            except ValueError:
+                route = None
+
+        return {
+            "firewall_id": self.firewall_id,
+            "allowed": action == "accept",
+            "action": action,
+            "policy_id": policy.get("policyid") if policy else None,
+            "policy_name": policy.get("name", "Unknown") if policy else None,
+            "reachable": route is not None,
+            "interface": route.get("interface") if route else None,
+            "next_hop": route.get("gateway") if route else None,
+        }
+
+
+class BatchTrafficSimulator:
+    """analyze_path(src_ip, dst_ip, port, protocol)를 제공하는 분석기로 대량 플로우를 평가하는 클래스"""
+
+    def __init__(self, analyzer, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        일괄 시뮬레이터 초기화
+
+        Args:
+            analyzer: FixedPathAnalyzer, CompiledPathEvaluator 등 analyze_path를 제공하는 분석기
+            workers (int, optional): 프로세스 풀 크기 (None이면 CPU 수, 0/1이면 현재 프로세스에서 평가)
+            chunk_size (int): 워커에 한 번에 전달하는 고유 플로우 수
+        """
+        self.analyzer = analyzer
+        self.workers = workers
+        self.chunk_size = max(1, chunk_size)
+        self.logger = logger
+        self.last_summary = {}
+
+    def _unique_chunks(self, flows, stats):
+        """입력 플로우를 정규화·중복 제거하여 청크 단위로 생성"""
+        seen = set()
+        chunk = []
+
+        for flow in flows:
+            stats["total"] += 1
+            try:
+                key = normalize_flow(flow)
+            except ValueError as e:
+                stats["invalid"] += 1
+                self.logger.warning(f"잘못된 플로우 건너뜀: {e}")
+                continue
+
+            if key in seen:
+                stats["duplicates"] += 1
+                continue
+
+            seen.add(key)
+            chunk.append(key)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+    def simulate(self, flows):
+        """
+        플로우를 평가하여 결과 레코드를 입력(첫 등장) 순서대로 스트리밍
+
+        Args:
+            flows (iterable): 플로우 목록 (dict 또는 (src, dst, port, protocol) 튜플)
+
+        Yields:
+            dict: 플로우별 분석 결과 레코드
+        """
+        started = time.perf_counter()
+        stats = {"total": 0, "unique": 0, "duplicates": 0, "invalid": 0, "errors": 0}
+        self.last_summary = stats
+
+        for record in self._evaluate(self._unique_chunks(flows, stats)):
+            stats["unique"] += 1
+            if "error" in record:
+                stats["errors"] += 1
+            yield record
+
+        stats["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        self.logger.info(
+            f"일괄 트래픽 분석 완료: 입력 {stats['total']}건, 고유 {stats['unique']}건, "
+            f"중복 {stats['duplicates']}건, 오류 {stats['errors']}건 ({stats['elapsed_ms']:.1f}ms)"
+        )
+
+    def _evaluate(self, chunks):
+        if self.workers is not None and self.workers <= 1:
+            for chunk in chunks:
+                for flow in chunk:
+                    yield _evaluate_flow(self.analyzer, flow)
+            return
+
+        workers = self.workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self.analyzer,)) as executor:
+            # 메모리 사용량을 제한하기 위해 진행 중인 청크 수를 워커 수의 2배로 제한
+            window = 2 * workers
+            pending = deque()
+
+            for chunk in chunks:
+                pending.append(executor.submit(_evaluate_chunk, chunk))
+                if len(pending) >= window:
+                    yield from pending.popleft().result()
+
+            while pending:
+                yield from pending.popleft().result()
+
+    def simulate_to_ndjson(self, flows, stream, include_summary=True):
+        """
+        플로우를 평가하여 NDJSON으로 스트림에 기록
+
+        Args:
+            flows (iterable): 플로우 목록
+            stream: 쓰기 가능한 텍스트 스트림
+            include_summary (bool): 마지막 줄에 요약 레코드를 추가할지 여부
+
+        Returns:
+            dict: 처리 요약
+        """
+        write_ndjson(self.simulate(flows), stream)
+        if include_summary:
+            write_ndjson([{"summary": self.last_summary}], stream)
+        return self.last_summary
@@ -0,0 +1,262 @@
+"""
+정책 충돌 탐지 컴포넌트
+
+컴파일된 정책을 (소스, 목적지, 프로토콜/포트) 공간의 하이퍼 직사각형 합집합으로 보고
+실제로 겹치는 정책 쌍만 찾아 섀도잉/중복/일반화/상관 관계를 분류하는 책임을 담당합니다.
+소스/목적지/서비스 차원 중 겹치는 구간 쌍이 가장 적은(가장 선택적인) 차원을 O(n log n)으로 골라
+그 차원에서 스윕 라인으로 후보 쌍을 찾고, 나머지 차원은 구간 교차 검사로 걸러냅니다.
+srcaddr "all"처럼 한 차원이 전체를 덮는 정책이 많아도 목적지나 서비스가 갈리면 후보가 늘지 않으므로
+전체 쌍을 비교하지 않고 대략 O(n log n + k) 시간에 동작합니다 (k는 선택한 차원에서 겹치는 쌍 수).
+"""
+
+import bisect
+import heapq
+import time
+
+from utils.unified_logger import setup_logger
+
+from .group_resolver import SERVICE_PROTOCOLS
+from .ruleset_compiler import IP_SPACE_MAX, PORT_MAX
+
+logger = setup_logger("conflict_detector")
+
+FULL_ADDRESS_SPACE = {version: [(0, space_max)] for version, space_max in IP_SPACE_MAX.items()}
+
+# 차원 구간을 한 수직선에 펼칠 때의 오프셋 (IPv4 다음 IPv6, TCP 다음 UDP 포트)
+_ADDRESS_OFFSETS = {4: 0, 6: IP_SPACE_MAX[4] + 1}
+_SERVICE_OFFSETS = {protocol: i * (PORT_MAX + 1) for i, protocol in enumerate(SERVICE_PROTOCOLS)}
+_ALL_SERVICES_LINE = [(0, len(SERVICE_PROTOCOLS) * (PORT_MAX + 1) - 1)]
+
+CONFLICT_TYPES = ("shadow", "redundancy", "generalization", "correlation")
+
+
+def intervals_intersect(first, second):
+    """정렬·병합된 두 구간 목록이 겹치는지 확인"""
+    i = j = 0
+    while i < len(first) and j < len(second):
+        if first[i][1] < second[j][0]:
+            i += 1
+        elif second[j][1] < first[i][0]:
+            j += 1
+        else:
+            return True
+    return False
+
+
+def intervals_cover(outer, inner):
+    """정렬·병합된 구간 목록 outer가 inner를 모두 포함하는지 확인"""
+    starts = [start for start, _ in outer]
+    for start, end in inner:
+        pos = bisect.bisect_right(starts, start) - 1
+        if pos < 0 or end > outer[pos][1]:
+            return False
+    return True
+
+
+class _RuleGeometry:
+    """정책 하나의 하이퍼 직사각형 표현"""
+
+    __slots__ = ("bit", "policy", "action", "src", "dst", "services")
+
+    def __init__(self, bit, policy, src, dst, services):
+        self.bit = bit
+        self.policy = policy
+        self.action = policy.get("action", "deny").lower()
+        self.src = src
+        self.dst = dst
+        self.services = services  # None이면 모든 서비스
+
+    def is_empty(self):
+        """어떤 트래픽과도 매치될 수 없는 정책인지 확인"""
+        if not any(self.src.values()) or not any(self.dst.values()):
+            return True
+        return self.services is not None and not any(self.services.values())
+
+
+def _address_overlap(first, second):
+    return any(intervals_intersect(first[version], second[version]) for version in IP_SPACE_MAX)
+
+
+def _address_cover(outer, inner):
+    return all(intervals_cover(outer[version], inner[version]) for version in IP_SPACE_MAX)
+
+
+def _service_overlap(first, second):
+    if first is None or second is None:
+        return True
+    return any(intervals_intersect(ranges, second.get(protocol, [])) for protocol, ranges in first.items())
+
+
+def _service_cover(outer, inner):
+    if outer is None:
+        return True
+    if inner is None:
+        return False
+    return all(intervals_cover(outer.get(protocol, []), ranges) for protocol, ranges in inner.items())
+
+
+def _overlaps(first, second):
+    return (
+        _address_overlap(first.src, second.src)
+        and _address_overlap(first.dst, second.dst)
+        and _service_overlap(first.services, second.services)
+    )
+
+
+def _covers(outer, inner):
+    return (
+        _address_cover(outer.src, inner.src)
+        and _address_cover(outer.dst, inner.dst)
+        and _service_cover(outer.services, inner.services)
+    )
+
+
+def _classify(earlier, later):
+    """먼저 평가되는 정책(earlier)과 나중 정책(later)의 관계 분류"""
+    same_action = earlier.action == later.action
+
+    if _covers(earlier, later):
+        return "redundancy" if same_action else "shadow"
+    if same_action:
+        return None
+    if _covers(later, earlier):
+        return "generalization"
+    return "correlation"
+
+
+def _address_line(address):
+    return [
+        (start + offset, end + offset)
+        for version, offset in _ADDRESS_OFFSETS.items()
+        for start, end in address[version]
+    ]
+
+
+def _service_line(services):
+    if services is None:
+        return _ALL_SERVICES_LINE
+    return [
+        (start + _SERVICE_OFFSETS[protocol], end + _SERVICE_OFFSETS[protocol])
+        for protocol, ranges in services.items()
+        if protocol in _SERVICE_OFFSETS
+        for start, end in ranges
+    ]
+
+
+def _dimension_lines(rules):
+    """차원별로 각 정책의 구간을 한 수직선 위 구간 목록으로 변환"""
+    return {
+        "src": [_address_line(rule.src) for rule in rules],
+        "dst": [_address_line(rule.dst) for rule in rules],
+        "service": [_service_line(rule.services) for rule in rules],
+    }
+
+
+def _overlapping_interval_pairs(lines):
+    """
+    수직선 위에서 겹치는 구간 쌍 수 (O(n log n))
+
+    시작점 순서로 볼 때 각 구간과 겹치는 앞선 구간 수는 (앞선 구간 수 - 이 구간 시작 전에 끝난 구간 수)
+    """
+    intervals = sorted(interval for line in lines for interval in line)
+    ends = sorted(end for _, end in intervals)
+    return sum(position - bisect.bisect_left(ends, start) for position, (start, _) in enumerate(intervals))
+
+
+def _candidate_pairs(lines):
+    """한 차원의 스윕 라인으로 그 차원에서 구간이 겹치는 정책 쌍 생성"""
+    seen = set()
+    intervals = sorted((start, end, index) for index, line in enumerate(lines) for start, end in line)
+    active = []  # (끝, 규칙 인덱스) 최소 힙
+
+    for start, end, index in intervals:
+        while active and active[0][0] < start:
+            heapq.heappop(active)
+
+        for _, other in active:
+            pair = (other, index) if other < index else (index, other)
+            if pair[0] != pair[1] and pair not in seen:
+                seen.add(pair)
+                yield pair
+
+        heapq.heappush(active, (end, index))
+
+
+def _policy_summary(rule):
+    return {
+        "id": rule.policy.get("policyid"),
+        "name": rule.policy.get("name", "Unknown"),
+        "action": rule.policy.get("action", "deny"),
+    }
+
+
+def detect_conflicts(ruleset):
+    """
+    컴파일된 정책 집합에서 실제 충돌 관계 탐지
+
+    Args:
+        ruleset (CompiledRuleset): 컴파일된 정책 집합
+
+    Returns:
+        dict: 충돌 목록, 유형별 개수, 소요 시간(ms)
+    """
+    started = time.perf_counter()
+
+    rules = []
+    for bit, policy in enumerate(ruleset.policies):
+        if policy.get("status") == "disable":
+            continue
+        rule = _RuleGeometry(
+            bit,
+            policy,
+            ruleset.src_intervals[bit] or FULL_ADDRESS_SPACE,
+            ruleset.dst_intervals[bit] or FULL_ADDRESS_SPACE,
+            ruleset.service_ranges[bit],
+        )
+        if not rule.is_empty():
+            rules.append(rule)
+
+    # 겹치는 쌍이 가장 적은 차원에서 스윕
+    lines = _dimension_lines(rules)
+    overlap_counts = {dimension: _overlapping_interval_pairs(line) for dimension, line in lines.items()}
+    sweep_dimension = min(overlap_counts, key=overlap_counts.get)
+
+    conflicts = []
+    candidates = 0
+    for first, second in _candidate_pairs(lines[sweep_dimension]):
+        candidates += 1
+        earlier, later = rules[first], rules[second]
+        if not _overlaps(earlier, later):
+            continue
+
+        conflict_type = _classify(earlier, later)
+        if conflict_type:
+            conflicts.append(
+                {
+                    "policy1": _policy_summary(earlier),
+                    "policy2": _policy_summary(later),
+                    "conflict_type": conflict_type,
+                }
+            )
+
+    conflicts.sort(key=lambda c: (c["policy2"]["id"] or 0, c["policy1"]["id"] or 0))
+
+    summary = {conflict_type: 0 for conflict_type in CONFLICT_TYPES}
+    for conflict in conflicts:
+        summary[conflict["conflict_type"]] += 1
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(
+        f"정책 충돌 분석 완료: {len(rules)}개 정책, {sweep_dimension} 차원 스윕, 후보 {candidates}쌍, "
+        f"충돌 {len(conflicts)}건 ({elapsed_ms:.1f}ms)"
+    )
+
+    return {
+        "total_policies": len(ruleset.policies),
+        "analyzed_policies": len(rules),
+        "conflicts": conflicts,
+        "summary": summary,
+        "sweep_dimension": sweep_dimension,
+        "candidate_pairs": candidates,
+        "elapsed_ms": round(elapsed_ms, 3),
+    }
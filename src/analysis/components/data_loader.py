@@ -4,26 +4,62 @@
 방화벽 및 FortiManager에서 데이터를 로드하는 책임을 담당합니다.
 """
 
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from utils.unified_logger import setup_logger
 
+from .route_trie import build_routing_index
+from .ruleset_compiler import compile_ruleset
+
 logger = setup_logger("data_loader")
 
+# 병렬 로드 기본값
+DEFAULT_LOAD_WORKERS = 16
+DEFAULT_FORTIMANAGER_CONCURRENCY = 8
+
+# 증분 동기화 대상 테이블 (정책 인덱스 입력 테이블 / 라우팅 인덱스 입력 테이블)
+RULESET_TABLES = ("policies", "addresses", "address_groups", "services", "service_groups")
+ROUTING_TABLES = ("routes",)
+DATA_TABLES = RULESET_TABLES + ROUTING_TABLES
+
+
+def content_hash(data):
+    """테이블 데이터의 내용 해시 (키 순서와 무관)"""
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
 
 class DataLoader:
     """FortiGate 및 FortiManager로부터 데이터를 로드하는 클래스"""
 
-    def __init__(self, fortigate_client=None, fortimanager_client=None):
+    def __init__(
+        self,
+        fortigate_client=None,
+        fortimanager_client=None,
+        max_workers=DEFAULT_LOAD_WORKERS,
+        fortimanager_concurrency=DEFAULT_FORTIMANAGER_CONCURRENCY,
+    ):
         """
         데이터 로더 초기화
 
         Args:
             fortigate_client: FortiGate API 클라이언트
             fortimanager_client: FortiManager API 클라이언트
+            max_workers (int): 전체 장치 병렬 로드 시 작업 스레드 수
+            fortimanager_concurrency (int): FortiManager로 동시에 보내는 최대 요청 수
         """
         self.fortigate_client = fortigate_client
         self.fortimanager_client = fortimanager_client
         self.logger = logger
 
+        self.max_workers = max(1, max_workers)
+        self._fortimanager_slots = threading.BoundedSemaphore(max(1, fortimanager_concurrency))
+        self.last_load_report = {}
+
         # 데이터 캐시
         self._policies = {}
         self._addresses = {}
@@ -33,29 +69,210 @@ class DataLoader:
         self._routing_tables = {}
         self._firewalls = {}
 
-    def load_firewall_data(self, firewall_id="default"):
+        # 컴파일된 정책/라우팅 인덱스 캐시 (데이터 재로드 시 무효화)
+        self._compiled_rulesets = {}
+        self._routing_indexes = {}
+
+        # 방화벽별 데이터 세대 (데이터가 바뀔 때마다 증가)
+        self._generations = {}
+        self._base_generation = 0
+
+        # 증분 동기화용 테이블별 리비전/내용 해시 및 무효화 이벤트 리스너
+        self._table_revisions = {}
+        self._invalidation_listeners = []
+
+    def load_firewall_data(self, firewall_id="default", adom="root", adom_objects=None):
         """
         특정 방화벽의 데이터 로드
 
         Args:
             firewall_id (str): 방화벽 식별자
+            adom (str): FortiManager ADOM 이름
+            adom_objects (dict, optional): 같은 ADOM 장치들이 공유하는 미리 로드된 객체
 
         Returns:
             bool: 데이터 로드 성공 여부
         """
         try:
+            # 재로드되는 데이터와 어긋나지 않도록 기존 컴파일 결과를 먼저 폐기
+            self.invalidate_compiled(firewall_id)
+
             if self.fortigate_client:
-                return self._load_from_fortigate(firewall_id)
+                loaded = self._load_from_fortigate(firewall_id)
             elif self.fortimanager_client:
-                return self._load_from_fortimanager(firewall_id)
+                loaded = self._load_from_fortimanager(firewall_id, adom, adom_objects)
             else:
                 self.logger.error("FortiGate 또는 FortiManager 클라이언트가 필요합니다.")
                 return False
 
+            if loaded:
+                self._record_table_revisions(firewall_id, adom)
+                self.get_compiled_ruleset(firewall_id)
+                self.get_routing_index(firewall_id)
+                self._notify_invalidation(firewall_id, DATA_TABLES)
+            return loaded
+
         except Exception as e:
             self.logger.error(f"데이터 로드 중 오류 발생: {str(e)}")
             return False
 
+    def refresh_firewall_data(self, firewall_id="default", adom="root"):
+        """
+        변경된 테이블만 다시 가져오는 증분 동기화
+
+        클라이언트가 get_table_revision(table, firewall_id, adom)을 제공하면 리비전이 같은 테이블은
+        아예 가져오지 않고, 그렇지 않으면 가져온 뒤 내용 해시로 변경 여부를 판단합니다.
+        변경된 테이블에 의존하는 인덱스만 무효화·재생성하고 무효화 이벤트를 발생시킵니다.
+
+        Args:
+            firewall_id (str): 방화벽 식별자
+            adom (str): FortiManager ADOM 이름
+
+        Returns:
+            dict: 변경된 테이블(changed), 변경 없는 테이블(unchanged), 가져온 테이블(fetched), 성공 여부
+        """
+        result = {"success": False, "changed": [], "unchanged": [], "fetched": []}
+
+        try:
+            fetchers = self._table_fetchers(firewall_id, adom)
+            if fetchers is None:
+                self.logger.error("FortiGate 또는 FortiManager 클라이언트가 필요합니다.")
+                return result
+
+            revisions = self._table_revisions.setdefault(firewall_id, {})
+            storage = self._table_storage()
+
+            for table in DATA_TABLES:
+                previous = revisions.get(table)
+                revision = self._get_table_revision(table, firewall_id, adom)
+
+                if previous and revision is not None and previous["revision"] == revision:
+                    result["unchanged"].append(table)
+                    continue
+
+                data = fetchers[table]()
+                result["fetched"].append(table)
+                digest = content_hash(data)
+
+                if previous and previous["hash"] == digest and firewall_id in storage[table]:
+                    previous["revision"] = revision
+                    result["unchanged"].append(table)
+                    continue
+
+                storage[table][firewall_id] = data
+                revisions[table] = {"revision": revision, "hash": digest}
+                result["changed"].append(table)
+
+            if result["changed"]:
+                self.invalidate_compiled(firewall_id, result["changed"])
+                if any(table in RULESET_TABLES for table in result["changed"]):
+                    self.get_compiled_ruleset(firewall_id)
+                if any(table in ROUTING_TABLES for table in result["changed"]):
+                    self.get_routing_index(firewall_id)
+                self._notify_invalidation(firewall_id, result["changed"])
+
+            self.logger.info(
+                f"{firewall_id} 증분 동기화 완료: 변경 {result['changed'] or '없음'}, "
+                f"조회 {len(result['fetched'])}/{len(DATA_TABLES)}개 테이블"
+            )
+            result["success"] = True
+            return result
+
+        except Exception as e:
+            self.logger.error(f"증분 동기화 중 오류 발생: {str(e)}")
+            return result
+
+    def add_invalidation_listener(self, callback):
+        """
+        데이터 무효화 이벤트 리스너 등록
+
+        Args:
+            callback (callable): (firewall_id, 변경된 테이블 목록)을 받는 콜백
+        """
+        self._invalidation_listeners.append(callback)
+
+    def remove_invalidation_listener(self, callback):
+        """데이터 무효화 이벤트 리스너 제거"""
+        if callback in self._invalidation_listeners:
+            self._invalidation_listeners.remove(callback)
+
+    def _notify_invalidation(self, firewall_id, tables):
+        for callback in list(self._invalidation_listeners):
+            try:
+                callback(firewall_id, list(tables))
+            except Exception as e:
+                self.logger.error(f"무효화 이벤트 처리 중 오류: {str(e)}")
+
+    def _table_storage(self):
+        """테이블 이름별 데이터 캐시"""
+        return {
+            "policies": self._policies,
+            "addresses": self._addresses,
+            "address_groups": self._address_groups,
+            "services": self._services,
+            "service_groups": self._service_groups,
+            "routes": self._routing_tables,
+        }
+
+    def _table_fetchers(self, firewall_id, adom):
+        """테이블 이름별 데이터 조회 함수 (클라이언트가 없으면 None)"""
+        if self.fortigate_client:
+            client = self.fortigate_client
+            return {
+                "policies": client.get_firewall_policies,
+                "addresses": client.get_firewall_addresses,
+                "address_groups": client.get_firewall_address_groups,
+                "services": client.get_firewall_services,
+                "service_groups": client.get_firewall_service_groups,
+                "routes": client.get_routing_table,
+            }
+
+        if self.fortimanager_client:
+
+            def fetch_policies():
+                policy_packages = self._call_fortimanager("get_policy_packages", adom)
+                if not policy_packages:
+                    return self._policies.get(firewall_id, [])
+                return self._call_fortimanager("get_firewall_policies", policy_packages[0]["name"], adom)
+
+            return {
+                "policies": fetch_policies,
+                "addresses": lambda: self._call_fortimanager("get_firewall_addresses", adom),
+                "address_groups": lambda: self._call_fortimanager("get_firewall_address_groups", adom),
+                "services": lambda: self._call_fortimanager("get_firewall_services", adom),
+                "service_groups": lambda: self._call_fortimanager("get_firewall_service_groups", adom),
+                "routes": lambda: self._call_fortimanager("get_device_routing_table", firewall_id, adom),
+            }
+
+        return None
+
+    def _get_table_revision(self, table, firewall_id, adom):
+        """클라이언트가 지원하면 테이블 리비전 조회 (미지원 또는 오류 시 None)"""
+        client = self.fortigate_client or self.fortimanager_client
+        get_revision = getattr(client, "get_table_revision", None)
+        if not callable(get_revision):
+            return None
+
+        try:
+            if client is self.fortimanager_client:
+                with self._fortimanager_slots:
+                    return get_revision(table, firewall_id, adom)
+            return get_revision(table, firewall_id, adom)
+        except Exception as e:
+            self.logger.warning(f"테이블 리비전 조회 실패: {table}, {str(e)}")
+            return None
+
+    def _record_table_revisions(self, firewall_id, adom):
+        """전체 로드 직후 테이블별 리비전과 내용 해시 기록"""
+        storage = self._table_storage()
+        self._table_revisions[firewall_id] = {
+            table: {
+                "revision": self._get_table_revision(table, firewall_id, adom),
+                "hash": content_hash(storage[table].get(firewall_id, [])),
+            }
+            for table in DATA_TABLES
+        }
+
     def _load_from_fortigate(self, firewall_id):
         """FortiGate에서 직접 데이터 로드"""
         self._policies[firewall_id] = self.fortigate_client.get_firewall_policies()
@@ -66,46 +283,80 @@ class DataLoader:
         self._routing_tables[firewall_id] = self.fortigate_client.get_routing_table()
         return True
 
-    def _load_from_fortimanager(self, firewall_id):
+    def _call_fortimanager(self, method_name, *args):
+        """FortiManager 동시 요청 수 제한을 적용하여 API 호출"""
+        with self._fortimanager_slots:
+            return getattr(self.fortimanager_client, method_name)(*args)
+
+    def _fetch_adom_objects(self, adom):
+        """
+        ADOM 단위로 공유되는 정책 패키지/정책/주소/서비스 객체 로드
+
+        Args:
+            adom (str): ADOM 이름
+
+        Returns:
+            dict: ADOM 공유 객체
+        """
+        policy_packages = self._call_fortimanager("get_policy_packages", adom)
+
+        # 첫 번째 정책 패키지 사용 (단순화)
+        policy_package = policy_packages[0]["name"] if policy_packages else None
+        policies = self._call_fortimanager("get_firewall_policies", policy_package, adom) if policy_package else None
+
+        return {
+            "policy_packages": policy_packages,
+            "policies": policies,
+            "addresses": self._call_fortimanager("get_firewall_addresses", adom),
+            "address_groups": self._call_fortimanager("get_firewall_address_groups", adom),
+            "services": self._call_fortimanager("get_firewall_services", adom),
+            "service_groups": self._call_fortimanager("get_firewall_service_groups", adom),
+        }
+
+    def _load_from_fortimanager(self, firewall_id, adom="root", adom_objects=None):
         """FortiManager에서 데이터 로드"""
         self.logger.info(f"FortiManager를 통해 {firewall_id} 방화벽 데이터 로드 중...")
 
-        adom = "root"
-
         # 장치 정보 로드
-        device_info = self.fortimanager_client.get_device_info(firewall_id, adom)
+        device_info = self._call_fortimanager("get_device_info", firewall_id, adom)
         if not device_info:
             self.logger.error(f"장치 정보를 로드할 수 없습니다: {firewall_id}")
             return False
 
         self._firewalls[firewall_id] = device_info
 
-        # 정책 패키지 정보 로드
-        policy_packages = self.fortimanager_client.get_policy_packages(adom)
-        if not policy_packages:
+        # 정책 패키지 및 ADOM 공유 객체 로드 (미리 로드된 경우 재사용)
+        if adom_objects is None:
+            adom_objects = self._fetch_adom_objects(adom)
+
+        if not adom_objects["policy_packages"]:
             self.logger.error(f"{firewall_id}에 대한 정책 패키지를 로드할 수 없습니다.")
             return False
 
-        # 첫 번째 정책 패키지 사용 (단순화)
-        policy_package = policy_packages[0]["name"] if policy_packages else None
-
-        if policy_package:
-            self._policies[firewall_id] = self.fortimanager_client.get_firewall_policies(policy_package, adom)
+        if adom_objects["policies"] is not None:
+            self._policies[firewall_id] = adom_objects["policies"]
 
-        # 주소 객체 및 서비스 객체 로드
-        self._addresses[firewall_id] = self.fortimanager_client.get_firewall_addresses(adom)
-        self._address_groups[firewall_id] = self.fortimanager_client.get_firewall_address_groups(adom)
-        self._services[firewall_id] = self.fortimanager_client.get_firewall_services(adom)
-        self._service_groups[firewall_id] = self.fortimanager_client.get_firewall_service_groups(adom)
+        # 주소 객체 및 서비스 객체
+        self._addresses[firewall_id] = adom_objects["addresses"]
+        self._address_groups[firewall_id] = adom_objects["address_groups"]
+        self._services[firewall_id] = adom_objects["services"]
+        self._service_groups[firewall_id] = adom_objects["service_groups"]
 
         # 라우팅 테이블 로드
-        self._routing_tables[firewall_id] = self.fortimanager_client.get_device_routing_table(firewall_id, adom)
+        self._routing_tables[firewall_id] = self._call_fortimanager("get_device_routing_table", firewall_id, adom)
 
         return True
 
-    def load_all_firewalls(self):
+    def load_all_firewalls(self, progress_callback=None):
         """
-        FortiManager를 통해 모든 방화벽 장치의 데이터 로드
+        FortiManager를 통해 모든 방화벽 장치의 데이터를 병렬로 로드
+
+        ADOM별 공유 객체는 ADOM당 한 번만 가져오고, 장치별 데이터는 스레드 풀에서
+        FortiManager 동시 요청 수 제한 안에서 병렬로 로드합니다.
+        장치별 결과와 소요 시간은 last_load_report에 기록됩니다.
+
+        Args:
+            progress_callback (callable, optional): (완료 수, 전체 수, 장치 결과) 진행 콜백
 
         Returns:
             bool: 데이터 로드 성공 여부
@@ -114,34 +365,174 @@ class DataLoader:
             self.logger.error("FortiManager 클라이언트가 필요합니다.")
             return False
 
+        started = time.perf_counter()
+        device_reports = {}
+        self.last_load_report = {"devices": device_reports, "total": 0, "loaded": 0, "failed": 0, "elapsed_ms": 0.0}
+
         try:
-            adoms = self.fortimanager_client.get_adoms()
+            adoms = self._call_fortimanager("get_adoms")
             if not adoms:
                 self.logger.error("ADOM 목록을 가져올 수 없습니다.")
                 return False
 
-            loaded = False
-
-            for adom in adoms:
-                adom_name = adom.get("name")
-                if not adom_name:
-                    continue
+            adom_names = [adom.get("name") for adom in adoms if adom.get("name")]
+
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="fw-loader") as executor:
+                # 1단계: ADOM별 장치 목록과 공유 객체 로드
+                adom_futures = {executor.submit(self._load_adom_inventory, name): name for name in adom_names}
+                device_jobs = []
+                for future in as_completed(adom_futures):
+                    adom_name = adom_futures[future]
+                    devices, adom_objects = future.result()
+                    if not devices:
+                        self.logger.warning(f"ADOM '{adom_name}'에서 장치를 찾을 수 없습니다.")
+                        continue
+                    for device in devices:
+                        device_name = device.get("name")
+                        if device_name:
+                            device_jobs.append((device_name, adom_name, adom_objects))
+
+                # 2단계: 장치별 데이터 병렬 로드
+                total = len(device_jobs)
+                self.last_load_report["total"] = total
+                device_futures = [executor.submit(self._load_device, *job) for job in device_jobs]
+
+                for completed, future in enumerate(as_completed(device_futures), 1):
+                    report = future.result()
+                    device_reports[report["device"]] = report
+                    self.last_load_report["loaded" if report["success"] else "failed"] += 1
+
+                    if progress_callback:
+                        progress_callback(completed, total, report)
+
+            return self.last_load_report["loaded"] > 0
 
-                devices = self.fortimanager_client.get_devices(adom_name)
-                if not devices:
-                    self.logger.warning(f"ADOM '{adom_name}'에서 장치를 찾을 수 없습니다.")
-                    continue
+        except Exception as e:
+            self.logger.error(f"모든 방화벽 데이터 로드 중 오류 발생: {str(e)}")
+            return False
 
-                for device in devices:
-                    device_name = device.get("name")
-                    if device_name and self.load_firewall_data(device_name):
-                        loaded = True
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.last_load_report["elapsed_ms"] = round(elapsed_ms, 3)
+            self.logger.info(
+                f"전체 방화벽 로드 완료: {self.last_load_report['loaded']}/{self.last_load_report['total']}개 성공 "
+                f"({elapsed_ms:.1f}ms)"
+            )
 
-            return loaded
+    def _load_adom_inventory(self, adom_name):
+        """ADOM의 장치 목록과 공유 객체 로드 (장치가 없으면 공유 객체는 로드하지 않음)"""
+        try:
+            devices = self._call_fortimanager("get_devices", adom_name)
+            if not devices:
+                return devices, None
+            return devices, self._fetch_adom_objects(adom_name)
 
         except Exception as e:
-            self.logger.error(f"모든 방화벽 데이터 로드 중 오류 발생: {str(e)}")
-            return False
+            self.logger.error(f"ADOM '{adom_name}' 로드 중 오류 발생: {str(e)}")
+            return None, None
+
+    def _load_device(self, device_name, adom_name, adom_objects):
+        """장치 하나를 로드하고 결과와 소요 시간 반환"""
+        started = time.perf_counter()
+        success = self.load_firewall_data(device_name, adom_name, adom_objects)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        self.logger.info(f"장치 로드 {'완료' if success else '실패'}: {adom_name}/{device_name} ({elapsed_ms:.1f}ms)")
+        return {
+            "device": device_name,
+            "adom": adom_name,
+            "success": success,
+            "elapsed_ms": round(elapsed_ms, 3),
+        }
+
+    def invalidate_compiled(self, firewall_id=None, tables=None):
+        """
+        컴파일된 정책/라우팅 인덱스 무효화 및 데이터 세대 증가
+
+        Args:
+            firewall_id (str, optional): 방화벽 식별자 (None이면 전체 무효화)
+            tables (iterable, optional): 변경된 테이블 목록 (None이면 모든 테이블)
+        """
+        tables = set(DATA_TABLES if tables is None else tables)
+        ruleset_changed = bool(tables & set(RULESET_TABLES))
+        routing_changed = bool(tables & set(ROUTING_TABLES))
+
+        if firewall_id is None:
+            if ruleset_changed:
+                self._compiled_rulesets.clear()
+                self._base_generation += 1
+            if routing_changed:
+                self._routing_indexes.clear()
+        else:
+            if ruleset_changed:
+                self._compiled_rulesets.pop(firewall_id, None)
+                self._generations[firewall_id] = self._generations.get(firewall_id, 0) + 1
+            if routing_changed:
+                self._routing_indexes.pop(firewall_id, None)
+
+    def get_generation(self, firewall_id="default"):
+        """
+        방화벽 데이터 세대 반환 (파생 캐시의 유효성 확인용)
+
+        Args:
+            firewall_id (str): 방화벽 식별자
+
+        Returns:
+            int: 데이터 세대
+        """
+        return self._base_generation + self._generations.get(firewall_id, 0)
+
+    def get_compiled_ruleset(self, firewall_id="default"):
+        """
+        컴파일된 정책 인덱스 반환 (없으면 현재 로드된 데이터로 컴파일)
+
+        Args:
+            firewall_id (str): 방화벽 식별자
+
+        Returns:
+            CompiledRuleset or None: 정책 데이터가 없으면 None
+        """
+        ruleset = self._compiled_rulesets.get(firewall_id)
+        if ruleset is None:
+            policies = self.get_policies(firewall_id)
+            if not policies:
+                return None
+
+            ruleset = compile_ruleset(
+                policies,
+                self.get_addresses(firewall_id),
+                self.get_address_groups(firewall_id),
+                self.get_services(firewall_id),
+                self.get_service_groups(firewall_id),
+            )
+            self._compiled_rulesets[firewall_id] = ruleset
+
+        return ruleset
+
+    def get_routing_index(self, firewall_id="default"):
+        """
+        라우팅 테이블의 LPM 인덱스 반환 (없으면 현재 로드된 라우팅 테이블로 생성)
+
+        Args:
+            firewall_id (str): 방화벽 식별자
+
+        Returns:
+            RoutingIndex or None: 라우팅 테이블이 없으면 None
+        """
+        index = self._routing_indexes.get(firewall_id)
+        if index is None:
+            routing_table = self.get_routing_tables(firewall_id)
+            if not routing_table:
+                return None
+
+            index = build_routing_index(routing_table)
+            self._routing_indexes[firewall_id] = index
+
+        return index
+
+    def get_firewall_ids(self):
+        """정책 또는 라우팅 테이블이 로드된 방화벽 식별자 목록"""
+        return sorted(set(self._policies) | set(self._routing_tables))
 
     def get_policies(self, firewall_id="default"):
         """정책 데이터 반환"""
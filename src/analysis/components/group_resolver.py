@@ -0,0 +1,281 @@
+"""
+그룹 해석 컴포넌트
+
+주소 그룹과 서비스 그룹을 한 번만 펼쳐서 병합·정렬된 구간 집합으로 보관하는 책임을 담당합니다.
+중첩 그룹은 순환 참조 검사와 함께 재귀적으로 확장되며, 확장 결과는 그룹 이름별로 메모이즈됩니다.
+멤버십 검사는 정렬된 구간에 대한 이진 탐색으로 수행됩니다.
+"""
+
+import bisect
+import ipaddress
+
+from utils.unified_logger import setup_logger
+
+logger = setup_logger("group_resolver")
+
+SERVICE_PROTOCOLS = ("tcp", "udp")
+
+
+def merge_intervals(intervals):
+    """겹치거나 인접한 정수 구간을 병합하여 정렬된 목록으로 반환"""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def address_object_intervals(address_obj):
+    """
+    주소 객체를 (IP 버전, 시작 정수, 끝 정수) 구간 목록으로 변환
+
+    ipmask/iprange 이외의 유형(FQDN 등)은 IP 매칭에 사용할 수 없으므로 빈 목록을 반환합니다.
+    """
+    obj_type = address_obj.get("type")
+    try:
+        if obj_type == "ipmask":
+            subnet = address_obj.get("subnet", "0.0.0.0/0")
+            if " " in subnet:
+                ip_part, mask_part = subnet.split(" ")
+                mask_prefix = sum([bin(int(x)).count("1") for x in mask_part.split(".")])
+                subnet = f"{ip_part}/{mask_prefix}"
+            network = ipaddress.ip_network(subnet, strict=False)
+            return [(network.version, int(network.network_address), int(network.broadcast_address))]
+
+        if obj_type == "iprange":
+            start_ip = ipaddress.ip_address(address_obj.get("start-ip", "0.0.0.0"))
+            end_ip = ipaddress.ip_address(address_obj.get("end-ip", "255.255.255.255"))
+            if start_ip.version != end_ip.version or int(start_ip) > int(end_ip):
+                return []
+            return [(start_ip.version, int(start_ip), int(end_ip))]
+
+    except ValueError as e:
+        logger.warning(f"주소 객체 파싱 오류: {address_obj.get('name')}, {str(e)}")
+
+    return []
+
+
+def parse_port_range(port_range):
+    """포트 범위 문자열('80' 또는 '80-90')을 (시작, 끝) 구간 목록으로 변환"""
+    if not port_range:
+        return []
+
+    try:
+        if "-" not in port_range:
+            port = int(port_range)
+            return [(port, port)]
+
+        start_port, end_port = map(int, port_range.split("-"))
+        return [(start_port, end_port)] if start_port <= end_port else []
+
+    except ValueError:
+        return []
+
+
+def service_object_ranges(service_obj):
+    """서비스 객체를 프로토콜별 포트 구간 사전으로 변환"""
+    service_protocol = service_obj.get("protocol", "").lower()
+    ranges = {}
+
+    for protocol in SERVICE_PROTOCOLS:
+        if service_protocol and service_protocol != protocol:
+            continue
+        port_ranges = parse_port_range(service_obj.get(f"{protocol}-portrange", ""))
+        if port_ranges:
+            ranges[protocol] = port_ranges
+
+    return ranges
+
+
+class IntervalSet:
+    """병합·정렬된 정수 구간 집합"""
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, intervals=()):
+        merged = merge_intervals(intervals)
+        self.starts = [start for start, _ in merged]
+        self.ends = [end for _, end in merged]
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __contains__(self, value):
+        pos = bisect.bisect_right(self.starts, value) - 1
+        return pos >= 0 and value <= self.ends[pos]
+
+    def intervals(self):
+        """(시작, 끝) 구간 목록 반환"""
+        return list(zip(self.starts, self.ends))
+
+
+class ResolvedGroups:
+    """
+    방화벽 하나의 주소/서비스 객체와 그룹에 대한 해석 결과
+
+    이름→객체 해시맵을 보관하고, 그룹 확장 결과를 이름별로 메모이즈합니다.
+    """
+
+    def __init__(self, addresses, address_groups, services, service_groups):
+        """
+        그룹 해석 결과 초기화
+
+        Args:
+            addresses (list): 주소 객체 목록
+            address_groups (list): 주소 그룹 목록
+            services (list): 서비스 객체 목록
+            service_groups (list): 서비스 그룹 목록
+        """
+        self.addresses = {obj.get("name"): obj for obj in addresses or []}
+        self.address_groups = {obj.get("name"): obj for obj in address_groups or []}
+        self.services = {obj.get("name"): obj for obj in services or []}
+        self.service_groups = {obj.get("name"): obj for obj in service_groups or []}
+
+        self._address_intervals = {}
+        self._service_ranges = {}
+        self._address_sets = {}
+        self._service_sets = {}
+
+    def address_intervals(self, name):
+        """
+        주소 이름(그룹 또는 객체)을 (IP 버전, 시작, 끝) 구간 목록으로 해석
+
+        Args:
+            name (str): 주소 그룹 또는 주소 객체 이름
+
+        Returns:
+            list: 병합되지 않은 구간 목록
+        """
+        return self._expand_address(name, set())
+
+    def service_ranges(self, name):
+        """
+        서비스 이름(그룹 또는 객체)을 프로토콜별 포트 구간 사전으로 해석
+
+        Args:
+            name (str): 서비스 그룹 또는 서비스 객체 이름
+
+        Returns:
+            dict: 프로토콜별 포트 구간 목록
+        """
+        return self._expand_service(name, set())
+
+    def address_set(self, name):
+        """주소 이름에 대한 IP 버전별 IntervalSet 반환"""
+        sets = self._address_sets.get(name)
+        if sets is None:
+            per_version = {4: [], 6: []}
+            for version, start, end in self.address_intervals(name):
+                per_version[version].append((start, end))
+            sets = {version: IntervalSet(intervals) for version, intervals in per_version.items()}
+            self._address_sets[name] = sets
+        return sets
+
+    def service_set(self, name):
+        """서비스 이름에 대한 프로토콜별 IntervalSet 반환"""
+        sets = self._service_sets.get(name)
+        if sets is None:
+            sets = {protocol: IntervalSet(ranges) for protocol, ranges in self.service_ranges(name).items()}
+            self._service_sets[name] = sets
+        return sets
+
+    def _expand_address(self, name, visiting):
+        if name in self._address_intervals:
+            return self._address_intervals[name]
+        if name in visiting:
+            logger.warning(f"주소 그룹 순환 참조 감지: {name}")
+            return []
+
+        visiting.add(name)
+        intervals = []
+
+        group = self.address_groups.get(name)
+        if group:
+            for member in group.get("member", []):
+                intervals.extend(self._expand_address(member.get("name"), visiting))
+
+        address_obj = self.addresses.get(name)
+        if address_obj:
+            intervals.extend(address_object_intervals(address_obj))
+
+        visiting.discard(name)
+        self._address_intervals[name] = intervals
+        return intervals
+
+    def _expand_service(self, name, visiting):
+        if name in self._service_ranges:
+            return self._service_ranges[name]
+        if name in visiting:
+            logger.warning(f"서비스 그룹 순환 참조 감지: {name}")
+            return {}
+
+        visiting.add(name)
+        ranges = {}
+
+        group = self.service_groups.get(name)
+        if group:
+            for member in group.get("member", []):
+                for protocol, port_ranges in self._expand_service(member.get("name"), visiting).items():
+                    ranges.setdefault(protocol, []).extend(port_ranges)
+
+        service_obj = self.services.get(name)
+        if service_obj:
+            for protocol, port_ranges in service_object_ranges(service_obj).items():
+                ranges.setdefault(protocol, []).extend(port_ranges)
+
+        visiting.discard(name)
+        self._service_ranges[name] = ranges
+        return ranges
+
+
+class GroupResolver:
+    """방화벽별 ResolvedGroups를 데이터 세대(generation) 기준으로 캐시하는 클래스"""
+
+    def __init__(self, data_loader):
+        """
+        그룹 해석기 초기화
+
+        Args:
+            data_loader: DataLoader 인스턴스
+        """
+        self.data_loader = data_loader
+        self._resolved = {}  # firewall_id -> (generation, ResolvedGroups)
+
+    def get(self, firewall_id="default"):
+        """
+        현재 데이터 세대에 맞는 ResolvedGroups 반환 (세대가 바뀌면 다시 생성)
+
+        Args:
+            firewall_id (str): 방화벽 식별자
+
+        Returns:
+            ResolvedGroups: 그룹 해석 결과
+        """
+        generation = self.data_loader.get_generation(firewall_id)
+        cached = self._resolved.get(firewall_id)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+
+        resolved = ResolvedGroups(
+            self.data_loader.get_addresses(firewall_id),
+            self.data_loader.get_address_groups(firewall_id),
+            self.data_loader.get_services(firewall_id),
+            self.data_loader.get_service_groups(firewall_id),
+        )
+        self._resolved[firewall_id] = (generation, resolved)
+        return resolved
+
+    def clear(self, firewall_id=None):
+        """
+        캐시된 해석 결과 제거
+
+        Args:
+            firewall_id (str, optional): 방화벽 식별자 (None이면 전체 제거)
+        """
+        if firewall_id is None:
+            self._resolved.clear()
+        else:
+            self._resolved.pop(firewall_id, None)
@@ -37,9 +37,9 @@ class PathTracer:
             dict: 경로 추적 결과
         """
         try:
-            # 라우팅 테이블 가져오기
-            routing_table = self.data_loader.get_routing_tables(firewall_id)
-            if not routing_table:
+            # 라우팅 인덱스 가져오기
+            routing_index = self.data_loader.get_routing_index(firewall_id)
+            if routing_index is None:
                 return {
                     "success": False,
                     "error": "라우팅 테이블 데이터가 없습니다.",
@@ -47,10 +47,10 @@ class PathTracer:
                 }
 
             # 소스 IP의 인터페이스 결정
-            src_interface = self._determine_interface(src_ip, routing_table)
+            src_interface = self._determine_interface(src_ip, routing_index)
 
             # 목적지 IP의 라우트 결정
-            dst_route = self._find_best_route(dst_ip, routing_table)
+            dst_route = self._find_best_route(dst_ip, routing_index)
 
             # 경로 정보 구성
             path_info = {
@@ -70,27 +70,66 @@ class PathTracer:
             self.logger.error(f"패킷 경로 추적 중 오류: {str(e)}")
             return {"success": False, "error": str(e), "path": []}
 
-    def _determine_interface(self, ip, routing_table):
+    def resolve_routes(self, dst_ips, firewall_id="default"):
+        """
+        여러 목적지 IP의 라우트를 한 번에 조회 (예: CMDB 전체 도달성 확인)
+
+        Args:
+            dst_ips (iterable): 목적지 IP 주소 목록
+            firewall_id (str): 방화벽 식별자
+
+        Returns:
+            list: 입력 순서대로 정렬된 목적지별 라우트 조회 결과
+        """
+        routing_index = self.data_loader.get_routing_index(firewall_id)
+        results = []
+
+        for dst_ip in dst_ips:
+            result = {
+                "dst_ip": dst_ip,
+                "reachable": False,
+                "route": None,
+                "interface": None,
+                "next_hop": None,
+            }
+
+            if routing_index is None:
+                result["error"] = "라우팅 테이블 데이터가 없습니다."
+                results.append(result)
+                continue
+
+            try:
+                route = routing_index.best_route(dst_ip)
+            except ValueError as e:
+                result["error"] = str(e)
+                results.append(result)
+                continue
+
+            if route is not None:
+                result.update(
+                    {
+                        "reachable": True,
+                        "route": route,
+                        "interface": route.get("interface", "unknown"),
+                        "next_hop": route.get("gateway"),
+                    }
+                )
+            results.append(result)
+
+        self.logger.info(f"일괄 라우트 조회 완료: {len(results)}개 목적지")
+        return results
+
+    def _determine_interface(self, ip, routing_index):
         """IP 주소가 속한 인터페이스 결정"""
         try:
-            target_ip = ipaddress.ip_address(ip)
-
-            for route in routing_table:
-                destination = route.get("destination", "127.0.0.0/24")
-                interface = route.get("interface", "unknown")
-
-                # 직접 연결된 네트워크인지 확인
-                if route.get("type") == "connected":
-                    try:
-                        network = ipaddress.ip_network(destination, strict=False)
-                        if target_ip in network:
-                            return {
-                                "name": interface,
-                                "network": destination,
-                                "type": "connected",
-                            }
-                    except ValueError:
-                        continue
+            # 직접 연결된 네트워크인지 확인
+            route = routing_index.connected_route(ip)
+            if route is not None:
+                return {
+                    "name": route.get("interface", "unknown"),
+                    "network": route.get("destination", "127.0.0.0/24"),
+                    "type": "connected",
+                }
 
             # 기본 인터페이스 반환
             return {"name": "unknown", "network": "unknown", "type": "unknown"}
@@ -99,40 +138,10 @@ class PathTracer:
             self.logger.error(f"인터페이스 결정 중 오류: {str(e)}")
             return {"name": "error", "network": "error", "type": "error"}
 
-    def _find_best_route(self, dst_ip, routing_table):
+    def _find_best_route(self, dst_ip, routing_index):
         """목적지 IP에 대한 최적 라우트 찾기"""
         try:
-            target_ip = ipaddress.ip_address(dst_ip)
-            best_route = None
-            longest_prefix = -1
-
-            for route in routing_table:
-                destination = route.get("destination", "127.0.0.0/24")
-
-                try:
-                    # CIDR 형식이 아닌 경우 처리
-                    if "/" not in destination:
-                        if destination == "0.0.0.0":
-                            destination = "127.0.0.0/24"
-                        else:
-                            destination = f"{destination}/32"
-
-                    network = ipaddress.ip_network(destination, strict=False)
-
-                    # 타겟 IP가 이 네트워크에 포함되는지 확인
-                    if target_ip in network:
-                        prefix_length = network.prefixlen
-
-                        # 가장 긴 prefix 매치 찾기
-                        if prefix_length > longest_prefix:
-                            longest_prefix = prefix_length
-                            best_route = route
-
-                except ValueError as e:
-                    self.logger.warning(f"라우트 파싱 오류: {destination}, {str(e)}")
-                    continue
-
-            return best_route
+            return routing_index.best_route(dst_ip)
 
         except Exception as e:
             self.logger.error(f"최적 라우트 찾기 중 오류: {str(e)}")
@@ -0,0 +1,181 @@
+"""
+라우팅 트라이 컴포넌트
+
+라우팅 테이블을 경로 압축 이진 트라이(Patricia trie)로 구성하여
+최장 프리픽스 매칭(LPM)을 프리픽스 길이에 비례하는 시간에 수행하는 책임을 담당합니다.
+IPv4와 IPv6는 각각 별도의 트라이로 관리합니다.
+"""
+
+import ipaddress
+
+from utils.unified_logger import setup_logger
+
+logger = setup_logger("route_trie")
+
+ADDRESS_WIDTH = {4: 32, 6: 128}
+
+
+def normalize_route_destination(destination):
+    """라우트 목적지를 CIDR 형식 문자열로 정규화"""
+    if "/" not in destination:
+        if destination == "0.0.0.0":
+            return "127.0.0.0/24"
+        return f"{destination}/32"
+    return destination
+
+
+class _TrieNode:
+    """트라이 노드 (prefix는 네트워크 주소 정수, length는 프리픽스 길이)"""
+
+    __slots__ = ("prefix", "length", "route", "children")
+
+    def __init__(self, prefix, length, route=None):
+        self.prefix = prefix
+        self.length = length
+        self.route = route
+        self.children = [None, None]
+
+
+class RouteTrie:
+    """IPv4/IPv6 경로 압축 이진 트라이"""
+
+    def __init__(self):
+        """빈 트라이 초기화"""
+        self._roots = {version: _TrieNode(0, 0) for version in ADDRESS_WIDTH}
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def insert(self, network, route):
+        """
+        네트워크와 라우트를 트라이에 삽입
+
+        동일한 프리픽스가 이미 있으면 먼저 삽입된 라우트를 유지합니다.
+
+        Args:
+            network (ipaddress.IPv4Network | ipaddress.IPv6Network): 목적지 네트워크
+            route (dict): 라우트 정보
+        """
+        width = ADDRESS_WIDTH[network.version]
+        prefix = int(network.network_address)
+        length = network.prefixlen
+        node = self._roots[network.version]
+
+        while True:
+            if node.length == length:
+                if node.route is None:
+                    node.route = route
+                    self._size += 1
+                return
+
+            branch = (prefix >> (width - 1 - node.length)) & 1
+            child = node.children[branch]
+            if child is None:
+                node.children[branch] = _TrieNode(prefix, length, route)
+                self._size += 1
+                return
+
+            diff = prefix ^ child.prefix
+            common = min(length, child.length, width - diff.bit_length() if diff else width)
+
+            if common == child.length:
+                node = child
+                continue
+
+            if common == length:
+                # 새 프리픽스가 기존 자식의 상위 네트워크인 경우
+                parent = _TrieNode(prefix, length, route)
+                parent.children[(child.prefix >> (width - 1 - length)) & 1] = child
+                node.children[branch] = parent
+                self._size += 1
+                return
+
+            # 공통 프리픽스에서 분기 노드 생성
+            split_prefix = prefix & ~((1 << (width - common)) - 1)
+            split = _TrieNode(split_prefix, common)
+            split.children[(child.prefix >> (width - 1 - common)) & 1] = child
+            split.children[(prefix >> (width - 1 - common)) & 1] = _TrieNode(prefix, length, route)
+            node.children[branch] = split
+            self._size += 1
+            return
+
+    def lookup(self, ip):
+        """
+        IP 주소에 대한 최장 프리픽스 매칭 라우트 조회
+
+        Args:
+            ip (str | ipaddress.IPv4Address | ipaddress.IPv6Address): 조회할 IP 주소
+
+        Returns:
+            dict or None: 매칭된 라우트
+        """
+        address = ip if isinstance(ip, (ipaddress.IPv4Address, ipaddress.IPv6Address)) else ipaddress.ip_address(ip)
+        width = ADDRESS_WIDTH[address.version]
+        value = int(address)
+
+        node = self._roots[address.version]
+        best = None
+        while node is not None:
+            if (value ^ node.prefix) >> (width - node.length):
+                break
+            if node.route is not None:
+                best = node.route
+            if node.length == width:
+                break
+            node = node.children[(value >> (width - 1 - node.length)) & 1]
+
+        return best
+
+
+class RoutingIndex:
+    """방화벽 하나의 라우팅 테이블에 대한 LPM 인덱스"""
+
+    def __init__(self, routing_table):
+        """
+        라우팅 인덱스 초기화
+
+        Args:
+            routing_table (list): 라우트 목록
+        """
+        self.routes = RouteTrie()
+        self.connected = RouteTrie()
+
+        for route in routing_table or []:
+            destination = route.get("destination", "127.0.0.0/24")
+
+            try:
+                network = ipaddress.ip_network(normalize_route_destination(destination), strict=False)
+            except ValueError as e:
+                logger.warning(f"라우트 파싱 오류: {destination}, {str(e)}")
+                continue
+            self.routes.insert(network, route)
+
+            if route.get("type") == "connected":
+                try:
+                    self.connected.insert(ipaddress.ip_network(destination, strict=False), route)
+                except ValueError:
+                    continue
+
+    def __len__(self):
+        return len(self.routes)
+
+    def best_route(self, ip):
+        """목적지 IP에 대한 최적 라우트 조회"""
+        return self.routes.lookup(ip)
+
+    def connected_route(self, ip):
+        """IP가 속한 직접 연결 네트워크의 라우트 조회"""
+        return self.connected.lookup(ip)
+
+
+def build_routing_index(routing_table):
+    """
+    라우팅 테이블로부터 RoutingIndex 생성
+
+    Returns:
+        RoutingIndex: 생성된 라우팅 인덱스
+    """
+    index = RoutingIndex(routing_table)
+    logger.info(f"라우팅 인덱스 생성 완료: {len(index)}개 프리픽스")
+    return index
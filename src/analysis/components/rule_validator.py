@@ -8,6 +8,8 @@ import ipaddress
 
 from utils.unified_logger import setup_logger
 
+from .group_resolver import GroupResolver
+
 logger = setup_logger("rule_validator")
 
 
@@ -23,6 +25,7 @@ class RuleValidator:
         """
         self.data_loader = data_loader
         self.logger = logger
+        self.group_resolver = GroupResolver(data_loader) if data_loader else None
 
     def is_ip_in_address_object(self, ip, address_obj, firewall_id="default"):
         """
@@ -89,53 +92,26 @@ class RuleValidator:
         Returns:
             bool: IP가 주소 그룹에 포함되는지 여부
         """
-        address_groups = self.data_loader.get_address_groups(firewall_id)
-        if not address_groups:
+        groups = self.group_resolver.get(firewall_id)
+        if not groups.address_groups:
             self.logger.error(f"방화벽 {firewall_id}의 주소 그룹 데이터가 로드되지 않았습니다.")
             return False
 
-        # 그룹 찾기
-        group = self._find_address_group(group_name, address_groups)
-        if not group:
+        if group_name not in groups.address_groups:
             self.logger.warning(f"주소 그룹을 찾을 수 없음: {group_name}")
             return False
 
-        # 그룹 멤버 확인
-        members = group.get("member", [])
-
-        for member in members:
-            member_name = member.get("name")
-
-            # 멤버가 다른 주소 그룹인지 확인
-            if self._is_address_group(member_name, address_groups):
-                if self.is_ip_in_address_group(ip, member_name, firewall_id):
-                    return True
-            else:
-                # 멤버가 주소 객체인 경우
-                address_obj = self._find_address_object(member_name, firewall_id)
-                if address_obj and self.is_ip_in_address_object(ip, address_obj, firewall_id):
-                    return True
-
-        return False
-
-    def _find_address_group(self, group_name, address_groups):
-        """주소 그룹 찾기"""
-        for addr_group in address_groups:
-            if addr_group.get("name") == group_name:
-                return addr_group
-        return None
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return False
 
-    def _is_address_group(self, name, address_groups):
-        """이름이 주소 그룹인지 확인"""
-        return self._find_address_group(name, address_groups) is not None
+        # 평탄화된 구간 집합에서 이진 탐색
+        return int(address) in groups.address_set(group_name)[address.version]
 
     def _find_address_object(self, name, firewall_id):
         """주소 객체 찾기"""
-        addresses = self.data_loader.get_addresses(firewall_id)
-        for addr in addresses:
-            if addr.get("name") == name:
-                return addr
-        return None
+        return self.group_resolver.get(firewall_id).addresses.get(name)
 
     def is_port_in_service_object(self, port, protocol, service_obj, firewall_id="default"):
         """
@@ -202,50 +178,18 @@ class RuleValidator:
         Returns:
             bool: 포트가 서비스 그룹에 포함되는지 여부
         """
-        service_groups = self.data_loader.get_service_groups(firewall_id)
-        if not service_groups:
+        groups = self.group_resolver.get(firewall_id)
+        if not groups.service_groups:
             self.logger.error(f"방화벽 {firewall_id}의 서비스 그룹 데이터가 로드되지 않았습니다.")
             return False
 
-        # 그룹 찾기
-        group = self._find_service_group(group_name, service_groups)
-        if not group:
+        if group_name not in groups.service_groups:
             self.logger.warning(f"서비스 그룹을 찾을 수 없음: {group_name}")
             return False
 
-        # 그룹 멤버 확인
-        members = group.get("member", [])
-
-        for member in members:
-            member_name = member.get("name")
-
-            # 멤버가 다른 서비스 그룹인지 확인
-            if self._is_service_group(member_name, service_groups):
-                if self.is_port_in_service_group(port, protocol, member_name, firewall_id):
-                    return True
-            else:
-                # 멤버가 서비스 객체인 경우
-                service_obj = self._find_service_object(member_name, firewall_id)
-                if service_obj and self.is_port_in_service_object(port, protocol, service_obj, firewall_id):
-                    return True
-
-        return False
-
-    def _find_service_group(self, group_name, service_groups):
-        """서비스 그룹 찾기"""
-        for service_group in service_groups:
-            if service_group.get("name") == group_name:
-                return service_group
-        return None
-
-    def _is_service_group(self, name, service_groups):
-        """이름이 서비스 그룹인지 확인"""
-        return self._find_service_group(name, service_groups) is not None
+        port_set = groups.service_set(group_name).get(str(protocol).lower())
+        return port_set is not None and port in port_set
 
     def _find_service_object(self, name, firewall_id):
         """서비스 객체 찾기"""
-        services = self.data_loader.get_services(firewall_id)
-        for service in services:
-            if service.get("name") == name:
-                return service
-        return None
+        return self.group_resolver.get(firewall_id).services.get(name)
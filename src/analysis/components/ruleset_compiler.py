@@ -0,0 +1,245 @@
+"""
+정책 컴파일러 컴포넌트
+
+방화벽 정책을 조회용 인덱스로 한 번만 컴파일하는 책임을 담당합니다.
+주소 객체는 정수 IP 구간으로, 서비스 객체는 포트 범위 테이블로 평탄화하고,
+각 차원(소스/목적지/서비스)을 경계값 기준으로 분할한 뒤 구간마다 매치되는
+정책 집합을 비트마스크로 저장합니다. 조회 시에는 차원별 이진 탐색 후
+비트마스크 AND 연산만 수행하므로 정책 수와 무관하게 빠르게 응답합니다.
+"""
+
+import bisect
+import ipaddress
+
+from utils.unified_logger import setup_logger
+
+from .group_resolver import SERVICE_PROTOCOLS, ResolvedGroups, merge_intervals
+
+logger = setup_logger("ruleset_compiler")
+
+# IP 버전별 주소 공간의 최대값
+IP_SPACE_MAX = {4: (1 << 32) - 1, 6: (1 << 128) - 1}
+PORT_MAX = 65535
+
+
+class DimensionIndex:
+    """
+    한 차원의 정수 공간을 경계값으로 분할하고 구간별 정책 비트마스크를 보관하는 인덱스
+    """
+
+    __slots__ = ("boundaries", "masks")
+
+    def __init__(self, boundaries, masks):
+        self.boundaries = boundaries
+        self.masks = masks
+
+    @classmethod
+    def build(cls, rule_intervals):
+        """
+        규칙별 구간 목록으로부터 인덱스 생성
+
+        Args:
+            rule_intervals (list): (비트 위치, [(시작, 끝), ...]) 튜플 목록
+
+        Returns:
+            DimensionIndex: 생성된 인덱스
+        """
+        events = {}
+        for bit, intervals in rule_intervals:
+            flag = 1 << bit
+            for start, end in intervals:
+                events[start] = events.get(start, 0) ^ flag
+                events[end + 1] = events.get(end + 1, 0) ^ flag
+
+        boundaries = []
+        masks = []
+        active = 0
+        for point in sorted(events):
+            active ^= events[point]
+            boundaries.append(point)
+            masks.append(active)
+
+        return cls(boundaries, masks)
+
+    def lookup(self, value):
+        """값이 속한 구간의 정책 비트마스크 반환"""
+        pos = bisect.bisect_right(self.boundaries, value) - 1
+        return self.masks[pos] if pos >= 0 else 0
+
+
+class CompiledRuleset:
+    """
+    방화벽 하나에 대한 컴파일된 정책 집합
+
+    정책은 policyid 순으로 정렬되어 비트 위치가 곧 우선순위가 되며,
+    가장 낮은 비트가 첫 번째로 매치되는 정책입니다.
+    """
+
+    def __init__(self, policies, groups):
+        """
+        컴파일된 정책 집합 초기화
+
+        Args:
+            policies (list): 방화벽 정책 목록
+            groups (ResolvedGroups): 주소/서비스 객체 및 그룹 해석 결과
+        """
+        self.groups = groups
+
+        # (원래 목록에서의 위치, 정책) 을 policyid 순으로 정렬
+        ordered = sorted(enumerate(policies or []), key=lambda item: item[1].get("policyid", 0))
+        self.policies = [policy for _, policy in ordered]
+        self.original_positions = [position for position, _ in ordered]
+
+        # 규칙별 병합 구간 (충돌 분석용, None은 모든 값 허용)
+        self.src_intervals = [None] * len(self.policies)
+        self.dst_intervals = [None] * len(self.policies)
+        self.service_ranges = [None] * len(self.policies)
+
+        self.src_index, self.src_any = self._build_address_indexes("srcaddr")
+        self.dst_index, self.dst_any = self._build_address_indexes("dstaddr")
+        self.service_index, self.service_any = self._build_service_indexes()
+
+    def __len__(self):
+        return len(self.policies)
+
+    def _enabled_policies(self):
+        for bit, policy in enumerate(self.policies):
+            if policy.get("status") != "disable":
+                yield bit, policy
+
+    def _build_address_indexes(self, field):
+        """주소 필드(srcaddr/dstaddr)에 대한 IP 버전별 인덱스 생성"""
+        rule_intervals = self.src_intervals if field == "srcaddr" else self.dst_intervals
+        per_version = {4: [], 6: []}
+        any_mask = 0
+
+        for bit, policy in self._enabled_policies():
+            entries = policy.get(field, [])
+            names = [entry.get("name") for entry in entries]
+            if not entries or "all" in names:
+                any_mask |= 1 << bit
+                for version, space_max in IP_SPACE_MAX.items():
+                    per_version[version].append((bit, [(0, space_max)]))
+                continue
+
+            intervals = {4: [], 6: []}
+            for name in names:
+                for version, start, end in self.groups.address_intervals(name):
+                    intervals[version].append((start, end))
+
+            merged = {version: merge_intervals(found) for version, found in intervals.items()}
+            rule_intervals[bit] = merged
+            for version, version_intervals in merged.items():
+                if version_intervals:
+                    per_version[version].append((bit, version_intervals))
+
+        indexes = {version: DimensionIndex.build(rules) for version, rules in per_version.items()}
+        return indexes, any_mask
+
+    def _build_service_indexes(self):
+        """서비스 필드에 대한 프로토콜별 포트 인덱스 생성"""
+        per_protocol = {protocol: [] for protocol in SERVICE_PROTOCOLS}
+        any_mask = 0
+
+        for bit, policy in self._enabled_policies():
+            entries = policy.get("service", [])
+            names = [entry.get("name") for entry in entries]
+            if not entries or "ALL" in names:
+                any_mask |= 1 << bit
+                for protocol in SERVICE_PROTOCOLS:
+                    per_protocol[protocol].append((bit, [(0, PORT_MAX)]))
+                continue
+
+            ranges = {protocol: [] for protocol in SERVICE_PROTOCOLS}
+            for name in names:
+                for protocol, port_ranges in self.groups.service_ranges(name).items():
+                    ranges[protocol].extend(port_ranges)
+
+            merged = {protocol: merge_intervals(found) for protocol, found in ranges.items()}
+            self.service_ranges[bit] = merged
+            for protocol, port_ranges in merged.items():
+                if port_ranges:
+                    per_protocol[protocol].append((bit, port_ranges))
+
+        indexes = {protocol: DimensionIndex.build(rules) for protocol, rules in per_protocol.items()}
+        return indexes, any_mask
+
+    def _address_mask(self, indexes, any_mask, ip):
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return any_mask
+        return indexes[address.version].lookup(int(address))
+
+    def match_mask(self, src_ip, dst_ip, dst_port, protocol="tcp"):
+        """
+        트래픽과 매치되는 정책들의 비트마스크 반환
+
+        Args:
+            src_ip (str): 소스 IP 주소
+            dst_ip (str): 목적지 IP 주소
+            dst_port (int): 목적지 포트
+            protocol (str): 프로토콜 (tcp/udp)
+
+        Returns:
+            int: 매치되는 정책의 비트마스크 (비트 위치 = policyid 순서)
+        """
+        mask = self._address_mask(self.src_index, self.src_any, src_ip)
+        if not mask:
+            return 0
+
+        mask &= self._address_mask(self.dst_index, self.dst_any, dst_ip)
+        if not mask:
+            return 0
+
+        service_index = self.service_index.get(str(protocol).lower())
+        try:
+            port = int(dst_port)
+        except (TypeError, ValueError):
+            port = None
+
+        if service_index is None or port is None:
+            return mask & self.service_any
+        return mask & service_index.lookup(port)
+
+    def first_match(self, src_ip, dst_ip, dst_port, protocol="tcp"):
+        """
+        우선순위가 가장 높은(첫 번째로 매치되는) 정책 반환
+
+        Returns:
+            dict or None: 매치된 정책
+        """
+        mask = self.match_mask(src_ip, dst_ip, dst_port, protocol)
+        if not mask:
+            return None
+        return self.policies[(mask & -mask).bit_length() - 1]
+
+    def all_matches(self, src_ip, dst_ip, dst_port, protocol="tcp"):
+        """
+        매치되는 모든 정책을 원래 정책 목록 순서대로 반환
+
+        Returns:
+            list: 매치된 정책 목록
+        """
+        mask = self.match_mask(src_ip, dst_ip, dst_port, protocol)
+        matched = []
+        while mask:
+            low = mask & -mask
+            bit = low.bit_length() - 1
+            matched.append((self.original_positions[bit], self.policies[bit]))
+            mask ^= low
+
+        return [policy for _, policy in sorted(matched, key=lambda item: item[0])]
+
+
+def compile_ruleset(policies, addresses, address_groups, services, service_groups):
+    """
+    방화벽 데이터를 CompiledRuleset으로 컴파일
+
+    Returns:
+        CompiledRuleset: 컴파일된 정책 집합
+    """
+    groups = ResolvedGroups(addresses, address_groups, services, service_groups)
+    ruleset = CompiledRuleset(policies, groups)
+    logger.info(f"정책 컴파일 완료: {len(ruleset)}개 정책")
+    return ruleset
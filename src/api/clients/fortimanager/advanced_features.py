@@ -8,6 +8,8 @@ import logging
 import time
 from typing import Any, Dict, List
 
+from .cache_invalidation import invalidate_cached_data
+
 logger = logging.getLogger(__name__)
 
 
@@ -219,6 +221,7 @@ class AdvancedFeaturesMixin:
             response = self._make_api_request("exec", "/securityconsole/install/package", data=data)
 
             if response and response.get("status", {}).get("code") == 0:
+                invalidate_cached_data(devices=device_targets, packages=[package_name], adom=adom)
                 task_id = response.get("data", {}).get("task")
                 return {
                     "status": "success",
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+FortiManager Cache Invalidation
+Caches FortiManager reads tagged with the devices, policy packages and object types they depend on,
+and evicts them when FortiManager mutations change those
+"""
+
+import inspect
+import logging
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+def cached_read(ttl: int, depends_on: Callable[..., Dict[str, str]]) -> Callable:
+    """
+    Cache successful results of a FortiManager client read in the unified cache
+
+    The key covers the client host, the method and its arguments (with defaults applied), and
+    only results with status "success" are cached.
+
+    Args:
+        ttl: Time-to-live in seconds
+        depends_on: Function taking the read's arguments by name and returning the cache_tags keyword
+            arguments (device, adom, package, object_type) the result depends on
+    """
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(self, *args, **kwargs) -> Any:
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            arguments.pop("self")
+
+            try:
+                from utils.unified_cache_manager import cache_tags, get_cache_manager
+
+                cache = get_cache_manager()
+                key = cache.generate_cache_key(
+                    f"fortimanager:{func.__name__}", getattr(self, "host", None), **arguments
+                )
+                result = cache.get(key)
+            except Exception as e:
+                # Reads must keep working without a cache
+                logger.warning(f"Cache lookup failed: {e}")
+                return func(self, *args, **kwargs)
+            if result is not None:
+                return result
+
+            result = func(self, *args, **kwargs)
+            if isinstance(result, dict) and result.get("status") == "success":
+                cache.set(key, result, ttl, tags=cache_tags(**depends_on(**arguments)))
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate_cached_data(
+    devices: Iterable[str] = (), packages: Iterable[str] = (), adom: str = "root", objects: Iterable[str] = ()
+) -> int:
+    """
+    Invalidate cache entries that depend on changed devices, policy packages or object types
+
+    Device lists (object:device) summarize every device, so any device change evicts them as well.
+
+    Args:
+        devices: Device names whose configuration changed
+        packages: Policy packages (in adom) that changed
+        adom: Administrative domain of the packages
+        objects: Object types whose lists changed (e.g. package when packages are added or removed)
+
+    Returns:
+        Number of cache entries removed
+    """
+    try:
+        from utils.unified_cache_manager import device_tag, get_cache_manager, object_tag, package_tag
+
+        devices, objects = list(devices), list(objects)
+        if devices and "device" not in objects:
+            objects.append("device")
+        tags = (
+            [device_tag(device) for device in devices]
+            + [package_tag(package, adom) for package in packages]
+            + [object_tag(object_type) for object_type in objects]
+        )
+        if not tags:
+            return 0
+        return get_cache_manager().invalidate_tags(tags)
+
+    except Exception as e:
+        # A failed invalidation must not fail the mutation that already succeeded on FortiManager
+        logger.warning(f"Cache invalidation failed: {e}")
+        return 0
@@ -7,6 +7,8 @@ Handles device-related API operations
 import logging
 from typing import Any, Dict
 
+from .cache_invalidation import cached_read, invalidate_cached_data
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,6 +20,7 @@ class DeviceManagementMixin:
         data = {"adom": adom}
         return self._make_api_request("get", "/dvmdb/adom/{adom}/device".format(adom=adom), data=data)
 
+    @cached_read(ttl=120, depends_on=lambda adom: {"adom": adom, "object_type": "device"})
     def get_managed_devices(self, adom="root"):
         """Get managed devices with detailed information"""
         try:
@@ -124,6 +127,7 @@ class DeviceManagementMixin:
             )
 
             if response and response.get("status", {}).get("code") == 0:
+                invalidate_cached_data(devices=[device_name])
                 return {
                     "status": "success",
                     "message": f"Successfully updated settings at {cli_path}",
@@ -198,6 +202,7 @@ class DeviceManagementMixin:
             )
 
             if response and response.get("status", {}).get("code") == 0:
+                invalidate_cached_data(devices=[device_name])
                 return {
                     "status": "success",
                     "message": f"Successfully updated VDOM {vdom} settings at {cli_path}",
@@ -8,12 +8,15 @@ import logging
 from datetime import datetime
 from typing import Any, Dict, List
 
+from .cache_invalidation import cached_read, invalidate_cached_data
+
 logger = logging.getLogger(__name__)
 
 
 class PackageManagementMixin:
     """Mixin for FortiManager package management operations"""
 
+    @cached_read(ttl=300, depends_on=lambda adom: {"adom": adom, "object_type": "package"})
     def get_packages(self, adom: str = "root") -> Dict[str, Any]:
         """
         Get list of policy packages in ADOM
@@ -56,6 +59,7 @@ class PackageManagementMixin:
             logger.error(f"Error getting packages: {e}")
             return {"status": "error", "message": str(e)}
 
+    @cached_read(ttl=300, depends_on=lambda package_name, adom: {"adom": adom, "package": package_name})
     def get_package_details(self, package_name: str, adom: str = "root") -> Dict[str, Any]:
         """
         Get detailed information about a specific package
@@ -67,6 +71,10 @@ class PackageManagementMixin:
         Returns:
             Package details including policies
         """
+        return self._fetch_package_details(package_name, adom)
+
+    def _fetch_package_details(self, package_name: str, adom: str = "root") -> Dict[str, Any]:
+        """Package details read from FortiManager (uncached, for read-modify-write operations)"""
         try:
             response = self._make_api_request(
                 "get",
@@ -151,6 +159,7 @@ class PackageManagementMixin:
             response = self._make_api_request("add", f"/pm/pkg/adom/{adom}", data=data)
 
             if response and response.get("status", {}).get("code") == 0:
+                invalidate_cached_data(packages=[name], adom=adom, objects=["package"])
                 return {
                     "status": "success",
                     "message": f"Package '{name}' created successfully",
@@ -184,6 +193,7 @@ class PackageManagementMixin:
             response = self._make_api_request("update", f"/pm/pkg/adom/{adom}/{package_name}", data=data)
 
             if response and response.get("status", {}).get("code") == 0:
+                invalidate_cached_data(packages=[package_name], adom=adom, objects=["package"])
                 return {
                     "status": "success",
                     "message": f"Package '{package_name}' updated successfully",
@@ -217,6 +227,7 @@ class PackageManagementMixin:
             )
 
             if response and response.get("status", {}).get("code") == 0:
+                invalidate_cached_data(packages=[package_name], adom=adom, objects=["package"])
                 return {
                     "status": "success",
                     "message": f"Package '{package_name}' deleted successfully",
@@ -252,7 +263,7 @@ class PackageManagementMixin:
         """
         try:
             # Get current package scope
-            pkg_details = self.get_package_details(package_name, adom)
+            pkg_details = self._fetch_package_details(package_name, adom)
             if pkg_details.get("status") != "success":
                 return pkg_details
 
@@ -299,7 +310,7 @@ class PackageManagementMixin:
         """
         try:
             # Get current package scope
-            pkg_details = self.get_package_details(package_name, adom)
+            pkg_details = self._fetch_package_details(package_name, adom)
             if pkg_details.get("status") != "success":
                 return pkg_details
 
@@ -401,6 +412,7 @@ class PackageManagementMixin:
             )
 
             if response and response.get("status", {}).get("code") == 0:
+                invalidate_cached_data(packages=[package_name], adom=adom)
                 return {
                     "status": "success",
                     "message": f"Policy added to package '{package_name}'",
@@ -430,7 +442,7 @@ class PackageManagementMixin:
         """
         try:
             # Get source package details
-            source = self.get_package_details(source_package, adom)
+            source = self._fetch_package_details(source_package, adom)
             if source.get("status") != "success":
                 return source
 
@@ -7,12 +7,22 @@ Handles policy-related API operations
 import logging
 from typing import Any, Dict
 
+from .cache_invalidation import cached_read, invalidate_cached_data
+
 logger = logging.getLogger(__name__)
 
 
 class PolicyManagementMixin:
     """Mixin for FortiManager policy management operations"""
 
+    @cached_read(
+        ttl=300,
+        depends_on=lambda device_name, adom, **_: {
+            "device": device_name,
+            "adom": adom,
+            "object_type": "firewall_policy",
+        },
+    )
     def get_firewall_policies(self, device_name, vdom="root", adom="root"):
         """Get firewall policies for a specific device"""
         try:
@@ -34,6 +44,10 @@ class PolicyManagementMixin:
             logger.error(f"Error getting firewall policies: {e}")
             return {"status": "error", "message": str(e)}
 
+    @cached_read(
+        ttl=300,
+        depends_on=lambda package_name, adom: {"adom": adom, "package": package_name, "object_type": "firewall_policy"},
+    )
     def get_package_policies(self, package_name="default", adom="root"):
         """Get policies from a policy package"""
         try:
@@ -74,6 +88,7 @@ class PolicyManagementMixin:
             logger.error(f"Error getting package policies: {e}")
             return {"status": "error", "message": str(e)}
 
+    @cached_read(ttl=300, depends_on=lambda package_name, adom, **_: {"adom": adom, "package": package_name})
     def get_policy_package_settings(self, package_name: str, cli_path: str, adom: str = "root") -> Dict[str, Any]:
         """Get settings from a policy package"""
         try:
@@ -121,6 +136,7 @@ class PolicyManagementMixin:
             )
 
             if response and response.get("status", {}).get("code") == 0:
+                invalidate_cached_data(packages=[package_name], adom=adom)
                 return {
                     "status": "success",
                     "message": f"Successfully updated package {package_name} settings at {cli_path}",
@@ -159,6 +175,7 @@ class PolicyManagementMixin:
             )
 
             if response and response.get("status", {}).get("code") == 0:
+                invalidate_cached_data(devices=[device_name])
                 return {
                     "status": "success",
                     "message": "Successfully created firewall policy",
@@ -199,6 +216,7 @@ class PolicyManagementMixin:
             )
 
             if response and response.get("status", {}).get("code") == 0:
+                invalidate_cached_data(devices=[device_name])
                 return {
                     "status": "success",
                     "message": f"Successfully updated firewall policy {policy_id}",
@@ -236,6 +254,7 @@ class PolicyManagementMixin:
             )
 
             if response and response.get("status", {}).get("code") == 0:
+                invalidate_cached_data(devices=[device_name])
                 return {
                     "status": "success",
                     "message": f"Successfully deleted firewall policy {policy_id}",
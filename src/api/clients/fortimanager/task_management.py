@@ -8,6 +8,8 @@ import logging
 import time
 from typing import Any, Dict, List
 
+from .cache_invalidation import invalidate_cached_data
+
 logger = logging.getLogger(__name__)
 
 
@@ -327,6 +329,7 @@ class TaskManagementMixin:
             response = self._make_api_request("exec", "/securityconsole/install/package", data=task_data)
 
             if response and response.get("status", {}).get("code") == 0:
+                invalidate_cached_data(devices=target_devices, packages=[package_name], adom=adom)
                 task_id = response.get("data", {}).get("task")
 
                 return {
@@ -39,6 +39,12 @@ CACHE_SETTINGS = {
     "CLEANUP_INTERVAL": int(os.getenv("CACHE_CLEANUP_INTERVAL", "300")),
     "TTL_DEFAULT": int(os.getenv("CACHE_TTL_DEFAULT", "3600")),
     "REDIS_MAX_CONNECTIONS": int(os.getenv("REDIS_MAX_CONNECTIONS", "50")),
+    "STALE_TTL": int(os.getenv("CACHE_STALE_TTL", "60")),
+    "EARLY_EXPIRY_BETA": float(os.getenv("CACHE_EARLY_EXPIRY_BETA", "1.0")),
+    "LOCK_TIMEOUT": int(os.getenv("CACHE_LOCK_TIMEOUT", "30")),
+    "SERIALIZER": os.getenv("CACHE_SERIALIZER", "auto"),
+    "COMPRESSION": os.getenv("CACHE_COMPRESSION", "auto"),
+    "COMPRESS_THRESHOLD": int(os.getenv("CACHE_COMPRESS_THRESHOLD", "1024")),
 }
 
 # Batch Operation Settings
@@ -7,12 +7,14 @@ Version: 3.0.0
 Date: 2025-05-30
 """
 
+import threading
+from dataclasses import replace
 
 from urllib3 import disable_warnings
 from urllib3.exceptions import InsecureRequestWarning
 
 # 공통 임포트 사용
-from utils.common_imports import Any, Dict, Enum, Optional, dataclass, requests, setup_module_logger, time
+from utils.common_imports import Any, Dict, Enum, List, Optional, dataclass, requests, setup_module_logger, time
 from utils.exception_handlers import NetworkException
 
 from .auth_manager import AuthManager, AuthType
@@ -218,6 +220,7 @@ class UnifiedAPIClient:
         headers: Optional[Dict] = None,
         cache_ttl: Optional[int] = None,
         bypass_cache: bool = False,
+        cache_tags: Optional[List[str]] = None,
     ) -> APIResponse:
         """
         Make API request with caching and error handling.
@@ -230,23 +233,59 @@ class UnifiedAPIClient:
             headers: Additional headers
             cache_ttl: Cache time-to-live in seconds
             bypass_cache: Whether to bypass cache
+            cache_tags: Tags for the cached response (see CacheManager.invalidate_tags)
 
         Returns:
             APIResponse object
         """
-        start_time = time.time()
+        if not (self.cache_enabled and method.upper() == "GET" and not bypass_cache):
+            return self._send(method, endpoint, data, params, headers)
+
+        cache_key = self._generate_cache_key(method, endpoint, params)
+        ttl = cache_ttl or self.config_manager.app.cache_default_ttl
+        caller = threading.get_ident()
+        fetched = []
+
+        def fetch() -> APIResponse:
+            if threading.get_ident() == caller:
+                fetched.append(True)
+            return self._send(method, endpoint, data, params, headers)
+
+        # Concurrent misses for the same GET share one device request; expired entries are
+        # served while a single background request refreshes them
+        response = self.cache_manager.get_or_compute(
+            cache_key, fetch, ttl, cache_if=lambda r: r.success, tags=cache_tags
+        )
+        if fetched:
+            return response
+
+        self._stats["requests_cached"] += 1
+        if isinstance(response, dict):  # Deserialized from Redis
+            return APIResponse(**{**response, "cached": True})
+        return replace(response, cached=True)
+
+    def _send(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+    ) -> APIResponse:
+        """
+        Send a request to the device without consulting the cache.
 
-        # Generate cache key
-        cache_key = None
-        if self.cache_enabled and method.upper() == "GET" and not bypass_cache:
-            cache_key = self._generate_cache_key(method, endpoint, params)
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            data: Request data
+            params: URL parameters
+            headers: Additional headers
 
-            # Try to get from cache
-            cached_response = self.cache_manager.get(cache_key)
-            if cached_response:
-                self._stats["requests_cached"] += 1
-                cached_response.cached = True
-                return cached_response
+        Returns:
+            APIResponse object
+        """
+        start_time = time.time()
 
         # Ensure authentication
         if not self.session_id:
@@ -270,14 +309,7 @@ class UnifiedAPIClient:
             self._stats["total_response_time"] += response_time
 
             # Parse response
-            api_response = self._parse_response(response, response_time)
-
-            # Cache successful GET responses
-            if self.cache_enabled and cache_key and api_response.success and method.upper() == "GET":
-                ttl = cache_ttl or self.config_manager.app.cache_default_ttl
-                self.cache_manager.set(cache_key, api_response, ttl)
-
-            return api_response
+            return self._parse_response(response, response_time)
 
         except Exception as e:
             self._stats["requests_failed"] += 1
@@ -537,12 +569,24 @@ class UnifiedAPIClient:
             if pattern != "*":
                 cache_pattern = f"{self.client_type.value}:{self.host}:{self.port}:{pattern}"
 
-            keys = self.cache_manager.keys(cache_pattern)
-            for key in keys:
-                self.cache_manager.delete(key)
+            self.cache_manager.delete_pattern(cache_pattern)
             return True
         return False
 
+    def invalidate_cache_tags(self, tags: List[str]) -> int:
+        """
+        Evict cached responses carrying any of the tags.
+
+        Args:
+            tags: Tags given as cache_tags to request()
+
+        Returns:
+            Number of entries removed
+        """
+        if self.cache_enabled:
+            return self.cache_manager.invalidate_tags(tags)
+        return 0
+
     def health_check(self) -> APIResponse:
         """
         Perform health check on the target system.
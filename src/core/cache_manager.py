@@ -8,17 +8,35 @@ Date: 2025-05-30
 """
 
 import hashlib
+import heapq
 import json
+import math
+import random
+import sys
+import threading
 import time
+import uuid
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 import orjson
 
 from config.constants import CACHE_SETTINGS, DEFAULT_PORTS
+from utils.cache_codec import CacheCodec, get_default_codec
+from utils.redis_keyspace import KeyRegistry, add_tags, delete_pattern, invalidate_tag_sets, scan_keys, unlink_keys
+
+# Memory backend lock sharding: one shard per this many items, at most MEMORY_MAX_SHARDS
+MEMORY_SHARD_MIN_ITEMS = 256
+MEMORY_MAX_SHARDS = 16
+
+# Marker key of entries written by CacheManager.get_or_compute
+ENVELOPE_MARKER = "__cache_envelope__"
+
+_MISSING = object()
 
 
 class CacheBackend(Enum):
@@ -90,141 +108,344 @@ class BaseCacheBackend(ABC):
     def stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
 
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get several values; missing keys are left out of the result."""
+        result = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                result[key] = value
+        return result
+
+    def set_many(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """Set several values with the same TTL."""
+        success = True
+        for key, value in mapping.items():
+            if not self.set(key, value, ttl):
+                success = False
+        return success
+
+    def delete_many(self, keys: List[str]) -> int:
+        """Delete several keys, returning how many existed."""
+        return sum(1 for key in keys if self.delete(key))
+
+    def delete_pattern(self, pattern: str) -> int:
+        """Delete all keys matching pattern, returning how many were removed."""
+        return self.delete_many(self.keys(pattern))
+
+    def tag(self, key: str, tags: List[str], ttl: Optional[int] = None) -> bool:
+        """Attach tags to a stored key (False if the backend does not support tags)."""
+        return False
+
+    def invalidate_tags(self, tags: List[str]) -> int:
+        """Delete every key carrying any of the tags, returning how many were removed."""
+        return 0
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate size of a cached value in bytes (serialized length)."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8", "surrogatepass"))
+    try:
+        return len(orjson.dumps(value, default=str))
+    except TypeError:
+        return sys.getsizeof(value)
+
+
+class _MemoryEntry:
+    """Memory cache entry (value, monotonic expiry time, accounted size, tags)."""
+
+    __slots__ = ("value", "expires_at", "size", "tags")
+
+    def __init__(self, value: Any, expires_at: Optional[float], size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.tags: Optional[Set[str]] = None
+
+
+class _MemoryShard:
+    """
+    One lock-protected partition of the memory cache.
+
+    Recency is kept by an OrderedDict (move_to_end on hit, popitem(last=False) to evict) and expiry by a
+    min-heap of (expires_at, key); heap entries are checked against the live entry on pop, so updating a
+    key's TTL just pushes a new heap entry. Tags are indexed per shard (tag -> keys) and unlinked whenever
+    an entry is removed, so the index never outlives the entries.
+    """
+
+    __slots__ = ("lock", "entries", "expiry", "tag_index", "max_items", "max_bytes", "bytes", "stats")
+
+    def __init__(self, max_items: int, max_bytes: Optional[int]):
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[str, _MemoryEntry]" = OrderedDict()
+        self.expiry: List[Tuple[float, str]] = []
+        self.tag_index: Dict[str, Set[str]] = {}
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "sets": 0, "deletes": 0, "evictions": 0, "expirations": 0}
+
+    def remove(self, key: str) -> _MemoryEntry:
+        entry = self.entries.pop(key)
+        self.bytes -= entry.size
+        if entry.tags:
+            for tag in entry.tags:
+                keys = self.tag_index.get(tag)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self.tag_index[tag]
+        return entry
+
+    def expire(self, now: float) -> None:
+        """Drop entries whose TTL has passed (O(k log n) for k expired entries)."""
+        expiry = self.expiry
+        while expiry and expiry[0][0] <= now:
+            expires_at, key = heapq.heappop(expiry)
+            entry = self.entries.get(key)
+            if entry is not None and entry.expires_at == expires_at:
+                self.remove(key)
+                self.stats["expirations"] += 1
+        # Rebuild when stale heap entries (overwritten or deleted keys) dominate
+        if len(expiry) > 2 * len(self.entries) + 64:
+            self.expiry = [(entry.expires_at, key) for key, entry in self.entries.items() if entry.expires_at]
+            heapq.heapify(self.expiry)
+
+    def evict(self, incoming_size: int) -> None:
+        """Evict least recently used entries until one more item of incoming_size fits."""
+        while self.entries and (
+            len(self.entries) >= self.max_items
+            or (self.max_bytes is not None and self.bytes + incoming_size > self.max_bytes)
+        ):
+            self.remove(next(iter(self.entries)))
+            self.stats["evictions"] += 1
+
 
 class MemoryCacheBackend(BaseCacheBackend):
-    """In-memory cache backend."""
+    """
+    In-memory cache backend.
 
-    def __init__(self, max_size: int = None, cleanup_interval: int = None):
+    Thread-safe LRU with TTL expiry. Keys are spread over lock-sharded partitions so concurrent requests
+    rarely contend; get/set/delete are O(1) and expiry is processed incrementally from a per-shard
+    min-heap instead of scanning the whole cache. LRU order is exact within a shard.
+    """
+
+    def __init__(
+        self,
+        max_size: int = None,
+        cleanup_interval: int = None,
+        max_bytes: Optional[int] = None,
+        shards: int = None,
+        size_of: Optional[Callable[[Any], int]] = None,
+    ):
         """
         Initialize memory cache.
 
         Args:
             max_size: Maximum number of items to store
-            cleanup_interval: Cleanup interval in seconds
+            cleanup_interval: Interval in seconds for a full expiry pass from get();
+                set() already expires due entries from the heap
+            max_bytes: Optional limit on the total accounted size of values
+            shards: Number of lock partitions (defaults to one per MEMORY_SHARD_MIN_ITEMS items, up to 16)
+            size_of: Function returning a value's size in bytes (default: serialized length)
         """
-        self._cache: Dict[str, CacheItem] = {}
         self._max_size = max_size or CACHE_SETTINGS["MAX_SIZE"]
         self._cleanup_interval = cleanup_interval or CACHE_SETTINGS["CLEANUP_INTERVAL"]
-        self._last_cleanup = time.time()
+        self._max_bytes = max_bytes
+        self._size_of = size_of or _estimate_size
+        self._last_cleanup = time.monotonic()
+
+        if shards is None:
+            shards = min(MEMORY_MAX_SHARDS, self._max_size // MEMORY_SHARD_MIN_ITEMS)
+        shards = max(1, min(shards, self._max_size))
+        # Split limits so the shard totals equal max_size/max_bytes exactly
+        base, extra = divmod(self._max_size, shards)
+        self._shards = [
+            _MemoryShard(
+                base + (1 if i < extra else 0),
+                None if max_bytes is None else max_bytes // shards,
+            )
+            for i in range(shards)
+        ]
 
-        # Statistics
-        self._stats = {
-            "hits": 0,
-            "misses": 0,
-            "sets": 0,
-            "deletes": 0,
-            "evictions": 0,
-            "size": 0,
-        }
+    def _shard(self, key: str) -> _MemoryShard:
+        return self._shards[hash(key) % len(self._shards)]
 
     def get(self, key: str) -> Optional[Any]:
         """Get value from memory cache."""
         self._cleanup_if_needed()
 
-        item = self._cache.get(key)
-        if item is None:
-            self._stats["misses"] += 1
-            return None
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is None:
+                shard.stats["misses"] += 1
+                return None
 
-        if item.is_expired():
-            self.delete(key)
-            self._stats["misses"] += 1
-            return None
+            if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+                shard.remove(key)
+                shard.stats["expirations"] += 1
+                shard.stats["misses"] += 1
+                return None
 
-        item.touch()
-        self._stats["hits"] += 1
-        return item.value
+            shard.entries.move_to_end(key)
+            shard.stats["hits"] += 1
+            return entry.value
 
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """Set value in memory cache."""
-        self._cleanup_if_needed()
-
-        # Check if we need to evict items
-        if len(self._cache) >= self._max_size and key not in self._cache:
-            self._evict_lru()
-
-        expires_at = None
-        if ttl is not None:
-            expires_at = datetime.now() + timedelta(seconds=ttl)
-
-        self._cache[key] = CacheItem(key=key, value=value, expires_at=expires_at)
-
-        self._stats["sets"] += 1
-        self._stats["size"] = len(self._cache)
+        size = self._size_of(value) if self._max_bytes is not None else 0
+        now = time.monotonic()
+        expires_at = now + ttl if ttl is not None else None
+
+        shard = self._shard(key)
+        with shard.lock:
+            if shard.max_bytes is not None and size > shard.max_bytes:
+                return False  # would evict the whole shard and still not fit
+
+            shard.expire(now)
+            if key in shard.entries:
+                shard.remove(key)
+            shard.evict(size)
+
+            shard.entries[key] = _MemoryEntry(value, expires_at, size)
+            shard.bytes += size
+            if expires_at is not None:
+                heapq.heappush(shard.expiry, (expires_at, key))
+            shard.stats["sets"] += 1
         return True
 
     def delete(self, key: str) -> bool:
         """Delete value from memory cache."""
-        if key in self._cache:
-            del self._cache[key]
-            self._stats["deletes"] += 1
-            self._stats["size"] = len(self._cache)
-            return True
+        shard = self._shard(key)
+        with shard.lock:
+            if key in shard.entries:
+                shard.remove(key)
+                shard.stats["deletes"] += 1
+                return True
         return False
 
     def exists(self, key: str) -> bool:
         """Check if key exists in memory cache."""
-        item = self._cache.get(key)
-        if item is None:
-            return False
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is None:
+                return False
 
-        if item.is_expired():
-            self.delete(key)
-            return False
+            if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+                shard.remove(key)
+                shard.stats["expirations"] += 1
+                return False
 
         return True
 
     def clear(self) -> bool:
         """Clear all cache entries."""
-        self._cache.clear()
-        self._stats["size"] = 0
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.expiry.clear()
+                shard.tag_index.clear()
+                shard.bytes = 0
         return True
 
+    def tag(self, key: str, tags: List[str], ttl: Optional[int] = None) -> bool:
+        """Attach tags to a stored key."""
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is None:
+                return False
+            if entry.tags is None:
+                entry.tags = set()
+            entry.tags.update(tags)
+            for tag in tags:
+                shard.tag_index.setdefault(tag, set()).add(key)
+        return True
+
+    def invalidate_tags(self, tags: List[str]) -> int:
+        """Delete every key carrying any of the tags."""
+        removed = 0
+        for shard in self._shards:
+            with shard.lock:
+                keys = set()
+                for tag in tags:
+                    keys.update(shard.tag_index.get(tag, ()))
+                for key in keys:
+                    shard.remove(key)
+                shard.stats["deletes"] += len(keys)
+                removed += len(keys)
+        return removed
+
     def keys(self, pattern: str = "*") -> List[str]:
         """Get all keys matching pattern."""
         import fnmatch
 
-        return [key for key in self._cache.keys() if fnmatch.fnmatch(key, pattern)]
+        now = time.monotonic()
+        matched = []
+        for shard in self._shards:
+            with shard.lock:
+                matched.extend(
+                    key
+                    for key, entry in shard.entries.items()
+                    if (entry.expires_at is None or entry.expires_at > now) and fnmatch.fnmatch(key, pattern)
+                )
+        return matched
 
     def stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
+        totals = {"hits": 0, "misses": 0, "sets": 0, "deletes": 0, "evictions": 0, "expirations": 0}
+        size = total_bytes = 0
+        for shard in self._shards:
+            with shard.lock:
+                for name, value in shard.stats.items():
+                    totals[name] += value
+                size += len(shard.entries)
+                total_bytes += shard.bytes
+
         hit_rate = 0
-        total_requests = self._stats["hits"] + self._stats["misses"]
+        total_requests = totals["hits"] + totals["misses"]
         if total_requests > 0:
-            hit_rate = self._stats["hits"] / total_requests
-
-        return {**self._stats, "hit_rate": hit_rate, "backend": "memory"}
+            hit_rate = totals["hits"] / total_requests
+
+        return {
+            **totals,
+            "size": size,
+            "max_size": self._max_size,
+            "bytes": total_bytes,
+            "max_bytes": self._max_bytes,
+            "shards": len(self._shards),
+            "hit_rate": hit_rate,
+            "backend": "memory",
+        }
 
     def _cleanup_if_needed(self):
         """Cleanup expired items if needed."""
-        current_time = time.time()
+        current_time = time.monotonic()
         if current_time - self._last_cleanup > self._cleanup_interval:
-            self._cleanup_expired()
             self._last_cleanup = current_time
+            self._cleanup_expired()
 
     def _cleanup_expired(self):
-        """Remove expired items."""
-        expired_keys = []
-        for key, item in self._cache.items():
-            if item.is_expired():
-                expired_keys.append(key)
-
-        for key in expired_keys:
-            self.delete(key)
-
-    def _evict_lru(self):
-        """Evict least recently used item."""
-        if not self._cache:
-            return
-
-        lru_key = min(self._cache.keys(), key=lambda k: self._cache[k].last_accessed)
-        self.delete(lru_key)
-        self._stats["evictions"] += 1
+        """Remove expired items from every shard."""
+        now = time.monotonic()
+        for shard in self._shards:
+            with shard.lock:
+                shard.expire(now)
 
 
 class RedisCacheBackend(BaseCacheBackend):
     """Redis cache backend."""
 
+    # Delete the lock only if it still holds our token
+    _RELEASE_LOCK_SCRIPT = (
+        "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+    )
+
     def __init__(
         self,
         host: str = None,
@@ -232,6 +453,7 @@ class RedisCacheBackend(BaseCacheBackend):
         db: int = None,
         password: Optional[str] = None,
         prefix: str = "nextrade:",
+        codec: Optional[CacheCodec] = None,
     ):
         """
         Initialize Redis cache.
@@ -242,6 +464,7 @@ class RedisCacheBackend(BaseCacheBackend):
             db: Redis database number
             password: Redis password
             prefix: Key prefix
+            codec: Payload codec, defaults to the shared codec built from CACHE_SETTINGS
         """
         import os
 
@@ -250,8 +473,10 @@ class RedisCacheBackend(BaseCacheBackend):
         self._db = db or int(os.getenv("REDIS_DB", "0"))
         self._password = password or os.getenv("REDIS_PASSWORD")
         self._prefix = prefix
+        self._codec = codec or get_default_codec()
         self._redis = None
         self._connected = False
+        self._registry: Optional[KeyRegistry] = None
 
         # Statistics
         self._stats = {
@@ -281,6 +506,8 @@ class RedisCacheBackend(BaseCacheBackend):
             # Test connection
             self._redis.ping()
             self._connected = True
+            # Key count registry lives outside the prefix so SCAN over the namespace skips it
+            self._registry = KeyRegistry(self._redis, f"__keys__:{self._prefix}")
         except ImportError:
             print("Redis library not installed. Please install: pip install redis")
             self._connected = False
@@ -288,6 +515,62 @@ class RedisCacheBackend(BaseCacheBackend):
             print(f"Redis connection failed: {e}")
             self._connected = False
 
+    @property
+    def connected(self) -> bool:
+        """Whether the Redis server is reachable."""
+        return self._connected
+
+    def acquire_lock(self, name: str, timeout: float) -> Optional[str]:
+        """
+        Try to take a cross-process lock (SET NX PX).
+
+        Args:
+            name: Lock name
+            timeout: Seconds until the lock expires on its own
+
+        Returns:
+            Owner token, or None if the lock is held elsewhere or Redis is unavailable
+        """
+        if not self._connected:
+            return None
+
+        token = uuid.uuid4().hex
+        try:
+            if self._redis.set(self._prefixed_key(f"lock:{name}"), token, nx=True, px=max(1, int(timeout * 1000))):
+                return token
+            return None
+
+        except Exception as e:
+            print(f"Redis lock error: {e}")
+            self._stats["errors"] += 1
+            return None
+
+    def release_lock(self, name: str, token: str) -> bool:
+        """Release a lock taken with acquire_lock if it is still owned by token."""
+        if not self._connected:
+            return False
+
+        try:
+            return bool(self._redis.eval(self._RELEASE_LOCK_SCRIPT, 1, self._prefixed_key(f"lock:{name}"), token))
+
+        except Exception as e:
+            print(f"Redis unlock error: {e}")
+            self._stats["errors"] += 1
+            return False
+
+    def lock_held(self, name: str) -> bool:
+        """Check whether a lock is currently held by any process."""
+        if not self._connected:
+            return False
+
+        try:
+            return self._redis.exists(self._prefixed_key(f"lock:{name}")) > 0
+
+        except Exception as e:
+            print(f"Redis lock check error: {e}")
+            self._stats["errors"] += 1
+            return False
+
     def _prefixed_key(self, key: str) -> str:
         """Add prefix to key."""
         return f"{self._prefix}{key}"
@@ -312,7 +595,7 @@ class RedisCacheBackend(BaseCacheBackend):
                 self._stats["misses"] += 1
                 return None
 
-            value = json.loads(data.decode() if isinstance(data, bytes) else data)
+            value = self._decode(data)
             self._stats["hits"] += 1
             return value
 
@@ -329,12 +612,15 @@ class RedisCacheBackend(BaseCacheBackend):
 
         try:
             prefixed_key = self._prefixed_key(key)
-            data = orjson.dumps(value)
+            data = self._codec.encode(value)
 
+            pipe = self._redis.pipeline(transaction=False)
             if ttl is not None:
-                self._redis.setex(prefixed_key, ttl, data)
+                pipe.setex(prefixed_key, ttl, data)
             else:
-                self._redis.set(prefixed_key, data)
+                pipe.set(prefixed_key, data)
+            self._registry.add(pipe, [prefixed_key], ttl)
+            pipe.execute()
 
             self._stats["sets"] += 1
             return True
@@ -352,6 +638,8 @@ class RedisCacheBackend(BaseCacheBackend):
         try:
             prefixed_key = self._prefixed_key(key)
             result = self._redis.delete(prefixed_key)
+            if result:
+                self._redis.zrem(self._registry.name, prefixed_key)
             self._stats["deletes"] += 1
             return result > 0
 
@@ -380,10 +668,11 @@ class RedisCacheBackend(BaseCacheBackend):
             return False
 
         try:
-            pattern = f"{self._prefix}*"
-            keys = self._redis.keys(pattern)
-            if keys:
-                self._redis.delete(*keys)
+            delete_pattern(self._redis, f"{self._prefix}*")
+            delete_pattern(self._redis, self._tag_key("*"))
+            pipe = self._redis.pipeline(transaction=False)
+            self._registry.clear(pipe)
+            pipe.execute()
             return True
 
         except Exception as e:
@@ -398,14 +687,128 @@ class RedisCacheBackend(BaseCacheBackend):
 
         try:
             prefixed_pattern = self._prefixed_key(pattern)
-            keys = self._redis.keys(prefixed_pattern)
-            return [self._unprefixed_key(key.decode()) for key in keys]
+            return [self._unprefixed_key(key.decode()) for key in scan_keys(self._redis, prefixed_pattern)]
 
         except Exception as e:
             print(f"Redis keys error: {e}")
             self._stats["errors"] += 1
             return []
 
+    def _decode(self, data: Any) -> Any:
+        """Deserialize a stored value."""
+        return self._codec.decode(data)
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get several values with one MGET."""
+        if not self._connected or not keys:
+            self._stats["misses"] += len(keys)
+            return {}
+
+        try:
+            values = self._redis.mget([self._prefixed_key(key) for key in keys])
+            result = {key: self._decode(data) for key, data in zip(keys, values) if data is not None}
+            self._stats["hits"] += len(result)
+            self._stats["misses"] += len(keys) - len(result)
+            return result
+
+        except Exception as e:
+            print(f"Redis mget error: {e}")
+            self._stats["errors"] += 1
+            self._stats["misses"] += len(keys)
+            return {}
+
+    def set_many(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """Set several values in one pipeline (MSET without TTL, SETEX per key with TTL)."""
+        if not self._connected:
+            return False
+        if not mapping:
+            return True
+
+        try:
+            data = {self._prefixed_key(key): self._codec.encode(value) for key, value in mapping.items()}
+
+            pipe = self._redis.pipeline(transaction=False)
+            if ttl is None:
+                pipe.mset(data)
+            else:
+                for prefixed_key, payload in data.items():
+                    pipe.setex(prefixed_key, ttl, payload)
+            self._registry.add(pipe, data.keys(), ttl)
+            pipe.execute()
+
+            self._stats["sets"] += len(data)
+            return True
+
+        except Exception as e:
+            print(f"Redis mset error: {e}")
+            self._stats["errors"] += 1
+            return False
+
+    def delete_many(self, keys: List[str]) -> int:
+        """Delete several keys with batched UNLINK."""
+        if not self._connected:
+            return 0
+
+        try:
+            removed = unlink_keys(self._redis, [self._prefixed_key(key) for key in keys], registry=self._registry)
+            self._stats["deletes"] += removed
+            return removed
+
+        except Exception as e:
+            print(f"Redis delete error: {e}")
+            self._stats["errors"] += 1
+            return 0
+
+    def delete_pattern(self, pattern: str) -> int:
+        """Delete keys matching pattern with SCAN and batched UNLINK."""
+        if not self._connected:
+            return 0
+
+        try:
+            removed = delete_pattern(self._redis, self._prefixed_key(pattern), registry=self._registry)
+            self._stats["deletes"] += removed
+            return removed
+
+        except Exception as e:
+            print(f"Redis delete pattern error: {e}")
+            self._stats["errors"] += 1
+            return 0
+
+    def _tag_key(self, tag: str) -> str:
+        """Redis set holding the keys of a tag (outside the prefix so key scans skip it)."""
+        return f"__tags__:{self._prefix}{tag}"
+
+    def tag(self, key: str, tags: List[str], ttl: Optional[int] = None) -> bool:
+        """Add key to one Redis set per tag."""
+        if not self._connected:
+            return False
+
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            add_tags(pipe, [self._tag_key(tag) for tag in tags], self._prefixed_key(key), ttl)
+            pipe.execute()
+            return True
+
+        except Exception as e:
+            print(f"Redis tag error: {e}")
+            self._stats["errors"] += 1
+            return False
+
+    def invalidate_tags(self, tags: List[str]) -> int:
+        """Delete the members of the tag sets and the sets themselves."""
+        if not self._connected:
+            return 0
+
+        try:
+            removed = invalidate_tag_sets(self._redis, [self._tag_key(tag) for tag in tags], self._registry)
+            self._stats["deletes"] += removed
+            return removed
+
+        except Exception as e:
+            print(f"Redis tag invalidation error: {e}")
+            self._stats["errors"] += 1
+            return 0
+
     def stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
         hit_rate = 0
@@ -418,6 +821,7 @@ class RedisCacheBackend(BaseCacheBackend):
             "hit_rate": hit_rate,
             "backend": "redis",
             "connected": self._connected,
+            "codec": self._codec.stats(),
         }
 
         if self._connected:
@@ -425,6 +829,7 @@ class RedisCacheBackend(BaseCacheBackend):
                 info = self._redis.info()
                 stats.update(
                     {
+                        "keys": self._registry.count(),
                         "redis_memory_used": info.get("used_memory_human", "Unknown"),
                         "redis_keys": (info.get("db0", {}).get("keys", 0) if "db0" in info else 0),
                     }
@@ -435,6 +840,29 @@ class RedisCacheBackend(BaseCacheBackend):
         return stats
 
 
+@dataclass
+class _FlightOptions:
+    """How get_or_compute stores a computed value."""
+
+    ttl: Optional[int]
+    backends: Optional[List[CacheBackend]]
+    stale_ttl: int
+    cache_if: Callable[[Any], bool]
+    lock_timeout: float
+    tags: Optional[List[str]] = None
+
+
+class _Flight:
+    """One in-progress computation that concurrent callers for the same key wait on."""
+
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = _MISSING
+        self.error: Optional[BaseException] = None
+
+
 class CacheManager:
     """
     Unified Cache Manager
@@ -470,6 +898,17 @@ class CacheManager:
                 config = redis_config or {}
                 self._backends[backend] = RedisCacheBackend(**config)
 
+        # Single-flight state for get_or_compute
+        self._flight_lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self._flight_stats = {
+            "computes": 0,
+            "coalesced": 0,
+            "stale_served": 0,
+            "background_refreshes": 0,
+            "lock_waits": 0,
+        }
+
     def get(self, key: str, backend: CacheBackend = CacheBackend.AUTO) -> Optional[Any]:
         """
         Get value from cache.
@@ -481,6 +920,10 @@ class CacheManager:
         Returns:
             Cached value or None
         """
+        return self._unwrap(self._lookup(key, backend))
+
+    def _lookup(self, key: str, backend: CacheBackend = CacheBackend.AUTO) -> Optional[Any]:
+        """Get the stored value as is (envelopes are not unwrapped)."""
         if backend == CacheBackend.AUTO:
             # Try memory first, then Redis
             for backend_type in [CacheBackend.MEMORY, CacheBackend.REDIS]:
@@ -497,12 +940,20 @@ class CacheManager:
                 return backend_instance.get(key)
             return None
 
+    @staticmethod
+    def _unwrap(value: Any) -> Any:
+        """Return the payload of an envelope written by get_or_compute or a tagged set."""
+        if isinstance(value, dict) and value.get(ENVELOPE_MARKER):
+            return value["value"]
+        return value
+
     def set(
         self,
         key: str,
         value: Any,
         ttl: Optional[int] = None,
         backends: Optional[List[CacheBackend]] = None,
+        tags: Optional[List[str]] = None,
     ) -> bool:
         """
         Set value in cache.
@@ -512,10 +963,33 @@ class CacheManager:
             value: Value to cache
             ttl: Time to live in seconds
             backends: Specific backends to use
+            tags: Tags (dependencies) to invalidate the entry by, see invalidate_tags
 
         Returns:
             True if set in at least one backend
         """
+        if tags:
+            # Keep the tags with the value so copies promoted from Redis to memory stay tagged
+            value = {
+                ENVELOPE_MARKER: 1,
+                "value": value,
+                "expires_at": None,
+                "stale_until": None,
+                "delta": 0.0,
+                "created_at": time.time(),
+                "tags": list(tags),
+            }
+        return self._write(key, value, ttl, backends, tags)
+
+    def _write(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int],
+        backends: Optional[List[CacheBackend]],
+        tags: Optional[List[str]],
+    ) -> bool:
+        """Store value as is in the backends and register its tags."""
         if backends is None:
             backends = list(self._backends.keys())
 
@@ -525,9 +999,33 @@ class CacheManager:
             if backend_instance:
                 if backend_instance.set(key, value, ttl):
                     success = True
+                    if tags:
+                        backend_instance.tag(key, tags, ttl)
 
         return success
 
+    def invalidate_tags(self, tags: List[str], backends: Optional[List[CacheBackend]] = None) -> int:
+        """
+        Delete every entry carrying any of the tags.
+
+        Args:
+            tags: Tags such as "device:FGT-01" or "package:root/default"
+            backends: Specific backends to use
+
+        Returns:
+            Largest number of entries removed from any one backend
+        """
+        if backends is None:
+            backends = list(self._backends.keys())
+
+        removed = 0
+        for backend in backends:
+            backend_instance = self._backends.get(backend)
+            if backend_instance:
+                removed = max(removed, backend_instance.invalidate_tags(list(tags)))
+
+        return removed
+
     def delete(self, key: str, backends: Optional[List[CacheBackend]] = None) -> bool:
         """
         Delete value from cache.
@@ -619,6 +1117,109 @@ class CacheManager:
                 return backend_instance.keys(pattern)
             return []
 
+    def get_many(self, keys: List[str], backend: CacheBackend = CacheBackend.AUTO) -> Dict[str, Any]:
+        """
+        Get several values at once (one MGET round trip for Redis).
+
+        Args:
+            keys: Cache keys
+            backend: Specific backend to use
+
+        Returns:
+            Mapping of found keys to values
+        """
+        if backend != CacheBackend.AUTO:
+            backend_instance = self._backends.get(backend)
+            if backend_instance:
+                return {key: self._unwrap(value) for key, value in backend_instance.get_many(keys).items()}
+            return {}
+
+        result: Dict[str, Any] = {}
+        remaining = list(keys)
+        # Try memory first, then Redis for whatever is still missing
+        for backend_type in [CacheBackend.MEMORY, CacheBackend.REDIS]:
+            if not remaining or backend_type not in self._backends:
+                continue
+            found = self._backends[backend_type].get_many(remaining)
+            for key, value in found.items():
+                result[key] = self._unwrap(value)
+                self._populate_lower_caches(key, value, backend_type)
+            remaining = [key for key in remaining if key not in found]
+        return result
+
+    def set_many(
+        self,
+        mapping: Dict[str, Any],
+        ttl: Optional[int] = None,
+        backends: Optional[List[CacheBackend]] = None,
+    ) -> bool:
+        """
+        Set several values at once (one pipeline for Redis).
+
+        Args:
+            mapping: Keys and values to cache
+            ttl: Time to live in seconds
+            backends: Specific backends to use
+
+        Returns:
+            True if set in at least one backend
+        """
+        if backends is None:
+            backends = list(self._backends.keys())
+
+        success = False
+        for backend in backends:
+            backend_instance = self._backends.get(backend)
+            if backend_instance:
+                if backend_instance.set_many(mapping, ttl):
+                    success = True
+
+        return success
+
+    def delete_many(self, keys: List[str], backends: Optional[List[CacheBackend]] = None) -> int:
+        """
+        Delete several keys at once.
+
+        Args:
+            keys: Cache keys
+            backends: Specific backends to use
+
+        Returns:
+            Largest number of keys removed from any one backend
+        """
+        if backends is None:
+            backends = list(self._backends.keys())
+
+        removed = 0
+        for backend in backends:
+            backend_instance = self._backends.get(backend)
+            if backend_instance:
+                removed = max(removed, backend_instance.delete_many(keys))
+
+        return removed
+
+    def delete_pattern(self, pattern: str, backends: Optional[List[CacheBackend]] = None) -> int:
+        """
+        Delete all keys matching pattern (SCAN + batched UNLINK for Redis).
+
+        Args:
+            pattern: Key pattern
+            backends: Specific backends to use
+
+        Returns:
+            Largest number of keys removed from any one backend
+        """
+        if backends is None:
+            backends = list(self._backends.keys())
+
+        removed = 0
+        for backend in backends:
+            backend_instance = self._backends.get(backend)
+            if backend_instance:
+                removed = max(removed, backend_instance.delete_pattern(pattern))
+
+        return removed
+
     def stats(self) -> Dict[str, Any]:
         """
         Get cache statistics.
@@ -631,6 +1232,9 @@ class CacheManager:
         for backend_type, backend_instance in self._backends.items():
             stats["backends"][backend_type.value] = backend_instance.stats()
 
+        with self._flight_lock:
+            stats["single_flight"] = {**self._flight_stats, "in_flight": len(self._flights)}
+
         return stats
 
     def cache_key(self, *args, **kwargs) -> str:
@@ -654,13 +1258,21 @@ class CacheManager:
         self,
         ttl: Optional[int] = None,
         backends: Optional[List[CacheBackend]] = None,
+        stale_ttl: Optional[int] = None,
+        beta: Optional[float] = None,
+        tags: Union[List[str], Callable[..., List[str]], None] = None,
     ):
         """
         Decorator for caching function results.
 
+        Concurrent calls that miss the same key run the function once (see get_or_compute).
+
         Args:
             ttl: Time to live in seconds
             backends: Specific backends to use
+            stale_ttl: Seconds an expired result may still be served while it is refreshed
+            beta: Early expiration factor (0 disables early expiration)
+            tags: Tags for the results, or a function of the call arguments returning them
 
         Returns:
             Decorator function
@@ -670,21 +1282,250 @@ class CacheManager:
             def wrapper(*args, **kwargs):
                 # Generate cache key
                 key = f"func:{func.__name__}:{self.cache_key(*args, **kwargs)}"
-
-                # Try to get from cache
-                result = self.get(key)
-                if result is not None:
-                    return result
-
-                # Execute function and cache result
-                result = func(*args, **kwargs)
-                self.set(key, result, ttl, backends)
-                return result
+                return self.get_or_compute(
+                    key,
+                    lambda: func(*args, **kwargs),
+                    ttl,
+                    backends,
+                    stale_ttl,
+                    beta,
+                    tags=tags(*args, **kwargs) if callable(tags) else tags,
+                )
 
             return wrapper
 
         return decorator
 
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: Optional[int] = None,
+        backends: Optional[List[CacheBackend]] = None,
+        stale_ttl: Optional[int] = None,
+        beta: Optional[float] = None,
+        cache_if: Optional[Callable[[Any], bool]] = None,
+        lock_timeout: Optional[float] = None,
+        tags: Optional[List[str]] = None,
+    ) -> Any:
+        """
+        Get value from cache, computing it at most once per key on a miss.
+
+        Concurrent misses wait on a single computation (single-flight). When the
+        Redis backend is connected, a Redis lock extends this across processes.
+        Entries may expire early with probability rising towards their TTL (XFetch),
+        and for stale_ttl seconds after it the old value is served while one
+        background refresh runs.
+
+        Args:
+            key: Cache key
+            compute: Function producing the value
+            ttl: Time to live in seconds (None keeps the value until evicted)
+            backends: Specific backends to use
+            stale_ttl: Seconds an expired value may still be served while it is refreshed
+            beta: Early expiration factor (0 disables early expiration)
+            cache_if: Whether a computed value should be cached (default: not None)
+            lock_timeout: Seconds to wait for another caller's computation
+            tags: Tags to invalidate the cached value by (see invalidate_tags)
+
+        Returns:
+            Cached or computed value
+        """
+        options = _FlightOptions(
+            ttl=ttl,
+            backends=backends,
+            stale_ttl=CACHE_SETTINGS["STALE_TTL"] if stale_ttl is None else stale_ttl,
+            cache_if=cache_if or (lambda value: value is not None),
+            lock_timeout=CACHE_SETTINGS["LOCK_TIMEOUT"] if lock_timeout is None else lock_timeout,
+            tags=tags,
+        )
+        beta = CACHE_SETTINGS["EARLY_EXPIRY_BETA"] if beta is None else beta
+
+        now = time.time()
+        entry = self._get_envelope(key)
+        if entry is not None:
+            if self._is_fresh(entry, now, beta):
+                return entry["value"]
+            if now < entry["stale_until"]:
+                # Expired (or picked for early expiry) but still servable: refresh behind the caller
+                self._count("stale_served")
+                self._refresh_in_background(key, compute, options, now)
+                return entry["value"]
+
+        return self._compute_once(key, compute, options, now)
+
+    def _count(self, name: str):
+        """Increment a single-flight statistic."""
+        with self._flight_lock:
+            self._flight_stats[name] += 1
+
+    def _get_envelope(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read an entry written by get_or_compute; plain values are treated as never expiring."""
+        value = self._lookup(key)
+        if value is None:
+            return None
+        if isinstance(value, dict) and value.get(ENVELOPE_MARKER):
+            return value
+        return {"value": value, "expires_at": None, "stale_until": None, "delta": 0.0, "created_at": 0.0}
+
+    @staticmethod
+    def _is_fresh(entry: Dict[str, Any], now: float, beta: float) -> bool:
+        """
+        XFetch check: expire early with probability growing as expiry nears.
+
+        The lead time is delta * beta * -log(U), so slow-to-compute values start
+        refreshing earlier and, across many callers, only a few refresh at once.
+        """
+        expires_at = entry["expires_at"]
+        if expires_at is None:
+            return True
+        if beta <= 0 or entry["delta"] <= 0:
+            return now < expires_at
+        return now - entry["delta"] * beta * math.log(1.0 - random.random()) < expires_at
+
+    def _store(self, key: str, value: Any, options: _FlightOptions, delta: float):
+        """Cache value with logical expiry; the backends keep it stale_ttl longer."""
+        now = time.time()
+        if options.ttl is None:
+            expires_at = stale_until = physical_ttl = None
+        else:
+            expires_at = now + options.ttl
+            stale_until = expires_at + options.stale_ttl
+            physical_ttl = options.ttl + options.stale_ttl
+
+        envelope = {
+            ENVELOPE_MARKER: 1,
+            "value": value,
+            "expires_at": expires_at,
+            "stale_until": stale_until,
+            "delta": delta,
+            "created_at": now,
+        }
+        if options.tags:
+            envelope["tags"] = list(options.tags)
+        self._write(key, envelope, physical_ttl, options.backends, options.tags)
+
+    def _lock_backend(self) -> Optional[RedisCacheBackend]:
+        """Redis backend usable for cross-process locking, if any."""
+        backend = self._backends.get(CacheBackend.REDIS)
+        if backend is not None and backend.connected:
+            return backend
+        return None
+
+    def _compute_once(self, key: str, compute: Callable[[], Any], options: _FlightOptions, since: float) -> Any:
+        """Compute value on a miss, joining an in-progress computation for the same key."""
+        with self._flight_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self._flight_stats["coalesced"] += 1
+
+        if leader:
+            return self._lead(key, flight, compute, options, since, background=False)
+
+        if not flight.done.wait(options.lock_timeout):
+            # Leader is stuck; do not hold this caller hostage
+            return compute()
+        if flight.error is not None:
+            raise flight.error
+        if flight.value is _MISSING:
+            # Background refresh deferred to another process
+            return self._compute_once(key, compute, options, time.time())
+        return flight.value
+
+    def _refresh_in_background(self, key: str, compute: Callable[[], Any], options: _FlightOptions, since: float):
+        """Start one refresh thread for key unless a computation is already running."""
+        with self._flight_lock:
+            if key in self._flights:
+                return
+            flight = self._flights[key] = _Flight()
+            self._flight_stats["background_refreshes"] += 1
+
+        thread = threading.Thread(
+            target=self._lead,
+            args=(key, flight, compute, options, since, True),
+            name=f"cache-refresh-{key[:32]}",
+            daemon=True,
+        )
+        thread.start()
+
+    def _lead(
+        self,
+        key: str,
+        flight: _Flight,
+        compute: Callable[[], Any],
+        options: _FlightOptions,
+        since: float,
+        background: bool,
+    ) -> Any:
+        """Run the computation for a flight and publish its outcome to waiting callers."""
+        try:
+            flight.value = self._compute_and_store(key, compute, options, since, wait=not background)
+            return flight.value
+        except Exception as e:
+            flight.error = e
+            if not background:
+                raise
+            print(f"Cache refresh error for {key}: {e}")
+            return None
+        finally:
+            with self._flight_lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _compute_and_store(
+        self, key: str, compute: Callable[[], Any], options: _FlightOptions, since: float, wait: bool
+    ) -> Any:
+        """
+        Compute and cache value under the cross-process lock when Redis is available.
+
+        Returns:
+            Value, or _MISSING when wait is False and another process holds the lock
+        """
+        lock = self._lock_backend()
+        token = None
+        if lock is not None:
+            token = lock.acquire_lock(key, options.lock_timeout)
+            if token is None:
+                if not wait:
+                    return _MISSING
+                self._count("lock_waits")
+                value = self._wait_for_peer(lock, key, since, options.lock_timeout)
+                if value is not _MISSING:
+                    return value
+
+        try:
+            # Another caller may have stored a fresh value since we looked
+            entry = self._get_envelope(key)
+            if entry is not None and entry["created_at"] >= since:
+                return entry["value"]
+
+            self._count("computes")
+            started = time.time()
+            value = compute()
+            if options.cache_if(value):
+                self._store(key, value, options, time.time() - started)
+            return value
+        finally:
+            if token is not None:
+                lock.release_lock(key, token)
+
+    def _wait_for_peer(self, lock: RedisCacheBackend, key: str, since: float, timeout: float) -> Any:
+        """Poll until the process holding the lock stores a value, releases the lock or times out."""
+        deadline = time.time() + timeout
+        delay = 0.01
+        while True:
+            held = lock.lock_held(key)
+            entry = self._get_envelope(key)
+            if entry is not None and entry["created_at"] >= since:
+                return entry["value"]
+            if not held or time.time() >= deadline:
+                return _MISSING
+            time.sleep(delay)
+            delay = min(delay * 2, 0.25)
+
     def _populate_lower_caches(self, key: str, value: Any, source_backend: CacheBackend):
         """
         Populate lower-priority caches with value from higher-priority cache.
@@ -696,7 +1537,16 @@ class CacheManager:
         """
         # Only populate memory cache from Redis
         if source_backend == CacheBackend.REDIS and CacheBackend.MEMORY in self._backends:
-            self._backends[CacheBackend.MEMORY].set(key, value)
+            memory = self._backends[CacheBackend.MEMORY]
+            ttl = None
+            tags = None
+            if isinstance(value, dict) and value.get(ENVELOPE_MARKER):
+                if value.get("stale_until") is not None:
+                    # Keep the memory copy no longer than Redis would
+                    ttl = max(0, math.ceil(value["stale_until"] - time.time()))
+                tags = value.get("tags")
+            if memory.set(key, value, ttl) and tags:
+                memory.tag(key, tags, ttl)
 
 
 # Global cache manager instance
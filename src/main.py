@@ -102,6 +102,14 @@ def parse_args():
         required=False,
     )
     parser.add_argument("--output", help="출력 파일 경로", required=False)
+    parser.add_argument("--flows", help="일괄 분석할 플로우 파일 (NDJSON 또는 CSV, --output 필요)", required=False)
+    parser.add_argument("--workers", help="일괄 분석 프로세스 수 (기본: CPU 수)", type=int, required=False)
+    parser.add_argument(
+        "--firewall",
+        help="일괄 분석 대상 방화벽 ID (--manager 사용 시 장치 이름)",
+        default="default",
+        required=False,
+    )
     parser.add_argument("--web", help="웹 인터페이스 시작", action="store_true")
     parser.add_argument("--host", help="FortiManager 또는 FortiGate 호스트", required=False)
     parser.add_argument("--token", help="API 토큰", required=False)
@@ -152,6 +160,54 @@ def analyze_packet_path(src_ip, dst_ip, port, protocol, api_client, manager=Fals
         return None
 
 
+def create_api_client(args):
+    """명령줄 인수로 FortiGate 또는 FortiManager API 클라이언트 생성"""
+    if args.manager:
+        return FortiManagerAPIClient(
+            host=args.host,
+            api_token=args.token,
+            username=args.username,
+            password=args.password,
+        )
+    return FortiGateAPIClient(host=args.host, api_token=args.token)
+
+
+def run_batch_analysis(args):
+    """플로우 파일을 일괄 분석하여 결과를 NDJSON 파일(--output)로 출력"""
+    from analysis.batch_simulator import BatchTrafficSimulator, CompiledPathEvaluator, read_flows
+    from analysis.components import DataLoader
+    from analysis.fixed_path_analyzer import FixedPathAnalyzer
+
+    try:
+        if args.host:
+            # 실제 장비 데이터로 정책/라우팅 인덱스를 미리 계산
+            api_client = create_api_client(args)
+            data_loader = DataLoader(
+                fortigate_client=None if args.manager else api_client,
+                fortimanager_client=api_client if args.manager else None,
+            )
+            loaded = data_loader.load_all_firewalls() if args.manager else data_loader.load_firewall_data(args.firewall)
+            if not loaded:
+                logger.error("방화벽 데이터 로드 실패")
+                return 1
+            # 선택한 방화벽의 정책/라우팅 데이터가 없으면 ValueError (--manager에서는 --firewall로 장치 지정)
+            analyzer = CompiledPathEvaluator.from_data_loader(data_loader, args.firewall)
+        else:
+            analyzer = FixedPathAnalyzer()
+
+        simulator = BatchTrafficSimulator(analyzer, workers=args.workers)
+
+        with open(args.output, "w", encoding="utf-8") as f:
+            summary = simulator.simulate_to_ndjson(read_flows(args.flows), f)
+
+        logger.info(f"일괄 분석 요약: {summary}")
+        return 0
+
+    except Exception as e:
+        logger.error(f"일괄 분석 중 오류: {str(e)}")
+        return 1
+
+
 def visualize_path(path_data):
     """경로 시각화"""
     try:
@@ -253,23 +309,20 @@ def main():
             app.run(host=host, port=port, debug=debug)
         return
 
+    # 플로우 파일 일괄 분석 모드 (stdout에는 콘솔 로그가 섞이므로 결과는 파일로만 출력)
+    if args.flows:
+        if not args.output:
+            print("오류: 일괄 분석(--flows)에는 결과 파일 경로(--output)가 필요합니다.")
+            return 1
+        return run_batch_analysis(args)
+
     # CLI 모드에서는 필수 인수 확인
     if not all([args.src, args.dst, args.port]):
         print("오류: 출발지 IP(--src), 목적지 IP(--dst), 포트(--port)는 필수 인수입니다.")
         return 1
 
     # API 클라이언트 설정
-    if args.manager:
-        # FortiManager API 클라이언트
-        api_client = FortiManagerAPIClient(
-            host=args.host,
-            api_token=args.token,
-            username=args.username,
-            password=args.password,
-        )
-    else:
-        # FortiGate API 클라이언트
-        api_client = FortiGateAPIClient(host=args.host, api_token=args.token)
+    api_client = create_api_client(args)
 
     # 분석 실행
     path_data = analyze_packet_path(args.src, args.dst, args.port, args.protocol, api_client, args.manager)
@@ -7,7 +7,7 @@ FortiManager 장치 관리 라우트
 from flask import Blueprint, jsonify
 
 from utils.api_utils import get_api_manager
-from utils.unified_cache_manager import cached
+from utils.unified_cache_manager import cache_tags, cached
 from utils.unified_logger import setup_logger
 
 # Note: Test mode functionality removed for production stability
@@ -29,7 +29,7 @@ device_bp = Blueprint("devices", __name__, url_prefix="/devices")
 
 
 @device_bp.route("/status", methods=["GET"])
-@cached(ttl=60)
+@cached(ttl=60, tags=cache_tags(adom="root"))
 def get_fortimanager_status():
     """FortiManager 연결 상태 조회"""
     try:
@@ -91,7 +91,7 @@ def get_fortimanager_status():
 
 
 @device_bp.route("/", methods=["GET"])
-@cached(ttl=120)
+@cached(ttl=120, tags=cache_tags(adom="root", object_type="device"))
 def get_devices():
     """관리되는 모든 장치 목록 조회"""
     try:
@@ -121,7 +121,7 @@ def get_devices():
 
 
 @device_bp.route("/<device_id>", methods=["GET"])
-@cached(ttl=300)
+@cached(ttl=300, tags=lambda device_id: cache_tags(device=device_id))
 def get_device_info(device_id):
     """특정 장치의 상세 정보 조회"""
     try:
@@ -148,7 +148,7 @@ def get_device_info(device_id):
 
 
 @device_bp.route("/<device_id>/interfaces", methods=["GET"])
-@cached(ttl=180)
+@cached(ttl=180, tags=lambda device_id: cache_tags(device=device_id))
 def get_device_interfaces(device_id):
     """장치의 네트워크 인터페이스 정보 조회"""
     try:
@@ -184,7 +184,7 @@ def get_device_interfaces(device_id):
 
 
 @device_bp.route("/<device_id>/monitoring", methods=["GET"])
-@cached(ttl=30)
+@cached(ttl=30, tags=lambda device_id: cache_tags(device=device_id))
 def get_device_monitoring(device_id):
     """장치 모니터링 정보 조회"""
     try:
@@ -220,7 +220,7 @@ def get_device_monitoring(device_id):
 
 
 @device_bp.route("/dashboard", methods=["GET"])
-@cached(ttl=60)
+@cached(ttl=60, tags=cache_tags(adom="root", object_type="device"))
 def get_dashboard_data():
     """FortiManager 대시보드 데이터 조회"""
     try:
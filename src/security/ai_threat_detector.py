@@ -5,6 +5,7 @@ Implements machine learning for packet analysis and threat detection
 """
 
 import asyncio
+import threading
 from collections import defaultdict, deque
 from datetime import datetime
 from enum import Enum
@@ -174,8 +175,16 @@ class PacketAnalyzer:
 class AIThreatDetector:
     """AI-powered threat detection system"""
 
-    def __init__(self):
+    def __init__(self, workers: int = 0):
+        """
+        Args:
+            workers: packet analysis worker processes (2+ analyzes every packet in the workers,
+                partitioned by source IP so per-source history stays in one worker)
+        """
         self.packet_analyzer = PacketAnalyzer()
+        self.workers = workers
+        self._pipeline = None
+        self._pipeline_lock = threading.Lock()
         self.threat_patterns = []
         self.threat_intelligence = {}
         self.detection_models = self._initialize_models()
@@ -184,6 +193,30 @@ class AIThreatDetector:
 
         logger.info("AI Threat Detector initialized")
 
+    def _analyze_parallel(self, packets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Analyze packets in the worker pool
+
+        The pool is kept for the detector's lifetime so per-source history spans calls. Its result
+        queue is shared by every batch, so concurrent calls take turns instead of reading each
+        other's results.
+        """
+        with self._pipeline_lock:
+            if self._pipeline is None:
+                from security.packet_sniffer.dpi_pipeline import DPIPipeline, source_partition_key
+
+                self._pipeline = DPIPipeline(
+                    PacketAnalyzer, "analyze_packet", workers=self.workers, partition_key=source_partition_key
+                )
+            return self._pipeline.analyze_batch(packets)
+
+    def close(self) -> None:
+        """Stop packet analysis workers"""
+        with self._pipeline_lock:
+            if self._pipeline is not None:
+                self._pipeline.close()
+                self._pipeline = None
+
     def _initialize_models(self) -> Dict[str, Any]:
         """Initialize detection models"""
         return {
@@ -198,16 +231,17 @@ class AIThreatDetector:
         logger.info(f"Analyzing {len(packets)} packets for threats")
 
         threats_detected = []
-        packet_analyses = []
 
-        # Analyze individual packets
-        for packet in packets:
-            analysis = self.packet_analyzer.analyze_packet(packet)
-            packet_analyses.append(analysis)
+        # Analyze individual packets (with workers, every call goes to the same per-source worker state)
+        if self.workers > 1 and packets:
+            packet_analyses = await asyncio.get_running_loop().run_in_executor(None, self._analyze_parallel, packets)
+        else:
+            packet_analyses = [self.packet_analyzer.analyze_packet(packet) for packet in packets]
 
+        for analysis in packet_analyses:
             # Update statistics
             self.statistics["packets_analyzed"] += 1
-            if analysis["risk_score"] > 0.5:
+            if analysis.get("risk_score", 0.0) > 0.5:
                 self.statistics["suspicious_packets"] += 1
 
         # Run specialized detectors
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+DPI 분석 결과 캐시
+전체 페이로드의 다이제스트와 포트/프로토콜을 키로 하는 LRU + TTL 캐시입니다.
+선택적으로 여러 캡처 워커가 공유하는 매핑(multiprocessing.Manager().dict() 등)을
+2차 계층으로 사용하여 다른 워커의 분석 결과를 재사용합니다. 공유 매핑이 가득 차면
+만료 항목과 가장 오래 저장된 항목을 일괄 제거하여 새 결과를 계속 게시합니다.
+"""
+
+import hashlib
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, MutableMapping, Optional, Tuple
+
+from utils.unified_logger import get_logger
+
+# 선택적 import - 없으면 hashlib.blake2b 사용
+try:
+    import xxhash
+
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
+
+DEFAULT_CACHE_SIZE = 1000
+DEFAULT_CACHE_TTL = 300.0  # 초
+DEFAULT_SHARED_MAX_SIZE = 100000
+SHARED_EVICT_FRACTION = 0.1  # 공유 매핑이 가득 차면 한 번에 비우는 비율 (정리 비용 분산)
+
+logger = get_logger(__name__)
+
+
+def payload_digest(payload: bytes) -> bytes:
+    """
+    페이로드 전체의 128비트 다이제스트
+
+    파이썬 hash()와 달리 프로세스 간에 안정적이므로 공유 계층의 키로 사용할 수 있습니다.
+    """
+    if HAS_XXHASH:
+        return xxhash.xxh3_128_digest(payload)
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def analysis_cache_key(packet) -> Tuple[Any, ...]:
+    """패킷의 분석 캐시 키 (프로토콜, 포트, 페이로드 길이, 페이로드 다이제스트)"""
+    payload = packet.payload or b""
+    return (packet.protocol, packet.src_port, packet.dst_port, len(payload), payload_digest(payload))
+
+
+class AnalysisCache(OrderedDict):
+    """
+    LRU + TTL 분석 결과 캐시
+
+    딕셔너리로서는 키 -> 분석 결과를 담고 있으며 최근 사용 순서를 유지합니다.
+    조회/저장은 lookup()/store()를 사용해야 TTL, 지표, 공유 계층이 적용됩니다.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_CACHE_SIZE,
+        ttl: Optional[float] = DEFAULT_CACHE_TTL,
+        shared: Optional[MutableMapping] = None,
+        shared_max_size: int = DEFAULT_SHARED_MAX_SIZE,
+    ):
+        """
+        분석 캐시 초기화
+
+        Args:
+            max_size: 로컬 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목 제거)
+            ttl: 항목 유효 시간(초), None이면 만료 없음
+            shared: 워커 간 공유 매핑 (키 -> (저장 시각, 결과)), None이면 사용 안 함
+            shared_max_size: 공유 매핑 최대 항목 수 (가득 차면 만료 항목과 오래된 항목을 제거)
+        """
+        super().__init__()
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self.shared = shared
+        self.shared_max_size = max(1, shared_max_size)
+        self.lock = threading.Lock()
+        self._stored_at: Dict[Any, float] = {}
+        self.metrics = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "shared_hits": 0,
+            "shared_evictions": 0,
+            "shared_errors": 0,
+        }
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl is not None and now - stored_at >= self.ttl
+
+    def _insert(self, key, value, stored_at: float) -> None:
+        self[key] = value
+        self.move_to_end(key)
+        self._stored_at[key] = stored_at
+        while len(self) > self.max_size:
+            oldest, _ = self.popitem(last=False)
+            self._stored_at.pop(oldest, None)
+            self.metrics["evictions"] += 1
+
+    def lookup(self, key, now: Optional[float] = None) -> Optional[Any]:
+        """
+        캐시 조회 (로컬 -> 공유 계층 순)
+
+        Args:
+            key: 캐시 키
+            now: 기준 시각(epoch 초), 없으면 현재 시각
+
+        Returns:
+            캐시된 분석 결과 (없거나 만료되었으면 None)
+        """
+        now = time.time() if now is None else now
+        with self.lock:
+            value = self.get(key)
+            if value is not None:
+                if not self._expired(self._stored_at[key], now):
+                    self.move_to_end(key)
+                    self.metrics["hits"] += 1
+                    return value
+                del self[key]
+                del self._stored_at[key]
+                self.metrics["expirations"] += 1
+
+        entry = self._shared_get(key, now)
+        with self.lock:
+            if entry is not None:
+                stored_at, value = entry
+                self._insert(key, value, stored_at)
+                self.metrics["hits"] += 1
+                self.metrics["shared_hits"] += 1
+                return value
+            self.metrics["misses"] += 1
+            return None
+
+    def store(self, key, value, now: Optional[float] = None) -> None:
+        """결과 저장 (공유 계층이 있으면 함께 게시)"""
+        now = time.time() if now is None else now
+        with self.lock:
+            self._insert(key, value, now)
+
+        if self.shared is not None:
+            try:
+                if key not in self.shared and len(self.shared) >= self.shared_max_size:
+                    self._shared_evict(now)
+                self.shared[key] = (now, value)
+            except Exception as e:
+                self._shared_failed(e)
+
+    def _shared_evict(self, now: float) -> None:
+        """
+        공유 매핑의 만료 항목을 제거하고, 그래도 가득 차 있으면 가장 오래 저장된 항목부터 제거
+
+        매 저장마다 정리하지 않도록 최대 크기의 SHARED_EVICT_FRACTION만큼 여유를 만듭니다.
+        다른 워커가 같은 항목을 먼저 지웠을 수 있으므로 pop()으로 제거합니다.
+        """
+        entries = list(self.shared.items())
+        expired = [key for key, (stored_at, _) in entries if self._expired(stored_at, now)]
+        target = self.shared_max_size - max(1, int(self.shared_max_size * SHARED_EVICT_FRACTION))
+        excess = len(entries) - len(expired) - target
+        if excess > 0:
+            expired_keys = set(expired)
+            live = ((stored_at, key) for key, (stored_at, _) in entries if key not in expired_keys)
+            expired += [key for _, key in heapq.nsmallest(excess, live, key=lambda item: item[0])]
+
+        for key in expired:
+            self.shared.pop(key, None)
+        with self.lock:
+            self.metrics["shared_evictions"] += len(expired)
+
+    def _shared_get(self, key, now: float) -> Optional[Tuple[float, Any]]:
+        if self.shared is None:
+            return None
+        try:
+            entry = self.shared.get(key)
+            if entry is not None and self._expired(entry[0], now):
+                self.shared.pop(key, None)
+                return None
+            return entry
+        except Exception as e:
+            self._shared_failed(e)
+            return None
+
+    def _shared_failed(self, error: Exception) -> None:
+        # 공유 계층 장애는 로컬 캐시로 계속 동작
+        with self.lock:
+            self.metrics["shared_errors"] += 1
+        logger.debug(f"공유 분석 캐시 접근 실패: {error}")
+
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        """만료된 로컬 항목 제거"""
+        if self.ttl is None:
+            return 0
+        now = time.time() if now is None else now
+        with self.lock:
+            expired = [key for key, stored_at in self._stored_at.items() if self._expired(stored_at, now)]
+            for key in expired:
+                del self[key]
+                del self._stored_at[key]
+            self.metrics["expirations"] += len(expired)
+            return len(expired)
+
+    def clear(self) -> None:
+        """로컬 항목 삭제 (공유 계층과 지표는 유지)"""
+        with self.lock:
+            super().clear()
+            self._stored_at.clear()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """캐시 지표"""
+        with self.lock:
+            metrics = dict(self.metrics)
+            size = len(self)
+        lookups = metrics["hits"] + metrics["misses"]
+        return {
+            "size": size,
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "shared": self.shared is not None,
+            **metrics,
+            "hit_rate": round(metrics["hits"] / lookups * 100, 2) if lookups else 0.0,
+        }
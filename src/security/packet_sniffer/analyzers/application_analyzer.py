@@ -7,6 +7,7 @@
 import logging
 from typing import Any, Dict, List, Optional
 
+from ..payload_stats import looks_encrypted, payload_statistics, printable_ratio, shannon_entropy
 from .ssh_analyzer import SSHAnalyzer
 from .web_analyzer import WebAnalyzer
 
@@ -173,11 +174,12 @@ class ApplicationAnalyzer:
     def _analyze_generic(self, payload: bytes, packet_info: Dict[str, Any], protocol: str) -> Dict[str, Any]:
         """일반적인 프로토콜 분석"""
 
+        stats = payload_statistics(payload)
         analysis = {
             "protocol": protocol,
             "payload_size": len(payload),
-            "is_encrypted": self._detect_encryption(payload),
-            "printable_ratio": self._calculate_printable_ratio(payload),
+            "is_encrypted": looks_encrypted(stats),
+            "printable_ratio": stats.printable_ratio,
         }
 
         # 텍스트 기반 프로토콜인 경우 간단한 분석
@@ -192,45 +194,16 @@ class ApplicationAnalyzer:
         return analysis
 
     def _detect_encryption(self, payload: bytes) -> bool:
-        """암호화된 데이터 탐지"""
-
-        if len(payload) == 0:
-            return False
-
-        # 엔트로피 기반 간단한 암호화 탐지
-        entropy = self._calculate_entropy(payload)
-        return entropy > 7.0  # 높은 엔트로피는 암호화 가능성
+        """암호화된 데이터 탐지 (높은 엔트로피는 암호화 가능성)"""
+        return looks_encrypted(payload_statistics(payload))
 
     def _calculate_entropy(self, data: bytes) -> float:
-        """데이터 엔트로피 계산"""
-
-        if not data:
-            return 0.0
-
-        # 바이트 빈도 계산
-        frequency = [0] * 256
-        for byte in data:
-            frequency[byte] += 1
-
-        # 엔트로피 계산
-        entropy = 0.0
-        data_len = len(data)
-
-        for freq in frequency:
-            if freq > 0:
-                prob = freq / data_len
-                entropy -= prob * (prob.bit_length() - 1)
-
-        return entropy
+        """데이터 엔트로피 계산 (바이트당 비트)"""
+        return shannon_entropy(data)
 
     def _calculate_printable_ratio(self, payload: bytes) -> float:
         """출력 가능한 문자 비율 계산"""
-
-        if not payload:
-            return 0.0
-
-        printable_count = sum(1 for byte in payload if 32 <= byte <= 126)
-        return printable_count / len(payload)
+        return printable_ratio(payload)
 
     def _update_session_info(self, analysis: Dict[str, Any], packet_info: Dict[str, Any]) -> Dict[str, Any]:
         """세션 정보 업데이트"""
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+플로우 테이블
+방향 정규화된 5-튜플 키로 연결을 추적하고, 용량(LRU)/유휴 시간/종료(FIN·RST) 기준으로
+만료된 플로우를 제거하여 플로우 레코드로 내보냅니다.
+"""
+
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from functools import lru_cache
+from ipaddress import ip_address
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_MAX_FLOWS = 100000
+DEFAULT_IDLE_TIMEOUT = 300.0  # 초
+DEFAULT_CLOSE_LINGER = 30.0  # 초
+DEFAULT_EXPORT_BUFFER = 10000
+
+PROTOCOL_NUMBERS = {"ICMP": 1, "TCP": 6, "UDP": 17}
+
+EVICTION_REASONS = ("capacity", "idle", "closed")
+
+
+@lru_cache(maxsize=65536)
+def ip_to_int(ip_str: str) -> int:
+    """IP 문자열을 정수로 변환 (잘못된 값은 -1)"""
+    try:
+        return int(ip_address(ip_str))
+    except ValueError:
+        return -1
+
+
+def timestamp_seconds(value: Any) -> float:
+    """패킷 타임스탬프(epoch 초 또는 ISO 문자열)를 epoch 초로 변환"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            pass
+    return time.time()
+
+
+def flow_key(protocol: str, src_ip: str, src_port: int, dst_ip: str, dst_port: int) -> Tuple[Tuple[int, ...], bool]:
+    """
+    방향 정규화된 플로우 키 생성
+
+    Returns:
+        tuple: (키, 패킷 방향이 키의 첫 번째 엔드포인트에서 출발했는지 여부)
+    """
+    src = (ip_to_int(src_ip) if src_ip else -1, src_port or 0)
+    dst = (ip_to_int(dst_ip) if dst_ip else -1, dst_port or 0)
+    number = PROTOCOL_NUMBERS.get(protocol, 0)
+    if src <= dst:
+        return (number, src[0], src[1], dst[0], dst[1]), True
+    return (number, dst[0], dst[1], src[0], src[1]), False
+
+
+class FlowEntry:
+    """플로우 테이블 항목"""
+
+    __slots__ = (
+        "key",
+        "src_ip",
+        "src_port",
+        "dst_ip",
+        "dst_port",
+        "protocol",
+        "initiator_first",
+        "state",
+        "packets",
+        "bytes",
+        "start_time",
+        "first_seen",
+        "last_seen",
+        "closed_at",
+    )
+
+    def __init__(self, key, src_ip, src_port, dst_ip, dst_port, protocol, initiator_first, start_time, now):
+        self.key = key
+        self.src_ip = src_ip
+        self.src_port = src_port
+        self.dst_ip = dst_ip
+        self.dst_port = dst_port
+        self.protocol = protocol
+        self.initiator_first = initiator_first
+        self.state = "UNKNOWN"
+        self.packets = 0
+        self.bytes = 0
+        self.start_time = start_time
+        self.first_seen = now
+        self.last_seen = now
+        self.closed_at = None
+
+    def to_record(self, reason: str) -> Dict[str, Any]:
+        """내보내기용 플로우 레코드"""
+        return {
+            "src_ip": self.src_ip,
+            "src_port": self.src_port,
+            "dst_ip": self.dst_ip,
+            "dst_port": self.dst_port,
+            "protocol": self.protocol,
+            "state": self.state,
+            "packets": self.packets,
+            "bytes": self.bytes,
+            "start_time": self.start_time,
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+            "duration": self.last_seen - self.first_seen,
+            "reason": reason,
+        }
+
+
+class FlowTable:
+    """용량 제한과 만료 정책을 가진 플로우 테이블"""
+
+    def __init__(
+        self,
+        max_flows: int = DEFAULT_MAX_FLOWS,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        close_linger: float = DEFAULT_CLOSE_LINGER,
+        export_buffer: int = DEFAULT_EXPORT_BUFFER,
+        on_expire: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        """
+        플로우 테이블 초기화
+
+        Args:
+            max_flows: 최대 플로우 수 (초과 시 가장 오래 사용되지 않은 플로우 제거)
+            idle_timeout: 유휴 플로우 만료 시간(초)
+            close_linger: FIN/RST로 종료된 플로우를 유지하는 시간(초)
+            export_buffer: 보관할 만료 플로우 레코드 수
+            on_expire: 플로우 만료 시 호출할 콜백 (플로우 레코드 전달)
+        """
+        self.max_flows = max(1, max_flows)
+        self.idle_timeout = idle_timeout
+        self.close_linger = close_linger
+        self.on_expire = on_expire
+        self.expired_flows = deque(maxlen=export_buffer)
+        self._flows: "OrderedDict[Tuple[int, ...], FlowEntry]" = OrderedDict()
+        self._closing = deque()  # (종료 시각, 키)
+        self.counters = {"created": 0, "peak": 0, **{f"evicted_{reason}": 0 for reason in EVICTION_REASONS}}
+
+    def __len__(self) -> int:
+        return len(self._flows)
+
+    def __contains__(self, key) -> bool:
+        return key in self._flows
+
+    def get(self, key) -> Optional[FlowEntry]:
+        return self._flows.get(key)
+
+    def entries(self) -> Iterator[FlowEntry]:
+        """활성 플로우 항목 (오래 사용되지 않은 순)"""
+        return iter(self._flows.values())
+
+    def touch(self, packet_info: Dict[str, Any], src_port: int, dst_port: int) -> Tuple[FlowEntry, str]:
+        """
+        패킷으로 플로우를 조회/생성하고 최근 사용 위치로 이동
+
+        Args:
+            packet_info: 패킷 기본 정보 (src_ip, dst_ip, protocol, timestamp)
+            src_port: 출발지 포트
+            dst_port: 목적지 포트
+
+        Returns:
+            tuple: (플로우 항목, "forward" 또는 "reverse")
+        """
+        src_ip = packet_info.get("src_ip")
+        dst_ip = packet_info.get("dst_ip")
+        protocol = packet_info.get("protocol", "TCP")
+        timestamp = packet_info.get("timestamp")
+        now = timestamp_seconds(timestamp)
+
+        self.expire(now)
+
+        key, src_first = flow_key(protocol, src_ip, src_port, dst_ip, dst_port)
+        entry = self._flows.get(key)
+        if entry is None:
+            entry = FlowEntry(key, src_ip, src_port, dst_ip, dst_port, protocol, src_first, timestamp, now)
+            self._flows[key] = entry
+            self.counters["created"] += 1
+            if len(self._flows) > self.max_flows:
+                self._evict(next(iter(self._flows)), "capacity")
+            self.counters["peak"] = max(self.counters["peak"], len(self._flows))
+        else:
+            self._flows.move_to_end(key)
+
+        entry.last_seen = max(entry.last_seen, now)
+        return entry, "forward" if src_first == entry.initiator_first else "reverse"
+
+    def mark_closed(self, entry: FlowEntry) -> None:
+        """FIN/RST로 종료된 플로우 표시 (close_linger 이후 제거)"""
+        if entry.closed_at is None:
+            entry.closed_at = entry.last_seen
+            self._closing.append((entry.closed_at, entry.key))
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """
+        유휴/종료 플로우 만료 처리
+
+        Args:
+            now: 기준 시각(epoch 초), 없으면 현재 시각
+
+        Returns:
+            int: 만료된 플로우 수
+        """
+        now = time.time() if now is None else now
+        expired = 0
+
+        # 종료된 플로우: 종료 후 추가 패킷이 없으면 linger 이후 제거
+        while self._closing and now - self._closing[0][0] >= self.close_linger:
+            _, key = self._closing.popleft()
+            entry = self._flows.get(key)
+            if entry is None or entry.closed_at is None:
+                continue
+            if now - entry.last_seen >= self.close_linger:
+                self._evict(key, "closed")
+                expired += 1
+            else:
+                self._closing.append((entry.last_seen, key))
+
+        # 유휴 플로우: LRU 순서이므로 앞쪽부터 확인
+        while self._flows:
+            key, entry = next(iter(self._flows.items()))
+            if now - entry.last_seen < self.idle_timeout:
+                break
+            self._evict(key, "idle")
+            expired += 1
+
+        return expired
+
+    def _evict(self, key, reason: str) -> None:
+        entry = self._flows.pop(key)
+        self.counters[f"evicted_{reason}"] += 1
+        record = entry.to_record(reason)
+        self.expired_flows.append(record)
+        if self.on_expire:
+            self.on_expire(record)
+
+    def drain_expired(self) -> List[Dict[str, Any]]:
+        """보관 중인 만료 플로우 레코드를 반환하고 비움"""
+        records = list(self.expired_flows)
+        self.expired_flows.clear()
+        return records
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """플로우 테이블 통계"""
+        return {"active_flows": len(self._flows), "max_flows": self.max_flows, **self.counters}
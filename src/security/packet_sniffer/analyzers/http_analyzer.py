@@ -5,13 +5,17 @@ HTTP 분석기 - HTTP/HTTPS 프로토콜 전용 분석
 
 import json
 import re
+from collections import Counter
 from typing import Any, Dict, List, Optional
 from urllib.parse import parse_qs, urlparse
 
 from security.packet_sniffer.base_sniffer import PacketInfo
+from security.packet_sniffer.signature_engine import Signature, get_signature_engine
 
 from .protocol_analyzer import BaseProtocolAnalyzer, ProtocolAnalysisResult
 
+SENSITIVE_DATA_SIGNATURE_SET = "http_sensitive_data"
+
 
 class HttpAnalyzer(BaseProtocolAnalyzer):
     """HTTP/HTTPS 프로토콜 분석기"""
@@ -60,6 +64,16 @@ class HttpAnalyzer(BaseProtocolAnalyzer):
             "password": r'(?i)(password|passwd|pwd)\s*[:=]\s*["\']?([^"\'\s]+)["\']?',
         }
 
+        # 민감한 정보 패턴은 유형별 교대식으로 컴파일하여 본문을 한 번에 검사
+        self.signature_engine = get_signature_engine()
+        self.signature_engine.register(
+            SENSITIVE_DATA_SIGNATURE_SET,
+            [
+                Signature(data_type, data_type, pattern, regex=True)
+                for data_type, pattern in self.sensitive_patterns.items()
+            ],
+        )
+
     def can_analyze(self, packet: PacketInfo) -> bool:
         """HTTP 패킷 분석 가능 여부 확인"""
         # HTTP 기본 포트 확인
@@ -481,14 +495,17 @@ class HttpAnalyzer(BaseProtocolAnalyzer):
 
     def _detect_sensitive_data(self, content: str) -> List[str]:
         """민감한 데이터 탐지"""
-        detected = []
-
-        for data_type, pattern in self.sensitive_patterns.items():
-            matches = re.findall(pattern, content)
-            if matches:
-                detected.append(f"{data_type}: {len(matches)} occurrences")
-
-        return detected
+        # 핫 리로드로 추가된 유형도 보고하도록 현재 로드된 집합의 카테고리 기준으로 집계
+        signature_set = self.signature_engine.get(SENSITIVE_DATA_SIGNATURE_SET)
+        if signature_set is None:
+            return []
+        counts = Counter(hit.category for hit in signature_set.scan(content))
+
+        return [
+            f"{data_type}: {counts[data_type]} occurrences"
+            for data_type in signature_set.categories
+            if counts[data_type]
+        ]
 
     def _is_error_page(self, content: str) -> bool:
         """에러 페이지 탐지"""
@@ -4,6 +4,7 @@
 기본 네트워크 프로토콜 분석 및 네트워크 상태 감지
 """
 
+import heapq
 import logging
 import socket
 import struct
@@ -11,6 +12,8 @@ from collections import defaultdict
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+from .flow_table import DEFAULT_CLOSE_LINGER, DEFAULT_IDLE_TIMEOUT, DEFAULT_MAX_FLOWS, FlowTable
+
 logger = logging.getLogger(__name__)
 
 
@@ -89,9 +92,25 @@ class NetworkAnalyzer:
         27017: "MONGODB",
     }
 
-    def __init__(self):
-        self.connections = defaultdict(dict)  # TCP 연결 추적
-        self.flow_stats = defaultdict(lambda: {"packets": 0, "bytes": 0})  # 플로우 통계
+    # 종료된 것으로 보는 TCP 상태 (close_linger 이후 플로우 테이블에서 제거)
+    CLOSED_TCP_STATES = ("FIN_WAIT", "CLOSE_WAIT", "RESET")
+
+    def __init__(
+        self,
+        max_flows: int = DEFAULT_MAX_FLOWS,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        close_linger: float = DEFAULT_CLOSE_LINGER,
+        on_flow_expire=None,
+    ):
+        # TCP 연결 추적 (용량 제한 및 유휴/종료 만료)
+        self.connections = FlowTable(
+            max_flows=max_flows,
+            idle_timeout=idle_timeout,
+            close_linger=close_linger,
+            on_expire=on_flow_expire,
+        )
+        # 전체 프로토콜 플로우 통계 (연결 추적과 같은 용량/유휴 만료 적용)
+        self.flows = FlowTable(max_flows=max_flows, idle_timeout=idle_timeout, close_linger=close_linger)
         self.port_stats = defaultdict(int)  # 포트 사용 통계
 
     def analyze(self, packet_data: bytes, packet_info: Dict[str, Any]) -> Dict[str, Any]:
@@ -461,63 +480,41 @@ class NetworkAnalyzer:
     def _track_tcp_connection(self, tcp_info: Dict[str, Any], packet_info: Dict[str, Any]) -> Dict[str, Any]:
         """TCP 연결 상태 추적"""
         try:
-            src_ip = packet_info.get("src_ip")
-            dst_ip = packet_info.get("dst_ip")
-            src_port = tcp_info["src_port"]
-            dst_port = tcp_info["dst_port"]
-
-            # 연결 키 생성 (양방향)
-            conn_key1 = f"{src_ip}:{src_port}-{dst_ip}:{dst_port}"
-            conn_key2 = f"{dst_ip}:{dst_port}-{src_ip}:{src_port}"
-
-            connection = None
-            if conn_key1 in self.connections:
-                connection = self.connections[conn_key1]
-                direction = "forward"
-            elif conn_key2 in self.connections:
-                connection = self.connections[conn_key2]
-                direction = "reverse"
-            else:
-                connection = {
-                    "state": "UNKNOWN",
-                    "seq_next": {},
-                    "packets": 0,
-                    "bytes": 0,
-                    "start_time": packet_info.get("timestamp"),
-                }
-                self.connections[conn_key1] = connection
-                direction = "forward"
+            connection, direction = self.connections.touch(packet_info, tcp_info["src_port"], tcp_info["dst_port"])
 
             # 패킷 수 및 바이트 수 업데이트
-            connection["packets"] += 1
-            connection["bytes"] += tcp_info.get("payload_size", 0)
+            connection.packets += 1
+            connection.bytes += tcp_info.get("payload_size", 0)
 
             # TCP 상태 머신 업데이트
             flags = tcp_info["flags"]
 
             if "SYN" in flags and "ACK" not in flags:
-                connection["state"] = "SYN_SENT"
+                connection.state = "SYN_SENT"
             elif "SYN" in flags and "ACK" in flags:
-                connection["state"] = "SYN_RECEIVED"
-            elif "ACK" in flags and connection["state"] in [
+                connection.state = "SYN_RECEIVED"
+            elif "ACK" in flags and connection.state in [
                 "SYN_SENT",
                 "SYN_RECEIVED",
             ]:
-                connection["state"] = "ESTABLISHED"
+                connection.state = "ESTABLISHED"
             elif "FIN" in flags:
-                if connection["state"] == "ESTABLISHED":
-                    connection["state"] = "FIN_WAIT"
-                elif connection["state"] == "FIN_WAIT":
-                    connection["state"] = "CLOSE_WAIT"
+                if connection.state == "ESTABLISHED":
+                    connection.state = "FIN_WAIT"
+                elif connection.state == "FIN_WAIT":
+                    connection.state = "CLOSE_WAIT"
             elif "RST" in flags:
-                connection["state"] = "RESET"
+                connection.state = "RESET"
+
+            if connection.state in self.CLOSED_TCP_STATES:
+                self.connections.mark_closed(connection)
 
             return {
-                "state": connection["state"],
+                "state": connection.state,
                 "direction": direction,
-                "packets": connection["packets"],
-                "bytes": connection["bytes"],
-                "duration": self._calculate_duration(connection["start_time"], packet_info.get("timestamp")),
+                "packets": connection.packets,
+                "bytes": connection.bytes,
+                "duration": connection.last_seen - connection.first_seen,
             }
 
         except Exception as e:
@@ -651,14 +648,13 @@ class NetworkAnalyzer:
     def _update_statistics(self, packet_info: Dict[str, Any], packet_size: int):
         """통계 업데이트"""
         try:
-            protocol = packet_info.get("protocol", "unknown")
             src_port = packet_info.get("src_port")
             dst_port = packet_info.get("dst_port")
 
-            # 프로토콜별 통계
-            flow_key = f"{packet_info.get('src_ip')}:{src_port}-{packet_info.get('dst_ip')}:{dst_port}/{protocol}"
-            self.flow_stats[flow_key]["packets"] += 1
-            self.flow_stats[flow_key]["bytes"] += packet_size
+            # 플로우별 통계
+            flow, _ = self.flows.touch(packet_info, src_port, dst_port)
+            flow.packets += 1
+            flow.bytes += packet_size
 
             # 포트별 통계
             if src_port:
@@ -673,11 +669,7 @@ class NetworkAnalyzer:
         """현재 통계 반환"""
         try:
             # 상위 플로우
-            top_flows = sorted(
-                [(k, v) for k, v in self.flow_stats.items()],
-                key=lambda x: x[1]["bytes"],
-                reverse=True,
-            )[:10]
+            top_flows = heapq.nlargest(10, self.flows.entries(), key=lambda flow: flow.bytes)
 
             # 상위 포트
             top_ports = sorted(
@@ -687,13 +679,14 @@ class NetworkAnalyzer:
             )[:10]
 
             return {
-                "total_flows": len(self.flow_stats),
+                "total_flows": len(self.flows),
                 "total_connections": len(self.connections),
+                "flow_table": self.connections.get_statistics(),
                 "top_flows": [
                     {
-                        "flow": f[0],
-                        "packets": f[1]["packets"],
-                        "bytes": f[1]["bytes"],
+                        "flow": f"{f.src_ip}:{f.src_port}-{f.dst_ip}:{f.dst_port}/{f.protocol}",
+                        "packets": f.packets,
+                        "bytes": f.bytes,
                     }
                     for f in top_flows
                 ],
@@ -927,19 +920,22 @@ class NetworkAnalyzer:
 
         return anomalies
 
-    def _calculate_duration(self, start_time: str, current_time: str) -> float:
-        """연결 지속 시간 계산"""
-        try:
-            if not start_time or not current_time:
-                return 0.0
+    def expire_flows(self, now: Optional[float] = None) -> int:
+        """
+        유휴/종료된 TCP 플로우 만료 처리 (패킷이 없는 동안 주기적으로 호출)
 
-            start = datetime.fromisoformat(start_time.replace("Z", "+00:00"))
-            current = datetime.fromisoformat(current_time.replace("Z", "+00:00"))
+        Args:
+            now: 기준 시각(epoch 초), 없으면 현재 시각
 
-            return (current - start).total_seconds()
+        Returns:
+            int: 만료된 TCP 연결 수
+        """
+        self.flows.expire(now)
+        return self.connections.expire(now)
 
-        except Exception:
-            return 0.0
+    def export_expired_flows(self) -> List[Dict[str, Any]]:
+        """만료된 플로우 레코드를 반환하고 버퍼를 비움"""
+        return self.connections.drain_expired()
 
 
 # 팩토리 함수
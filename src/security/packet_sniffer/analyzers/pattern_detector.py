@@ -2,12 +2,17 @@
 """
 패킷 패턴 탐지기
 주기적, 버스트, 스캔, 표적화, 비정상 패턴 등 다양한 네트워크 패턴 식별
+
+detect_patterns는 패킷 목록 전체를 한 번에 분석하고, push는 패킷을 하나씩 받아
+슬라이딩 윈도우 상태(PatternStream)를 갱신하며 임계값을 넘는 순간 탐지 결과를 반환합니다.
 """
 
 import logging
 from collections import defaultdict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
+
+from .pattern_stream import DEFAULT_MAX_KEYS, DEFAULT_WINDOW_SECONDS, PatternStream
 
 logger = logging.getLogger(__name__)
 
@@ -15,9 +20,13 @@ logger = logging.getLogger(__name__)
 class PatternDetector:
     """패킷 패턴 탐지 엔진"""
 
-    def __init__(self):
+    def __init__(self, window_seconds: float = DEFAULT_WINDOW_SECONDS, max_keys: int = DEFAULT_MAX_KEYS):
         """
         패턴 탐지기 초기화
+
+        Args:
+            window_seconds: 스트리밍 모드의 표적화/큰 패킷 탐지 윈도우 (초)
+            max_keys: 스트리밍 모드에서 테이블별로 추적할 최대 키 수
         """
         self.statistics = {
             "patterns_detected": 0,
@@ -37,12 +46,19 @@ class PatternDetector:
             "burst_min_packets": 5,  # 버스트 최소 패킷 수
             "scan_min_ports": 5,  # 포트 스캔 최소 포트 수
             "scan_max_duration": 10.0,  # 포트 스캔 최대 지속 시간
+            "host_scan_min_hosts": 5,  # 호스트 스캔 최소 호스트 수
+            "host_scan_max_duration": 30.0,  # 호스트 스캔 최대 지속 시간
             "targeted_packet_ratio": 0.3,  # 표적화 통신 패킷 비율
             "targeted_min_sources": 2,  # 표적화 통신 최소 발신지 수
             "targeted_min_protocols": 2,  # 표적화 통신 최소 프로토콜 수
             "large_packet_threshold": 1500,  # 큰 패킷 임계값
         }
 
+        # 스트리밍 모드 상태 (push 첫 호출 시 생성)
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self._stream: Optional[PatternStream] = None
+
     def detect_patterns(self, packets: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         패킷에서 다양한 패턴 탐지
@@ -66,8 +82,12 @@ class PatternDetector:
                 "targeted": [],  # 표적화된 통신 패턴
             }
 
-            # 시간순 정렬
-            sorted_packets = sorted(packets, key=lambda x: x.get("timestamp", 0))
+            # 시간순 정렬 (이미 정렬된 입력은 그대로 사용)
+            timestamps = [packet.get("timestamp", 0) for packet in packets]
+            if all(a <= b for a, b in zip(timestamps, timestamps[1:])):
+                sorted_packets = packets
+            else:
+                sorted_packets = sorted(packets, key=lambda x: x.get("timestamp", 0))
 
             # 각종 패턴 탐지 수행
             patterns["periodic"] = self._detect_periodic_patterns(sorted_packets)
@@ -401,7 +421,10 @@ class PatternDetector:
                 duration = scan["end_time"] - scan["start_time"]
 
                 # 다수의 목적지 호스트를 짧은 시간에 스캔하는 경우
-                if host_count >= 5 and duration <= 30.0:  # 30초 내 5개 이상 호스트
+                if (
+                    host_count >= self.thresholds["host_scan_min_hosts"]
+                    and duration <= self.thresholds["host_scan_max_duration"]
+                ):
                     detected_scans.append(
                         {
                             "type": "host_scan",
@@ -654,6 +677,50 @@ class PatternDetector:
 
         return None
 
+    def push(self, packet: Any) -> List[Dict[str, Any]]:
+        """
+        스트리밍 모드로 패킷 하나 반영
+
+        패킷 순서대로 호출하며, CaptureSession.add_callback(detector.push)처럼 캡처 콜백으로 연결할 수 있습니다.
+
+        Args:
+            packet: 패킷 dict, PacketInfo 또는 PacketView
+
+        Returns:
+            list: 이 패킷으로 임계값을 넘은 탐지 결과 (category: periodic/burst/scan/targeted/unusual)
+        """
+        try:
+            if self._stream is None:
+                self._stream = PatternStream(self.thresholds, self.window_seconds, max_keys=self.max_keys)
+            detections = self._stream.push(packet)
+        except Exception as e:
+            logger.error(f"스트리밍 패턴 탐지 오류: {e}")
+            return []
+
+        for detection in detections:
+            self.statistics[f"{detection['category']}_patterns"] += 1
+        if detections:
+            self.statistics["patterns_detected"] += len(detections)
+            self.statistics["last_analysis"] = datetime.now().isoformat()
+        return detections
+
+    def push_many(self, packets: Iterable[Any]) -> List[Dict[str, Any]]:
+        """스트리밍 모드로 여러 패킷 반영 (탐지 결과를 발생 순서대로 반환)"""
+        detections = []
+        for packet in packets:
+            detections.extend(self.push(packet))
+        return detections
+
+    def get_stream_statistics(self) -> Dict[str, Any]:
+        """스트리밍 모드 상태 통계"""
+        if self._stream is None:
+            return {"packets_processed": 0, "detections": 0}
+        return self._stream.get_statistics()
+
+    def reset_stream(self) -> None:
+        """스트리밍 모드 상태 초기화"""
+        self._stream = None
+
     def _update_statistics(self, patterns: Dict[str, List]):
         """통계 정보 업데이트"""
         try:
@@ -0,0 +1,724 @@
+#!/usr/bin/env python3
+"""
+스트리밍 패턴 탐지 - 패킷을 하나씩 받아 슬라이딩 윈도우 구조를 갱신하고
+임계값을 넘는 순간 탐지 결과를 내보냄
+
+- 출발지별 고유 포트/호스트 수: 슬롯 링 + 고유값 스케치 (작을 때는 정확한 해시 집합,
+  sparse_limit을 넘으면 HyperLogLog로 전환)
+- 주기성: 그룹별 최근 N개 도착 간격의 로그 히스토그램과 평균/분산
+- 버스트: 엔드포인트 쌍별 최근 burst_min_packets개 타임스탬프
+
+모든 키 테이블은 max_keys를 넘으면 가장 오래 갱신되지 않은 키부터 제거하므로 메모리는
+윈도우 크기와 키 수 상한으로 제한됩니다.
+"""
+
+import hashlib
+import math
+from array import array
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Set, Tuple
+
+DEFAULT_WINDOW_SECONDS = 60.0
+DEFAULT_SLOTS = 10
+DEFAULT_MAX_KEYS = 10000
+DEFAULT_HLL_PRECISION = 10
+DEFAULT_SPARSE_LIMIT = 64
+DEFAULT_PERIODIC_WINDOW = 64
+HISTOGRAM_BUCKETS = 32  # 도착 간격 log2(ms) 버킷
+TIME_GAP_MIN_PACKETS = 10
+TIME_GAP_SMOOTHING = 0.1
+STABLE_HASH_CACHE_SIZE = 65536
+
+COMMON_PROTOCOLS = frozenset({"TCP", "UDP", "ICMP", "DNS", "HTTP", "HTTPS", "ARP"})
+
+# 탐지 유형 -> 통계 분류
+CATEGORIES = {
+    "port_scan": "scan",
+    "host_scan": "scan",
+    "burst": "burst",
+    "periodic": "periodic",
+    "targeted_communication": "targeted",
+    "unusual_protocols": "unusual",
+    "large_packets": "unusual",
+    "flag_anomalies": "unusual",
+    "time_anomalies": "unusual",
+}
+
+
+@lru_cache(maxsize=STABLE_HASH_CACHE_SIZE)
+def stable_hash(value: Any) -> int:
+    """프로세스 간 동일한 64비트 해시 (포트/IP처럼 반복되는 값은 캐시)"""
+    return int.from_bytes(hashlib.blake2b(repr(value).encode(), digest_size=8).digest(), "little")
+
+
+class HyperLogLog:
+    """HyperLogLog 고유값 수 추정 (표준 오차 약 1.04/sqrt(2^precision))"""
+
+    __slots__ = ("precision", "registers", "_inverse_sum", "_zeros")
+
+    def __init__(self, precision: int = DEFAULT_HLL_PRECISION):
+        if not 4 <= precision <= 16:
+            raise ValueError(f"precision은 4~16 사이여야 합니다: {precision}")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+        # 추정식의 sum(2^-rank)와 0 레지스터 수를 증분으로 유지하여 count()는 O(1)
+        self._inverse_sum = float(len(self.registers))
+        self._zeros = len(self.registers)
+
+    @classmethod
+    def union(cls, sketches: List["HyperLogLog"], precision: int = DEFAULT_HLL_PRECISION) -> "HyperLogLog":
+        """여러 스케치의 합집합 스케치"""
+        merged = cls(precision)
+        if len(sketches) == 1:
+            merged.registers = bytearray(sketches[0].registers)
+        elif sketches:
+            merged.registers = bytearray(map(max, *(sketch.registers for sketch in sketches)))
+        merged._recompute()
+        return merged
+
+    def _recompute(self) -> None:
+        rank_counts = [self.registers.count(rank) for rank in range(max(self.registers) + 1)]
+        self._inverse_sum = sum(count * 2.0**-rank for rank, count in enumerate(rank_counts) if count)
+        self._zeros = rank_counts[0]
+
+    def add_hash(self, value_hash: int) -> bool:
+        """64비트 해시 추가 (레지스터가 바뀌면 True)"""
+        width = 64 - self.precision
+        index = value_hash >> width
+        rank = width - (value_hash & ((1 << width) - 1)).bit_length() + 1
+        previous = self.registers[index]
+        if rank > previous:
+            self.registers[index] = rank
+            self._inverse_sum += 2.0**-rank - 2.0**-previous
+            if not previous:
+                self._zeros -= 1
+            return True
+        return False
+
+    def merge(self, other: "HyperLogLog") -> None:
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        self._recompute()
+
+    def count(self) -> float:
+        m = len(self.registers)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        estimate = alpha * m * m / self._inverse_sum
+        if estimate <= 2.5 * m and self._zeros:
+            estimate = m * math.log(m / self._zeros)  # 작은 값 구간은 선형 계수
+        return estimate
+
+
+class DistinctSketch:
+    """고유값 스케치 - sparse_limit까지는 정확한 해시 집합, 넘으면 HyperLogLog"""
+
+    __slots__ = ("hashes", "hll", "precision", "sparse_limit")
+
+    def __init__(self, precision: int = DEFAULT_HLL_PRECISION, sparse_limit: int = DEFAULT_SPARSE_LIMIT):
+        self.hashes: Optional[Set[int]] = set()
+        self.hll: Optional[HyperLogLog] = None
+        self.precision = precision
+        self.sparse_limit = sparse_limit
+
+    def add_hash(self, value_hash: int) -> bool:
+        """해시 추가 (추정값이 늘 수 있으면 True)"""
+        if self.hll is not None:
+            return self.hll.add_hash(value_hash)
+        if value_hash in self.hashes:
+            return False
+        self.hashes.add(value_hash)
+        if len(self.hashes) > self.sparse_limit:
+            self.hll = HyperLogLog(self.precision)
+            for known in self.hashes:
+                self.hll.add_hash(known)
+            self.hashes = None
+        return True
+
+    def count(self) -> int:
+        return len(self.hashes) if self.hll is None else round(self.hll.count())
+
+
+class SlidingDistinct:
+    """
+    슬라이딩 윈도우 고유값 수 (윈도우를 slots개 슬롯으로 나눈 링)
+
+    윈도우 전체의 합집합을 증분으로 유지합니다. 고유값이 sparse_limit 이하이면 슬롯별 해시 집합과
+    해시별 포함 슬롯 수를, 넘으면 슬롯별 HyperLogLog와 병합 스케치를 유지하며 병합 스케치는 슬롯이
+    만료될 때만 다시 만듭니다. 따라서 add/count는 패킷당 O(1)입니다.
+    """
+
+    __slots__ = ("slot_width", "slots", "buckets", "precision", "sparse_limit", "counts", "merged")
+
+    def __init__(
+        self,
+        window_seconds: float,
+        slots: int = DEFAULT_SLOTS,
+        precision: int = DEFAULT_HLL_PRECISION,
+        sparse_limit: int = DEFAULT_SPARSE_LIMIT,
+    ):
+        self.slot_width = window_seconds / slots
+        self.slots = slots
+        self.buckets: Deque[Tuple[int, Any]] = deque()  # (슬롯, 해시 집합 또는 HyperLogLog)
+        self.precision = precision
+        self.sparse_limit = sparse_limit
+        self.counts: Optional[Dict[int, int]] = {}  # 정확 모드: 해시 -> 포함 슬롯 수
+        self.merged: Optional[HyperLogLog] = None  # 근사 모드: 윈도우 합집합
+
+    def expire(self, timestamp: float) -> None:
+        """윈도우 밖 슬롯 제거"""
+        oldest = int(timestamp // self.slot_width) - self.slots + 1
+        if not self.buckets or self.buckets[0][0] >= oldest:
+            return
+        while self.buckets and self.buckets[0][0] < oldest:
+            _, expired = self.buckets.popleft()
+            if self.merged is None:
+                for value_hash in expired:
+                    remaining = self.counts[value_hash] - 1
+                    if remaining:
+                        self.counts[value_hash] = remaining
+                    else:
+                        del self.counts[value_hash]
+        if self.merged is not None:
+            if self.buckets:
+                self.merged = HyperLogLog.union([sketch for _, sketch in self.buckets], self.precision)
+            else:
+                self.counts, self.merged = {}, None  # 윈도우가 비면 정확 모드로 복귀
+
+    def add(self, value_hash: int, timestamp: float) -> bool:
+        """값 추가 (고유값 수가 늘 수 있으면 True, 늦게 도착한 패킷은 최신 슬롯에 기록)"""
+        self.expire(timestamp)
+        slot = int(timestamp // self.slot_width)
+        if not self.buckets or self.buckets[-1][0] < slot:
+            self.buckets.append((slot, set() if self.merged is None else HyperLogLog(self.precision)))
+        current = self.buckets[-1][1]
+
+        if self.merged is not None:
+            current.add_hash(value_hash)
+            return self.merged.add_hash(value_hash)
+
+        if value_hash in current:
+            return False
+        current.add(value_hash)
+        previous = self.counts.get(value_hash, 0)
+        self.counts[value_hash] = previous + 1
+        if previous:
+            return False
+        if len(self.counts) > self.sparse_limit:
+            self._to_sketches()
+        return True
+
+    def _to_sketches(self) -> None:
+        """정확 모드에서 HyperLogLog 모드로 전환"""
+        buckets: Deque[Tuple[int, Any]] = deque()
+        for slot, hashes in self.buckets:
+            sketch = HyperLogLog(self.precision)
+            for value_hash in hashes:
+                sketch.add_hash(value_hash)
+            buckets.append((slot, sketch))
+        self.buckets = buckets
+        self.merged = HyperLogLog.union([sketch for _, sketch in buckets], self.precision)
+        self.counts = None
+
+    def count(self) -> int:
+        return len(self.counts) if self.merged is None else round(self.merged.count())
+
+
+class SlidingCounter:
+    """슬라이딩 윈도우 카운터 (슬롯 링)"""
+
+    __slots__ = ("slot_width", "slots", "buckets", "total")
+
+    def __init__(self, window_seconds: float, slots: int = DEFAULT_SLOTS):
+        self.slot_width = window_seconds / slots
+        self.slots = slots
+        self.buckets: Deque[List[int]] = deque()
+        self.total = 0
+
+    def expire(self, timestamp: float) -> None:
+        oldest = int(timestamp // self.slot_width) - self.slots + 1
+        while self.buckets and self.buckets[0][0] < oldest:
+            self.total -= self.buckets.popleft()[1]
+
+    def add(self, timestamp: float, amount: int = 1) -> int:
+        """값 추가 후 윈도우 합계 반환"""
+        self.expire(timestamp)
+        slot = int(timestamp // self.slot_width)
+        if not self.buckets or self.buckets[-1][0] < slot:
+            self.buckets.append([slot, 0])
+        self.buckets[-1][1] += amount
+        self.total += amount
+        return self.total
+
+
+class IntervalHistogram:
+    """최근 N개 도착 간격의 평균/분산과 log2(ms) 히스토그램"""
+
+    __slots__ = ("intervals", "size", "total", "total_squares", "buckets", "last_timestamp", "packet_count")
+
+    def __init__(self, size: int = DEFAULT_PERIODIC_WINDOW):
+        self.intervals: Deque[float] = deque()
+        self.size = size
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.buckets = array("I", [0]) * HISTOGRAM_BUCKETS
+        self.last_timestamp: Optional[float] = None
+        self.packet_count = 0
+
+    @staticmethod
+    def _bucket(interval: float) -> int:
+        return min(HISTOGRAM_BUCKETS - 1, max(0, math.frexp(interval * 1000.0)[1]))
+
+    def add(self, timestamp: float) -> None:
+        self.packet_count += 1
+        if self.last_timestamp is not None:
+            interval = max(0.0, timestamp - self.last_timestamp)
+            if len(self.intervals) == self.size:
+                dropped = self.intervals.popleft()
+                self.total -= dropped
+                self.total_squares -= dropped * dropped
+                self.buckets[self._bucket(dropped)] -= 1
+            self.intervals.append(interval)
+            self.total += interval
+            self.total_squares += interval * interval
+            self.buckets[self._bucket(interval)] += 1
+        self.last_timestamp = timestamp
+
+    @property
+    def mean(self) -> float:
+        return self.total / len(self.intervals) if self.intervals else 0.0
+
+    def variation(self) -> float:
+        """변동 계수 (표준편차 / 평균)"""
+        mean = self.mean
+        if mean <= 0:
+            return float("inf")
+        variance = max(0.0, self.total_squares / len(self.intervals) - mean * mean)
+        return math.sqrt(variance) / mean
+
+    def histogram(self) -> Dict[str, int]:
+        """비어 있지 않은 버킷 ({상한(ms)}ms -> 간격 수)"""
+        return {f"<{2 ** i}ms": count for i, count in enumerate(self.buckets) if count}
+
+
+def _packet_fields(packet: Any) -> Tuple[float, str, str, Any, str, int, List[str]]:
+    """패킷 dict/PacketInfo/PacketView에서 탐지에 쓰는 필드 추출 (플래그는 이름 목록으로)"""
+    if isinstance(packet, Mapping):
+        get = packet.get
+    else:
+
+        def get(name: str, default: Any = None) -> Any:
+            return getattr(packet, name, default)
+
+    flags = get("flags", []) or []
+    if isinstance(flags, Mapping):
+        flags = [name for name, enabled in flags.items() if enabled]
+    elif not isinstance(flags, list):
+        flags = list(flags) if isinstance(flags, (tuple, set)) else []
+    return (
+        get("timestamp", 0) or 0,
+        get("src_ip", "") or "",
+        get("dst_ip", "") or "",
+        get("dst_port"),
+        get("protocol", "Unknown") or "Unknown",
+        get("length", 0) or get("size", 0) or 0,
+        flags,
+    )
+
+
+class PatternStream:
+    """온라인 패턴 탐지 상태"""
+
+    def __init__(
+        self,
+        thresholds: Dict[str, Any],
+        window_seconds: float = DEFAULT_WINDOW_SECONDS,
+        slots: int = DEFAULT_SLOTS,
+        max_keys: int = DEFAULT_MAX_KEYS,
+        periodic_window: int = DEFAULT_PERIODIC_WINDOW,
+        hll_precision: int = DEFAULT_HLL_PRECISION,
+        sparse_limit: int = DEFAULT_SPARSE_LIMIT,
+    ):
+        """
+        스트리밍 탐지 상태 초기화
+
+        Args:
+            thresholds: PatternDetector 임계값 (같은 dict를 공유하므로 변경 즉시 반영)
+            window_seconds: 표적화/큰 패킷 탐지 윈도우 (초), 스캔 윈도우는 scan_max_duration/host_scan_max_duration
+            slots: 슬라이딩 윈도우 슬롯 수
+            max_keys: 테이블별 최대 추적 키 수 (초과 시 가장 오래된 키 제거)
+            periodic_window: 주기성 판단에 쓰는 최근 도착 간격 수
+            hll_precision: HyperLogLog 정밀도
+            sparse_limit: 정확한 집합으로 유지할 최대 고유값 수
+        """
+        self.thresholds = thresholds
+        self.window_seconds = window_seconds
+        self.slots = slots
+        self.max_keys = max_keys
+        self.periodic_window = periodic_window
+        self.hll_precision = hll_precision
+        self.sparse_limit = sparse_limit
+
+        self.port_scans: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self.host_scans: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self.bursts: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self.periodic: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self.targets: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self.large_senders: "OrderedDict[Hashable, float]" = OrderedDict()
+        self.protocols_reported: "OrderedDict[str, None]" = OrderedDict()
+
+        self.total = SlidingCounter(window_seconds, slots)
+        self.last_timestamp: Optional[float] = None
+        self.mean_gap: Optional[float] = None
+        self.packets_processed = 0
+        self.detections = 0
+        self.evicted_keys = 0
+
+    def _entry(self, table: OrderedDict, key: Hashable, factory: Callable[[], Any]) -> Any:
+        entry = table.get(key)
+        if entry is None:
+            entry = table[key] = factory()
+            if len(table) > self.max_keys:
+                table.popitem(last=False)
+                self.evicted_keys += 1
+        else:
+            table.move_to_end(key)
+        return entry
+
+    def _sliding_distinct(self, window_seconds: float) -> SlidingDistinct:
+        return SlidingDistinct(window_seconds, self.slots, self.hll_precision, self.sparse_limit)
+
+    def push(self, packet: Any) -> List[Dict[str, Any]]:
+        """
+        패킷 하나 반영
+
+        Args:
+            packet: 패킷 dict, PacketInfo 또는 PacketView
+
+        Returns:
+            list: 이 패킷으로 임계값을 넘은 탐지 결과 (각 결과에 category 포함)
+        """
+        timestamp, src_ip, dst_ip, dst_port, protocol, size, flags = _packet_fields(packet)
+        detections: List[Dict[str, Any]] = []
+        self.packets_processed += 1
+
+        self._update_time_gap(timestamp, detections)
+        self.total.add(timestamp)
+        if src_ip and dst_ip:
+            if dst_port is not None:
+                self._update_port_scan(timestamp, src_ip, dst_ip, dst_port, flags, detections)
+            self._update_host_scan(timestamp, src_ip, dst_ip, protocol, detections)
+            self._update_burst(timestamp, src_ip, dst_ip, protocol, detections)
+        if dst_ip:
+            self._update_target(timestamp, src_ip, dst_ip, protocol, size, detections)
+        self._update_periodic(timestamp, src_ip, dst_ip, protocol, detections)
+        self._check_packet(timestamp, src_ip, dst_ip, protocol, size, flags, detections)
+
+        for detection in detections:
+            detection["category"] = CATEGORIES[detection["type"]]
+            detection["detected_at"] = timestamp
+        self.detections += len(detections)
+        return detections
+
+    # 스캔 ----------------------------------------------------------------
+
+    def _update_port_scan(self, timestamp, src_ip, dst_ip, dst_port, flags, detections) -> None:
+        window = self.thresholds["scan_max_duration"]
+        scan = self._entry(
+            self.port_scans,
+            (src_ip, dst_ip),
+            lambda: {"ports": self._sliding_distinct(window), "active": False},
+        )
+        if "start_time" not in scan or timestamp - scan["end_time"] > window:
+            scan.update(start_time=timestamp, packet_count=0, flags=set())  # 유휴 후 새 구간
+        scan["end_time"] = timestamp
+        scan["packet_count"] += 1
+        scan["flags"].update(flags)
+
+        ports = scan["ports"]
+        ports.add(stable_hash(dst_port), timestamp)
+        port_count = ports.count()
+        if port_count < self.thresholds["scan_min_ports"]:
+            scan["active"] = False
+            return
+        if scan["active"]:
+            return
+        scan["active"] = True
+
+        scan_type = "unknown"
+        if "SYN" in scan["flags"] and "ACK" not in scan["flags"]:
+            scan_type = "syn_scan"
+        elif "FIN" in scan["flags"]:
+            scan_type = "fin_scan"
+        elif not scan["flags"]:
+            scan_type = "udp_scan"
+        duration = timestamp - scan["start_time"]
+        detections.append(
+            {
+                "type": "port_scan",
+                "scan_type": scan_type,
+                "src_ip": src_ip,
+                "dst_ip": dst_ip,
+                "port_count": port_count,
+                "packet_count": scan["packet_count"],
+                "duration": duration,
+                "start_time": scan["start_time"],
+                "end_time": timestamp,
+                "scan_rate": port_count / duration if duration > 0 else float("inf"),
+            }
+        )
+
+    def _update_host_scan(self, timestamp, src_ip, dst_ip, protocol, detections) -> None:
+        window = self.thresholds["host_scan_max_duration"]
+        scan = self._entry(
+            self.host_scans,
+            src_ip,
+            lambda: {"hosts": self._sliding_distinct(window), "active": False},
+        )
+        if "start_time" not in scan or timestamp - scan["end_time"] > window:
+            scan.update(start_time=timestamp, packet_count=0, protocols=set())
+        scan["end_time"] = timestamp
+        scan["packet_count"] += 1
+        if len(scan["protocols"]) < 16:
+            scan["protocols"].add(protocol)
+
+        hosts = scan["hosts"]
+        hosts.add(stable_hash(dst_ip), timestamp)
+        host_count = hosts.count()
+        if host_count < self.thresholds["host_scan_min_hosts"]:
+            scan["active"] = False
+            return
+        if scan["active"]:
+            return
+        scan["active"] = True
+
+        duration = timestamp - scan["start_time"]
+        detections.append(
+            {
+                "type": "host_scan",
+                "src_ip": src_ip,
+                "host_count": host_count,
+                "protocols": sorted(scan["protocols"]),
+                "packet_count": scan["packet_count"],
+                "duration": duration,
+                "start_time": scan["start_time"],
+                "end_time": timestamp,
+                "scan_rate": host_count / duration if duration > 0 else float("inf"),
+            }
+        )
+
+    # 버스트 / 주기성 -----------------------------------------------------
+
+    def _update_burst(self, timestamp, src_ip, dst_ip, protocol, detections) -> None:
+        window = self.thresholds["burst_window_seconds"]
+        min_packets = self.thresholds["burst_min_packets"]
+        burst = self._entry(self.bursts, (src_ip, dst_ip), lambda: {"recent": deque(maxlen=min_packets)})
+        if burst["recent"].maxlen != min_packets:
+            burst["recent"] = deque(burst["recent"], maxlen=min_packets)
+        recent = burst["recent"]
+        recent.append((timestamp, protocol))
+
+        # 진행 중인 버스트는 시작 시점부터 윈도우 안에서만 연장 (배치 탐지와 같은 규칙)
+        if burst.get("start_time") is not None and timestamp - burst["start_time"] <= window:
+            burst["packet_count"] += 1
+            return
+        burst["start_time"] = None
+
+        start_time = recent[0][0]
+        if len(recent) < min_packets or timestamp - start_time > window:
+            return
+        burst.update(start_time=start_time, packet_count=min_packets)
+        duration = timestamp - start_time
+        detections.append(
+            {
+                "type": "burst",
+                "start_time": start_time,
+                "end_time": timestamp,
+                "src_ip": src_ip,
+                "dst_ip": dst_ip,
+                "protocols": sorted({proto for _, proto in recent}),
+                "packet_count": min_packets,
+                "duration": duration,
+                "intensity": min_packets / duration if duration > 0 else float("inf"),
+            }
+        )
+
+    def _update_periodic(self, timestamp, src_ip, dst_ip, protocol, detections) -> None:
+        group = self._entry(
+            self.periodic,
+            (protocol, src_ip, dst_ip),
+            lambda: {"intervals": IntervalHistogram(self.periodic_window), "active": False, "first_seen": timestamp},
+        )
+        intervals = group["intervals"]
+        intervals.add(timestamp)
+
+        ratio = self.thresholds["periodic_variance_ratio"]
+        periodic = False
+        if intervals.packet_count >= self.thresholds["periodic_min_packets"] and intervals.mean > 0:
+            # 범위/평균 < ratio 이면 표준편차/평균 < ratio/2 이므로 변동 계수로 먼저 거름
+            if intervals.variation() < ratio / 2:
+                spread = max(intervals.intervals) - min(intervals.intervals)
+                periodic = spread / intervals.mean < ratio
+        if not periodic:
+            group["active"] = False
+            return
+        if group["active"]:
+            return
+        group["active"] = True
+
+        detections.append(
+            {
+                "type": "periodic",
+                "group_key": f"{protocol}_{src_ip}_{dst_ip}",
+                "protocol": protocol,
+                "src_ip": src_ip,
+                "dst_ip": dst_ip,
+                "packet_count": intervals.packet_count,
+                "avg_interval": intervals.mean,
+                "interval_variation": intervals.variation(),
+                "interval_histogram": intervals.histogram(),
+                "duration": timestamp - group["first_seen"],
+                "first_seen": group["first_seen"],
+                "last_seen": timestamp,
+            }
+        )
+
+    # 표적화 / 비정상 ------------------------------------------------------
+
+    def _update_target(self, timestamp, src_ip, dst_ip, protocol, size, detections) -> None:
+        target = self._entry(
+            self.targets,
+            dst_ip,
+            lambda: {
+                "packets": SlidingCounter(self.window_seconds, self.slots),
+                "bytes": SlidingCounter(self.window_seconds, self.slots),
+                "sources": self._sliding_distinct(self.window_seconds),
+                "protocols": self._sliding_distinct(self.window_seconds),
+                "active": False,
+                "start_time": timestamp,
+            },
+        )
+        packet_count = target["packets"].add(timestamp)
+        total_bytes = target["bytes"].add(timestamp, size)
+        target["sources"].add(stable_hash(src_ip), timestamp)
+        target["protocols"].add(stable_hash(protocol), timestamp)
+
+        # 패킷 비율 조건이 맞을 때만 고유값 수를 확인
+        packet_ratio = packet_count / self.total.total if self.total.total else 0.0
+        targeted = packet_ratio > self.thresholds["targeted_packet_ratio"]
+        if targeted:
+            source_count = target["sources"].count()
+            protocol_count = target["protocols"].count()
+            targeted = (
+                source_count >= self.thresholds["targeted_min_sources"]
+                and protocol_count >= self.thresholds["targeted_min_protocols"]
+            )
+        if not targeted:
+            target["active"] = False
+            return
+        if target["active"]:
+            return
+        target["active"] = True
+
+        duration = min(timestamp - target["start_time"], self.window_seconds)
+        detections.append(
+            {
+                "type": "targeted_communication",
+                "dst_ip": dst_ip,
+                "packet_count": packet_count,
+                "packet_ratio": packet_ratio,
+                "source_count": source_count,
+                "protocol_count": protocol_count,
+                "total_bytes": total_bytes,
+                "window_seconds": self.window_seconds,
+                "traffic_intensity": packet_count / duration if duration > 0 else float("inf"),
+            }
+        )
+
+    def _update_time_gap(self, timestamp: float, detections: List[Dict[str, Any]]) -> None:
+        """평균(지수 이동 평균)의 10배 이상인 도착 간격 탐지"""
+        if self.last_timestamp is not None:
+            gap = max(0.0, timestamp - self.last_timestamp)
+            if self.mean_gap and self.packets_processed > TIME_GAP_MIN_PACKETS and gap > self.mean_gap * 10:
+                detections.append(
+                    {
+                        "type": "time_anomalies",
+                        "description": "비정상적인 시간 간격",
+                        "avg_gap": self.mean_gap,
+                        "max_gap": gap,
+                        "gap_ratio": gap / self.mean_gap,
+                    }
+                )
+            self.mean_gap = gap if self.mean_gap is None else self.mean_gap + TIME_GAP_SMOOTHING * (gap - self.mean_gap)
+        self.last_timestamp = timestamp if self.last_timestamp is None else max(self.last_timestamp, timestamp)
+
+    def _check_packet(self, timestamp, src_ip, dst_ip, protocol, size, flags, detections) -> None:
+        """패킷 단위 비정상 (새 비정상 프로토콜, 큰 패킷, TCP 플래그 조합)"""
+        if protocol not in COMMON_PROTOCOLS and protocol not in self.protocols_reported:
+            self._entry(self.protocols_reported, protocol, lambda: None)
+            detections.append(
+                {
+                    "type": "unusual_protocols",
+                    "description": "일반적이지 않은 프로토콜 사용",
+                    "protocols": [protocol],
+                    "src_ip": src_ip,
+                    "dst_ip": dst_ip,
+                }
+            )
+
+        threshold = self.thresholds["large_packet_threshold"]
+        if size > threshold:
+            # 같은 엔드포인트 쌍은 윈도우당 한 번만 보고
+            last_reported = self.large_senders.get((src_ip, dst_ip))
+            if last_reported is None or timestamp - last_reported > self.window_seconds:
+                self._entry(self.large_senders, (src_ip, dst_ip), lambda: timestamp)
+                self.large_senders[(src_ip, dst_ip)] = timestamp
+                detections.append(
+                    {
+                        "type": "large_packets",
+                        "description": f"{threshold}바이트 이상의 큰 패킷",
+                        "timestamp": timestamp,
+                        "length": size,
+                        "protocol": protocol,
+                        "src_ip": src_ip,
+                        "dst_ip": dst_ip,
+                    }
+                )
+
+        if protocol == "TCP" and flags:
+            anomaly_type = None
+            if "SYN" in flags and "FIN" in flags:
+                anomaly_type = "SYN+FIN"
+            elif "RST" in flags and "FIN" in flags:
+                anomaly_type = "RST+FIN"
+            elif "URG" in flags and "PSH" in flags and "FIN" in flags:
+                anomaly_type = "URG+PSH+FIN"
+            if anomaly_type:
+                detections.append(
+                    {
+                        "type": "flag_anomalies",
+                        "description": "TCP 플래그 조합 이상",
+                        "timestamp": timestamp,
+                        "src_ip": src_ip,
+                        "dst_ip": dst_ip,
+                        "flags": list(flags),
+                        "anomaly": anomaly_type,
+                    }
+                )
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """스트리밍 상태 통계 (추적 키 수로 메모리 사용량 확인)"""
+        return {
+            "packets_processed": self.packets_processed,
+            "detections": self.detections,
+            "window_packets": self.total.total,
+            "tracked_keys": {
+                "port_scans": len(self.port_scans),
+                "host_scans": len(self.host_scans),
+                "bursts": len(self.bursts),
+                "periodic": len(self.periodic),
+                "targets": len(self.targets),
+            },
+            "max_keys": self.max_keys,
+            "evicted_keys": self.evicted_keys,
+        }
@@ -5,11 +5,14 @@
 
 import time
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+from functools import partial
+from typing import Any, Dict, List, MutableMapping, Optional, Tuple
 
 from security.packet_sniffer.base_sniffer import PacketInfo, ProtocolIdentifier
 from utils.unified_logger import get_logger
 
+from .analysis_cache import DEFAULT_CACHE_SIZE, DEFAULT_CACHE_TTL, AnalysisCache, analysis_cache_key
+
 
 @dataclass
 class ProtocolAnalysisResult:
@@ -221,11 +224,24 @@ class BaseProtocolAnalyzer:
 class ProtocolAnalyzer:
     """메인 프로토콜 분석기 - 다양한 분석기들을 조율"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        cache_max_size: int = DEFAULT_CACHE_SIZE,
+        cache_ttl: Optional[float] = DEFAULT_CACHE_TTL,
+        shared_cache: Optional[MutableMapping] = None,
+    ):
+        """
+        프로토콜 분석기 초기화
+
+        Args:
+            cache_max_size: 분석 결과 캐시 최대 항목 수 (LRU)
+            cache_ttl: 캐시 항목 유효 시간(초), None이면 만료 없음
+            shared_cache: 캡처 워커 간 공유 캐시 매핑 (예: multiprocessing.Manager().dict())
+        """
         self.logger = get_logger(self.__class__.__name__, "advanced")
         self.analyzers: Dict[str, BaseProtocolAnalyzer] = {}
-        self.analysis_cache: Dict[str, ProtocolAnalysisResult] = {}
-        self.cache_max_size = 1000
+        self.analysis_cache = AnalysisCache(cache_max_size, cache_ttl, shared_cache)
+        self.cache_max_size = cache_max_size
 
         # 통계
         self.stats = {
@@ -275,9 +291,10 @@ class ProtocolAnalyzer:
         try:
             # 캐시 확인
             cache_key = self._generate_cache_key(packet)
-            if cache_key in self.analysis_cache:
+            cached = self.analysis_cache.lookup(cache_key)
+            if cached is not None:
                 self.stats["cache_hits"] += 1
-                return self.analysis_cache[cache_key].to_dict()
+                return cached.to_dict()
 
             # 분석 결과 초기화
             inspection_result = self._initialize_inspection_result()
@@ -564,26 +581,13 @@ class ProtocolAnalyzer:
         main_result["security_flags"].update(analyzer_result.security_flags)
         main_result["anomalies"].extend(analyzer_result.anomalies)
 
-    def _generate_cache_key(self, packet: PacketInfo) -> str:
-        """캐시 키 생성"""
-        # 패킷의 핵심 정보로 캐시 키 생성
-        key_parts = [
-            packet.protocol,
-            str(packet.src_port),
-            str(packet.dst_port),
-            str(len(packet.payload)),
-            str(hash(packet.payload[:100])),  # 페이로드 앞부분 해시
-        ]
-        return "_".join(key_parts)
-
-    def _cache_result(self, cache_key: str, result: ProtocolAnalysisResult) -> None:
-        """결과 캐시에 저장"""
-        if len(self.analysis_cache) >= self.cache_max_size:
-            # 가장 오래된 항목 제거 (간단한 LRU)
-            oldest_key = next(iter(self.analysis_cache))
-            del self.analysis_cache[oldest_key]
+    def _generate_cache_key(self, packet: PacketInfo) -> Tuple[Any, ...]:
+        """캐시 키 생성 (프로토콜, 포트, 전체 페이로드 다이제스트)"""
+        return analysis_cache_key(packet)
 
-        self.analysis_cache[cache_key] = result
+    def _cache_result(self, cache_key: Tuple[Any, ...], result: ProtocolAnalysisResult) -> None:
+        """결과 캐시에 저장 (가득 차면 가장 오래 사용되지 않은 항목 제거)"""
+        self.analysis_cache.store(cache_key, result)
 
     def _get_error_result(self, error_message: str) -> Dict[str, Any]:
         """오류 결과 생성"""
@@ -607,6 +611,7 @@ class ProtocolAnalyzer:
             "error_rate": self.stats["analysis_errors"] / max(self.stats["total_analyzed"], 1) * 100,
             "analyzer_usage": self.stats["analyzer_usage"].copy(),
             "cache_size": len(self.analysis_cache),
+            "cache": self.analysis_cache.get_statistics(),
             "registered_analyzers": list(self.analyzers.keys()),
         }
 
@@ -615,12 +620,28 @@ class ProtocolAnalyzer:
         self.analysis_cache.clear()
         self.logger.info("분석 캐시 정리됨")
 
-    def analyze_packet_batch(self, packets: List[PacketInfo]) -> List[Dict[str, Any]]:
-        """패킷 배치 분석"""
-        results = []
-        for packet in packets:
-            result = self.perform_deep_packet_inspection(packet)
-            results.append(result)
+    def analyze_packet_batch(self, packets: List[PacketInfo], workers: int = 0) -> List[Dict[str, Any]]:
+        """
+        패킷 배치 분석
+
+        Args:
+            packets: 분석할 패킷 목록
+            workers: 워커 프로세스 수 (2 이상이면 플로우 단위로 나누어 병렬 분석, 결과는 캡처 순서 유지)
+
+        Returns:
+            list: 패킷별 분석 결과
+        """
+        if workers <= 1 or len(packets) < 2:
+            return [self.perform_deep_packet_inspection(packet) for packet in packets]
+
+        from ..dpi_pipeline import DPIPipeline
+
+        # 워커 분석기는 같은 캐시 설정과 공유 캐시 계층을 사용
+        factory = partial(ProtocolAnalyzer, self.cache_max_size, self.analysis_cache.ttl, self.analysis_cache.shared)
+        with DPIPipeline(factory, "perform_deep_packet_inspection", workers=workers) as pipeline:
+            results = pipeline.analyze_batch(packets)
+
+        self.stats["total_analyzed"] += len(results)
         return results
 
 
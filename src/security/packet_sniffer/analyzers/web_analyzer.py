@@ -9,8 +9,38 @@ import re
 from typing import Any, Dict, List, Optional
 from urllib.parse import parse_qs, urlparse
 
+from ..signature_engine import Signature, get_signature_engine
+
 logger = logging.getLogger(__name__)
 
+WEB_ATTACK_SIGNATURE_SET = "web_attacks"
+WEB_ATTACK_CATEGORIES = ("sql_injection_attempt", "xss_attempt", "directory_traversal", "sensitive_file_access")
+
+
+def _web_attack_signatures() -> List[Signature]:
+    """웹 공격 탐지 시그니처 (카테고리 = 보안 이슈 이름)"""
+    signatures = []
+
+    sql_patterns = [
+        r"'.*or.*'.*=.*'",
+        r"union.*select",
+        r"drop.*table",
+        r"insert.*into",
+        r"delete.*from",
+        r"exec.*xp_",
+        r"sp_.*password",
+    ]
+    xss_patterns = [r"<script.*>", r"javascript:", r"onerror=", r"onload=", r"onclick=", r"<iframe.*>"]
+    for category, patterns in (("sql_injection_attempt", sql_patterns), ("xss_attempt", xss_patterns)):
+        signatures.extend(Signature(pattern, category, pattern, regex=True, ignore_case=True) for pattern in patterns)
+
+    traversal_patterns = ["../", "..\\", "%2e%2e%2f", "%2e%2e%5c"]
+    sensitive_files = ["passwd", "shadow", "hosts", "web.config", ".htaccess", ".env", "config.php", "database.yml"]
+    for category, literals in (("directory_traversal", traversal_patterns), ("sensitive_file_access", sensitive_files)):
+        signatures.extend(Signature(literal, category, literal, ignore_case=True) for literal in literals)
+
+    return signatures
+
 
 class WebAnalyzer:
     """HTTP/HTTPS 프로토콜 전용 분석기"""
@@ -19,6 +49,8 @@ class WebAnalyzer:
         self.http_methods = []
         self.user_agents = []
         self.domains = []
+        self.signature_engine = get_signature_engine()
+        self.signature_engine.register(WEB_ATTACK_SIGNATURE_SET, _web_attack_signatures())
 
     def analyze_http(self, payload: bytes, packet_info: Dict[str, Any]) -> Dict[str, Any]:
         """HTTP 패킷 분석"""
@@ -276,23 +308,9 @@ class WebAnalyzer:
     def _check_web_security(self, payload_str: str, analysis: Dict[str, Any]) -> List[str]:
         """웹 보안 검사"""
 
-        issues = []
-
-        # SQL 인젝션 패턴 검사
-        if self._detect_sql_injection(payload_str):
-            issues.append("sql_injection_attempt")
-
-        # XSS 패턴 검사
-        if self._detect_xss(payload_str):
-            issues.append("xss_attempt")
-
-        # 디렉토리 트래버설 검사
-        if self._detect_directory_traversal(payload_str):
-            issues.append("directory_traversal")
-
-        # 민감한 파일 접근 시도
-        if self._detect_sensitive_file_access(payload_str):
-            issues.append("sensitive_file_access")
+        # SQL 인젝션, XSS, 디렉토리 트래버설, 민감한 파일 접근을 한 번의 검사로 탐지
+        detected = self.signatures.match_categories(payload_str)
+        issues = [category for category in WEB_ATTACK_CATEGORIES if category in detected]
 
         # 비정상적인 HTTP 메소드
         method = analysis.get("method", "")
@@ -301,60 +319,26 @@ class WebAnalyzer:
 
         return issues
 
+    @property
+    def signatures(self):
+        """웹 공격 시그니처 집합 (핫 리로드된 최신 집합)"""
+        return self.signature_engine.get(WEB_ATTACK_SIGNATURE_SET)
+
     def _detect_sql_injection(self, payload_str: str) -> bool:
         """SQL 인젝션 탐지"""
-
-        sql_patterns = [
-            r"'.*or.*'.*=.*'",
-            r"union.*select",
-            r"drop.*table",
-            r"insert.*into",
-            r"delete.*from",
-            r"exec.*xp_",
-            r"sp_.*password",
-        ]
-
-        payload_lower = payload_str.lower()
-        return any(re.search(pattern, payload_lower) for pattern in sql_patterns)
+        return "sql_injection_attempt" in self.signatures.match_categories(payload_str)
 
     def _detect_xss(self, payload_str: str) -> bool:
         """XSS 탐지"""
-
-        xss_patterns = [
-            r"<script.*>",
-            r"javascript:",
-            r"onerror=",
-            r"onload=",
-            r"onclick=",
-            r"<iframe.*>",
-        ]
-
-        payload_lower = payload_str.lower()
-        return any(re.search(pattern, payload_lower) for pattern in xss_patterns)
+        return "xss_attempt" in self.signatures.match_categories(payload_str)
 
     def _detect_directory_traversal(self, payload_str: str) -> bool:
         """디렉토리 트래버설 탐지"""
-
-        traversal_patterns = [r"\.\./", r"\.\.\\", r"%2e%2e%2f", r"%2e%2e%5c"]
-
-        return any(re.search(pattern, payload_str, re.IGNORECASE) for pattern in traversal_patterns)
+        return "directory_traversal" in self.signatures.match_categories(payload_str)
 
     def _detect_sensitive_file_access(self, payload_str: str) -> bool:
         """민감한 파일 접근 탐지"""
-
-        sensitive_files = [
-            "passwd",
-            "shadow",
-            "hosts",
-            "web.config",
-            ".htaccess",
-            ".env",
-            "config.php",
-            "database.yml",
-        ]
-
-        payload_lower = payload_str.lower()
-        return any(filename in payload_lower for filename in sensitive_files)
+        return "sensitive_file_access" in self.signatures.match_categories(payload_str)
 
     def _check_suspicious_uri_patterns(self, uri: str) -> List[str]:
         """의심스러운 URI 패턴 검사"""
@@ -35,7 +35,7 @@ class SnifferConfig:
         self.fortigate_token = os.getenv("FORTIGATE_API_TOKEN", self.fortigate_token)
 
 
-@dataclass
+@dataclass(slots=True)
 class PacketInfo:
     """패킷 정보 구조체"""
 
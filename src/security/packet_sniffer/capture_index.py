@@ -0,0 +1,554 @@
+#!/usr/bin/env python3
+"""
+캡처 인덱스 - 패킷 번호에 대한 역색인
+
+수집 시점에 출발지/목적지 IP, 포트, 프로토콜, 플로우 해시, 시간 버킷별로 패킷 번호 목록
+(오름차순 array)을 유지합니다. 필터 조회는 가장 짧은 목록을 기준으로 나머지 목록을 이진
+탐색하여 교집합을 구하므로 저장된 패킷 수가 아니라 일치 후보 수에 비례합니다.
+
+스풀 세그먼트가 닫히면 해당 구간의 역색인을 세그먼트 옆 .postings 파일로 내보내고 메모리에서
+제거합니다. 메모리에는 세그먼트별 요약(패킷 번호/시간 구간, 필드별 값 필터)만 남으며, 조회 시
+요약으로 걸러지지 않은 세그먼트의 역색인만 파일에서 읽습니다 (최근 읽은 몇 개는 캐시).
+"""
+
+import base64
+import bisect
+import json
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .analyzers.flow_table import flow_key
+
+DEFAULT_TIME_BUCKET = 60.0  # 초
+DEFAULT_CACHED_SEGMENTS = 2
+
+# 역색인 필드 (조회 조건 키와 동일)
+INDEXED_FIELDS = ("src_ip", "dst_ip", "src_port", "dst_port", "protocol", "flow_id", "time_bucket")
+
+# 출발지/목적지 어느 쪽이든 일치하는 조건 키
+EITHER_FIELDS = {"ip": ("src_ip", "dst_ip"), "port": ("src_port", "dst_port")}
+TIME_FIELDS = ("start_time", "end_time")
+
+POSTINGS_SUFFIX = ".postings"
+
+# 세그먼트 값 필터: 고유값이 적으면 정확한 집합, 많으면 블룸 필터 (값당 10비트, 해시 7개 -> 오탐 약 1%)
+EXACT_FILTER_LIMIT = 64
+BLOOM_BITS_PER_VALUE = 10
+BLOOM_HASHES = 7
+
+
+def packet_flow_hash(packet: Any) -> int:
+    """방향 정규화된 5-튜플의 64비트 플로우 ID (정수 튜플 해시는 프로세스/재시작 간 동일)"""
+    key, _ = flow_key(packet.protocol, packet.src_ip, packet.src_port, packet.dst_ip, packet.dst_port)
+    return hash(key) & 0xFFFFFFFFFFFFFFFF
+
+
+def split_criteria(
+    criteria: Optional[Dict[str, Any]],
+) -> Tuple[Dict[str, Any], Dict[str, Any], Optional[float], Optional[float]]:
+    """
+    조회 조건을 색인 조건, 나머지 조건(패킷 dict와 직접 비교), 시간 구간으로 분리
+
+    Returns:
+        tuple: (색인 조건, 나머지 조건, start_time, end_time)
+    """
+    indexed, residual = {}, {}
+    for key, value in (criteria or {}).items():
+        if key in TIME_FIELDS:
+            continue
+        if key in INDEXED_FIELDS or key in EITHER_FIELDS:
+            indexed[key] = value
+        else:
+            residual[key] = value
+    criteria = criteria or {}
+    return indexed, residual, criteria.get("start_time"), criteria.get("end_time")
+
+
+def _intersect(lists: List[array]) -> List[int]:
+    """오름차순 목록들의 교집합 (가장 짧은 목록 기준 이진 탐색)"""
+    lists = sorted(lists, key=len)
+    result = []
+    positions = [0] * len(lists)
+    for number in lists[0]:
+        for i, other in enumerate(lists[1:], 1):
+            position = bisect.bisect_left(other, number, positions[i])
+            positions[i] = position
+            if position == len(other) or other[position] != number:
+                break
+        else:
+            result.append(number)
+    return result
+
+
+def _union(lists: List[array]) -> array:
+    if len(lists) == 1:
+        return lists[0]
+    return array("I", sorted(set().union(*lists)))
+
+
+def _normalize(criteria: Dict[str, Any]) -> List[Tuple[Tuple[str, ...], List[Any]]]:
+    """조회 조건을 (필드 목록, 값 목록)으로 변환 (색인되지 않은 필드는 KeyError)"""
+    normalized = []
+    for name, value in criteria.items():
+        fields = EITHER_FIELDS.get(name, (name,))
+        for field_name in fields:
+            if field_name not in INDEXED_FIELDS:
+                raise KeyError(f"색인되지 않은 필드: {name}")
+        values = list(value) if isinstance(value, (list, tuple, set, frozenset)) else [value]
+        normalized.append((fields, values))
+    return normalized
+
+
+class _ValueFilter:
+    """세그먼트의 필드 값 요약 (값이 없을 수 있는지만 판정, 블룸 필터는 오탐 가능)"""
+
+    __slots__ = ("exact", "bits", "size")
+
+    def __init__(self, values: List[Any]):
+        if len(values) <= EXACT_FILTER_LIMIT:
+            self.exact, self.bits, self.size = frozenset(values), None, 0
+            return
+        self.exact = None
+        self.size = len(values) * BLOOM_BITS_PER_VALUE
+        self.bits = bytearray((self.size + 7) // 8)
+        for value in values:
+            for position in self._positions(value):
+                self.bits[position >> 3] |= 1 << (position & 7)
+
+    def _positions(self, value: Any) -> Iterable[int]:
+        digest = hash((value,)) & 0xFFFFFFFFFFFFFFFF
+        low, high = digest & 0xFFFFFFFF, (digest >> 32) | 1
+        return ((low + i * high) % self.size for i in range(BLOOM_HASHES))
+
+    def __contains__(self, value: Any) -> bool:
+        if self.bits is None:
+            return value in self.exact
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.bits) if self.bits is not None else 0
+
+
+class _Postings:
+    """한 구간(닫힌 세그먼트 또는 현재 구간)의 역색인 - 값별 구간 내 위치(오름차순) 목록"""
+
+    def __init__(self, first: int):
+        self.first = first  # 구간 첫 패킷 번호
+        self.fields: Dict[str, Dict[Any, array]] = {name: {} for name in INDEXED_FIELDS}
+        self.timestamps = array("d")
+        self.flows = array("Q")
+        self.skipped = 0
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def add(self, values: Tuple[Tuple[str, Any], ...], timestamp: float, packet_flow: int) -> None:
+        position = len(self.timestamps)
+        for name, value in values:
+            numbers = self.fields[name].get(value)
+            if numbers is None:
+                numbers = self.fields[name][value] = array("I")
+            numbers.append(position)
+        self.timestamps.append(timestamp)
+        self.flows.append(packet_flow)
+
+    def skip(self) -> None:
+        self.timestamps.append(0.0)
+        self.flows.append(0)
+        self.skipped += 1
+
+    def time_range(self) -> Tuple[Optional[float], Optional[float]]:
+        """색인된 패킷의 최소/최대 타임스탬프"""
+        if self.skipped:
+            indexed = [t for t in self.timestamps if t] if self.skipped < len(self.timestamps) else []
+        else:
+            indexed = self.timestamps
+        if not indexed:
+            return None, None
+        return min(indexed), max(indexed)
+
+    def query(
+        self,
+        criteria: List[Tuple[Tuple[str, ...], List[Any]]],
+        start_time: Optional[float],
+        end_time: Optional[float],
+        time_bucket: float,
+    ) -> List[int]:
+        empty = array("I")
+        lists = [
+            _union([self.fields[name].get(value, empty) for name in fields for value in values])
+            for fields, values in criteria
+        ]
+        timed = start_time is not None or end_time is not None
+        if timed:
+            lists.append(self._time_candidates(start_time, end_time, time_bucket))
+
+        positions = _intersect(lists) if lists else range(len(self.timestamps))
+        if not timed:
+            return [self.first + position for position in positions]
+        timestamps = self.timestamps
+        return [
+            self.first + position
+            for position in positions
+            if (start_time is None or timestamps[position] >= start_time)
+            and (end_time is None or timestamps[position] < end_time)
+        ]
+
+    def _time_candidates(self, start_time: Optional[float], end_time: Optional[float], time_bucket: float) -> array:
+        buckets = self.fields["time_bucket"]
+        if not buckets:
+            return array("I")
+        first = int(start_time // time_bucket) if start_time is not None else min(buckets)
+        last = int(end_time // time_bucket) if end_time is not None else max(buckets)
+        if last - first > len(buckets):
+            selected = [numbers for bucket, numbers in buckets.items() if first <= bucket <= last]
+        else:
+            selected = [buckets[bucket] for bucket in range(first, last + 1) if bucket in buckets]
+        if not selected:
+            return array("I")
+        return _union(selected)
+
+    def nbytes(self) -> int:
+        return (
+            sum(numbers.itemsize * len(numbers) for values in self.fields.values() for numbers in values.values())
+            + self.timestamps.itemsize * len(self.timestamps)
+            + self.flows.itemsize * len(self.flows)
+        )
+
+    def to_document(self, time_bucket: float) -> Dict[str, Any]:
+        start_time, end_time = self.time_range()
+        return {
+            "first": self.first,
+            "count": len(self.timestamps),
+            "skipped": self.skipped,
+            "start_time": start_time,
+            "end_time": end_time,
+            "time_bucket": time_bucket,
+            "timestamps": _encode_array(self.timestamps),
+            "flows": _encode_array(self.flows),
+            "postings": {
+                name: [[value, _encode_array(numbers)] for value, numbers in values.items()]
+                for name, values in self.fields.items()
+            },
+        }
+
+    @classmethod
+    def from_document(cls, document: Dict[str, Any]) -> "_Postings":
+        postings = cls(document["first"])
+        postings.timestamps = _decode_array("d", document["timestamps"])
+        postings.flows = _decode_array("Q", document["flows"])
+        postings.skipped = document["skipped"]
+        for name, entries in document["postings"].items():
+            postings.fields[name] = {value: _decode_array("I", encoded) for value, encoded in entries}
+        return postings
+
+
+class _SegmentSummary:
+    """닫힌 세그먼트의 메모리 요약 (역색인 본문은 .postings 파일에 있음)"""
+
+    __slots__ = ("first", "count", "skipped", "path", "start_time", "end_time", "filters")
+
+    def __init__(self, document: Dict[str, Any], path: Path):
+        self.first = document["first"]
+        self.count = document["count"]
+        self.skipped = document["skipped"]
+        self.path = path
+        self.start_time = document["start_time"]
+        self.end_time = document["end_time"]
+        # 시간 버킷은 시간 구간으로 충분하므로 필터를 두지 않음
+        self.filters = {
+            name: _ValueFilter([value for value, _ in entries])
+            for name, entries in document["postings"].items()
+            if name != "time_bucket"
+        }
+
+    @property
+    def end(self) -> int:
+        return self.first + self.count
+
+    def may_match(
+        self,
+        criteria: List[Tuple[Tuple[str, ...], List[Any]]],
+        start_time: Optional[float],
+        end_time: Optional[float],
+    ) -> bool:
+        """요약만으로 일치하는 패킷이 없다고 판정할 수 없으면 True"""
+        if criteria or start_time is not None or end_time is not None:
+            if self.start_time is None:
+                return False
+            if start_time is not None and self.end_time < start_time:
+                return False
+            if end_time is not None and self.start_time >= end_time:
+                return False
+        for fields, values in criteria:
+            filters = [self.filters[name] for name in fields if name in self.filters]
+            if filters and not any(value in f for f in filters for value in values):
+                return False
+        return True
+
+    def covers(self, start_time: Optional[float], end_time: Optional[float]) -> bool:
+        """세그먼트 전체가 시간 구간 안에 있음 (역색인을 읽지 않고 전 구간 반환 가능)"""
+        return (
+            not self.skipped
+            and self.start_time is not None
+            and (start_time is None or self.start_time >= start_time)
+            and (end_time is None or self.end_time < end_time)
+        )
+
+
+class CaptureIndex:
+    """패킷 역색인"""
+
+    def __init__(self, time_bucket: float = DEFAULT_TIME_BUCKET, cached_segments: int = DEFAULT_CACHED_SEGMENTS):
+        """
+        캡처 인덱스 초기화
+
+        Args:
+            time_bucket: 시간 버킷 크기 (초)
+            cached_segments: 파일에서 읽은 세그먼트 역색인을 메모리에 유지할 개수
+        """
+        self.time_bucket = time_bucket
+        self.cached_segments = cached_segments
+        self.lock = threading.RLock()
+        self._cache_lock = threading.Lock()
+        self._reset(0)
+
+    def _reset(self, next_number: int) -> None:
+        self.segments: List[_SegmentSummary] = []
+        self.active = _Postings(next_number)  # 체크포인트되지 않은 현재 구간
+        self.first_retained = next_number  # 이보다 작은 번호는 삭제된 패킷
+        self._loaded: "OrderedDict[int, _Postings]" = OrderedDict()
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.next_number - self.first_retained
+
+    @property
+    def next_number(self) -> int:
+        """다음에 추가될 패킷 번호"""
+        return self.active.first + len(self.active)
+
+    def clear(self, next_number: int = 0) -> None:
+        """
+        인덱스 비우기
+
+        Args:
+            next_number: 이후 추가될 첫 패킷 번호 (스풀은 삭제 후에도 번호를 이어감)
+        """
+        with self.lock, self._cache_lock:
+            self._reset(next_number)
+
+    def _values(self, packet: Any, packet_flow: int) -> Tuple[Tuple[str, Any], ...]:
+        return (
+            ("src_ip", packet.src_ip),
+            ("dst_ip", packet.dst_ip),
+            ("src_port", packet.src_port),
+            ("dst_port", packet.dst_port),
+            ("protocol", packet.protocol),
+            ("flow_id", packet_flow),
+            ("time_bucket", int(packet.timestamp // self.time_bucket)),
+        )
+
+    def add(self, number: int, packet: Any, packet_flow: Optional[int] = None) -> None:
+        """
+        패킷 색인 (패킷 번호는 증가하는 순서로 추가)
+
+        Args:
+            number: 패킷 번호 (세션 저장소/스풀의 패킷 번호)
+            packet: PacketInfo 또는 PacketView
+            packet_flow: 이미 계산한 packet_flow_hash 값
+        """
+        if packet_flow is None:
+            packet_flow = packet_flow_hash(packet)
+        values = self._values(packet, packet_flow)
+        with self.lock:
+            if number != self.next_number:
+                raise ValueError(f"패킷 번호가 연속적이지 않습니다: {number} (예상 {self.next_number})")
+            self.active.add(values, packet.timestamp, packet_flow)
+
+    def skip(self, number: int) -> None:
+        """어떤 조건에도 일치하지 않는 자리 채우기 (디코딩할 수 없는 레코드)"""
+        with self.lock:
+            if number != self.next_number:
+                raise ValueError(f"패킷 번호가 연속적이지 않습니다: {number} (예상 {self.next_number})")
+            self.active.skip()
+
+    def discard_before(self, number: int) -> None:
+        """지정 번호 이전 패킷을 조회 대상에서 제외 (링 스풀 회전), 전부 삭제된 세그먼트 요약은 제거"""
+        with self.lock:
+            self.first_retained = max(self.first_retained, number)
+            dropped = 0
+            while dropped < len(self.segments) and self.segments[dropped].end <= self.first_retained:
+                dropped += 1
+            if dropped:
+                removed = self.segments[:dropped]
+                del self.segments[:dropped]
+                with self._cache_lock:
+                    for summary in removed:
+                        self._loaded.pop(summary.first, None)
+
+    # 조회 ---------------------------------------------------------------
+
+    def query(
+        self,
+        criteria: Optional[Dict[str, Any]] = None,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+    ) -> List[int]:
+        """
+        조건에 맞는 패킷 번호 조회 (오름차순)
+
+        닫힌 세그먼트는 요약(시간 구간, 값 필터)으로 먼저 거르고, 남은 세그먼트의 역색인만 파일에서 읽습니다.
+
+        Args:
+            criteria: 색인 필드 조건 (src_ip, dst_ip, ip, src_port, dst_port, port, protocol, flow_id)
+                값이 list/tuple/set이면 그 중 하나와 일치
+            start_time: 시작 시각 (포함)
+            end_time: 종료 시각 (제외)
+
+        Returns:
+            list: 패킷 번호 목록
+        """
+        normalized = _normalize(criteria or {})
+        with self.lock:
+            segments = list(self.segments)
+            active = self.active.query(normalized, start_time, end_time, self.time_bucket)
+
+        numbers: List[int] = []
+        for summary in segments:
+            if not summary.may_match(normalized, start_time, end_time):
+                continue
+            if not normalized and summary.covers(start_time, end_time):
+                numbers.extend(range(summary.first, summary.end))
+                continue
+            postings = self._load_segment(summary)
+            if postings is not None:
+                numbers.extend(postings.query(normalized, start_time, end_time, self.time_bucket))
+        numbers.extend(active)
+
+        first_retained = self.first_retained
+        if numbers and numbers[0] < first_retained:
+            numbers = numbers[bisect.bisect_left(numbers, first_retained) :]
+        return numbers
+
+    def _load_segment(self, summary: _SegmentSummary) -> Optional[_Postings]:
+        """세그먼트 역색인 읽기 (최근 읽은 세그먼트는 캐시, 링 회전으로 삭제되었으면 None)"""
+        with self._cache_lock:
+            postings = self._loaded.get(summary.first)
+            if postings is not None:
+                self._loaded.move_to_end(summary.first)
+                return postings
+        try:
+            postings = _Postings.from_document(json.loads(summary.path.read_text(encoding="utf-8")))
+        except FileNotFoundError:
+            return None
+        self._remember(postings)
+        return postings
+
+    def _remember(self, postings: _Postings) -> None:
+        with self._cache_lock:
+            self._loaded[postings.first] = postings
+            self._loaded.move_to_end(postings.first)
+            while len(self._loaded) > self.cached_segments:
+                self._loaded.popitem(last=False)
+
+    def flow_of(self, number: int) -> Optional[int]:
+        """패킷 번호의 플로우 ID"""
+        with self.lock:
+            if not self.first_retained <= number < self.next_number:
+                return None
+            if number >= self.active.first:
+                return self.active.flows[number - self.active.first]
+            position = bisect.bisect_right([summary.first for summary in self.segments], number) - 1
+            if position < 0:
+                return None
+            summary = self.segments[position]
+        postings = self._load_segment(summary)
+        return postings.flows[number - summary.first] if postings is not None else None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """인덱스 통계"""
+        with self.lock:
+            with self._cache_lock:
+                cached = list(self._loaded.values())
+            return {
+                "packets": self.next_number - self.first_retained,
+                "first_number": self.first_retained,
+                "time_bucket": self.time_bucket,
+                "segments": len(self.segments),
+                "cached_segments": len(cached),
+                "active_packets": len(self.active),
+                "distinct": {name: len(values) for name, values in self.active.fields.items()},
+                "memory_bytes": self.active.nbytes()
+                + sum(postings.nbytes() for postings in cached)
+                + sum(f.nbytes for summary in self.segments for f in summary.filters.values()),
+            }
+
+    # 영속화 -------------------------------------------------------------
+
+    def checkpoint(self, path: Union[str, Path]) -> Optional[int]:
+        """
+        현재 구간의 역색인을 파일로 내보내고 메모리에서는 요약만 유지 (스풀 세그먼트 종료 시 호출)
+
+        Returns:
+            int: 저장한 패킷 수 (저장할 내용이 없으면 None)
+        """
+        path = Path(path)
+        with self.lock:
+            postings = self.active
+            if not len(postings):
+                return None
+            document = postings.to_document(self.time_bucket)
+            temporary = Path(str(path) + ".tmp")
+            temporary.write_text(json.dumps(document), encoding="utf-8")
+            temporary.replace(path)
+
+            self.segments.append(_SegmentSummary(document, path))
+            self.active = _Postings(self.next_number)
+        # 방금 닫은 세그먼트는 곧 조회될 가능성이 높으므로 캐시에 둠
+        self._remember(postings)
+        return len(postings)
+
+    def load(self, path: Union[str, Path], expected_count: Optional[int] = None) -> int:
+        """
+        체크포인트 파일의 요약 불러오기 (패킷 번호 순서대로 호출, 역색인 본문은 조회 시 읽음)
+
+        Args:
+            path: .postings 파일 경로
+            expected_count: 세그먼트 패킷 수 (다르면 불러오지 않고 ValueError)
+
+        Returns:
+            int: 불러온 패킷 수
+        """
+        path = Path(path)
+        document = json.loads(path.read_text(encoding="utf-8"))
+        if expected_count is not None and document["count"] != expected_count:
+            raise ValueError(f"인덱스 패킷 수가 세그먼트와 다릅니다: {path}")
+        summary = _SegmentSummary(document, path)
+        with self.lock:
+            if not self.segments and not len(self.active):
+                self.first_retained = summary.first
+            elif summary.first != self.next_number or len(self.active):
+                raise ValueError(f"인덱스 구간이 연속적이지 않습니다: {path}")
+            self.segments.append(summary)
+            self.active = _Postings(summary.end)
+        return summary.count
+
+
+def _encode_array(values: array) -> str:
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+
+def _decode_array(typecode: str, encoded: str) -> array:
+    values = array(typecode)
+    values.frombytes(base64.b64decode(encoded))
+    return values
+
+
+def postings_path(segment_path: Union[str, Path]) -> Path:
+    """세그먼트의 인덱스 체크포인트 경로"""
+    return Path(segment_path).with_suffix(POSTINGS_SUFFIX)
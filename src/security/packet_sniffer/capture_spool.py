@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+"""
+캡처 스풀 - 회전하는 pcap 세그먼트 파일에 세션 패킷을 연속 기록
+
+세그먼트는 크기 또는 기간 기준으로 회전하며, 보존 세그먼트 수를 넘으면 가장 오래된
+세그먼트부터 삭제하는 링 파일로 동작합니다. 세그먼트마다 (타임스탬프, 플로우 해시, 레코드 오프셋)
+사이드카 인덱스를 함께 기록하므로 조회/내보내기는 필요한 세그먼트의 필요한 위치만 읽습니다.
+
+세그먼트 파일 이름에 첫 패킷 번호가 들어 있어 같은 디렉토리로 다시 열면 기존 세그먼트를 복구하고,
+CaptureIndex가 연결되어 있으면 세그먼트별 체크포인트(.postings)에서 역색인도 복구합니다.
+"""
+
+import bisect
+import re
+import shutil
+import struct
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from utils.unified_logger import get_logger
+
+from .analyzers.flow_table import flow_key
+from .base_sniffer import PacketInfo
+from .capture_index import CaptureIndex, packet_flow_hash, postings_path
+from .exporters.pcap_io import PcapReader, PcapWriter, decode_packet, encode_packet
+
+DEFAULT_SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_SEGMENT_MAX_DURATION = 300.0  # 초
+DEFAULT_SPOOL_SNAPLEN = 262144
+INDEX_BUFFER_RECORDS = 4096
+
+# 인덱스 레코드: 타임스탬프(ns), 플로우 해시, pcap 레코드 오프셋
+INDEX_RECORD = struct.Struct("<qQQ")
+PCAP_GLOBAL_HEADER_SIZE = 24
+PCAP_RECORD_HEADER_SIZE = 16
+
+# segment_<순번>_<첫 패킷 번호>.pcap
+SEGMENT_NAME = re.compile(r"^segment_(\d+)_(\d+)\.pcap$")
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class SpoolSegment:
+    """스풀 세그먼트 정보"""
+
+    sequence: int
+    path: Path
+    first_packet: int  # 스풀 전체 기준 첫 패킷 번호
+    packet_count: int = 0
+    size: int = PCAP_GLOBAL_HEADER_SIZE
+    first_timestamp: Optional[float] = None
+    last_timestamp: Optional[float] = None
+
+    @property
+    def index_path(self) -> Path:
+        return self.path.with_suffix(".idx")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "sequence": self.sequence,
+            "path": str(self.path),
+            "first_packet": self.first_packet,
+            "packet_count": self.packet_count,
+            "size": self.size,
+            "first_timestamp": self.first_timestamp,
+            "last_timestamp": self.last_timestamp,
+        }
+
+
+class CaptureSpool:
+    """회전 pcap 세그먼트 스풀"""
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        segment_max_bytes: int = DEFAULT_SEGMENT_MAX_BYTES,
+        segment_max_duration: Optional[float] = DEFAULT_SEGMENT_MAX_DURATION,
+        max_segments: int = 0,
+        snaplen: int = DEFAULT_SPOOL_SNAPLEN,
+        index: Optional[CaptureIndex] = None,
+    ):
+        """
+        스풀 초기화
+
+        Args:
+            directory: 세그먼트 디렉토리 (세션별로 분리)
+            segment_max_bytes: 세그먼트 최대 크기 (바이트)
+            segment_max_duration: 세그먼트 최대 기간 (초, 패킷 타임스탬프 기준), None이면 크기만 사용
+            max_segments: 보존할 최대 세그먼트 수 (0이면 무제한, 초과 시 가장 오래된 세그먼트 삭제)
+            snaplen: 패킷 최대 저장 길이
+            index: 기록 시 함께 갱신하고 세그먼트 종료 시 체크포인트할 역색인
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes = segment_max_bytes
+        self.segment_max_duration = segment_max_duration
+        self.max_segments = max_segments
+        self.snaplen = snaplen
+        self.lock = threading.RLock()
+
+        self.segments: List[SpoolSegment] = []
+        self.total_packets = 0
+        self.dropped_segments = 0
+        self.dropped_packets = 0
+        self._writer: Optional[PcapWriter] = None
+        self._index_file = None
+        self._index_buffer = bytearray()
+        self._next_sequence = 0
+
+        self.index = index
+        self._recover()
+
+    def __len__(self) -> int:
+        """보존 중인 패킷 수"""
+        with self.lock:
+            return self.total_packets - self.first_retained
+
+    @property
+    def first_retained(self) -> int:
+        """보존 중인 첫 패킷 번호"""
+        return self.segments[0].first_packet if self.segments else self.total_packets
+
+    def append(self, packet: PacketInfo) -> None:
+        """패킷 기록 (필요하면 세그먼트 회전)"""
+        frame = encode_packet(packet)
+        with self.lock:
+            segment = self.segments[-1] if self._writer else None
+            if segment is None or self._should_rotate(segment, packet.timestamp):
+                segment = self._open_segment()
+
+            offset = segment.size
+            packet_flow = packet_flow_hash(packet)
+            if self.index is not None:
+                self.index.add(self.total_packets, packet, packet_flow)
+            self._writer.write(frame, packet.timestamp, orig_len=packet.size)
+            self._index_buffer += INDEX_RECORD.pack(round(packet.timestamp * 1_000_000_000), packet_flow, offset)
+            if len(self._index_buffer) >= INDEX_BUFFER_RECORDS * INDEX_RECORD.size:
+                self._flush_index()
+
+            segment.size += PCAP_RECORD_HEADER_SIZE + min(len(frame), self.snaplen)
+            segment.packet_count += 1
+            if segment.first_timestamp is None:
+                segment.first_timestamp = packet.timestamp
+            segment.last_timestamp = packet.timestamp
+            self.total_packets += 1
+
+    def _should_rotate(self, segment: SpoolSegment, timestamp: float) -> bool:
+        if segment.size >= self.segment_max_bytes:
+            return True
+        return (
+            self.segment_max_duration is not None
+            and segment.first_timestamp is not None
+            and timestamp - segment.first_timestamp >= self.segment_max_duration
+        )
+
+    def _open_segment(self) -> SpoolSegment:
+        self._close_writer()
+        segment = SpoolSegment(
+            self._next_sequence,
+            self.directory / f"segment_{self._next_sequence:06d}_{self.total_packets:012d}.pcap",
+            self.total_packets,
+        )
+        self._next_sequence += 1
+        self._writer = PcapWriter(segment.path, snaplen=self.snaplen, nanosecond=True)
+        self._index_file = open(segment.index_path, "wb")
+        self.segments.append(segment)
+
+        while self.max_segments and len(self.segments) > self.max_segments:
+            self._drop_segment(self.segments.pop(0))
+            if self.index is not None:
+                self.index.discard_before(self.first_retained)
+        return segment
+
+    def _drop_segment(self, segment: SpoolSegment, rotated: bool = True) -> None:
+        segment.path.unlink(missing_ok=True)
+        segment.index_path.unlink(missing_ok=True)
+        postings_path(segment.path).unlink(missing_ok=True)
+        if rotated:
+            self.dropped_segments += 1
+            self.dropped_packets += segment.packet_count
+            logger.debug(f"스풀 세그먼트 삭제: {segment.path}")
+
+    def _flush_index(self) -> None:
+        if self._index_buffer:
+            self._index_file.write(self._index_buffer)
+            self._index_buffer.clear()
+        self._index_file.flush()
+
+    def _close_writer(self) -> None:
+        if self._writer is None:
+            return
+        self._flush_index()
+        self._index_file.close()
+        self._writer.close()
+        self._writer = None
+        self._index_file = None
+        if self.index is not None:
+            self.index.checkpoint(postings_path(self.segments[-1].path))
+
+    def flush(self) -> None:
+        """현재 세그먼트의 버퍼를 파일에 기록 (조회 전에 호출)"""
+        with self.lock:
+            if self._writer is not None:
+                self._writer.flush()
+                self._flush_index()
+
+    def close(self) -> None:
+        """현재 세그먼트 닫기 (이후 append는 새 세그먼트에 기록)"""
+        with self.lock:
+            self._close_writer()
+
+    def clear(self) -> None:
+        """모든 세그먼트 삭제"""
+        with self.lock:
+            self._close_writer()
+            for segment in self.segments:
+                self._drop_segment(segment, rotated=False)
+            self.segments = []
+            if self.index is not None:
+                self.index.clear(self.total_packets)
+
+    def remove(self) -> None:
+        """세그먼트와 스풀 디렉토리 삭제"""
+        with self.lock:
+            self.clear()
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    # 복구 ---------------------------------------------------------------
+
+    def _recover(self) -> None:
+        """디렉토리에 남아 있는 세그먼트와 역색인 복구 (복구 후 기록은 새 세그먼트에서 시작)"""
+        found = []
+        for path in self.directory.glob("segment_*.pcap"):
+            match = SEGMENT_NAME.match(path.name)
+            if match:
+                found.append((int(match.group(1)), int(match.group(2)), path))
+
+        for sequence, first_packet, path in sorted(found):
+            segment = SpoolSegment(sequence, path, first_packet, size=path.stat().st_size)
+            try:
+                data = segment.index_path.read_bytes()
+            except FileNotFoundError:
+                data = b""
+            # 마지막 pcap 버퍼가 기록되지 않은 채 종료된 경우 파일 안에 있는 레코드까지만 사용
+            entries = [
+                entry
+                for entry in INDEX_RECORD.iter_unpack(data[: len(data) - len(data) % INDEX_RECORD.size])
+                if entry[2] + PCAP_RECORD_HEADER_SIZE <= segment.size
+            ]
+            segment.packet_count = len(entries)
+            if entries:
+                segment.first_timestamp = entries[0][0] / 1_000_000_000
+                segment.last_timestamp = entries[-1][0] / 1_000_000_000
+            self.segments.append(segment)
+
+        if not self.segments:
+            return
+        last = self.segments[-1]
+        self.total_packets = last.first_packet + last.packet_count
+        self._next_sequence = last.sequence + 1
+        logger.info(f"스풀 세그먼트 복구: {self.directory} ({len(self.segments)}개, {len(self)}개 패킷)")
+
+        if self.index is not None:
+            self._recover_index()
+
+    def _recover_index(self) -> None:
+        """세그먼트 체크포인트를 불러오고, 체크포인트가 없거나 손상된 세그먼트는 다시 색인"""
+        self.index.clear(self.segments[0].first_packet)
+        for segment in self.segments:
+            if segment.first_packet != self.index.next_number:
+                logger.warning(f"스풀 세그먼트 번호가 연속적이지 않습니다: {segment.path}")
+                self.index.clear(segment.first_packet)
+            try:
+                self.index.load(postings_path(segment.path), expected_count=segment.packet_count)
+                continue
+            except (OSError, ValueError, KeyError) as e:
+                # 체크포인트가 없거나 세그먼트와 맞지 않으면 세그먼트를 읽어 다시 색인
+                logger.debug(f"세그먼트 인덱스 재구성: {segment.path} ({e})")
+            self._reindex_segment(segment)
+            self.index.checkpoint(postings_path(segment.path))
+
+    def _reindex_segment(self, segment: SpoolSegment) -> None:
+        number = segment.first_packet
+        try:
+            reader = PcapReader(segment.path)
+        except (OSError, ValueError):
+            reader = None
+        if reader is not None:
+            with reader:
+                for record in reader:
+                    if number == segment.first_packet + segment.packet_count:
+                        break
+                    packet = decode_packet(record)
+                    del record
+                    if packet is None:
+                        self.index.skip(number)
+                    else:
+                        self.index.add(number, packet)
+                    number += 1
+        while number < segment.first_packet + segment.packet_count:
+            self.index.skip(number)
+            number += 1
+
+    # 조회 ---------------------------------------------------------------
+
+    def _snapshot(self) -> List[SpoolSegment]:
+        """조회용 세그먼트 목록 (현재 세그먼트 버퍼를 먼저 기록)"""
+        with self.lock:
+            self.flush()
+            return [SpoolSegment(**vars(segment)) for segment in self.segments]
+
+    @staticmethod
+    def _load_index(segment: SpoolSegment) -> List[Tuple[int, int, int]]:
+        with open(segment.index_path, "rb") as f:
+            data = f.read(segment.packet_count * INDEX_RECORD.size)
+        return list(INDEX_RECORD.iter_unpack(data))
+
+    @staticmethod
+    def _read_segment(segment: SpoolSegment, offset: int, count: int) -> Iterator[PacketInfo]:
+        """세그먼트의 offset 위치부터 count개 패킷 디코딩"""
+        if count <= 0:
+            return
+        try:
+            reader = PcapReader(segment.path)
+        except FileNotFoundError:
+            return  # 링 회전으로 삭제된 세그먼트
+        with reader:
+            for record in reader.iter_from(offset):
+                packet = decode_packet(record)
+                del record
+                if packet is not None:
+                    yield packet
+                count -= 1
+                if not count:
+                    break
+
+    def read(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[PacketInfo]:
+        """
+        보존 중인 패킷을 순서대로 지연 읽기
+
+        Args:
+            offset: 보존 중인 첫 패킷 기준 시작 위치
+            limit: 최대 패킷 수 (None이면 끝까지)
+
+        Yields:
+            PacketInfo: 세그먼트에서 디코딩한 패킷
+        """
+        segments = self._snapshot()
+        if not segments:
+            return
+        start = segments[0].first_packet + max(0, offset)
+        remaining = limit
+
+        position = max(0, bisect.bisect_right([segment.first_packet for segment in segments], start) - 1)
+        for segment in segments[position:]:
+            if remaining is not None and remaining <= 0:
+                break
+            local = start - segment.first_packet
+            if local >= segment.packet_count:
+                continue
+            count = segment.packet_count - local
+            if remaining is not None:
+                count = min(count, remaining)
+                remaining -= count
+
+            record_offset = self._load_index(segment)[local][2] if local else PCAP_GLOBAL_HEADER_SIZE
+            yield from self._read_segment(segment, record_offset, count)
+            start = segment.first_packet + segment.packet_count
+
+    def read_numbers(self, numbers: List[int]) -> Iterator[Tuple[int, PacketInfo]]:
+        """
+        패킷 번호 목록의 패킷 읽기 (역색인 조회 결과용, 레코드 단위 임의 접근)
+
+        Args:
+            numbers: 오름차순 패킷 번호 목록
+
+        Yields:
+            tuple: (패킷 번호, 패킷) - 삭제되었거나 디코딩할 수 없는 패킷은 건너뜀
+        """
+        segments = self._snapshot()
+        starts = [segment.first_packet for segment in segments]
+        current, wanted = None, []
+        for number in numbers:
+            position = bisect.bisect_right(starts, number) - 1
+            if position < 0 or number >= starts[position] + segments[position].packet_count:
+                continue  # 링 회전으로 삭제된 번호
+            if position != current:
+                if wanted:
+                    yield from self._read_numbers_in_segment(segments[current], wanted)
+                current, wanted = position, []
+            wanted.append(number)
+        if wanted:
+            yield from self._read_numbers_in_segment(segments[current], wanted)
+
+    def _read_numbers_in_segment(self, segment: SpoolSegment, wanted: List[int]) -> Iterator[Tuple[int, PacketInfo]]:
+        entries = self._load_index(segment)
+        try:
+            reader = PcapReader(segment.path)
+        except FileNotFoundError:
+            return
+        with reader:
+            for number in wanted:
+                local = number - segment.first_packet
+                if local >= len(entries):
+                    break
+                record = next(reader.iter_from(entries[local][2]), None)
+                packet = decode_packet(record) if record is not None else None
+                del record
+                if packet is not None:
+                    yield number, packet
+
+    def iter_range(self, start_time: Optional[float] = None, end_time: Optional[float] = None) -> Iterator[PacketInfo]:
+        """
+        시간 구간 [start_time, end_time)의 패킷 읽기 (범위 밖 세그먼트는 열지 않음)
+        """
+        start_ns = None if start_time is None else round(start_time * 1_000_000_000)
+        end_ns = None if end_time is None else round(end_time * 1_000_000_000)
+
+        for segment in self._snapshot():
+            if not segment.packet_count:
+                continue
+            if start_time is not None and segment.last_timestamp < start_time:
+                continue
+            if end_time is not None and segment.first_timestamp >= end_time:
+                continue
+
+            entries = self._load_index(segment)
+            selected = [
+                (position, entry[2])
+                for position, entry in enumerate(entries)
+                if (start_ns is None or entry[0] >= start_ns) and (end_ns is None or entry[0] < end_ns)
+            ]
+            if selected:
+                first, last = selected[0][0], selected[-1][0]
+                wanted = {position for position, _ in selected}
+                packets = self._read_segment(segment, selected[0][1], last - first + 1)
+                for position, packet in enumerate(packets, first):
+                    if position in wanted:
+                        yield packet
+
+    def iter_flow(self, packet: Any) -> Iterator[PacketInfo]:
+        """
+        주어진 패킷과 같은 플로우(양방향)의 패킷 읽기
+
+        인덱스의 플로우 해시로 후보 레코드만 디코딩합니다.
+        """
+        target = flow_key(packet.protocol, packet.src_ip, packet.src_port, packet.dst_ip, packet.dst_port)[0]
+        target_hash = hash(target) & 0xFFFFFFFFFFFFFFFF
+
+        for segment in self._snapshot():
+            offsets = [entry[2] for entry in self._load_index(segment) if entry[1] == target_hash]
+            for offset in offsets:
+                for candidate in self._read_segment(segment, offset, 1):
+                    key = flow_key(
+                        candidate.protocol,
+                        candidate.src_ip,
+                        candidate.src_port,
+                        candidate.dst_ip,
+                        candidate.dst_port,
+                    )[0]
+                    if key == target:
+                        yield candidate
+
+    def export_pcap(self, output: Union[str, Path]) -> Dict[str, Any]:
+        """
+        보존 중인 세그먼트를 하나의 pcap으로 내보내기 (레코드 단위 스트리밍 복사)
+
+        Returns:
+            dict: 내보내기 결과 (패킷 수, 세그먼트 수)
+        """
+        segments = self._snapshot()
+        with PcapWriter(output, snaplen=self.snaplen, nanosecond=True) as writer:
+            for segment in segments:
+                try:
+                    reader = PcapReader(segment.path)
+                except FileNotFoundError:
+                    continue
+                with reader:
+                    for record in reader:
+                        writer.write_record(record)
+            exported = writer.packets_written
+        return {"output_path": str(output), "exported_count": exported, "segments": len(segments)}
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """스풀 통계"""
+        with self.lock:
+            return {
+                "directory": str(self.directory),
+                "segments": len(self.segments),
+                "retained_packets": self.total_packets - self.first_retained,
+                "total_packets": self.total_packets,
+                "disk_bytes": sum(segment.size for segment in self.segments),
+                "dropped_segments": self.dropped_segments,
+                "dropped_packets": self.dropped_packets,
+                "segment_max_bytes": self.segment_max_bytes,
+                "segment_max_duration": self.segment_max_duration,
+                "max_segments": self.max_segments,
+            }
+
+    def get_segments(self) -> List[Dict[str, Any]]:
+        """세그먼트 목록"""
+        with self.lock:
+            return [segment.to_dict() for segment in self.segments]
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+병렬 DPI 파이프라인
+패킷을 플로우 해시로 파티션하여 워커 프로세스에 고정 배정하므로 플로우별 상태가 한 워커에만
+존재합니다. 배치마다 페이로드를 공유 메모리 블록 하나에 기록하고 워커에는 (오프셋, 길이)만
+전달하여 페이로드를 피클링하지 않으며, 결과는 캡처 순서대로 병합됩니다.
+
+오프라인 대용량 캡처 분석처럼 패킷 수가 많은 경우에 사용합니다. 워커가 1개 이하이면
+현재 프로세스에서 순서대로 분석합니다.
+"""
+
+import multiprocessing
+import os
+import queue
+import sys
+import time
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import fields
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from utils.unified_logger import get_logger
+
+from .analyzers.flow_table import flow_key
+from .base_sniffer import PacketInfo
+
+DEFAULT_BATCH_SIZE = 2048
+DEFAULT_MAX_IN_FLIGHT = 2  # 동시에 처리 중인 배치 수 (배치 준비와 분석을 겹침)
+WORKER_POLL_INTERVAL = 1.0  # 초
+
+_PACKET_FIELDS = tuple(field.name for field in fields(PacketInfo) if field.name != "payload")
+
+logger = get_logger(__name__)
+
+
+def _field(packet: Any, name: str, default: Any = None) -> Any:
+    if isinstance(packet, Mapping):
+        return packet.get(name, default)
+    return getattr(packet, name, default)
+
+
+def flow_partition_key(packet: Any) -> tuple:
+    """방향 정규화된 5-튜플 (같은 연결의 양방향 패킷은 같은 파티션)"""
+    key, _ = flow_key(
+        _field(packet, "protocol", ""),
+        _field(packet, "src_ip"),
+        _field(packet, "src_port"),
+        _field(packet, "dst_ip"),
+        _field(packet, "dst_port"),
+    )
+    return key
+
+
+def source_partition_key(packet: Any) -> Any:
+    """출발지 IP (출발지별 상태를 가진 분석기용)"""
+    return _field(packet, "src_ip")
+
+
+def _encode_packet(packet: Any):
+    """(종류, 페이로드를 제외한 필드, 페이로드) 분리"""
+    if isinstance(packet, PacketInfo):
+        return "packet", {name: getattr(packet, name) for name in _PACKET_FIELDS}, packet.payload
+    if isinstance(packet, Mapping):
+        values = dict(packet)
+        return "dict", values, values.pop("payload", None)
+    raise TypeError(f"지원하지 않는 패킷 타입: {type(packet).__name__}")
+
+
+def _decode_packet(kind: str, values: Dict[str, Any], payload: Any) -> Any:
+    if kind == "packet":
+        return PacketInfo(payload=payload, **values)
+    if payload is not None:
+        values["payload"] = payload
+    return values
+
+
+def _attach_block(name: str) -> shared_memory.SharedMemory:
+    """워커에서 공유 메모리 블록 연결 (해제/삭제는 생성한 메인 프로세스가 담당)"""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    block = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(block._name, "shared_memory")
+    return block
+
+
+def _pipeline_worker(task_queue, result_queue, handler_factory: Callable[[], Any], method: str) -> None:
+    """워커 프로세스: 고정 배정된 파티션의 패킷을 순서대로 분석"""
+    handler = getattr(handler_factory(), method)
+
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+
+        batch_id, shm_name, items = task
+        block = _attach_block(shm_name) if shm_name else None
+        results = []
+        try:
+            for seq, kind, values, offset, length, inline_payload in items:
+                # 분석기는 bytes 메서드를 사용하므로 분석할 패킷의 페이로드만 복사
+                payload = bytes(block.buf[offset : offset + length]) if length >= 0 else inline_payload
+                try:
+                    results.append((seq, handler(_decode_packet(kind, values, payload))))
+                except Exception as e:
+                    results.append((seq, {"error": str(e)}))
+        finally:
+            if block is not None:
+                block.close()
+        result_queue.put((batch_id, results))
+
+
+class _Batch:
+    """처리 중인 배치"""
+
+    __slots__ = ("batch_id", "size", "block", "pending", "results")
+
+    def __init__(self, batch_id: int, size: int, block: Optional[shared_memory.SharedMemory]):
+        self.batch_id = batch_id
+        self.size = size
+        self.block = block
+        self.pending = 0
+        self.results: List[Any] = [None] * size
+
+    def release(self) -> None:
+        if self.block is not None:
+            self.block.close()
+            self.block.unlink()
+            self.block = None
+
+
+class DPIPipeline:
+    """플로우 파티션 기반 병렬 패킷 분석 파이프라인"""
+
+    def __init__(
+        self,
+        handler_factory: Callable[[], Any],
+        method: str,
+        workers: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        partition_key: Callable[[Any], Any] = flow_partition_key,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    ):
+        """
+        파이프라인 초기화
+
+        Args:
+            handler_factory: 워커마다 분석기를 생성하는 피클 가능한 호출 객체 (클래스, functools.partial 등)
+            method: 패킷 하나를 받아 결과를 반환하는 분석기 메서드 이름
+            workers: 워커 프로세스 수 (None이면 CPU 수, 0/1이면 현재 프로세스에서 분석)
+            batch_size: 공유 메모리 블록 하나에 담는 패킷 수
+            partition_key: 파티션 키 함수 (같은 키의 패킷은 항상 같은 워커에서 순서대로 분석)
+            max_in_flight: 동시에 처리 중인 최대 배치 수
+        """
+        self.handler_factory = handler_factory
+        self.method = method
+        self.workers = os.cpu_count() or 1 if workers is None else workers
+        self.batch_size = max(1, batch_size)
+        self.partition_key = partition_key
+        self.max_in_flight = max(1, max_in_flight)
+        self.logger = logger
+
+        self._processes: List[multiprocessing.Process] = []
+        self._task_queues: List[Any] = []
+        self._result_queue = None
+        self._handler = None
+        self._next_batch_id = 0
+        self.stats = {"packets": 0, "batches": 0, "payload_bytes": 0, "elapsed": 0.0}
+        self.worker_packets = [0] * max(1, self.workers)
+
+    def __enter__(self) -> "DPIPipeline":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @property
+    def parallel(self) -> bool:
+        return self.workers > 1
+
+    def start(self) -> None:
+        """워커 프로세스 시작 (이미 시작되었으면 무시)"""
+        if not self.parallel:
+            if self._handler is None:
+                self._handler = getattr(self.handler_factory(), self.method)
+            return
+        if self._processes:
+            return
+
+        self._result_queue = multiprocessing.Queue()
+        for worker_id in range(self.workers):
+            task_queue = multiprocessing.Queue()
+            process = multiprocessing.Process(
+                target=_pipeline_worker,
+                args=(task_queue, self._result_queue, self.handler_factory, self.method),
+                name=f"dpi-worker-{worker_id}",
+                daemon=True,
+            )
+            process.start()
+            self._task_queues.append(task_queue)
+            self._processes.append(process)
+        self.logger.info(f"DPI 파이프라인 시작: 워커 {self.workers}개")
+
+    def close(self) -> None:
+        """워커 프로세스 종료"""
+        for task_queue in self._task_queues:
+            task_queue.put(None)
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        self._task_queues = []
+        self._result_queue = None
+
+    def analyze(self, packets: Iterable[Any]) -> Iterator[Any]:
+        """
+        패킷을 분석하여 결과를 캡처 순서대로 스트리밍
+
+        Args:
+            packets: PacketInfo 또는 패킷 딕셔너리 (PacketView 포함)
+
+        Yields:
+            패킷별 분석 결과 (분석기 예외는 {"error": ...})
+        """
+        self.start()
+        started = time.perf_counter()
+        try:
+            if not self.parallel:
+                yield from self._analyze_inline(packets)
+                return
+
+            in_flight = deque()
+            active: Dict[int, _Batch] = {}
+            try:
+                for packet_batch in self._batches(packets):
+                    batch = self._submit(packet_batch)
+                    active[batch.batch_id] = batch
+                    in_flight.append(batch)
+                    while len(in_flight) >= self.max_in_flight:
+                        yield from self._finish(in_flight.popleft(), active)
+                while in_flight:
+                    yield from self._finish(in_flight.popleft(), active)
+            finally:
+                for batch in active.values():
+                    batch.release()
+        finally:
+            self.stats["elapsed"] += time.perf_counter() - started
+
+    def analyze_batch(self, packets: Iterable[Any]) -> List[Any]:
+        """패킷 목록을 분석하여 캡처 순서의 결과 목록 반환"""
+        return list(self.analyze(packets))
+
+    def _analyze_inline(self, packets: Iterable[Any]) -> Iterator[Any]:
+        for packet in packets:
+            self.stats["packets"] += 1
+            try:
+                yield self._handler(packet)
+            except Exception as e:
+                yield {"error": str(e)}
+
+    def _batches(self, packets: Iterable[Any]) -> Iterator[List[Any]]:
+        batch = []
+        for packet in packets:
+            batch.append(packet)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _submit(self, packets: List[Any]) -> _Batch:
+        """배치 페이로드를 공유 메모리에 기록하고 파티션별로 워커에 전달"""
+        encoded = [_encode_packet(packet) for packet in packets]
+        total = sum(len(payload) for _, _, payload in encoded if isinstance(payload, (bytes, bytearray, memoryview)))
+        block = shared_memory.SharedMemory(create=True, size=total) if total else None
+
+        batch = _Batch(self._next_batch_id, len(packets), block)
+        self._next_batch_id += 1
+        partitions: List[List[tuple]] = [[] for _ in range(self.workers)]
+        position = 0
+
+        for seq, (packet, (kind, values, payload)) in enumerate(zip(packets, encoded)):
+            if isinstance(payload, (bytes, bytearray, memoryview)):
+                length = len(payload)
+                block.buf[position : position + length] = payload
+                item = (seq, kind, values, position, length, None)
+                position += length
+            else:
+                item = (seq, kind, values, 0, -1, payload)
+            partitions[hash(self.partition_key(packet)) % self.workers].append(item)
+
+        for worker_id, items in enumerate(partitions):
+            if items:
+                self._task_queues[worker_id].put((batch.batch_id, block.name if block else None, items))
+                self.worker_packets[worker_id] += len(items)
+                batch.pending += 1
+
+        self.stats["batches"] += 1
+        self.stats["packets"] += len(packets)
+        self.stats["payload_bytes"] += total
+        return batch
+
+    def _finish(self, batch: _Batch, active: Dict[int, _Batch]) -> Iterator[Any]:
+        """배치의 모든 파티션 결과를 수집하여 캡처 순서대로 반환 (뒤 배치 결과는 해당 배치에 보관)"""
+        while batch.pending:
+            batch_id, results = self._next_result()
+            owner = active[batch_id]
+            for seq, result in results:
+                owner.results[seq] = result
+            owner.pending -= 1
+
+        del active[batch.batch_id]
+        batch.release()
+        yield from batch.results
+
+    def _next_result(self):
+        while True:
+            try:
+                return self._result_queue.get(timeout=WORKER_POLL_INTERVAL)
+            except queue.Empty:
+                dead = [process.name for process in self._processes if not process.is_alive()]
+                if dead:
+                    raise RuntimeError(f"DPI 워커 프로세스가 종료되었습니다: {', '.join(dead)}")
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """파이프라인 처리 통계"""
+        stats = dict(self.stats)
+        elapsed = stats.pop("elapsed")
+        return {
+            "workers": self.workers,
+            "batch_size": self.batch_size,
+            **stats,
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "packets_per_sec": round(stats["packets"] / elapsed, 1) if elapsed else 0.0,
+            "worker_packets": list(self.worker_packets) if self.parallel else [stats["packets"]],
+        }
@@ -7,15 +7,22 @@
 from .csv_exporter import CSVExporter, create_csv_exporter
 from .json_exporter import JSONExporter, create_json_exporter
 from .pcap_exporter import PCAPExporter, create_pcap_exporter
+from .pcap_io import PcapReader, PcapRecord, PcapWriter, decode_packet, merge_pcap, read_packets
 from .report_exporter import ReportExporter, create_report_exporter
 
 __all__ = [
     "CSVExporter",
     "JSONExporter",
     "PCAPExporter",
+    "PcapReader",
+    "PcapRecord",
+    "PcapWriter",
     "ReportExporter",
     "create_csv_exporter",
     "create_json_exporter",
     "create_pcap_exporter",
     "create_report_exporter",
+    "decode_packet",
+    "merge_pcap",
+    "read_packets",
 ]
@@ -7,9 +7,14 @@ PCAP 내보내기
 import logging
 import socket
 import struct
+from collections import Counter
+from collections.abc import Sized
 from datetime import datetime
 from pathlib import Path
-from typing import Any, BinaryIO, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from ..base_sniffer import PacketInfo
+from .pcap_io import DEFAULT_WRITE_BUFFER, PcapWriter, merge_pcap, read_packets
 
 logger = logging.getLogger(__name__)
 
@@ -35,16 +40,18 @@ class PCAPExporter:
     DLT_RAW = 12  # Raw IP
     DLT_LINUX_SLL = 113  # Linux cooked
 
-    def __init__(self, snaplen: int = 65535, network: int = DLT_EN10MB):
+    def __init__(self, snaplen: int = 65535, network: int = DLT_EN10MB, buffer_size: int = DEFAULT_WRITE_BUFFER):
         """
         PCAP 내보내기 초기화
 
         Args:
             snaplen: 최대 패킷 크기
             network: 네트워크 타입 (DLT 값)
+            buffer_size: 파일 쓰기 버퍼 크기 (바이트)
         """
         self.snaplen = snaplen
         self.network = network
+        self.buffer_size = buffer_size
         self.statistics = {
             "exported_files": 0,
             "exported_packets": 0,
@@ -54,7 +61,7 @@ class PCAPExporter:
 
     def export_packets(
         self,
-        packets: List[Dict[str, Any]],
+        packets: Iterable[Dict[str, Any]],
         output_path: str,
         include_metadata: bool = False,
     ) -> Dict[str, Any]:
@@ -62,7 +69,7 @@ class PCAPExporter:
         패킷 목록을 PCAP 파일로 내보내기
 
         Args:
-            packets: 패킷 데이터 목록
+            packets: 패킷 데이터 목록 또는 이터레이터 (한 번만 순회하며 버퍼 단위로 기록)
             output_path: 출력 파일 경로
             include_metadata: 메타데이터 포함 여부
 
@@ -70,35 +77,42 @@ class PCAPExporter:
             dict: 내보내기 결과
         """
         try:
-            if not packets:
+            if isinstance(packets, Sized) and not packets:
                 return {
                     "success": False,
                     "error": "내보낼 패킷 데이터가 없습니다",
                     "exported_count": 0,
                 }
 
-            # 출력 디렉토리 생성
-            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-
-            exported_count = 0
+            seen = 0
             total_bytes = 0
+            summary = _PacketSummary() if include_metadata else None
 
-            with open(output_path, "wb") as pcap_file:
-                # PCAP 글로벌 헤더 작성
-                self._write_global_header(pcap_file)
-
+            with PcapWriter(
+                output_path, linktype=self.network, snaplen=self.snaplen, buffer_size=self.buffer_size
+            ) as writer:
                 for packet in packets:
+                    seen += 1
+                    if summary is not None:
+                        summary.add(packet)
                     packet_data = self._extract_packet_data(packet)
                     if packet_data:
-                        timestamp = self._extract_timestamp(packet)
-                        self._write_packet_record(pcap_file, packet_data, timestamp)
-                        exported_count += 1
+                        writer.write(packet_data, self._extract_timestamp(packet))
                         total_bytes += len(packet_data)
+                exported_count = writer.packets_written
+
+            if not seen:
+                Path(output_path).unlink(missing_ok=True)
+                return {
+                    "success": False,
+                    "error": "내보낼 패킷 데이터가 없습니다",
+                    "exported_count": 0,
+                }
 
             # 메타데이터 파일 생성 (선택사항)
             if include_metadata:
                 metadata_path = output_path + ".meta"
-                self._write_metadata_file(metadata_path, packets, exported_count)
+                self._write_metadata_file(metadata_path, summary, exported_count)
 
             file_size = Path(output_path).stat().st_size
 
@@ -294,41 +308,6 @@ class PCAPExporter:
             logger.error(f"시간별 PCAP 내보내기 오류: {e}")
             return {"success": False, "error": str(e), "exported_files": 0}
 
-    def _write_global_header(self, pcap_file: BinaryIO):
-        """PCAP 글로벌 헤더 작성"""
-        header = struct.pack(
-            "<IHHIIII",
-            0xA1B2C3D4,  # magic number
-            2,  # version major
-            4,  # version minor
-            0,  # thiszone
-            0,  # sigfigs
-            self.snaplen,  # snaplen
-            self.network,  # network
-        )
-        pcap_file.write(header)
-
-    def _write_packet_record(self, pcap_file: BinaryIO, packet_data: bytes, timestamp: float):
-        """패킷 레코드 작성"""
-        # 타임스탬프를 초와 마이크로초로 분리
-        ts_sec = int(timestamp)
-        ts_usec = int((timestamp - ts_sec) * 1000000)
-
-        # 패킷 길이 제한
-        caplen = min(len(packet_data), self.snaplen)
-
-        # 패킷 헤더 작성
-        packet_header = struct.pack(
-            "<IIII",
-            ts_sec,  # timestamp seconds
-            ts_usec,  # timestamp microseconds
-            caplen,  # captured length
-            len(packet_data),  # original length
-        )
-
-        pcap_file.write(packet_header)
-        pcap_file.write(packet_data[:caplen])
-
     def _extract_packet_data(self, packet: Dict[str, Any]) -> Optional[bytes]:
         """패킷에서 바이너리 데이터 추출"""
         try:
@@ -534,7 +513,7 @@ class PCAPExporter:
     def _write_metadata_file(
         self,
         metadata_path: str,
-        packets: List[Dict[str, Any]],
+        summary: "_PacketSummary",
         exported_count: int,
     ):
         """메타데이터 파일 작성"""
@@ -542,16 +521,16 @@ class PCAPExporter:
             metadata = {
                 "export_info": {
                     "timestamp": datetime.now().isoformat(),
-                    "total_packets": len(packets),
+                    "total_packets": summary.total,
                     "exported_packets": exported_count,
                     "exporter": "FortiGate Nextrade PCAP Exporter",
                 },
                 "capture_info": {
                     "snaplen": self.snaplen,
                     "network_type": self.network,
-                    "protocols": list(set(p.get("protocol", "unknown") for p in packets)),
+                    "protocols": list(summary.protocols),
                 },
-                "statistics": self._generate_packet_statistics(packets),
+                "statistics": summary.statistics(),
             }
 
             import json
@@ -564,69 +543,51 @@ class PCAPExporter:
 
     def _generate_packet_statistics(self, packets: List[Dict[str, Any]]) -> Dict[str, Any]:
         """패킷 통계 생성"""
-        from collections import Counter
-
-        protocols = Counter(p.get("protocol", "unknown") for p in packets)
-        src_ips = Counter(p.get("src_ip") for p in packets if p.get("src_ip"))
-        dst_ips = Counter(p.get("dst_ip") for p in packets if p.get("dst_ip"))
-
-        return {
-            "protocol_distribution": dict(protocols),
-            "top_src_ips": dict(src_ips.most_common(10)),
-            "top_dst_ips": dict(dst_ips.most_common(10)),
-            "total_packets": len(packets),
-        }
+        summary = _PacketSummary()
+        for packet in packets:
+            summary.add(packet)
+        return summary.statistics()
 
     def merge_pcap_files(self, input_files: List[str], output_path: str) -> Dict[str, Any]:
-        """여러 PCAP 파일을 하나로 병합"""
-        try:
-            total_packets = 0
-
-            with open(output_path, "wb") as output_file:
-                # 글로벌 헤더 작성
-                self._write_global_header(output_file)
-
-                for input_file in input_files:
-                    if not Path(input_file).exists():
-                        logger.warning(f"파일이 존재하지 않음: {input_file}")
-                        continue
-
-                    with open(input_file, "rb") as input_f:
-                        # 글로벌 헤더 건너뛰기
-                        input_f.seek(24)
-
-                        # 패킷 레코드 복사
-                        while True:
-                            packet_header = input_f.read(16)
-                            if not packet_header or len(packet_header) < 16:
-                                break
-
-                            caplen = struct.unpack("<I", packet_header[8:12])[0]
-                            packet_data = input_f.read(caplen)
+        """
+        여러 PCAP/PCAPNG 파일을 타임스탬프 순으로 병합
 
-                            if len(packet_data) < caplen:
-                                break
+        입력 엔디언/타임스탬프 정밀도와 무관하며, 입력 중 나노초 캡처가 있으면 나노초 pcap으로 기록합니다.
+        """
+        try:
+            existing = []
+            for input_file in input_files:
+                if Path(input_file).exists():
+                    existing.append(input_file)
+                else:
+                    logger.warning(f"파일이 존재하지 않음: {input_file}")
 
-                            output_file.write(packet_header)
-                            output_file.write(packet_data)
-                            total_packets += 1
+            result = merge_pcap(existing, output_path, buffer_size=self.buffer_size)
+            for truncated in result["truncated_files"]:
+                logger.warning(f"잘린 캡처 파일 (마지막 레코드 제외): {truncated}")
 
             file_size = Path(output_path).stat().st_size
+            total_packets = result["total_packets"]
 
             logger.info(f"PCAP 파일 병합 완료: {output_path} ({total_packets}개 패킷)")
 
             return {
                 "success": True,
                 "output_path": output_path,
-                "merged_files": len(input_files),
+                "merged_files": result["merged_files"],
                 "total_packets": total_packets,
                 "file_size": file_size,
+                "truncated_files": result["truncated_files"],
             }
 
         except Exception as e:
             logger.error(f"PCAP 파일 병합 오류: {e}")
             return {"success": False, "error": str(e), "merged_files": 0}
 
+    def read_packets(self, input_path: str) -> Iterator[PacketInfo]:
+        """캡처 파일을 PacketInfo 스트림으로 읽기 (mmap 기반, 메모리 사용량 일정)"""
+        return read_packets(input_path)
+
     def get_statistics(self) -> Dict[str, Any]:
         """내보내기 통계 반환"""
         return self.statistics.copy()
@@ -642,6 +603,32 @@ class PCAPExporter:
         logger.info("PCAP 내보내기 통계 초기화됨")
 
 
+class _PacketSummary:
+    """메타데이터용 패킷 통계 (스트리밍 누적)"""
+
+    def __init__(self):
+        self.total = 0
+        self.protocols: Counter = Counter()
+        self.src_ips: Counter = Counter()
+        self.dst_ips: Counter = Counter()
+
+    def add(self, packet: Dict[str, Any]) -> None:
+        self.total += 1
+        self.protocols[packet.get("protocol", "unknown")] += 1
+        if packet.get("src_ip"):
+            self.src_ips[packet["src_ip"]] += 1
+        if packet.get("dst_ip"):
+            self.dst_ips[packet["dst_ip"]] += 1
+
+    def statistics(self) -> Dict[str, Any]:
+        return {
+            "protocol_distribution": dict(self.protocols),
+            "top_src_ips": dict(self.src_ips.most_common(10)),
+            "top_dst_ips": dict(self.dst_ips.most_common(10)),
+            "total_packets": self.total,
+        }
+
+
 # 팩토리 함수
 def create_pcap_exporter(snaplen: int = 65535, network: int = PCAPExporter.DLT_EN10MB) -> PCAPExporter:
     """PCAP 내보내기 인스턴스 생성"""
@@ -0,0 +1,553 @@
+#!/usr/bin/env python3
+"""
+스트리밍 PCAP/PCAPNG 입출력
+파일을 mmap으로 열어 레코드 데이터를 복사 없이 memoryview로 반환하고, 쓰기는 큰 버퍼 단위로
+모아서 기록합니다. 리틀/빅 엔디언, 마이크로초/나노초 pcap과 pcapng(SHB/IDB/EPB/SPB)를 지원하며,
+타임스탬프는 모두 정수 나노초로 정규화합니다.
+
+수 GB 캡처도 페이지 캐시를 통해 읽으므로 메모리 사용량은 캡처 크기와 무관합니다.
+"""
+
+import heapq
+import mmap
+import os
+import socket
+import struct
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from utils.unified_logger import get_logger
+
+from ..base_sniffer import PacketInfo
+
+# 링크 계층 타입 (DLT)
+DLT_NULL = 0
+DLT_EN10MB = 1
+DLT_RAW = 12
+DLT_IPV4 = 228
+DLT_IPV6 = 229
+LINKTYPE_RAW = 101
+DLT_LINUX_SLL = 113
+
+# pcap 매직 넘버 (리틀 엔디언으로 읽은 값 -> (엔디언, 나노초 여부))
+PCAP_MAGIC_USEC = 0xA1B2C3D4
+PCAP_MAGIC_NSEC = 0xA1B23C4D
+_PCAP_MAGICS = {
+    PCAP_MAGIC_USEC: ("<", False),
+    PCAP_MAGIC_NSEC: ("<", True),
+    0xD4C3B2A1: (">", False),
+    0x4D3CB2A1: (">", True),
+}
+
+# pcapng 블록 타입
+PCAPNG_SHB = 0x0A0D0D0A
+PCAPNG_IDB = 0x00000001
+PCAPNG_SPB = 0x00000003
+PCAPNG_EPB = 0x00000006
+PCAPNG_BYTE_ORDER_MAGIC = 0x1A2B3C4D
+PCAPNG_OPT_TSRESOL = 9
+
+DEFAULT_SNAPLEN = 65535
+DEFAULT_WRITE_BUFFER = 1 << 20  # 1MB 단위로 기록
+
+NS_PER_SEC = 1_000_000_000
+
+logger = get_logger(__name__)
+
+
+class PcapRecord(NamedTuple):
+    """캡처 레코드 (data는 리더가 열려 있는 동안 유효한 memoryview)"""
+
+    timestamp_ns: int
+    data: memoryview
+    orig_len: int
+    linktype: int
+
+    @property
+    def timestamp(self) -> float:
+        return self.timestamp_ns / NS_PER_SEC
+
+
+class PcapReader:
+    """mmap 기반 pcap/pcapng 스트리밍 리더"""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        캡처 파일 열기
+
+        Args:
+            path: pcap 또는 pcapng 파일 경로
+
+        Raises:
+            ValueError: 지원하지 않는 형식이거나 헤더가 손상된 경우
+        """
+        self.path = str(path)
+        self.truncated = False  # 마지막 레코드가 잘린 채 끝났는지
+        self._file = open(self.path, "rb")
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            if size < 12:
+                raise ValueError(f"캡처 파일이 너무 짧습니다: {self.path}")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        if hasattr(self._map, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+            self._map.madvise(mmap.MADV_SEQUENTIAL)
+        self._view = memoryview(self._map)
+
+        (magic,) = struct.unpack_from("<I", self._map, 0)
+        if magic == PCAPNG_SHB:
+            self.format = "pcapng"
+            self.nanosecond = False
+            self.linktype, self.snaplen = self._first_interface()
+        elif magic in _PCAP_MAGICS:
+            if size < 24:
+                self.close()
+                raise ValueError(f"pcap 글로벌 헤더가 손상되었습니다: {self.path}")
+            self.format = "pcap"
+            self.byte_order, self.nanosecond = _PCAP_MAGICS[magic]
+            self.snaplen, network = struct.unpack_from(self.byte_order + "II", self._map, 16)
+            self.linktype = network & 0x0FFFFFFF  # 상위 비트는 FCS 정보
+        else:
+            self.close()
+            raise ValueError(f"지원하지 않는 캡처 형식입니다 (magic=0x{magic:08x}): {self.path}")
+
+    def __enter__(self) -> "PcapReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[PcapRecord]:
+        if self.format == "pcap":
+            return self._iter_pcap()
+        return self._iter_pcapng()
+
+    def close(self) -> None:
+        """mmap 해제 (반환한 레코드의 data가 남아 있으면 참조가 사라질 때 해제)"""
+        if self._map is None:
+            return
+        self._view.release()
+        try:
+            self._map.close()
+        except BufferError:
+            logger.debug(f"레코드 뷰가 남아 있어 mmap 해제를 지연합니다: {self.path}")
+        self._map = None
+        self._file.close()
+
+    def iter_from(self, offset: int) -> Iterator[PcapRecord]:
+        """
+        지정한 레코드 오프셋부터 순회 (pcap 전용, 사이드카 인덱스로 위치를 찾은 경우)
+
+        Args:
+            offset: 레코드 헤더의 파일 오프셋
+        """
+        if self.format != "pcap":
+            raise ValueError("오프셋 기반 순회는 pcap 형식만 지원합니다")
+        return self._iter_pcap(offset)
+
+    def _iter_pcap(self, offset: int = 24) -> Iterator[PcapRecord]:
+        header = struct.Struct(self.byte_order + "IIII")
+        scale = 1 if self.nanosecond else 1000
+        view, size, linktype = self._view, len(self._map), self.linktype
+
+        while offset + 16 <= size:
+            ts_sec, ts_frac, caplen, orig_len = header.unpack_from(view, offset)
+            start = offset + 16
+            offset = start + caplen
+            if offset > size:
+                self.truncated = True
+                return
+            yield PcapRecord(ts_sec * NS_PER_SEC + ts_frac * scale, view[start:offset], orig_len, linktype)
+        self.truncated = offset != size
+
+    def _iter_pcapng(self) -> Iterator[PcapRecord]:
+        view, size = self._view, len(self._map)
+        offset = 0
+        byte_order = "<"
+        interfaces: List[Tuple[int, int, Tuple[bool, int]]] = []
+
+        while offset + 12 <= size:
+            block_type = struct.unpack_from("<I", view, offset)[0]
+            if block_type == PCAPNG_SHB:
+                # 섹션마다 엔디언과 인터페이스 목록이 새로 시작
+                byte_order = self._section_byte_order(offset)
+                interfaces = []
+            else:
+                block_type = struct.unpack_from(byte_order + "I", view, offset)[0]
+            block_len = struct.unpack_from(byte_order + "I", view, offset + 4)[0]
+            if block_len < 12 or offset + block_len > size:
+                self.truncated = True
+                return
+
+            if block_type == PCAPNG_IDB:
+                interfaces.append(self._parse_interface(offset, block_len, byte_order))
+            elif block_type == PCAPNG_EPB:
+                interface_id, ts_high, ts_low, caplen, orig_len = struct.unpack_from(
+                    byte_order + "IIIII", view, offset + 8
+                )
+                linktype, _, resolution = interfaces[interface_id]
+                start = offset + 28
+                yield PcapRecord(
+                    _pcapng_timestamp_ns((ts_high << 32) | ts_low, resolution),
+                    view[start : start + caplen],
+                    orig_len,
+                    linktype,
+                )
+            elif block_type == PCAPNG_SPB:
+                linktype, snaplen, _ = interfaces[0]
+                (orig_len,) = struct.unpack_from(byte_order + "I", view, offset + 8)
+                caplen = min(orig_len, snaplen or orig_len, block_len - 16)
+                yield PcapRecord(0, view[offset + 12 : offset + 12 + caplen], orig_len, linktype)
+            offset += block_len
+        self.truncated = offset != size
+
+    def _section_byte_order(self, offset: int) -> str:
+        (order_magic,) = struct.unpack_from("<I", self._map, offset + 8)
+        if order_magic == PCAPNG_BYTE_ORDER_MAGIC:
+            return "<"
+        if struct.unpack_from(">I", self._map, offset + 8)[0] == PCAPNG_BYTE_ORDER_MAGIC:
+            return ">"
+        raise ValueError(f"pcapng 섹션 헤더가 손상되었습니다: {self.path}")
+
+    def _parse_interface(self, offset: int, block_len: int, byte_order: str) -> Tuple[int, int, Tuple[bool, int]]:
+        linktype, _, snaplen = struct.unpack_from(byte_order + "HHI", self._map, offset + 8)
+        resolution = (False, 6)  # 기본 마이크로초
+
+        position, end = offset + 16, offset + block_len - 4
+        while position + 4 <= end:
+            code, length = struct.unpack_from(byte_order + "HH", self._map, position)
+            if code == 0:
+                break
+            if code == PCAPNG_OPT_TSRESOL and length >= 1:
+                value = self._map[position + 4]
+                resolution = (bool(value & 0x80), value & 0x7F)
+            position += 4 + (length + 3) // 4 * 4
+        return linktype, snaplen, resolution
+
+    def _first_interface(self) -> Tuple[int, int]:
+        byte_order = self._section_byte_order(0)
+        offset = struct.unpack_from(byte_order + "I", self._map, 4)[0]
+        while offset + 12 <= len(self._map):
+            block_type, block_len = struct.unpack_from(byte_order + "II", self._map, offset)
+            if block_type == PCAPNG_IDB:
+                linktype, snaplen, _ = self._parse_interface(offset, block_len, byte_order)
+                return linktype, snaplen
+            if block_len < 12:
+                break
+            offset += block_len
+        return DLT_EN10MB, DEFAULT_SNAPLEN
+
+
+def _pcapng_timestamp_ns(value: int, resolution: Tuple[bool, int]) -> int:
+    power_of_two, exponent = resolution
+    if power_of_two:
+        return (value * NS_PER_SEC) >> exponent
+    if exponent <= 9:
+        return value * 10 ** (9 - exponent)
+    return value // 10 ** (exponent - 9)
+
+
+class PcapWriter:
+    """버퍼링 pcap 라이터 (리틀 엔디언, 마이크로초/나노초)"""
+
+    def __init__(
+        self,
+        target: Union[str, Path, BinaryIO],
+        linktype: int = DLT_EN10MB,
+        snaplen: int = DEFAULT_SNAPLEN,
+        nanosecond: bool = False,
+        buffer_size: int = DEFAULT_WRITE_BUFFER,
+    ):
+        """
+        pcap 파일 쓰기 시작 (글로벌 헤더 기록)
+
+        Args:
+            target: 출력 경로 또는 바이너리 파일 객체
+            linktype: 링크 계층 타입 (DLT 값)
+            snaplen: 최대 저장 길이 (초과분은 잘라서 기록)
+            nanosecond: 나노초 타임스탬프 pcap 여부
+            buffer_size: 이 크기만큼 모일 때마다 한 번에 기록
+        """
+        self._owns_file = isinstance(target, (str, Path))
+        if self._owns_file:
+            Path(target).parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(target, "wb")
+        else:
+            self._file = target
+        self.linktype = linktype
+        self.snaplen = snaplen
+        self.nanosecond = nanosecond
+        self.buffer_size = buffer_size
+        self.packets_written = 0
+        self.bytes_written = 0
+        self._divisor = 1 if nanosecond else 1000
+        self._header = struct.Struct("<IIII")
+        self._buffer = bytearray(
+            struct.pack("<IHHiIII", PCAP_MAGIC_NSEC if nanosecond else PCAP_MAGIC_USEC, 2, 4, 0, 0, snaplen, linktype)
+        )
+
+    def __enter__(self) -> "PcapWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def write(
+        self,
+        data: Union[bytes, bytearray, memoryview],
+        timestamp: Optional[float] = None,
+        orig_len: Optional[int] = None,
+        timestamp_ns: Optional[int] = None,
+    ) -> None:
+        """
+        레코드 기록
+
+        Args:
+            data: 프레임 데이터
+            timestamp: epoch 초 (timestamp_ns가 없을 때 사용)
+            orig_len: 원래 프레임 길이 (기본값은 data 길이)
+            timestamp_ns: epoch 나노초
+        """
+        if timestamp_ns is None:
+            timestamp_ns = round((timestamp or 0.0) * NS_PER_SEC)
+        seconds, fraction = divmod(timestamp_ns, NS_PER_SEC)
+        length = len(data)
+        caplen = min(length, self.snaplen)
+
+        buffer = self._buffer
+        buffer += self._header.pack(
+            seconds, fraction // self._divisor, caplen, length if orig_len is None else orig_len
+        )
+        buffer += data[:caplen] if caplen < length else data
+        self.packets_written += 1
+        self.bytes_written += caplen
+        if len(buffer) >= self.buffer_size:
+            self.flush()
+
+    def write_record(self, record: PcapRecord) -> None:
+        """리더에서 읽은 레코드 그대로 기록"""
+        self.write(record.data, orig_len=record.orig_len, timestamp_ns=record.timestamp_ns)
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self.flush()
+        if self._owns_file:
+            self._file.close()
+        self._file = None
+
+
+def merge_pcap(
+    input_files: Iterable[Union[str, Path]],
+    output: Union[str, Path, BinaryIO],
+    buffer_size: int = DEFAULT_WRITE_BUFFER,
+) -> Dict[str, Any]:
+    """
+    여러 캡처를 타임스탬프 순으로 k-way 병합
+
+    각 입력은 시간순이라고 가정하고 힙으로 병합하므로 입력 수와 무관하게 레코드를
+    하나씩만 메모리에 둡니다. 입력 중 하나라도 나노초이면 나노초 pcap으로 기록합니다.
+
+    Args:
+        input_files: pcap/pcapng 파일 경로 목록
+        output: 출력 경로 또는 바이너리 파일 객체
+        buffer_size: 쓰기 버퍼 크기
+
+    Returns:
+        dict: 병합 결과 (입력 수, 패킷 수, 잘린 입력)
+
+    Raises:
+        ValueError: 입력들의 링크 계층 타입이 다른 경우
+    """
+    readers = [PcapReader(path) for path in input_files]
+    try:
+        linktypes = {reader.linktype for reader in readers}
+        if len(linktypes) > 1:
+            raise ValueError(f"링크 계층 타입이 다른 캡처는 병합할 수 없습니다: {sorted(linktypes)}")
+
+        with PcapWriter(
+            output,
+            linktype=linktypes.pop() if linktypes else DLT_EN10MB,
+            snaplen=max((reader.snaplen for reader in readers), default=DEFAULT_SNAPLEN),
+            nanosecond=any(reader.nanosecond or reader.format == "pcapng" for reader in readers),
+            buffer_size=buffer_size,
+        ) as writer:
+            for record in heapq.merge(*readers, key=lambda record: record.timestamp_ns):
+                writer.write_record(record)
+            total = writer.packets_written
+
+        return {
+            "merged_files": len(readers),
+            "total_packets": total,
+            "truncated_files": [reader.path for reader in readers if reader.truncated],
+        }
+    finally:
+        for reader in readers:
+            reader.close()
+
+
+# 프레임 인코딩/디코딩 -----------------------------------------------------
+
+_IP_PROTOCOLS = {1: "ICMP", 6: "TCP", 17: "UDP", 58: "ICMP"}
+_PROTOCOL_NUMBERS = {"ICMP": 1, "TCP": 6, "UDP": 17}
+_TCP_FLAGS = (("FIN", 0x01), ("SYN", 0x02), ("RST", 0x04), ("PSH", 0x08), ("ACK", 0x10), ("URG", 0x20))
+_VLAN_TYPES = (0x8100, 0x88A8)
+
+
+def _network_layer(data: memoryview, linktype: int) -> Optional[Tuple[int, int]]:
+    """(이더타입, IP 헤더 오프셋)"""
+    if linktype == DLT_EN10MB:
+        if len(data) < 14:
+            return None
+        ether_type, offset = struct.unpack_from(">H", data, 12)[0], 14
+        while ether_type in _VLAN_TYPES and len(data) >= offset + 4:
+            ether_type, offset = struct.unpack_from(">H", data, offset + 2)[0], offset + 4
+        return ether_type, offset
+    if linktype == DLT_LINUX_SLL:
+        return (struct.unpack_from(">H", data, 14)[0], 16) if len(data) >= 16 else None
+    if linktype == DLT_NULL:
+        return (0x86DD if len(data) > 4 and data[4] >> 4 == 6 else 0x0800), 4
+    if linktype in (DLT_RAW, LINKTYPE_RAW, DLT_IPV4, DLT_IPV6):
+        return (0x86DD if len(data) and data[0] >> 4 == 6 else 0x0800), 0
+    return None
+
+
+def decode_packet(record: PcapRecord) -> Optional[PacketInfo]:
+    """
+    캡처 레코드를 PacketInfo로 디코딩 (IPv4/IPv6, TCP/UDP/ICMP)
+
+    Args:
+        record: 캡처 레코드
+
+    Returns:
+        PacketInfo: 디코딩된 패킷 (IP가 아니거나 잘린 프레임이면 None)
+    """
+    data = record.data
+    layer = _network_layer(data, record.linktype)
+    if layer is None:
+        return None
+    ether_type, offset = layer
+
+    if ether_type == 0x0800 and len(data) >= offset + 20:
+        header_len = (data[offset] & 0x0F) * 4
+        total_len = struct.unpack_from(">H", data, offset + 2)[0]
+        proto = data[offset + 9]
+        src_ip = socket.inet_ntop(socket.AF_INET, data[offset + 12 : offset + 16])
+        dst_ip = socket.inet_ntop(socket.AF_INET, data[offset + 16 : offset + 20])
+        end = min(len(data), offset + total_len) if total_len else len(data)  # 이더넷 패딩 제외
+        offset += header_len
+    elif ether_type == 0x86DD and len(data) >= offset + 40:
+        payload_len = struct.unpack_from(">H", data, offset + 4)[0]
+        proto = data[offset + 6]
+        src_ip = socket.inet_ntop(socket.AF_INET6, data[offset + 8 : offset + 24])
+        dst_ip = socket.inet_ntop(socket.AF_INET6, data[offset + 24 : offset + 40])
+        offset += 40
+        end = min(len(data), offset + payload_len) if payload_len else len(data)
+    else:
+        return None
+
+    src_port = dst_port = 0
+    flags: Dict[str, Any] = {}
+    if proto == 6 and end >= offset + 20:
+        src_port, dst_port = struct.unpack_from(">HH", data, offset)
+        tcp_flags = data[offset + 13]
+        flags = {name: True for name, bit in _TCP_FLAGS if tcp_flags & bit}
+        offset += (data[offset + 12] >> 4) * 4
+    elif proto == 17 and end >= offset + 8:
+        src_port, dst_port = struct.unpack_from(">HH", data, offset)
+        offset += 8
+
+    return PacketInfo(
+        timestamp=record.timestamp,
+        src_ip=src_ip,
+        dst_ip=dst_ip,
+        src_port=src_port,
+        dst_port=dst_port,
+        protocol=_IP_PROTOCOLS.get(proto, "IP"),
+        size=record.orig_len,
+        payload=bytes(data[offset:end]) if offset < end else b"",
+        flags=flags,
+    )
+
+
+def _address(ip: Optional[str], family: int) -> bytes:
+    try:
+        return socket.inet_pton(family, ip or "")
+    except (OSError, ValueError):
+        return bytes(4 if family == socket.AF_INET else 16)
+
+
+def encode_packet(packet: PacketInfo) -> bytes:
+    """
+    PacketInfo를 이더넷 프레임으로 인코딩 (decode_packet의 역변환)
+
+    주소, 포트, TCP 플래그, 페이로드를 보존합니다. TCP/UDP/ICMP 외 프로토콜 이름과
+    TCP 플래그가 아닌 flags 항목은 프레임으로 표현할 수 없으므로 저장되지 않습니다.
+    """
+    payload = packet.payload or b""
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    proto = _PROTOCOL_NUMBERS.get((packet.protocol or "").upper(), 0)
+    src_port, dst_port = (packet.src_port or 0) & 0xFFFF, (packet.dst_port or 0) & 0xFFFF
+
+    if proto == 6:
+        flags = packet.flags or {}
+        tcp_flags = sum(bit for name, bit in _TCP_FLAGS if flags.get(name))
+        transport = struct.pack(">HHIIBBHHH", src_port, dst_port, 0, 0, 0x50, tcp_flags, 65535, 0, 0)
+    elif proto == 17:
+        transport = struct.pack(">HHHH", src_port, dst_port, min(8 + len(payload), 0xFFFF), 0)
+    else:
+        transport = b""
+
+    length = len(transport) + len(payload)
+    if ":" in (packet.src_ip or "") or ":" in (packet.dst_ip or ""):
+        network = struct.pack(
+            ">IHBB16s16s",
+            6 << 28,
+            length if length <= 0xFFFF else 0,
+            58 if proto == 1 else proto,
+            64,
+            _address(packet.src_ip, socket.AF_INET6),
+            _address(packet.dst_ip, socket.AF_INET6),
+        )
+        ether_type = b"\x86\xdd"
+    else:
+        total = 20 + length
+        network = struct.pack(
+            ">BBHHHBBH4s4s",
+            0x45,
+            0,
+            total if total <= 0xFFFF else 0,  # 0이면 디코딩 시 프레임 끝까지
+            0,
+            0,
+            64,
+            proto,
+            0,
+            _address(packet.src_ip, socket.AF_INET),
+            _address(packet.dst_ip, socket.AF_INET),
+        )
+        ether_type = b"\x08\x00"
+    return bytes(12) + ether_type + network + transport + payload
+
+
+def read_packets(path: Union[str, Path]) -> Iterator[PacketInfo]:
+    """
+    캡처 파일을 PacketInfo 스트림으로 읽기
+
+    한 번에 패킷 하나의 페이로드만 복사하므로 DPIPipeline.analyze() 등에 그대로 넘겨
+    대용량 캡처를 일정한 메모리로 분석할 수 있습니다.
+    """
+    with PcapReader(path) as reader:
+        for record in reader:
+            packet = decode_packet(record)
+            del record
+            if packet is not None:
+                yield packet
@@ -7,14 +7,37 @@
 import json
 import logging
 import re
-from collections import defaultdict, deque
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
-import numpy as np
+from .window_stats import WindowedStatistics
 
 logger = logging.getLogger(__name__)
 
+PROTOCOL_NUMBERS = {"TCP": 6, "UDP": 17, "ICMP": 1}
+
+
+def extract_metric_value(packet_info: Dict[str, Any], metric: str) -> Optional[Union[int, float]]:
+    """패킷에서 메트릭 값 추출"""
+    if metric == "packet_size":
+        return packet_info.get("size", 0)
+    elif metric == "src_port":
+        return packet_info.get("src_port", 0)
+    elif metric == "dst_port":
+        return packet_info.get("dst_port", 0)
+    elif metric == "protocol_number":
+        return PROTOCOL_NUMBERS.get(packet_info.get("protocol", ""), 0)
+
+    # 중첩된 필드 지원 (예: tcp.window_size)
+    value = packet_info
+    for part in metric.split("."):
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        else:
+            return None
+    return value if isinstance(value, (int, float)) else None
+
 
 class AdvancedFilterRule:
     """고급 필터 규칙"""
@@ -112,7 +135,7 @@ class AdvancedFilterRule:
         """통계 기반 필터링"""
         try:
             params = self.parameters
-            stats = context.get("statistics", {}) if context else {}
+            stats = context.get("statistics") if context else None
 
             # 임계값 기반 필터링
             if "thresholds" in params:
@@ -250,24 +273,12 @@ class AdvancedFilterRule:
             window_size = burst_params.get("window_size", 10)
             threshold = burst_params.get("threshold", 5)
 
-            # 컨텍스트에서 최근 패킷 정보 가져오기
-            recent_packets = context.get("recent_packets", [])
-
-            if len(recent_packets) >= threshold:
-                # 윈도우 내 패킷 수 확인
-                current_time = datetime.now()
-                window_packets = [
-                    p
-                    for p in recent_packets
-                    if (
-                        current_time - datetime.fromisoformat(p.get("timestamp", current_time.isoformat()))
-                    ).total_seconds()
-                    <= window_size
-                ]
-
-                return len(window_packets) >= threshold
+            # 필터가 패킷마다 갱신하는 타임 휠에서 윈도우 내 패킷 수 조회
+            windows = context.get("statistics") if context else None
+            if not isinstance(windows, WindowedStatistics):
+                return False
 
-            return False
+            return windows.event_count(window_size, packet_info, burst_params.get("key")) >= threshold
 
         except Exception as e:
             logger.error(f"버스트 탐지 오류: {e}")
@@ -276,26 +287,7 @@ class AdvancedFilterRule:
     def _extract_metric_value(self, packet_info: Dict[str, Any], metric: str) -> Optional[Union[int, float]]:
         """패킷에서 메트릭 값 추출"""
         try:
-            if metric == "packet_size":
-                return packet_info.get("size", 0)
-            elif metric == "src_port":
-                return packet_info.get("src_port", 0)
-            elif metric == "dst_port":
-                return packet_info.get("dst_port", 0)
-            elif metric == "protocol_number":
-                protocol_map = {"TCP": 6, "UDP": 17, "ICMP": 1}
-                return protocol_map.get(packet_info.get("protocol", ""), 0)
-            else:
-                # 중첩된 필드 지원 (예: tcp.window_size)
-                parts = metric.split(".")
-                value = packet_info
-                for part in parts:
-                    if isinstance(value, dict) and part in value:
-                        value = value[part]
-                    else:
-                        return None
-                return value if isinstance(value, (int, float)) else None
-
+            return extract_metric_value(packet_info, metric)
         except Exception as e:
             logger.error(f"메트릭 값 추출 오류 ({metric}): {e}")
             return None
@@ -304,7 +296,7 @@ class AdvancedFilterRule:
         self,
         packet_info: Dict[str, Any],
         change_params: Dict[str, Any],
-        stats: Dict[str, Any],
+        stats: Optional[WindowedStatistics],
     ) -> bool:
         """변화율 확인"""
         try:
@@ -316,15 +308,12 @@ class AdvancedFilterRule:
             if current_value is None:
                 return True
 
-            # 통계에서 이전 값들 가져오기
-            historical_values = stats.get(f"historical_{metric}", [])
+            # 최근 값들의 평균 (증분 갱신된 윈도우에서 조회)
+            recent_avg = stats.recent_mean(metric) if isinstance(stats, WindowedStatistics) else None
 
-            if not historical_values:
+            if recent_avg is None or not stats.recent[metric]:
                 return True
 
-            # 최근 값들의 평균 계산
-            recent_avg = sum(historical_values[-10:]) / len(historical_values[-10:])
-
             # 변화율 계산
             if recent_avg > 0:
                 change_rate = abs(current_value - recent_avg) / recent_avg
@@ -340,7 +329,7 @@ class AdvancedFilterRule:
         self,
         packet_info: Dict[str, Any],
         outlier_params: Dict[str, Any],
-        stats: Dict[str, Any],
+        stats: Optional[WindowedStatistics],
     ) -> bool:
         """이상치 탐지"""
         try:
@@ -352,22 +341,21 @@ class AdvancedFilterRule:
             if current_value is None:
                 return False
 
-            historical_values = stats.get(f"historical_{metric}", [])
+            history = stats.get(metric) if isinstance(stats, WindowedStatistics) else None
 
-            if len(historical_values) < 10:  # 충분한 데이터가 없으면 이상치로 판단하지 않음
+            if history is None or len(history) < 10:  # 충분한 데이터가 없으면 이상치로 판단하지 않음
                 return False
 
             if method == "zscore":
-                mean_val = np.mean(historical_values)
-                std_val = np.std(historical_values)
+                std_val = history.std
 
                 if std_val > 0:
-                    z_score = abs(current_value - mean_val) / std_val
+                    z_score = abs(current_value - history.mean) / std_val
                     return z_score > threshold
 
             elif method == "iqr":
-                q1 = np.percentile(historical_values, 25)
-                q3 = np.percentile(historical_values, 75)
+                q1 = history.percentile(25)
+                q3 = history.percentile(75)
                 iqr = q3 - q1
 
                 lower_bound = q1 - threshold * iqr
@@ -546,7 +534,7 @@ class AdvancedFilter:
     def __init__(self):
         """고급 필터 초기화"""
         self.rules = {}  # rule_id -> AdvancedFilterRule
-        self.statistics = defaultdict(list)
+        self.statistics = WindowedStatistics()  # 규칙이 참조하는 증분 윈도우 집계
         self.recent_packets = deque(maxlen=1000)  # 최근 패킷 저장
         self.callbacks = []
         self.global_stats = {
@@ -569,9 +557,24 @@ class AdvancedFilter:
         """
         rule = AdvancedFilterRule(rule_id, rule_type, parameters)
         self.rules[rule_id] = rule
+        self._register_windows(rule_type, parameters)
         logger.info(f"고급 필터 규칙 추가: {rule_id} ({rule_type})")
         return rule
 
+    def _register_windows(self, rule_type: str, parameters: Dict[str, Any]) -> None:
+        """규칙이 사용하는 메트릭/버스트 윈도우를 통계 집계에 등록"""
+        if rule_type == "statistical":
+            for key in ("outlier_detection", "change_rate"):
+                metric = parameters.get(key, {}).get("metric")
+                if metric:
+                    self.statistics.track(metric)
+        elif rule_type == "time_based" and "burst_detection" in parameters:
+            burst = parameters["burst_detection"]
+            self.statistics.track_events(burst.get("window_size", 10), burst.get("key"))
+        elif rule_type == "composite":
+            for condition in parameters.get("conditions", []):
+                self._register_windows(condition.get("type"), condition.get("parameters", {}))
+
     def remove_rule(self, rule_id: str) -> bool:
         """
         필터 규칙 제거
@@ -621,11 +624,11 @@ class AdvancedFilter:
             # 통계 업데이트
             self._update_statistics(packet_info)
 
-            # 컨텍스트 생성
+            # 컨텍스트 생성 (복사 없이 증분 집계와 최근 패킷 윈도우를 그대로 참조)
             context = {
-                "statistics": dict(self.statistics),
-                "recent_packets": list(self.recent_packets),
-                "global_stats": self.global_stats.copy(),
+                "statistics": self.statistics,
+                "recent_packets": self.recent_packets,
+                "global_stats": self.global_stats,
             }
 
             result = {
@@ -684,22 +687,17 @@ class AdvancedFilter:
     def _update_statistics(self, packet_info: Dict[str, Any]):
         """통계 정보 업데이트"""
         try:
-            # 각종 메트릭 수집
-            metrics = ["size", "src_port", "dst_port", "protocol"]
-
-            for metric in metrics:
-                value = packet_info.get(metric)
-                if value is not None:
-                    # 숫자 값만 통계에 포함
-                    if isinstance(value, (int, float)):
-                        self.statistics[f"historical_{metric}"].append(value)
-                        # 최대 1000개만 유지
-                        if len(self.statistics[f"historical_{metric}"]) > 1000:
-                            self.statistics[f"historical_{metric}"] = self.statistics[f"historical_{metric}"][-1000:]
+            # 규칙이 사용하는 메트릭만 윈도우에 추가
+            for metric in self.statistics.history:
+                value = extract_metric_value(packet_info, metric)
+                if isinstance(value, (int, float)):
+                    self.statistics.add_value(metric, value)
+
+            # 버스트 탐지용 타임 휠
+            self.statistics.record_event(packet_info)
 
             # 시간대별 통계
-            current_hour = datetime.now().hour
-            self.statistics[f"hourly_packets_{current_hour}"].append(1)
+            self.statistics.record_hour(datetime.now().hour)
 
         except Exception as e:
             logger.error(f"통계 업데이트 오류: {e}")
@@ -827,6 +825,7 @@ class AdvancedFilter:
                 "active_rules": sum(1 for rule in self.rules.values() if rule.enabled),
                 "rule_statistics": rule_stats,
                 "recent_packet_count": len(self.recent_packets),
+                "hourly_packets": list(self.statistics.hourly_packets),
             }
         )
 
@@ -6,12 +6,116 @@ BPF (Berkeley Packet Filter) 필터
 
 import logging
 import re
+from functools import lru_cache
 from ipaddress import ip_address, ip_network
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 
+_KEYWORDS = {"and": "and", "&&": "and", "or": "or", "||": "or", "not": "not", "!": "not"}
+
+_TOKEN_PATTERN = re.compile(r"\(|\)|&&|\|\||[^\s()]+")
+
+
+@lru_cache(maxsize=65536)
+def _ip_key(ip_str: str) -> Optional[Tuple[int, int]]:
+    """IP 문자열을 (버전, 정수) 키로 변환 (캐시됨)"""
+    try:
+        ip = ip_address(ip_str)
+    except ValueError:
+        return None
+    return ip.version, int(ip)
+
+
+def _parse_network(network_str: str) -> Tuple[int, int, int]:
+    """네트워크 문자열을 (버전, 네트워크 주소, 마스크) 정수로 변환"""
+    network = ip_network(network_str, strict=False)
+    return network.version, int(network.network_address), int(network.netmask)
+
+
+def _net_predicate(network_str: str, fields: Tuple[str, ...]) -> Callable[[Dict[str, Any]], bool]:
+    version, network, mask = _parse_network(network_str)
+
+    def in_network(ip_str) -> bool:
+        if not ip_str:
+            return False
+        try:
+            key = _ip_key(ip_str)
+        except TypeError:
+            return False
+        return key is not None and key[0] == version and key[1] & mask == network
+
+    if len(fields) == 1:
+        field = fields[0]
+        return lambda p: in_network(p.get(field))
+    return lambda p: in_network(p.get("src_ip")) or in_network(p.get("dst_ip"))
+
+
+def _compile_node(node: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+    """파싱 트리 노드를 패킷 정보 -> bool 클로저로 변환"""
+    node_type = node.get("type")
+
+    if node_type == "always_true":
+        return lambda p: True
+    if node_type == "always_false":
+        return lambda p: False
+
+    if node_type == "binary_op":
+        left = _compile_node(node["left"])
+        right = _compile_node(node["right"])
+        if node["operator"] == "and":
+            return lambda p: left(p) and right(p)
+        return lambda p: left(p) or right(p)
+
+    if node_type == "unary_op":
+        operand = _compile_node(node["operand"])
+        return lambda p: not operand(p)
+
+    if node_type == "host":
+        ip = node["ip"]
+        return lambda p: p.get("src_ip", "") == ip or p.get("dst_ip", "") == ip
+    if node_type == "src_host":
+        ip = node["ip"]
+        return lambda p: p.get("src_ip", "") == ip
+    if node_type == "dst_host":
+        ip = node["ip"]
+        return lambda p: p.get("dst_ip", "") == ip
+
+    if node_type == "net":
+        return _net_predicate(node["network"], ("src_ip", "dst_ip"))
+    if node_type == "src_net":
+        return _net_predicate(node["network"], ("src_ip",))
+    if node_type == "dst_net":
+        return _net_predicate(node["network"], ("dst_ip",))
+
+    if node_type == "port":
+        port = node["port"]
+        return lambda p: p.get("src_port", 0) == port or p.get("dst_port", 0) == port
+    if node_type == "src_port":
+        port = node["port"]
+        return lambda p: p.get("src_port", 0) == port
+    if node_type == "dst_port":
+        port = node["port"]
+        return lambda p: p.get("dst_port", 0) == port
+    if node_type == "port_range":
+        start, end = node["start"], node["end"]
+        return lambda p: start <= p.get("src_port", 0) <= end or start <= p.get("dst_port", 0) <= end
+
+    if node_type == "greater":
+        size = node["size"]
+        return lambda p: p.get("size", 0) >= size
+    if node_type == "less":
+        size = node["size"]
+        return lambda p: p.get("size", 0) <= size
+
+    if node_type == "protocol":
+        protocol = node["protocol"]
+        return lambda p: (p.get("protocol") or "").lower() == protocol
+
+    raise ValueError(f"알 수 없는 필터 노드: {node_type}")
+
+
 class BPFFilter:
     """BPF 형식 패킷 필터"""
 
@@ -19,6 +123,7 @@ class BPFFilter:
         """BPF 필터 초기화"""
         self.filter_string = ""
         self.compiled_filter = None
+        self.predicate = None
         self.statistics = {
             "total_packets": 0,
             "matched_packets": 0,
@@ -40,20 +145,27 @@ class BPFFilter:
 
             if not self.filter_string:
                 self.compiled_filter = None
+                self.predicate = None
                 return True
 
             # BPF 문법 검증 및 파싱
             self.compiled_filter = self._compile_bpf(self.filter_string)
 
             if self.compiled_filter is None:
+                self.predicate = None
                 self.statistics["compilation_errors"] += 1
                 return False
 
+            # 파싱 트리를 패킷당 한 번 호출되는 클로저로 컴파일
+            self.predicate = _compile_node(self.compiled_filter)
+
             logger.info(f"BPF 필터 컴파일 성공: {filter_string}")
             return True
 
         except Exception as e:
             logger.error(f"BPF 필터 컴파일 오류: {e}")
+            self.compiled_filter = None
+            self.predicate = None
             self.statistics["compilation_errors"] += 1
             return False
 
@@ -70,10 +182,10 @@ class BPFFilter:
         try:
             self.statistics["total_packets"] += 1
 
-            if self.compiled_filter is None:
+            if self.predicate is None:
                 return True  # 필터가 없으면 모든 패킷 통과
 
-            result = self._evaluate_filter(self.compiled_filter, packet_info)
+            result = self.predicate(packet_info)
 
             if result:
                 self.statistics["matched_packets"] += 1
@@ -84,6 +196,35 @@ class BPFFilter:
             logger.error(f"BPF 필터 매칭 오류: {e}")
             return False
 
+    def matches_batch(self, packets: List[Dict[str, Any]]) -> List[bool]:
+        """
+        여러 패킷의 매치 여부를 한 번에 확인
+
+        Args:
+            packets: 패킷 정보 목록
+
+        Returns:
+            list: 패킷별 매치 여부
+        """
+        predicate = self.predicate
+        self.statistics["total_packets"] += len(packets)
+
+        if predicate is None:
+            self.statistics["matched_packets"] += len(packets)
+            return [True] * len(packets)
+
+        results = []
+        append = results.append
+        for packet_info in packets:
+            try:
+                append(bool(predicate(packet_info)))
+            except Exception as e:
+                logger.error(f"BPF 필터 매칭 오류: {e}")
+                append(False)
+
+        self.statistics["matched_packets"] += results.count(True)
+        return results
+
     def _compile_bpf(self, filter_string: str) -> Optional[Dict[str, Any]]:
         """
         BPF 필터 문자열을 파싱하여 내부 표현으로 컴파일
@@ -95,9 +236,6 @@ class BPFFilter:
             dict: 컴파일된 필터 또는 None
         """
         try:
-            # 공백 정규화
-            filter_string = " ".join(filter_string.split())
-
             # 논리 연산자로 분할
             tokens = self._tokenize(filter_string)
 
@@ -111,233 +249,120 @@ class BPFFilter:
             return None
 
     def _tokenize(self, filter_string: str) -> List[str]:
-        """필터 문자열을 토큰으로 분할"""
-        # 논리 연산자와 괄호를 기준으로 토큰화
-        pattern = r"(\s+and\s+|\s+or\s+|\s+not\s+|[()])"
-
+        """필터 문자열을 토큰으로 분할 (논리 연산자는 and/or/not으로 정규화)"""
         tokens = []
-        parts = re.split(pattern, filter_string, flags=re.IGNORECASE)
-
-        for part in parts:
-            part = part.strip()
-            if part and part.lower() not in ["and", "or", "not", "(", ")"]:
-                tokens.append(part)
-            elif part.lower() in ["and", "or", "not", "(", ")"]:
-                tokens.append(part.lower())
-
-        return [t for t in tokens if t]
+        for token in _TOKEN_PATTERN.findall(filter_string):
+            tokens.append(_KEYWORDS.get(token.lower(), token))
+        return tokens
 
     def _parse_tokens(self, tokens: List[str]) -> Dict[str, Any]:
-        """토큰 리스트를 파싱하여 필터 트리 생성"""
+        """토큰 리스트를 파싱하여 필터 트리 생성 (우선순위: not > and > or)"""
         if not tokens:
             return {"type": "always_true"}
 
-        # 단일 조건인 경우
-        if len(tokens) == 1:
-            return self._parse_condition(tokens[0])
-
-        # 복합 조건 파싱
-        return self._parse_expression(tokens)
-
-    def _parse_expression(self, tokens: List[str]) -> Dict[str, Any]:
-        """복합 표현식 파싱"""
-        # 간단한 좌에서 우로 파싱 (실제 BPF는 더 복잡한 우선순위 적용)
-        if len(tokens) == 3 and tokens[1].lower() in ["and", "or"]:
-            return {
-                "type": "binary_op",
-                "operator": tokens[1].lower(),
-                "left": self._parse_condition(tokens[0]),
-                "right": self._parse_condition(tokens[2]),
-            }
-
-        # NOT 연산자 처리
-        if len(tokens) >= 2 and tokens[0].lower() == "not":
-            return {
-                "type": "unary_op",
-                "operator": "not",
-                "operand": self._parse_tokens(tokens[1:]),
-            }
-
-        # 기본적으로 첫 번째 조건만 사용
-        return self._parse_condition(tokens[0])
+        position, tree = self._parse_expression(tokens, 0)
+        if position != len(tokens):
+            raise ValueError(f"예상하지 못한 토큰: {tokens[position]}")
+        return tree
+
+    def _parse_expression(self, tokens: List[str], position: int) -> Tuple[int, Dict[str, Any]]:
+        """or로 연결된 표현식 파싱"""
+        position, left = self._parse_term(tokens, position)
+        while position < len(tokens) and tokens[position] == "or":
+            position, right = self._parse_term(tokens, position + 1)
+            left = {"type": "binary_op", "operator": "or", "left": left, "right": right}
+        return position, left
+
+    def _parse_term(self, tokens: List[str], position: int) -> Tuple[int, Dict[str, Any]]:
+        """and로 연결된 항 파싱"""
+        position, left = self._parse_factor(tokens, position)
+        while position < len(tokens) and tokens[position] == "and":
+            position, right = self._parse_factor(tokens, position + 1)
+            left = {"type": "binary_op", "operator": "and", "left": left, "right": right}
+        return position, left
+
+    def _parse_factor(self, tokens: List[str], position: int) -> Tuple[int, Dict[str, Any]]:
+        """not, 괄호, 단일 조건 파싱"""
+        if position >= len(tokens):
+            raise ValueError("필터 표현식이 불완전합니다")
+
+        token = tokens[position]
+        if token == "not":
+            position, operand = self._parse_factor(tokens, position + 1)
+            return position, {"type": "unary_op", "operator": "not", "operand": operand}
+
+        if token == "(":
+            position, tree = self._parse_expression(tokens, position + 1)
+            if position >= len(tokens) or tokens[position] != ")":
+                raise ValueError("괄호가 닫히지 않았습니다")
+            return position + 1, tree
+
+        words = []
+        while position < len(tokens) and tokens[position] not in ("and", "or", "not", "(", ")"):
+            words.append(tokens[position])
+            position += 1
+
+        if not words:
+            raise ValueError(f"예상하지 못한 토큰: {token}")
+        return position, self._parse_condition(" ".join(words))
 
     def _parse_condition(self, condition: str) -> Dict[str, Any]:
         """단일 조건 파싱"""
         try:
             condition = condition.strip()
 
-            # IP 주소 조건 (host, src, dst)
-            if condition.startswith("host "):
-                ip = condition[5:].strip()
-                return {"type": "host", "ip": ip}
-
-            if condition.startswith("src ") or condition.startswith("src host "):
-                ip = condition.replace("src host ", "").replace("src ", "").strip()
-                return {"type": "src_host", "ip": ip}
-
-            if condition.startswith("dst ") or condition.startswith("dst host "):
-                ip = condition.replace("dst host ", "").replace("dst ", "").strip()
-                return {"type": "dst_host", "ip": ip}
-
             # 네트워크 조건
-            if condition.startswith("net "):
-                network = condition[4:].strip()
-                return {"type": "net", "network": network}
-
             if condition.startswith("src net "):
-                network = condition[8:].strip()
-                return {"type": "src_net", "network": network}
+                return {"type": "src_net", "network": condition[8:].strip()}
 
             if condition.startswith("dst net "):
-                network = condition[8:].strip()
-                return {"type": "dst_net", "network": network}
+                return {"type": "dst_net", "network": condition[8:].strip()}
 
-            # 포트 조건
-            if condition.startswith("port "):
-                port = int(condition[5:].strip())
-                return {"type": "port", "port": port}
+            if condition.startswith("net "):
+                return {"type": "net", "network": condition[4:].strip()}
 
+            # 포트 조건
             if condition.startswith("src port "):
-                port = int(condition[9:].strip())
-                return {"type": "src_port", "port": port}
+                return {"type": "src_port", "port": int(condition[9:].strip())}
 
             if condition.startswith("dst port "):
-                port = int(condition[9:].strip())
-                return {"type": "dst_port", "port": port}
+                return {"type": "dst_port", "port": int(condition[9:].strip())}
 
             # 포트 범위
-            port_range_match = re.match(r"port\s+(\d+)-(\d+)", condition)
+            port_range_match = re.fullmatch(r"(?:port|portrange)\s+(\d+)-(\d+)", condition)
             if port_range_match:
-                start_port = int(port_range_match.group(1))
-                end_port = int(port_range_match.group(2))
                 return {
                     "type": "port_range",
-                    "start": start_port,
-                    "end": end_port,
+                    "start": int(port_range_match.group(1)),
+                    "end": int(port_range_match.group(2)),
                 }
 
-            # 프로토콜 조건
-            protocols = ["tcp", "udp", "icmp", "ip", "ip6", "arp", "rarp"]
-            if condition.lower() in protocols:
-                return {"type": "protocol", "protocol": condition.lower()}
-
-            # 기본적으로 프로토콜로 처리
-            return {"type": "protocol", "protocol": condition.lower()}
-
-        except Exception as e:
-            logger.error(f"조건 파싱 오류 ({condition}): {e}")
-            return {"type": "always_false"}
-
-    def _evaluate_filter(self, filter_expr: Dict[str, Any], packet_info: Dict[str, Any]) -> bool:
-        """컴파일된 필터를 패킷 정보에 대해 평가"""
-        try:
-            expr_type = filter_expr.get("type")
+            if condition.startswith("port "):
+                return {"type": "port", "port": int(condition[5:].strip())}
 
-            if expr_type == "always_true":
-                return True
-            elif expr_type == "always_false":
-                return False
+            # IP 주소 조건 (host, src, dst)
+            if condition.startswith("host "):
+                return {"type": "host", "ip": condition[5:].strip()}
 
-            elif expr_type == "binary_op":
-                operator = filter_expr["operator"]
-                left_result = self._evaluate_filter(filter_expr["left"], packet_info)
-                right_result = self._evaluate_filter(filter_expr["right"], packet_info)
-
-                if operator == "and":
-                    return left_result and right_result
-                elif operator == "or":
-                    return left_result or right_result
-
-            elif expr_type == "unary_op":
-                operator = filter_expr["operator"]
-                operand_result = self._evaluate_filter(filter_expr["operand"], packet_info)
-
-                if operator == "not":
-                    return not operand_result
-
-            elif expr_type == "host":
-                ip = filter_expr["ip"]
-                src_ip = packet_info.get("src_ip", "")
-                dst_ip = packet_info.get("dst_ip", "")
-                return src_ip == ip or dst_ip == ip
-
-            elif expr_type == "src_host":
-                ip = filter_expr["ip"]
-                src_ip = packet_info.get("src_ip", "")
-                return src_ip == ip
-
-            elif expr_type == "dst_host":
-                ip = filter_expr["ip"]
-                dst_ip = packet_info.get("dst_ip", "")
-                return dst_ip == ip
-
-            elif expr_type == "net":
-                network = filter_expr["network"]
-                return self._ip_in_network(packet_info.get("src_ip"), network) or self._ip_in_network(
-                    packet_info.get("dst_ip"), network
-                )
-
-            elif expr_type == "src_net":
-                network = filter_expr["network"]
-                return self._ip_in_network(packet_info.get("src_ip"), network)
-
-            elif expr_type == "dst_net":
-                network = filter_expr["network"]
-                return self._ip_in_network(packet_info.get("dst_ip"), network)
-
-            elif expr_type == "port":
-                port = filter_expr["port"]
-                src_port = packet_info.get("src_port", 0)
-                dst_port = packet_info.get("dst_port", 0)
-                return src_port == port or dst_port == port
-
-            elif expr_type == "src_port":
-                port = filter_expr["port"]
-                src_port = packet_info.get("src_port", 0)
-                return src_port == port
-
-            elif expr_type == "dst_port":
-                port = filter_expr["port"]
-                dst_port = packet_info.get("dst_port", 0)
-                return dst_port == port
-
-            elif expr_type == "port_range":
-                start_port = filter_expr["start"]
-                end_port = filter_expr["end"]
-                src_port = packet_info.get("src_port", 0)
-                dst_port = packet_info.get("dst_port", 0)
-                return (start_port <= src_port <= end_port) or (start_port <= dst_port <= end_port)
-
-            elif expr_type == "protocol":
-                protocol = filter_expr["protocol"]
-                packet_protocol = packet_info.get("protocol", "").lower()
-                return packet_protocol == protocol
+            if condition.startswith("src "):
+                return {"type": "src_host", "ip": condition.replace("src host ", "").replace("src ", "").strip()}
 
-            return False
+            if condition.startswith("dst "):
+                return {"type": "dst_host", "ip": condition.replace("dst host ", "").replace("dst ", "").strip()}
 
-        except Exception as e:
-            logger.error(f"필터 평가 오류: {e}")
-            return False
+            # 패킷 크기 조건
+            if condition.startswith("greater "):
+                return {"type": "greater", "size": int(condition[8:].strip())}
 
-    def _ip_in_network(self, ip_str: str, network_str: str) -> bool:
-        """IP가 네트워크에 속하는지 확인"""
-        try:
-            if not ip_str or not network_str:
-                return False
+            if condition.startswith("less "):
+                return {"type": "less", "size": int(condition[5:].strip())}
 
-            ip = ip_address(ip_str)
-
-            # CIDR 표기법 확인
-            if "/" in network_str:
-                network = ip_network(network_str, strict=False)
-                return ip in network
-            else:
-                # 단일 IP 주소
-                return str(ip) == network_str
+            # 프로토콜 조건 (알 수 없는 조건도 프로토콜 이름으로 처리)
+            return {"type": "protocol", "protocol": condition.lower()}
 
         except Exception as e:
-            logger.error(f"IP 네트워크 검사 오류: {e}")
-            return False
+            logger.error(f"조건 파싱 오류 ({condition}): {e}")
+            return {"type": "always_false"}
 
     def get_predefined_filters(self) -> Dict[str, str]:
         """미리 정의된 BPF 필터 반환"""
@@ -424,6 +449,7 @@ class BPFFilter:
         try:
             old_filter = self.filter_string
             old_compiled = self.compiled_filter
+            old_predicate = self.predicate
 
             # 임시로 필터 설정해보기
             success = self.set_filter(filter_string)
@@ -431,6 +457,7 @@ class BPFFilter:
             # 원래 필터로 복원
             self.filter_string = old_filter
             self.compiled_filter = old_compiled
+            self.predicate = old_predicate
 
             if success:
                 return True, "문법이 올바릅니다"
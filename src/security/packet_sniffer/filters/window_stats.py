@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+슬라이딩 윈도우 통계
+고급 필터 규칙이 패킷마다 이력을 복사하지 않고 읽을 수 있도록 증분 갱신되는 집계를 제공합니다.
+
+- RollingStats: 고정 크기 윈도우의 평균/분산(Welford), 정렬 상태 유지로 백분위수 계산
+- TimeWheel: 시간 버킷 링으로 최근 N초 이벤트 수를 상수 시간에 유지
+- WindowedStatistics: 메트릭별 RollingStats와 (윈도우, 키)별 TimeWheel 관리
+"""
+
+import bisect
+import math
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+DEFAULT_HISTORY_SIZE = 1000
+DEFAULT_RECENT_SIZE = 10
+DEFAULT_WHEEL_RESOLUTION = 0.1  # 초
+DEFAULT_MAX_WHEEL_KEYS = 10000
+
+
+def event_time(value: Any, default: float) -> float:
+    """패킷 타임스탬프(epoch 초 또는 ISO 문자열)를 epoch 초로 변환"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            pass
+    return default
+
+
+class RollingStats:
+    """고정 크기 윈도우의 증분 통계"""
+
+    __slots__ = ("size", "values", "sorted_values", "mean", "_m2")
+
+    def __init__(self, size: int = DEFAULT_HISTORY_SIZE):
+        self.size = max(1, size)
+        self.values = deque(maxlen=self.size)
+        self.sorted_values = []
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def add(self, value: float) -> None:
+        """값 추가 (윈도우가 가득 차면 가장 오래된 값 제거)"""
+        if len(self.values) == self.size:
+            oldest = self.values[0]
+            self.sorted_values.pop(bisect.bisect_left(self.sorted_values, oldest))
+            # 슬라이딩 Welford: 가장 오래된 값을 새 값으로 교체
+            old_mean = self.mean
+            self.mean += (value - oldest) / self.size
+            self._m2 += (value - oldest) * (value - self.mean + oldest - old_mean)
+        else:
+            count = len(self.values) + 1
+            delta = value - self.mean
+            self.mean += delta / count
+            self._m2 += delta * (value - self.mean)
+
+        self.values.append(value)
+        bisect.insort(self.sorted_values, value)
+
+    @property
+    def variance(self) -> float:
+        """모분산 (numpy.var 기본값과 동일)"""
+        if not self.values:
+            return 0.0
+        return max(self._m2, 0.0) / len(self.values)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def percentile(self, q: float) -> float:
+        """선형 보간 백분위수 (numpy.percentile 기본값과 동일)"""
+        data = self.sorted_values
+        if not data:
+            return 0.0
+        position = (len(data) - 1) * q / 100.0
+        lower = int(position)
+        upper = min(lower + 1, len(data) - 1)
+        return data[lower] + (data[upper] - data[lower]) * (position - lower)
+
+    def clear(self) -> None:
+        self.values.clear()
+        self.sorted_values.clear()
+        self.mean = 0.0
+        self._m2 = 0.0
+
+
+class TimeWheel:
+    """최근 window초 동안의 이벤트 수를 유지하는 시간 버킷 링"""
+
+    __slots__ = ("resolution", "buckets", "total", "_current")
+
+    def __init__(self, window: float, resolution: float = DEFAULT_WHEEL_RESOLUTION):
+        self.resolution = resolution
+        self.buckets = [0] * max(1, math.ceil(window / resolution))
+        self.total = 0
+        self._current = None  # 가장 최근 버킷 번호
+
+    def _advance(self, slot: int) -> None:
+        if self._current is None:
+            self._current = slot
+            return
+        if slot <= self._current:
+            return
+
+        # 지나간 버킷 비우기 (링 크기를 넘으면 전체 초기화)
+        steps = slot - self._current
+        if steps >= len(self.buckets):
+            self.buckets = [0] * len(self.buckets)
+            self.total = 0
+        else:
+            for passed in range(self._current + 1, slot + 1):
+                index = passed % len(self.buckets)
+                self.total -= self.buckets[index]
+                self.buckets[index] = 0
+        self._current = slot
+
+    def add(self, timestamp: float, count: int = 1) -> None:
+        """이벤트 기록 (윈도우보다 오래된 이벤트는 무시)"""
+        slot = int(timestamp // self.resolution)
+        self._advance(slot)
+        if self._current - slot >= len(self.buckets):
+            return
+        self.buckets[slot % len(self.buckets)] += count
+        self.total += count
+
+    def count(self, now: float) -> int:
+        """now 기준 윈도우 내 이벤트 수"""
+        self._advance(int(now // self.resolution))
+        return self.total
+
+
+class WindowedStatistics:
+    """고급 필터 규칙이 공유하는 증분 윈도우 집계"""
+
+    def __init__(
+        self,
+        history_size: int = DEFAULT_HISTORY_SIZE,
+        recent_size: int = DEFAULT_RECENT_SIZE,
+        max_wheel_keys: int = DEFAULT_MAX_WHEEL_KEYS,
+    ):
+        """
+        윈도우 통계 초기화
+
+        Args:
+            history_size: 메트릭별 이력 윈도우 크기 (평균/분산/백분위수)
+            recent_size: 변화율 계산에 사용하는 최근 값 개수
+            max_wheel_keys: 키별 타임 휠 최대 개수 (초과 시 가장 오래 사용되지 않은 키 제거)
+        """
+        self.history_size = history_size
+        self.recent_size = recent_size
+        self.max_wheel_keys = max_wheel_keys
+        self.history: Dict[str, RollingStats] = {}
+        self.recent: Dict[str, RollingStats] = {}
+        self.hourly_packets = [0] * 24
+        self._wheels: Dict[float, "OrderedDict[Any, TimeWheel]"] = {}
+        self._wheel_keys: Dict[float, set] = {}
+
+    def track(self, metric: str) -> None:
+        """메트릭 추적 시작"""
+        if metric not in self.history:
+            self.history[metric] = RollingStats(self.history_size)
+            self.recent[metric] = RollingStats(self.recent_size)
+
+    def add_value(self, metric: str, value: float) -> None:
+        """메트릭 값 추가"""
+        self.track(metric)
+        self.history[metric].add(value)
+        self.recent[metric].add(value)
+
+    def get(self, metric: str) -> Optional[RollingStats]:
+        """메트릭 이력 윈도우 (없으면 None)"""
+        return self.history.get(metric)
+
+    def recent_mean(self, metric: str) -> Optional[float]:
+        """최근 값들의 평균 (값이 없으면 None)"""
+        recent = self.recent.get(metric)
+        return recent.mean if recent else None
+
+    def track_events(self, window: float, key_field: Optional[str] = None) -> None:
+        """(윈도우, 키 필드)별 이벤트 카운터 등록"""
+        self._wheels.setdefault(window, OrderedDict())
+        self._wheel_keys.setdefault(window, set()).add(key_field)
+
+    def record_event(self, packet_info: Dict[str, Any], now: Optional[float] = None) -> None:
+        """등록된 모든 이벤트 카운터에 패킷 기록"""
+        now = time.time() if now is None else now
+        timestamp = event_time(packet_info.get("timestamp"), now)
+        for window, wheels in self._wheels.items():
+            for key_field in self._wheel_keys[window]:
+                key = (key_field, packet_info.get(key_field)) if key_field else None
+                wheel = wheels.get(key)
+                if wheel is None:
+                    wheel = wheels[key] = TimeWheel(window)
+                    if len(wheels) > self.max_wheel_keys:
+                        wheels.popitem(last=False)
+                else:
+                    wheels.move_to_end(key)
+                wheel.add(timestamp)
+
+    def event_count(
+        self, window: float, packet_info: Optional[Dict[str, Any]] = None, key_field: Optional[str] = None, now=None
+    ) -> int:
+        """최근 window초 동안의 이벤트 수 (key_field가 있으면 해당 패킷의 키 기준)"""
+        wheels = self._wheels.get(window)
+        if not wheels:
+            return 0
+        key = (key_field, packet_info.get(key_field)) if key_field and packet_info is not None else None
+        wheel = wheels.get(key)
+        return wheel.count(time.time() if now is None else now) if wheel else 0
+
+    def record_hour(self, hour: int) -> None:
+        self.hourly_packets[hour] += 1
+
+    def clear(self) -> None:
+        """집계 초기화 (추적 중인 메트릭과 카운터 등록은 유지)"""
+        for stats in self.history.values():
+            stats.clear()
+        for stats in self.recent.values():
+            stats.clear()
+        for wheels in self._wheels.values():
+            wheels.clear()
+        self.hourly_packets = [0] * 24
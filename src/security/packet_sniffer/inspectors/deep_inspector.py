@@ -7,12 +7,40 @@
 import logging
 import re
 import struct
-from collections import defaultdict
+from collections import Counter
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+from ..payload_stats import PayloadStats, batch_payload_statistics, payload_statistics, shannon_entropy
+from ..signature_engine import Signature, get_signature_engine
+
 logger = logging.getLogger(__name__)
 
+PAYLOAD_PATTERN_SIGNATURE_SET = "dpi_payload_patterns"
+FILE_SIGNATURE_SET = "dpi_file_signatures"
+
+PAYLOAD_PATTERN_SIGNATURES = [
+    Signature("base64_block", "base64_data", r"[A-Za-z0-9+/]{50,}={0,2}", regex=True),
+    Signature("hex_string", "hex_data", r"[0-9a-fA-F]{100,}", regex=True),
+    Signature("url", "url", r"https?://[^\s]+", regex=True),
+]
+
+# 파일 매직 바이트 (카테고리 = 파일 유형)
+FILE_SIGNATURES = [
+    Signature(file_type, file_type, magic, anchored=True)
+    for magic, file_type in (
+        (b"\x89PNG", "PNG Image"),
+        (b"\xff\xd8\xff", "JPEG Image"),
+        (b"GIF8", "GIF Image"),
+        (b"PK\x03\x04", "ZIP Archive"),
+        (b"%PDF", "PDF Document"),
+        (b"MZ", "Executable"),
+        (b"\x7fELF", "ELF Executable"),
+    )
+]
+
+URL_SHORTENER_DOMAINS = ["bit.ly", "tinyurl", "short.link"]
+
 
 class DeepInspector:
     """딥 패킷 검사 엔진"""
@@ -21,6 +49,9 @@ class DeepInspector:
         """딥 패킷 검사 초기화"""
         self.suspicious_patterns = self._load_suspicious_patterns()
         self.protocol_signatures = self._load_protocol_signatures()
+        self.signature_engine = get_signature_engine()
+        self.signature_engine.register(PAYLOAD_PATTERN_SIGNATURE_SET, PAYLOAD_PATTERN_SIGNATURES)
+        self.signature_engine.register(FILE_SIGNATURE_SET, FILE_SIGNATURES)
         self.statistics = {
             "inspected_packets": 0,
             "threats_detected": 0,
@@ -521,34 +552,33 @@ class DeepInspector:
         patterns = []
 
         try:
-            # Base64 인코딩된 데이터 (대량)
+            # Base64 블록, 긴 16진수 문자열, URL을 한 번의 검사로 탐지
             payload_str = payload.decode("utf-8", errors="ignore")
-            base64_matches = re.findall(r"[A-Za-z0-9+/]{50,}={0,2}", payload_str)
+            hits = self.signature_engine.scan(PAYLOAD_PATTERN_SIGNATURE_SET, payload_str)
+            counts = Counter(hit.category for hit in hits)
 
-            if base64_matches:
+            if counts["base64_data"]:
                 patterns.append(
                     {
                         "type": "base64_data",
                         "severity": "medium",
-                        "description": f"{len(base64_matches)}개의 Base64 인코딩된 데이터 블록 발견",
+                        "description": f"{counts['base64_data']}개의 Base64 인코딩된 데이터 블록 발견",
                     }
                 )
 
             # 16진수 데이터
-            hex_matches = re.findall(r"[0-9a-fA-F]{100,}", payload_str)
-            if hex_matches:
+            if counts["hex_data"]:
                 patterns.append(
                     {
                         "type": "hex_data",
                         "severity": "low",
-                        "description": f"{len(hex_matches)}개의 긴 16진수 문자열 발견",
+                        "description": f"{counts['hex_data']}개의 긴 16진수 문자열 발견",
                     }
                 )
 
             # 의심스러운 URL 패턴
-            suspicious_urls = re.findall(r"https?://[^\s]+", payload_str)
-            for url in suspicious_urls:
-                if any(domain in url.lower() for domain in ["bit.ly", "tinyurl", "short.link"]):
+            for url in (hit.value for hit in hits if hit.category == "url"):
+                if any(domain in url.lower() for domain in URL_SHORTENER_DOMAINS):
                     patterns.append(
                         {
                             "type": "suspicious_url",
@@ -565,33 +595,34 @@ class DeepInspector:
     def _analyze_payload(self, payload: bytes) -> Dict[str, Any]:
         """페이로드 분석"""
         try:
-            analysis = {
-                "size": len(payload),
-                "entropy": self._calculate_entropy(payload),
-                "printable_ratio": 0,
-                "null_bytes": payload.count(b"\x00"),
-                "file_signatures": [],
-            }
-
-            if payload:
-                # 출력 가능한 문자 비율
-                try:
-                    text = payload.decode("utf-8", errors="ignore")
-                    printable_chars = sum(1 for c in text if c.isprintable())
-                    analysis["printable_ratio"] = printable_chars / len(text) if text else 0
-                except Exception:
-                    analysis["printable_ratio"] = 0
-
-                # 파일 시그니처 확인
-                file_sigs = self._detect_file_signatures(payload)
-                analysis["file_signatures"] = file_sigs
-
-            return analysis
+            return self._payload_analysis(payload, payload_statistics(payload))
 
         except Exception as e:
             logger.error(f"페이로드 분석 오류: {e}")
             return {"error": str(e)}
 
+    def _payload_analysis(self, payload: bytes, stats: PayloadStats) -> Dict[str, Any]:
+        return {
+            "size": stats.size,
+            "entropy": stats.entropy,
+            "printable_ratio": stats.printable_ratio,
+            "null_bytes": stats.null_bytes,
+            "file_signatures": self._detect_file_signatures(payload) if payload else [],
+        }
+
+    def analyze_payloads(self, payloads: List[bytes]) -> List[Dict[str, Any]]:
+        """
+        여러 페이로드 일괄 분석 (세션 전체 페이로드의 통계를 한 번에 계산)
+
+        Args:
+            payloads: 페이로드 목록
+
+        Returns:
+            list: 페이로드별 분석 결과 (_analyze_payload와 같은 형식)
+        """
+        stats = batch_payload_statistics(payloads)
+        return [self._payload_analysis(payload, payload_stats) for payload, payload_stats in zip(payloads, stats)]
+
     def _detect_malware_indicators(self, packet: Dict[str, Any], payload: bytes) -> List[Dict[str, Any]]:
         """멀웨어 지표 탐지"""
         indicators = []
@@ -768,28 +799,8 @@ class DeepInspector:
             return None, None
 
     def _calculate_entropy(self, data: bytes) -> float:
-        """데이터 엔트로피 계산"""
-        try:
-            if not data:
-                return 0
-
-            # 바이트 빈도 계산
-            byte_counts = defaultdict(int)
-            for byte in data:
-                byte_counts[byte] += 1
-
-            # 엔트로피 계산
-            entropy = 0
-            length = len(data)
-
-            for count in byte_counts.values():
-                probability = count / length
-                entropy -= probability * (probability.bit_length() - 1)
-
-            return entropy
-
-        except Exception:
-            return 0
+        """데이터 엔트로피 계산 (바이트당 비트, 문자열은 UTF-8 바이트 기준)"""
+        return shannon_entropy(data)
 
     def _is_suspicious_domain(self, domain: str) -> bool:
         """의심스러운 도메인 패턴 확인"""
@@ -820,21 +831,7 @@ class DeepInspector:
             return signatures
 
         # 파일 매직 바이트
-        file_signatures = {
-            b"\x89PNG": "PNG Image",
-            b"\xff\xd8\xff": "JPEG Image",
-            b"GIF8": "GIF Image",
-            b"PK\x03\x04": "ZIP Archive",
-            b"%PDF": "PDF Document",
-            b"MZ": "Executable",
-            b"\x7fELF": "ELF Executable",
-        }
-
-        for signature, file_type in file_signatures.items():
-            if payload.startswith(signature):
-                signatures.append(file_type)
-
-        return signatures
+        return [hit.category for hit in self.signature_engine.scan(FILE_SIGNATURE_SET, payload)]
 
     def _is_suspicious_header(self, header: str, value: str) -> bool:
         """의심스러운 HTTP 헤더 확인"""
@@ -3,6 +3,7 @@
 패킷 캡처러 - 실시간 패킷 캡처 엔진
 """
 
+import bisect
 import queue
 import threading
 import time
@@ -52,72 +53,108 @@ class CaptureFilter:
 
 
 class PacketBuffer:
-    """패킷 버퍼 - 순환 버퍼 방식"""
+    """
+    패킷 버퍼 - 고정 크기 순환 버퍼
+
+    삽입 순서를 유지하며 가장 최신 패킷은 O(1), 특정 시각 이후 패킷은 시간 인덱스 이분 탐색으로
+    O(log n + k)에 조회합니다. 조회 시에는 필요한 구간의 참조만 복사하므로 잠금 구간이 짧아
+    UI 폴링이 캡처 스레드를 막지 않습니다.
+    """
 
     def __init__(self, max_size: int = 10000):
-        self.max_size = max_size
-        self.packets: List[PacketInfo] = []
-        self.current_index = 0
+        self.max_size = max(1, max_size)
+        self._slots: List[Optional[PacketInfo]] = [None] * self.max_size
+        # 시간 인덱스: 삽입 순서 기준 누적 최대 타임스탬프 (항상 단조 증가)
+        self._time_index: List[float] = [0.0] * self.max_size
+        self._start = 0
+        self._size = 0
         self.total_packets = 0
-        self.lock = threading.RLock()
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
 
     def add_packet(self, packet: PacketInfo) -> None:
-        """패킷 추가"""
+        """패킷 추가 (가득 차면 가장 오래된 패킷을 덮어씀)"""
         with self.lock:
-            if len(self.packets) < self.max_size:
-                self.packets.append(packet)
+            if self._size < self.max_size:
+                position = (self._start + self._size) % self.max_size
+                self._size += 1
             else:
-                # 순환 버퍼: 가장 오래된 패킷 덮어쓰기
-                self.packets[self.current_index] = packet
-                self.current_index = (self.current_index + 1) % self.max_size
+                position = self._start
+                self._start = (self._start + 1) % self.max_size
 
+            previous = self._time_index[(position - 1) % self.max_size] if self._size > 1 else packet.timestamp
+            self._slots[position] = packet
+            self._time_index[position] = max(previous, packet.timestamp)
             self.total_packets += 1
 
+    def _first_position_since(self, since_timestamp: float) -> int:
+        """시간 인덱스가 since_timestamp 이상인 첫 논리 위치 (락 보유 상태에서 호출)"""
+        end = self._start + self._size
+        if end <= self.max_size:
+            return bisect.bisect_left(self._time_index, since_timestamp, self._start, end) - self._start
+
+        # 버퍼가 한 바퀴 돈 경우: [start, max_size)와 [0, end - max_size) 두 정렬 구간
+        head_length = self.max_size - self._start
+        position = bisect.bisect_left(self._time_index, since_timestamp, self._start, self.max_size)
+        if position < self.max_size:
+            return position - self._start
+        return head_length + bisect.bisect_left(self._time_index, since_timestamp, 0, end - self.max_size)
+
+    def _snapshot(self, first: int, last: int) -> List[PacketInfo]:
+        """논리 위치 [first, last) 구간의 패킷 참조 복사 (락 보유 상태에서 호출)"""
+        begin = (self._start + first) % self.max_size
+        count = last - first
+        if begin + count <= self.max_size:
+            return self._slots[begin : begin + count]
+        return self._slots[begin:] + self._slots[: begin + count - self.max_size]
+
     def get_packets(self, limit: Optional[int] = None, since: Optional[datetime] = None) -> List[PacketInfo]:
-        """패킷 조회"""
+        """패킷 조회 (최신 패킷 우선)"""
+        since_timestamp = since.timestamp() if since else None
+
         with self.lock:
-            packets = self.packets.copy()
+            first = self._first_position_since(since_timestamp) if since_timestamp is not None else 0
+            if limit and since_timestamp is None:
+                first = max(first, self._size - limit)
+            packets = self._snapshot(first, self._size)
 
-            # 시간 필터링
-            if since:
-                since_timestamp = since.timestamp()
-                packets = [p for p in packets if p.timestamp >= since_timestamp]
+        packets.reverse()
 
-            # 최신 패킷 우선으로 정렬
-            packets.sort(key=lambda p: p.timestamp, reverse=True)
+        # 누적 최대 인덱스 이후에 늦게 도착한 패킷 제외
+        if since_timestamp is not None:
+            packets = [p for p in packets if p.timestamp >= since_timestamp]
 
-            # 개수 제한
-            if limit:
-                packets = packets[:limit]
+        if limit:
+            packets = packets[:limit]
 
-            return packets
+        return packets
 
     def get_latest_packet(self) -> Optional[PacketInfo]:
-        """가장 최신 패킷 조회"""
+        """가장 최근에 추가된 패킷 조회"""
         with self.lock:
-            if not self.packets:
+            if not self._size:
                 return None
-
-            # 가장 최신 타임스탬프를 가진 패킷 찾기
-            latest_packet = max(self.packets, key=lambda p: p.timestamp)
-            return latest_packet
+            return self._slots[(self._start + self._size - 1) % self.max_size]
 
     def clear(self) -> None:
         """버퍼 초기화"""
         with self.lock:
-            self.packets.clear()
-            self.current_index = 0
+            self._slots = [None] * self.max_size
+            self._start = 0
+            self._size = 0
             self.total_packets = 0
 
     def get_stats(self) -> Dict[str, Any]:
         """버퍼 통계"""
-        with self.lock:
-            return {
-                "current_size": len(self.packets),
-                "max_size": self.max_size,
-                "total_packets": self.total_packets,
-                "buffer_usage": len(self.packets) / self.max_size * 100,
-            }
+        size = self._size
+        return {
+            "current_size": size,
+            "max_size": self.max_size,
+            "total_packets": self.total_packets,
+            "buffer_usage": size / self.max_size * 100,
+        }
 
 
 class PacketCapturer(BaseSniffer):
@@ -509,6 +546,42 @@ class PacketCapturer(BaseSniffer):
             return [p.to_dict() for p in packets]
         return []
 
+    def query_packets(
+        self,
+        session_id: str,
+        filter_criteria: Optional[Dict[str, Any]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """세션 패킷 색인 조회 (조건/페이지 단위, 각 패킷에 packet_number 포함)"""
+        session = self.session_manager.get_session(session_id)
+        if not session:
+            return {"total": 0, "packets": []}
+
+        result = session.query_packets(filter_criteria, offset, limit)
+        return {
+            "total": result["total"],
+            "packets": [
+                dict(packet.to_dict(), packet_number=number)
+                for number, packet in zip(result["packet_numbers"], result["packets"])
+            ],
+        }
+
+    def get_flow_packets(self, session_id: str, packet_number: int, limit: Optional[int] = None) -> Dict[str, Any]:
+        """지정 패킷과 같은 플로우의 세션 패킷 조회"""
+        session = self.session_manager.get_session(session_id)
+        if not session:
+            return {"total": 0, "packets": []}
+
+        result = session.get_flow_packets(packet_number, limit)
+        return {
+            "total": result["total"],
+            "packets": [
+                dict(packet.to_dict(), packet_number=number)
+                for number, packet in zip(result["packet_numbers"], result["packets"])
+            ],
+        }
+
     def filter_packets(self, packets: List[Dict[str, Any]], filter_criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
         """패킷 필터링"""
         filtered_packets = []
@@ -564,8 +637,10 @@ class PacketCapturer(BaseSniffer):
         """캡처 필터 생성"""
         return CaptureFilter(**kwargs)
 
-    def export_capture_data(self, session_id: Optional[str] = None) -> Dict[str, Any]:
-        """캡처 데이터 내보내기"""
+    def export_capture_data(
+        self, session_id: Optional[str] = None, offset: int = 0, limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """캡처 데이터 내보내기 (세션 패킷은 offset/limit 페이지 단위, 다음 페이지는 session_data.next_offset)"""
         export_data = {
             "timestamp": datetime.now().isoformat(),
             "capture_stats": self.capture_stats.copy(),
@@ -574,7 +649,7 @@ class PacketCapturer(BaseSniffer):
 
         if session_id:
             # 특정 세션 데이터
-            session_data = self.session_manager.export_session_data(session_id)
+            session_data = self.session_manager.export_session_data(session_id, offset, limit)
             if session_data:
                 export_data["session_data"] = session_data
         else:
@@ -593,7 +668,7 @@ class PacketCapturer(BaseSniffer):
             "packets_per_second": stats.get("packets_per_second", 0),
             "buffer_usage_percent": buffer_stats["buffer_usage"],
             "active_sessions": len(self.active_sessions),
-            "memory_usage": len(self.packet_buffer.packets) * 1024,  # 추정치
+            "memory_usage": len(self.packet_buffer) * 1024,  # 추정치
             "error_rate": self.capture_stats["errors"] / max(self.capture_stats["total_captured"], 1) * 100,
         }
 
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+패킷 저장소 - 열(column) 기반 압축 패킷 저장
+
+PacketInfo 객체를 패킷마다 유지하는 대신 필드별 타입 배열(array)에 나누어 저장합니다.
+IPv4 주소는 정수, 포트/프로토콜/크기는 고정 폭 배열, 페이로드는 공유 바이트 아레나에
+보관하므로 패킷당 수백 바이트의 객체 오버헤드가 수십 바이트로 줄어듭니다.
+분석기와 필터에는 복사 없이 원본 데이터를 읽는 PacketView를 제공합니다.
+"""
+
+import ipaddress
+import threading
+from array import array
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional
+
+from .base_sniffer import PacketInfo
+from .payload_stats import PayloadStats, batch_payload_statistics
+
+# 페이로드 아레나 청크 크기 (청크는 크기가 변하지 않으므로 memoryview를 안전하게 내보낼 수 있음)
+DEFAULT_ARENA_CHUNK_SIZE = 1 << 20
+
+# PacketView가 매핑으로 노출하는 필드 (PacketInfo.to_dict 필드 + payload)
+PACKET_FIELDS = ("timestamp", "src_ip", "dst_ip", "src_port", "dst_port", "protocol", "size", "flags", "payload")
+
+_MAX_IP_CACHE = 65536
+
+
+class PacketView(Mapping):
+    """
+    PacketStore의 한 행에 대한 읽기 전용 뷰
+
+    PacketInfo와 같은 속성을 제공하며, 딕셔너리 형태의 패킷 정보를 받는 필터에도
+    to_dict() 변환 없이 그대로 전달할 수 있습니다. 저장소가 clear()로 비워지면
+    이전에 만든 뷰는 무효화되어 필드 접근 시 RuntimeError가 발생합니다.
+    """
+
+    __slots__ = ("_store", "_row", "_generation")
+
+    def __init__(self, store: "PacketStore", row: int):
+        self._store = store
+        self._row = row
+        self._generation = store.generation
+
+    def _live_store(self) -> "PacketStore":
+        """뷰가 만들어진 이후 저장소가 비워졌으면 다른 패킷을 읽지 않도록 오류"""
+        if self._generation != self._store.generation:
+            raise RuntimeError(f"PacketView(row={self._row})의 저장소가 비워져 더 이상 유효하지 않습니다")
+        return self._store
+
+    @property
+    def row(self) -> int:
+        return self._row
+
+    @property
+    def is_valid(self) -> bool:
+        """저장소가 비워지지 않아 뷰가 아직 유효한지 여부"""
+        return self._generation == self._store.generation
+
+    @property
+    def timestamp(self) -> float:
+        return self._live_store()._timestamps[self._row]
+
+    @property
+    def src_ip(self) -> str:
+        store = self._live_store()
+        return store._decode_ip(self._row, "src_ip", store._src_ips)
+
+    @property
+    def dst_ip(self) -> str:
+        store = self._live_store()
+        return store._decode_ip(self._row, "dst_ip", store._dst_ips)
+
+    @property
+    def src_port(self) -> int:
+        store = self._live_store()
+        return store._value(self._row, "src_port", store._src_ports)
+
+    @property
+    def dst_port(self) -> int:
+        store = self._live_store()
+        return store._value(self._row, "dst_port", store._dst_ports)
+
+    @property
+    def protocol(self) -> str:
+        store = self._live_store()
+        return store._protocol_names[store._protocols[self._row]]
+
+    @property
+    def size(self) -> int:
+        store = self._live_store()
+        return store._value(self._row, "size", store._sizes)
+
+    @property
+    def flags(self) -> Dict[str, Any]:
+        return self._live_store()._flags.get(self._row, {})
+
+    @property
+    def payload_view(self) -> memoryview:
+        """페이로드의 복사 없는 읽기 전용 뷰"""
+        return self._live_store().payload_view(self._row)
+
+    @property
+    def payload(self) -> bytes:
+        return bytes(self.payload_view)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in PACKET_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(PACKET_FIELDS)
+
+    def __len__(self) -> int:
+        return len(PACKET_FIELDS)
+
+    def __repr__(self) -> str:
+        if not self.is_valid:
+            return f"PacketView(row={self._row}, stale)"
+        return (
+            f"PacketView(row={self._row}, "
+            f"{self.src_ip}:{self.src_port} -> {self.dst_ip}:{self.dst_port} {self.protocol})"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """PacketInfo.to_dict()와 같은 형식의 딕셔너리로 변환"""
+        return {
+            "timestamp": self.timestamp,
+            "src_ip": self.src_ip,
+            "dst_ip": self.dst_ip,
+            "src_port": self.src_port,
+            "dst_port": self.dst_port,
+            "protocol": self.protocol,
+            "size": self.size,
+            "flags": self.flags,
+        }
+
+    def to_packet(self) -> PacketInfo:
+        """독립적인 PacketInfo 객체로 변환"""
+        return PacketInfo(
+            timestamp=self.timestamp,
+            src_ip=self.src_ip,
+            dst_ip=self.dst_ip,
+            src_port=self.src_port,
+            dst_port=self.dst_port,
+            protocol=self.protocol,
+            size=self.size,
+            payload=self.payload,
+            flags=dict(self.flags),
+        )
+
+
+class PacketStore:
+    """
+    열 기반 추가 전용 패킷 저장소
+
+    배열 범위를 벗어나는 값(IPv6 주소, 잘못된 포트 등)과 비어 있지 않은 flags는
+    행 번호를 키로 하는 희소 딕셔너리에 따로 보관합니다.
+    """
+
+    def __init__(self, arena_chunk_size: int = DEFAULT_ARENA_CHUNK_SIZE):
+        self.arena_chunk_size = max(1, arena_chunk_size)
+        self.lock = threading.Lock()
+        self._protocol_names: List[str] = []
+        self._protocol_codes: Dict[str, int] = {}
+        self._ip_codes: Dict[str, Optional[int]] = {}
+        self._ip_names: Dict[int, str] = {}
+        self.generation = 0  # clear()마다 증가 (이전 뷰 무효화)
+        self._reset()
+
+    def _reset(self) -> None:
+        self._timestamps = array("d")
+        self._src_ips = array("I")
+        self._dst_ips = array("I")
+        self._src_ports = array("H")
+        self._dst_ports = array("H")
+        self._protocols = array("H")
+        self._sizes = array("I")
+        self._payload_chunks = array("I")
+        self._payload_offsets = array("I")
+        self._payload_lengths = array("I")
+        self._arena: List[bytearray] = []
+        self._arena_used = 0
+        self._overflow: Dict[tuple, Any] = {}
+        self._flags: Dict[int, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def __iter__(self) -> Iterator[PacketView]:
+        for row in range(len(self._timestamps)):
+            yield PacketView(self, row)
+
+    def __getitem__(self, row: int) -> PacketView:
+        if row < 0:
+            row += len(self._timestamps)
+        if not 0 <= row < len(self._timestamps):
+            raise IndexError("packet index out of range")
+        return PacketView(self, row)
+
+    def _encode_ip(self, ip: str) -> Optional[int]:
+        code = self._ip_codes.get(ip, -1)
+        if code != -1:
+            return code
+
+        try:
+            address = ipaddress.ip_address(ip)
+            code = int(address) if address.version == 4 else None
+        except (TypeError, ValueError):
+            code = None
+
+        if len(self._ip_codes) >= _MAX_IP_CACHE:
+            self._ip_codes.clear()
+        self._ip_codes[ip] = code
+        return code
+
+    def _decode_ip(self, row: int, field_name: str, column: array) -> str:
+        if self._overflow and (row, field_name) in self._overflow:
+            return self._overflow[(row, field_name)]
+
+        code = column[row]
+        name = self._ip_names.get(code)
+        if name is None:
+            if len(self._ip_names) >= _MAX_IP_CACHE:
+                self._ip_names.clear()
+            name = self._ip_names[code] = str(ipaddress.IPv4Address(code))
+        return name
+
+    def _value(self, row: int, field_name: str, column: array) -> Any:
+        if self._overflow and (row, field_name) in self._overflow:
+            return self._overflow[(row, field_name)]
+        return column[row]
+
+    def _append_value(self, row: int, field_name: str, column: array, value: Any, limit: int) -> None:
+        if isinstance(value, int) and 0 <= value <= limit:
+            column.append(value)
+        else:
+            column.append(0)
+            self._overflow[(row, field_name)] = value
+
+    def _append_ip(self, row: int, field_name: str, column: array, ip: str) -> None:
+        code = self._encode_ip(ip)
+        if code is None:
+            column.append(0)
+            self._overflow[(row, field_name)] = ip
+        else:
+            column.append(code)
+
+    def _protocol_code(self, protocol: str) -> int:
+        code = self._protocol_codes.get(protocol)
+        if code is None:
+            code = self._protocol_codes[protocol] = len(self._protocol_names)
+            self._protocol_names.append(protocol)
+        return code
+
+    def _store_payload(self, payload: bytes) -> None:
+        length = len(payload)
+        if not self._arena or self._arena_used + length > len(self._arena[-1]):
+            self._arena.append(bytearray(max(self.arena_chunk_size, length)))
+            self._arena_used = 0
+
+        chunk = self._arena[-1]
+        chunk[self._arena_used : self._arena_used + length] = payload
+        self._payload_chunks.append(len(self._arena) - 1)
+        self._payload_offsets.append(self._arena_used)
+        self._payload_lengths.append(length)
+        self._arena_used += length
+
+    def append(self, packet: PacketInfo) -> int:
+        """
+        패킷 추가
+
+        Args:
+            packet: 저장할 패킷 (PacketInfo 또는 같은 속성을 가진 객체)
+
+        Returns:
+            int: 저장된 행 번호
+        """
+        with self.lock:
+            row = len(self._timestamps)
+            self._append_ip(row, "src_ip", self._src_ips, packet.src_ip)
+            self._append_ip(row, "dst_ip", self._dst_ips, packet.dst_ip)
+            self._append_value(row, "src_port", self._src_ports, packet.src_port, 0xFFFF)
+            self._append_value(row, "dst_port", self._dst_ports, packet.dst_port, 0xFFFF)
+            self._append_value(row, "size", self._sizes, packet.size, 0xFFFFFFFF)
+            self._protocols.append(self._protocol_code(packet.protocol))
+            self._store_payload(packet.payload or b"")
+            if packet.flags:
+                self._flags[row] = packet.flags
+            # 타임스탬프를 마지막에 추가하여 len()이 완전히 기록된 행만 가리키도록 함
+            self._timestamps.append(packet.timestamp)
+            return row
+
+    def payload_view(self, row: int) -> memoryview:
+        """행의 페이로드에 대한 복사 없는 읽기 전용 memoryview"""
+        offset = self._payload_offsets[row]
+        chunk = self._arena[self._payload_chunks[row]]
+        return memoryview(chunk)[offset : offset + self._payload_lengths[row]].toreadonly()
+
+    def slice(self, offset: int = 0, limit: Optional[int] = None) -> List[PacketView]:
+        """행 범위에 대한 뷰 목록 (limit이 None이면 끝까지, 0이면 빈 목록)"""
+        end = len(self._timestamps)
+        if limit is not None:
+            end = min(end, offset + limit)
+        return [PacketView(self, row) for row in range(offset, end)]
+
+    def payload_statistics(self, offset: int = 0, limit: Optional[int] = None) -> List[PayloadStats]:
+        """행 범위 페이로드의 엔트로피/출력 가능 비율 등을 일괄 계산 (아레나의 memoryview로 읽음)"""
+        end = len(self._timestamps)
+        if limit is not None:
+            end = min(end, offset + limit)
+        return batch_payload_statistics([self.payload_view(row) for row in range(offset, end)])
+
+    def clear(self) -> None:
+        """
+        모든 패킷 삭제
+
+        행 번호가 재사용되므로 기존 PacketView는 무효화됩니다. 이미 꺼낸 payload_view
+        memoryview는 이전 아레나 청크를 참조하므로 해제될 때까지 그대로 유효합니다.
+        """
+        with self.lock:
+            self.generation += 1
+            self._reset()
+
+    def memory_usage(self) -> int:
+        """열 배열과 페이로드 아레나가 차지하는 대략적인 바이트 수"""
+        columns = (
+            self._timestamps,
+            self._src_ips,
+            self._dst_ips,
+            self._src_ports,
+            self._dst_ports,
+            self._protocols,
+            self._sizes,
+            self._payload_chunks,
+            self._payload_offsets,
+            self._payload_lengths,
+        )
+        return sum(column.itemsize * len(column) for column in columns) + sum(len(chunk) for chunk in self._arena)
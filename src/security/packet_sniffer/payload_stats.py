@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+페이로드 통계 커널
+바이트 히스토그램 한 번으로 섀넌 엔트로피, 출력 가능 문자 비율, NULL 바이트 수를 계산합니다.
+NumPy가 있으면 np.frombuffer + np.bincount로 바이트 단위 파이썬 루프 없이 계산하며,
+세션 전체 페이로드를 한 번의 bincount로 처리하는 일괄 계산을 제공합니다.
+"""
+
+import math
+from collections import Counter
+from typing import Iterable, List, NamedTuple, Optional, Union
+
+# 선택적 import - 없으면 Counter 기반으로 동작
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+    np = None
+
+BytesLike = Union[bytes, bytearray, memoryview, str]
+
+# 출력 가능한 ASCII 바이트 (0x20-0x7E)
+PRINTABLE_START = 32
+PRINTABLE_END = 127
+_PRINTABLE_BYTES = bytes(range(PRINTABLE_START, PRINTABLE_END))
+
+# 암호화/터널링 추정 기준 (바이트당 비트)
+ENCRYPTED_ENTROPY_THRESHOLD = 7.0
+
+# 일괄 계산 시 한 번의 bincount로 처리하는 페이로드 수 (히스토그램 행렬이 캐시에 머무는 크기)
+BATCH_CHUNK_ROWS = 32
+
+# c * log2(c) 조회 테이블: H = log2(n) - sum(c * log2(c)) / n 을 로그 계산 없이 구함
+_TABLE_SIZE = 1 << 16
+_COUNT_LOG2 = None
+if HAS_NUMPY:
+    _COUNT_LOG2 = np.zeros(_TABLE_SIZE)
+    _COUNT_LOG2[1:] = np.arange(1, _TABLE_SIZE) * np.log2(np.arange(1, _TABLE_SIZE))
+
+
+class PayloadStats(NamedTuple):
+    """페이로드 통계"""
+
+    size: int
+    entropy: float  # 바이트당 비트 (0.0 ~ 8.0)
+    printable_ratio: float
+    null_bytes: int
+    histogram: Optional[List[int]] = None  # 바이트 값별 출현 수 (요청 시)
+
+
+def _as_bytes(data: BytesLike) -> BytesLike:
+    return data.encode("utf-8") if isinstance(data, str) else data
+
+
+def byte_histogram(data: BytesLike) -> List[int]:
+    """바이트 값(0-255)별 출현 수"""
+    data = _as_bytes(data)
+    if HAS_NUMPY:
+        return np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256).tolist()
+
+    histogram = [0] * 256
+    for value, count in Counter(bytes(data)).items():
+        histogram[value] = count
+    return histogram
+
+
+def shannon_entropy(data: BytesLike) -> float:
+    """섀넌 엔트로피 (바이트당 비트)"""
+    return payload_statistics(data).entropy
+
+
+def printable_ratio(data: BytesLike) -> float:
+    """출력 가능한 ASCII 바이트 비율"""
+    data = bytes(_as_bytes(data))
+    if not data:
+        return 0.0
+    return 1.0 - len(data.translate(None, _PRINTABLE_BYTES)) / len(data)
+
+
+def _entropy(counts, size: int) -> float:
+    if size < _TABLE_SIZE:
+        return max(0.0, math.log2(size) - float(_COUNT_LOG2[counts].sum()) / size)
+    present = counts[counts > 0] / size
+    return float(-(present * np.log2(present)).sum())
+
+
+def payload_statistics(data: BytesLike, histogram: bool = False) -> PayloadStats:
+    """
+    페이로드 통계 계산 (바이트 히스토그램 한 번으로 모든 값 계산)
+
+    Args:
+        data: 페이로드 (str은 UTF-8로 인코딩)
+        histogram: 바이트 히스토그램 포함 여부
+
+    Returns:
+        PayloadStats: 페이로드 통계
+    """
+    data = _as_bytes(data)
+    size = len(data)
+    if not size:
+        return PayloadStats(0, 0.0, 0.0, 0, [0] * 256 if histogram else None)
+
+    if HAS_NUMPY:
+        counts = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+        printable = int(counts[PRINTABLE_START:PRINTABLE_END].sum())
+        return PayloadStats(
+            size,
+            _entropy(counts, size),
+            printable / size,
+            int(counts[0]),
+            counts.tolist() if histogram else None,
+        )
+
+    counts = Counter(bytes(data))
+    entropy = -sum(count / size * math.log2(count / size) for count in counts.values())
+    printable = sum(count for value, count in counts.items() if PRINTABLE_START <= value < PRINTABLE_END)
+    hist = None
+    if histogram:
+        hist = [0] * 256
+        for value, count in counts.items():
+            hist[value] = count
+    return PayloadStats(size, entropy, printable / size, counts.get(0, 0), hist)
+
+
+def batch_payload_statistics(payloads: Iterable[BytesLike], histogram: bool = False) -> List[PayloadStats]:
+    """
+    여러 페이로드의 통계를 한 번에 계산
+
+    BATCH_CHUNK_ROWS개씩 페이로드를 하나의 버퍼로 이어 붙이고 (행 번호 * 256 + 바이트 값)에 대해
+    bincount를 한 번 수행하여 (페이로드 수 x 256) 히스토그램 행렬을 만든 뒤 엔트로피와 비율을
+    행 단위로 계산합니다. 작은 페이로드가 많을수록 페이로드별 호출보다 빠릅니다.
+
+    Args:
+        payloads: 페이로드 목록 (bytes, memoryview 등)
+        histogram: 바이트 히스토그램 포함 여부
+
+    Returns:
+        list: 입력 순서대로의 PayloadStats
+    """
+    payloads = [_as_bytes(payload) for payload in payloads]
+    if not HAS_NUMPY:
+        return [payload_statistics(payload, histogram) for payload in payloads]
+    if not payloads:
+        return []
+
+    results = []
+    for start in range(0, len(payloads), BATCH_CHUNK_ROWS):
+        results.extend(_batch_chunk(payloads[start : start + BATCH_CHUNK_ROWS], histogram))
+    return results
+
+
+def _batch_chunk(payloads: List[BytesLike], histogram: bool) -> List[PayloadStats]:
+    rows = len(payloads)
+    sizes = np.fromiter((len(payload) for payload in payloads), dtype=np.intp, count=rows)
+    indexes = np.repeat(np.arange(0, rows * 256, 256, dtype=np.intp), sizes)
+    indexes += np.frombuffer(b"".join(payloads), dtype=np.uint8)
+    counts = np.bincount(indexes, minlength=rows * 256).reshape(rows, 256)
+
+    safe_sizes = np.maximum(sizes, 1)
+    if sizes.max(initial=0) < _TABLE_SIZE:
+        entropies = np.log2(safe_sizes) - _COUNT_LOG2[counts].sum(axis=1) / safe_sizes
+    else:
+        probabilities = counts / safe_sizes[:, None]
+        logs = np.log2(probabilities, out=np.zeros(counts.shape), where=counts > 0)
+        entropies = -(probabilities * logs).sum(axis=1)
+    ratios = counts[:, PRINTABLE_START:PRINTABLE_END].sum(axis=1) / safe_sizes
+
+    histograms = counts.tolist() if histogram else [None] * rows
+    return [
+        PayloadStats(size, max(0.0, entropy), ratio, nulls, hist)
+        for size, entropy, ratio, nulls, hist in zip(
+            sizes.tolist(), entropies.tolist(), ratios.tolist(), counts[:, 0].tolist(), histograms
+        )
+    ]
+
+
+def looks_encrypted(stats: PayloadStats, threshold: float = ENCRYPTED_ENTROPY_THRESHOLD) -> bool:
+    """엔트로피 기반 암호화/압축 데이터 추정"""
+    return stats.size > 0 and stats.entropy > threshold
@@ -3,16 +3,25 @@
 세션 관리자 - 패킷 캡처 세션의 생명주기 관리
 """
 
+import bisect
 import threading
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
 
 from utils.unified_logger import get_logger
 
 from .base_sniffer import PacketInfo
+from .capture_index import CaptureIndex, split_criteria
+from .capture_spool import DEFAULT_SEGMENT_MAX_BYTES, DEFAULT_SEGMENT_MAX_DURATION, CaptureSpool
+from .exporters.pcap_io import PcapWriter, encode_packet
+from .packet_store import PacketStore, PacketView
+from .payload_stats import PayloadStats, batch_payload_statistics
+
+EXPORT_PAGE_SIZE = 10000  # 스풀 모드 export_data 한 페이지의 최대 패킷 수 (전체 내보내기는 export_pcap)
 
 
 class SessionStatus(Enum):
@@ -38,6 +47,12 @@ class SessionConfig:
     filter_rules: List[Dict[str, Any]] = field(default_factory=list)
     capture_interface: str = "any"
     buffer_size: int = 65536
+    # 스풀 모드: spool_dir이 있으면 패킷을 회전 pcap 세그먼트에 기록하고 최근 hot_window개만 메모리에 유지
+    spool_dir: Optional[str] = None
+    segment_max_bytes: int = DEFAULT_SEGMENT_MAX_BYTES
+    segment_max_duration: Optional[float] = DEFAULT_SEGMENT_MAX_DURATION
+    max_segments: int = 0  # 0이면 무제한
+    hot_window: int = 10000
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -49,6 +64,11 @@ class SessionConfig:
             "filter_rules": self.filter_rules,
             "capture_interface": self.capture_interface,
             "buffer_size": self.buffer_size,
+            "spool_dir": self.spool_dir,
+            "segment_max_bytes": self.segment_max_bytes,
+            "segment_max_duration": self.segment_max_duration,
+            "max_segments": self.max_segments,
+            "hot_window": self.hot_window,
         }
 
 
@@ -99,10 +119,27 @@ class CaptureSession:
         self.info = SessionInfo(session_id, config)
         self.logger = get_logger(f"session_{session_id[:8]}", "advanced")
 
-        # 패킷 저장소
-        self.packets: List[PacketInfo] = []
+        # 패킷 저장소 (열 기반 압축 저장, 스풀 모드에서는 최근 패킷만 유지)
+        self.packets = PacketStore()
         self.packet_lock = threading.RLock()
 
+        # 패킷 번호 역색인 (필터 조회/플로우 조회용, 스풀 모드에서는 세그먼트와 함께 영속화)
+        self.index = CaptureIndex()
+
+        # 스풀 모드: 전체 패킷은 세그먼트 파일에, 메모리에는 두 세대의 저장소로 핫 윈도우만 유지
+        self.spool: Optional[CaptureSpool] = None
+        self._hot_previous = PacketStore()
+        if config.spool_dir:
+            self.spool = CaptureSpool(
+                Path(config.spool_dir) / session_id,
+                segment_max_bytes=config.segment_max_bytes,
+                segment_max_duration=config.segment_max_duration,
+                max_segments=config.max_segments,
+                index=self.index,
+            )
+            # 같은 디렉토리의 기존 세그먼트를 복구한 경우
+            self.info.packets_captured = len(self.spool)
+
         # 콜백 관리
         self.callbacks: List[Callable] = []
 
@@ -138,6 +175,13 @@ class CaptureSession:
                 return False
 
         with self.packet_lock:
+            if self.spool is not None:
+                self.spool.append(packet)
+                if len(self.packets) >= max(1, self.config.hot_window // 2):
+                    self._hot_previous = self.packets
+                    self.packets = PacketStore()
+            else:
+                self.index.add(len(self.packets), packet)
             self.packets.append(packet)
             self.info.packets_captured += 1
             self.info.total_bytes += packet.size
@@ -226,6 +270,10 @@ class CaptureSession:
         self._should_stop.set()
         self._is_paused.clear()
 
+        if self.spool is not None:
+            with self.packet_lock:
+                self.spool.close()
+
         # 통계 스레드 종료 대기
         if self._stats_thread and self._stats_thread.is_alive():
             self._stats_thread.join(timeout=5)
@@ -233,34 +281,195 @@ class CaptureSession:
         self.logger.info(f"세션 중지됨: {self.session_id} (상태: {status.value})")
         return True
 
-    def get_packets(self, limit: Optional[int] = None, offset: int = 0) -> List[PacketInfo]:
-        """패킷 조회"""
+    def _hot_slice(self, offset: int, limit: Optional[int]) -> Optional[List[PacketView]]:
+        """요청 구간이 핫 윈도우 안이면 메모리에서 반환 (아니면 None)"""
+        hot_count = len(self._hot_previous) + len(self.packets)
+        hot_start = len(self.spool) - hot_count
+        if offset < hot_start:
+            return None
+        local = offset - hot_start
+        previous = self._hot_previous.slice(local, limit)
+        if limit is not None:
+            limit -= len(previous)
+            if limit <= 0:
+                return previous
+        return previous + self.packets.slice(max(0, local - len(self._hot_previous)), limit)
+
+    def get_packets(self, limit: Optional[int] = None, offset: int = 0) -> List[Union[PacketView, PacketInfo]]:
+        """
+        패킷 조회
+
+        메모리 모드에서는 저장소를 직접 참조하는 PacketView 목록을 반환합니다. 스풀 모드에서는
+        핫 윈도우 안의 구간은 메모리에서, 그 이전 구간은 세그먼트 파일에서 읽은 PacketInfo로 반환합니다.
+        """
+        with self.packet_lock:
+            if self.spool is None:
+                return self.packets.slice(offset, limit)
+            hot = self._hot_slice(offset, limit)
+        if hot is not None:
+            return hot
+        return list(self.spool.read(offset, limit))
+
+    def iter_packets(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[Union[PacketView, PacketInfo]]:
+        """패킷 지연 순회 (스풀 모드에서는 세그먼트를 순서대로 읽음)"""
+        if self.spool is not None:
+            return self.spool.read(offset, limit)
+        return iter(self.get_packets(limit, offset))
+
+    def _fetch_numbers(self, numbers: List[int]) -> List[Union[PacketView, PacketInfo]]:
+        """패킷 번호 목록의 패킷 (핫 윈도우 안은 메모리, 나머지는 세그먼트에서 읽음)"""
+        with self.packet_lock:
+            if self.spool is None:
+                return [self.packets[number] for number in numbers if number < len(self.packets)]
+            hot_start = self.spool.total_packets - len(self._hot_previous) - len(self.packets)
+            previous, current = self._hot_previous, self.packets
+        position = bisect.bisect_left(numbers, hot_start)
+        packets: List[Union[PacketView, PacketInfo]] = [
+            packet for _, packet in self.spool.read_numbers(numbers[:position])
+        ]
+        for number in numbers[position:]:
+            local = number - hot_start
+            packets.append(previous[local] if local < len(previous) else current[local - len(previous)])
+        return packets
+
+    def query_packets(
+        self,
+        criteria: Optional[Dict[str, Any]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        역색인 기반 패킷 조회
+
+        색인 필드(src_ip, dst_ip, ip, src_port, dst_port, port, protocol, flow_id)와 시간 구간
+        (start_time, end_time)은 인덱스 교집합으로, 그 밖의 키는 후보 패킷의 dict 값과 비교합니다
+        (PacketCapturer.filter_packets와 같은 규칙).
+
+        Args:
+            criteria: 조회 조건
+            offset: 일치 결과 기준 시작 위치
+            limit: 최대 패킷 수
+
+        Returns:
+            dict: 전체 일치 수(total), 패킷 번호(packet_numbers), 패킷(packets)
+        """
+        indexed, residual, start_time, end_time = split_criteria(criteria)
+        numbers = self.index.query(indexed, start_time, end_time)
+
+        if residual:
+            matched = []
+            for number, packet in zip(numbers, self._fetch_numbers(numbers)):
+                values = packet.to_dict()
+                if all(key not in values or values[key] == value for key, value in residual.items()):
+                    matched.append((number, packet))
+            total = len(matched)
+            page = matched[offset:] if limit is None else matched[offset : offset + limit]
+            return {"total": total, "packet_numbers": [n for n, _ in page], "packets": [p for _, p in page]}
+
+        page_numbers = numbers[offset:] if limit is None else numbers[offset : offset + limit]
+        return {"total": len(numbers), "packet_numbers": page_numbers, "packets": self._fetch_numbers(page_numbers)}
+
+    def get_flow_packets(self, packet_number: int, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        지정 패킷과 같은 플로우(양방향)의 패킷 조회
+
+        Args:
+            packet_number: 기준 패킷 번호 (query_packets 결과의 packet_numbers)
+            limit: 최대 패킷 수
+
+        Returns:
+            dict: query_packets와 같은 형식 (플로우가 없으면 total 0)
+        """
+        packet_flow = self.index.flow_of(packet_number)
+        if packet_flow is None:
+            return {"total": 0, "packet_numbers": [], "packets": []}
+        return self.query_packets({"flow_id": packet_flow}, limit=limit)
+
+    def get_payload_statistics(self, limit: Optional[int] = None, offset: int = 0) -> List[PayloadStats]:
+        """세션 패킷 페이로드 통계 일괄 계산 (엔트로피, 출력 가능 비율, NULL 바이트 수)"""
         with self.packet_lock:
-            packets = self.packets[offset:]
-            if limit:
-                packets = packets[:limit]
-            return packets
+            if self.spool is None:
+                return self.packets.payload_statistics(offset, limit)
+        return batch_payload_statistics(packet.payload for packet in self.get_packets(limit, offset))
 
     def get_packet_count(self) -> int:
-        """패킷 수 조회"""
+        """패킷 수 조회 (스풀 모드에서는 디스크에 보존 중인 패킷 수)"""
         with self.packet_lock:
+            if self.spool is not None:
+                return len(self.spool)
             return len(self.packets)
 
     def clear_packets(self) -> None:
         """패킷 데이터 삭제"""
         with self.packet_lock:
             self.packets.clear()
+            self._hot_previous = PacketStore()
+            if self.spool is not None:
+                self.spool.clear()
+            else:
+                self.index.clear()
             self.info.packets_captured = 0
             self.info.total_bytes = 0
         self.logger.info(f"세션 패킷 데이터 삭제됨: {self.session_id}")
 
-    def export_data(self) -> Dict[str, Any]:
-        """세션 데이터 내보내기"""
+    def close(self) -> None:
+        """세션 자원 해제 (스풀 세그먼트 삭제)"""
+        if self.spool is not None:
+            with self.packet_lock:
+                self.spool.remove()
+
+    def export_data(self, offset: int = 0, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        세션 데이터 페이지 내보내기
+
+        메모리 모드에서는 limit이 None이면 끝까지 내보냅니다. 스풀 모드에서는 세그먼트에서 요청한
+        구간만 읽으며 한 페이지는 EXPORT_PAGE_SIZE를 넘지 않으므로, 세션 전체는 next_offset으로
+        이어서 요청하거나 export_pcap으로 스트리밍 내보내기합니다.
+
+        Args:
+            offset: 보존 중인 첫 패킷 기준 시작 위치
+            limit: 최대 패킷 수 (None이면 끝까지, 스풀 모드에서는 EXPORT_PAGE_SIZE까지)
+
+        Returns:
+            dict: 세션 정보, 패킷 페이지, 전체 패킷 수(total), 다음 페이지 위치(next_offset, 마지막이면 None)
+        """
+        offset = max(0, offset)
+        if self.spool is None:
+            with self.packet_lock:
+                total = len(self.packets)
+                packets = [packet.to_dict() for packet in self.packets.slice(offset, limit)]
+            data = {"session_info": self.info.to_dict()}
+        else:
+            limit = EXPORT_PAGE_SIZE if limit is None else min(limit, EXPORT_PAGE_SIZE)
+            total = len(self.spool)
+            packets = [packet.to_dict() for packet in self.spool.read(offset, limit)]
+            data = {"session_info": self.info.to_dict(), "spool": self.spool.get_statistics()}
+
+        end = offset + len(packets)
+        data.update(packets=packets, offset=offset, total=total, next_offset=end if end < total else None)
+        return data
+
+    def export_pcap(self, output_path: str) -> Dict[str, Any]:
+        """
+        세션 패킷을 pcap 파일로 내보내기
+
+        스풀 모드에서는 세그먼트 레코드를 그대로 스트리밍 복사하므로 세션 크기와 무관한 메모리로 동작합니다.
+
+        Args:
+            output_path: 출력 파일 경로
+
+        Returns:
+            dict: 내보내기 결과
+        """
+        if self.spool is not None:
+            return self.spool.export_pcap(output_path)
         with self.packet_lock:
-            return {
-                "session_info": self.info.to_dict(),
-                "packets": [packet.to_dict() for packet in self.packets],
-            }
+            packets = [packet.to_packet() for packet in self.packets]
+        with PcapWriter(output_path, nanosecond=True) as writer:
+            for packet in packets:
+                writer.write(encode_packet(packet), packet.timestamp, orig_len=packet.size)
+            exported = writer.packets_written
+        return {"output_path": output_path, "exported_count": exported, "segments": 0}
 
     def _stats_updater(self) -> None:
         """통계 업데이트 스레드"""
@@ -318,6 +527,30 @@ class SessionManager:
         self.logger.info(f"새 세션 생성됨: {session_id} ({config.name})")
         return session_id
 
+    def restore_session(self, session_id: str, config: SessionConfig) -> Optional[CaptureSession]:
+        """
+        스풀 디렉토리에 남아 있는 세션 복구 (재시작 후 조회용, 중지 상태로 등록)
+
+        Args:
+            session_id: 세션 ID (스풀 하위 디렉토리 이름)
+            config: spool_dir이 지정된 세션 설정
+
+        Returns:
+            CaptureSession: 복구된 세션 (스풀 세그먼트가 없으면 None)
+        """
+        if not config.spool_dir or not (Path(config.spool_dir) / session_id).is_dir():
+            return None
+
+        with self.session_lock:
+            if session_id in self.sessions:
+                return self.sessions[session_id]
+            session = CaptureSession(session_id, config)
+            session.info.status = SessionStatus.STOPPED
+            self.sessions[session_id] = session
+
+        self.logger.info(f"세션 복구됨: {session_id} ({session.get_packet_count()}개 패킷)")
+        return session
+
     def get_session(self, session_id: str) -> Optional[CaptureSession]:
         """세션 조회"""
         with self.session_lock:
@@ -363,7 +596,8 @@ class SessionManager:
             if session.info.status == SessionStatus.RUNNING:
                 session.stop()
 
-            # 세션 제거
+            # 세션 제거 (스풀 세그먼트 포함)
+            session.close()
             del self.sessions[session_id]
 
         self.logger.info(f"세션 삭제됨: {session_id}")
@@ -405,11 +639,20 @@ class SessionManager:
             return True
         return False
 
-    def export_session_data(self, session_id: str) -> Optional[Dict[str, Any]]:
-        """세션 데이터 내보내기"""
+    def export_session_data(
+        self, session_id: str, offset: int = 0, limit: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """세션 데이터 페이지 내보내기 (CaptureSession.export_data 참고)"""
+        session = self.get_session(session_id)
+        if session:
+            return session.export_data(offset, limit)
+        return None
+
+    def export_session_pcap(self, session_id: str, output_path: str) -> Optional[Dict[str, Any]]:
+        """세션 패킷을 pcap 파일로 내보내기"""
         session = self.get_session(session_id)
         if session:
-            return session.export_data()
+            return session.export_pcap(output_path)
         return None
 
     def get_session_statistics(self) -> Dict[str, Any]:
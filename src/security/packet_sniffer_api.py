@@ -336,11 +336,11 @@ class PacketSnifferAPI:
     ) -> Dict[str, Any]:
         """최신 패킷 목록 조회"""
         try:
-            packets = self.packet_capturer.get_latest_packets(session_id, count)
-
-            # 필터 적용
+            # 필터 조건은 세션 역색인으로 조회 (가져온 패킷을 다시 걸러내지 않음)
             if filter_criteria:
-                packets = self.packet_capturer.filter_packets(packets, filter_criteria)
+                packets = self.packet_capturer.query_packets(session_id, filter_criteria, limit=count)["packets"]
+            else:
+                packets = self.packet_capturer.get_latest_packets(session_id, count)
 
             return {
                 "success": True,
@@ -365,6 +365,52 @@ class PacketSnifferAPI:
             self.logger.error(f"모든 패킷 조회 실패: {e}")
             return []
 
+    def query_packets(
+        self,
+        session_id: str,
+        filter_criteria: Dict[str, Any] = None,
+        page: int = 1,
+        page_size: int = 100,
+    ) -> Dict[str, Any]:
+        """
+        세션 패킷 색인 조회 (페이지 단위)
+
+        filter_criteria의 src_ip, dst_ip, ip, src_port, dst_port, port, protocol, flow_id,
+        start_time, end_time은 세션 역색인으로 처리하므로 세션 크기만큼 순회하지 않습니다.
+        """
+        try:
+            page = max(1, page)
+            result = self.packet_capturer.query_packets(
+                session_id, filter_criteria, offset=(page - 1) * page_size, limit=page_size
+            )
+            return {
+                "success": True,
+                "packets": result["packets"],
+                "count": len(result["packets"]),
+                "total": result["total"],
+                "page": page,
+                "page_size": page_size,
+            }
+
+        except Exception as e:
+            self.logger.error(f"패킷 색인 조회 실패: {e}")
+            return {"success": False, "error": str(e)}
+
+    def get_flow_packets(self, session_id: str, packet_number: int, limit: Optional[int] = None) -> Dict[str, Any]:
+        """지정 패킷과 같은 플로우(양방향)의 패킷 조회"""
+        try:
+            result = self.packet_capturer.get_flow_packets(session_id, packet_number, limit)
+            return {
+                "success": True,
+                "packets": result["packets"],
+                "count": len(result["packets"]),
+                "total": result["total"],
+            }
+
+        except Exception as e:
+            self.logger.error(f"플로우 패킷 조회 실패: {e}")
+            return {"success": False, "error": str(e)}
+
     def filter_packets(self, packets: List[Dict[str, Any]], filter_criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
         """패킷 필터링"""
         try:
@@ -468,10 +514,12 @@ class PacketSnifferAPI:
 
     # ========== 내보내기 메서드들 ==========
 
-    def export_session_data(self, session_id: str, export_format: str = "json") -> Dict[str, Any]:
-        """세션 데이터 내보내기"""
+    def export_session_data(
+        self, session_id: str, export_format: str = "json", offset: int = 0, limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """세션 데이터 페이지 내보내기 (다음 페이지는 data.session_data.next_offset)"""
         try:
-            export_data = self.packet_capturer.export_capture_data(session_id)
+            export_data = self.packet_capturer.export_capture_data(session_id, offset, limit)
 
             if export_format.lower() == "json":
                 return {"success": True, "format": "json", "data": export_data}
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+캐시 페이로드 코덱
+Redis/파일 캐시에 저장하는 값을 직렬화(msgpack 또는 orjson)하고,
+임계값 이상이면 압축(zstd > lz4 > zlib)한 뒤 버전 헤더를 붙여 저장
+
+저장 형식: MAGIC(3) + 형식 버전(1) + 직렬화기 ID(1) + 압축기 ID(1) + 본문
+헤더가 없는 값은 이전 버전이 저장한 JSON으로 보고 그대로 읽으므로 업그레이드 중에도 기존 캐시를 쓸 수 있다.
+"""
+
+import dataclasses
+import datetime
+import enum
+import struct
+import threading
+import time
+import uuid
+import zlib
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+import orjson
+
+from config.constants import CACHE_SETTINGS
+from utils.unified_logger import get_logger
+
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import lz4.frame
+
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+# 0xff는 UTF-8 텍스트(JSON)에 나타나지 않으므로 헤더 없는 이전 형식과 구분된다
+MAGIC = b"\xffNC"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("!3sBBB")
+
+
+class CodecError(ValueError):
+    """저장된 페이로드를 해석할 수 없음 (알 수 없는 버전 또는 설치되지 않은 코덱)"""
+
+
+class _Stage(NamedTuple):
+    """직렬화/압축 단계 (ID는 저장 형식에 기록되므로 바꾸지 않는다)"""
+
+    code: int
+    name: str
+    encode: Callable[[bytes], bytes]
+    decode: Callable[[bytes], Any]
+
+
+def _msgpack_default(value: Any) -> Any:
+    """msgpack이 모르는 타입을 orjson과 같은 방식으로 변환 (dataclass -> dict, 날짜 -> ISO 문자열)"""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"Type is not msgpack serializable: {type(value).__name__}")
+
+
+SERIALIZERS: Dict[str, _Stage] = {"orjson": _Stage(1, "orjson", orjson.dumps, orjson.loads)}
+if MSGPACK_AVAILABLE:
+    SERIALIZERS["msgpack"] = _Stage(
+        2,
+        "msgpack",
+        lambda value: msgpack.packb(value, default=_msgpack_default, use_bin_type=True),
+        lambda data: msgpack.unpackb(data, raw=False, strict_map_key=False),
+    )
+
+COMPRESSORS: Dict[str, _Stage] = {
+    "none": _Stage(0, "none", bytes, bytes),
+    "zlib": _Stage(1, "zlib", lambda data: zlib.compress(data, 6), zlib.decompress),
+}
+if ZSTD_AVAILABLE:
+    # ZstdCompressor/ZstdDecompressor 인스턴스는 스레드 간 공유할 수 없으므로 스레드별로 둔다
+    _zstd_local = threading.local()
+
+    def _zstd_compress(data: bytes) -> bytes:
+        if not hasattr(_zstd_local, "compressor"):
+            _zstd_local.compressor = zstandard.ZstdCompressor(level=3)
+        return _zstd_local.compressor.compress(data)
+
+    def _zstd_decompress(data: bytes) -> bytes:
+        if not hasattr(_zstd_local, "decompressor"):
+            _zstd_local.decompressor = zstandard.ZstdDecompressor()
+        return _zstd_local.decompressor.decompress(data)
+
+    COMPRESSORS["zstd"] = _Stage(2, "zstd", _zstd_compress, _zstd_decompress)
+if LZ4_AVAILABLE:
+    COMPRESSORS["lz4"] = _Stage(3, "lz4", lz4.frame.compress, lz4.frame.decompress)
+
+_SERIALIZERS_BY_CODE = {stage.code: stage for stage in SERIALIZERS.values()}
+_COMPRESSORS_BY_CODE = {stage.code: stage for stage in COMPRESSORS.values()}
+
+
+def _resolve(name: Optional[str], available: Dict[str, _Stage], preference: tuple, kind: str) -> _Stage:
+    """요청한 코덱을 고르고, 없거나 설치되지 않았으면 설치된 것 중 우선순위가 가장 높은 코덱으로 대체"""
+    if name and name != "auto":
+        if name in available:
+            return available[name]
+        logger.warning(f"캐시 {kind} '{name}' 사용 불가 (미설치 또는 미지원), 대체 코덱 사용")
+    return next(available[candidate] for candidate in preference if candidate in available)
+
+
+class CacheCodec:
+    """
+    캐시 값 인코더/디코더
+
+    쓰기는 설정된 직렬화기/압축기를 쓰고, 읽기는 헤더에 기록된 코덱을 따르므로
+    설정을 바꾸거나 노드마다 설치된 라이브러리가 달라도 서로 저장한 값을 읽을 수 있다
+    (읽는 쪽에 해당 코덱이 없으면 CodecError -> 백엔드에서 캐시 미스로 처리).
+    """
+
+    def __init__(
+        self,
+        serializer: Optional[str] = None,
+        compression: Optional[str] = None,
+        compress_threshold: Optional[int] = None,
+    ):
+        """
+        Args:
+            serializer: "msgpack", "orjson" 또는 "auto" (msgpack 우선)
+            compression: "zstd", "lz4", "zlib", "none" 또는 "auto" (zstd > lz4 > zlib)
+            compress_threshold: 직렬화 결과가 이 바이트 수 이상일 때만 압축
+        """
+        self.serializer = _resolve(serializer, SERIALIZERS, ("msgpack", "orjson"), "직렬화기")
+        self.compressor = _resolve(compression, COMPRESSORS, ("zstd", "lz4", "zlib"), "압축기")
+        self.compress_threshold = (
+            CACHE_SETTINGS["COMPRESS_THRESHOLD"] if compress_threshold is None else compress_threshold
+        )
+
+        self._lock = threading.Lock()
+        self._timings: Dict[str, Dict[str, float]] = {}
+        self._stats = {"encoded_bytes": 0, "stored_bytes": 0, "compressed": 0, "legacy_decodes": 0}
+
+    def encode(self, value: Any) -> bytes:
+        """값을 헤더가 붙은 바이트열로 변환"""
+        started = time.perf_counter()
+        body = self.serializer.encode(value)
+        serialized = time.perf_counter()
+        self._record(self.serializer.name, "encode", serialized - started)
+
+        compressor = _COMPRESSORS_BY_CODE[0]
+        raw_size = len(body)
+        if self.compressor.code and raw_size >= self.compress_threshold:
+            packed = self.compressor.encode(body)
+            self._record(self.compressor.name, "encode", time.perf_counter() - serialized)
+            # 압축해도 줄지 않는 값(이미 압축된 데이터 등)은 원본 그대로 저장
+            if len(packed) < raw_size:
+                body, compressor = packed, self.compressor
+
+        with self._lock:
+            self._stats["encoded_bytes"] += raw_size
+            self._stats["stored_bytes"] += len(body)
+            self._stats["compressed"] += compressor.code != 0
+        return _HEADER.pack(MAGIC, FORMAT_VERSION, self.serializer.code, compressor.code) + body
+
+    def decode(self, data: Any) -> Any:
+        """encode로 저장한 값 또는 헤더 없는 이전 JSON 값을 복원"""
+        if isinstance(data, str) or not data.startswith(MAGIC):
+            started = time.perf_counter()
+            value = orjson.loads(data)
+            self._record("legacy-json", "decode", time.perf_counter() - started)
+            with self._lock:
+                self._stats["legacy_decodes"] += 1
+            return value
+
+        if len(data) < _HEADER.size:
+            raise CodecError("캐시 페이로드 헤더가 잘림")
+        _, version, serializer_code, compressor_code = _HEADER.unpack_from(data)
+        if version > FORMAT_VERSION:
+            raise CodecError(f"지원하지 않는 캐시 형식 버전: {version}")
+        serializer = _SERIALIZERS_BY_CODE.get(serializer_code)
+        compressor = _COMPRESSORS_BY_CODE.get(compressor_code)
+        if serializer is None or compressor is None:
+            raise CodecError(f"캐시 페이로드 코덱 사용 불가 (직렬화기 {serializer_code}, 압축기 {compressor_code})")
+
+        body = memoryview(data)[_HEADER.size :]
+        if compressor.code:
+            started = time.perf_counter()
+            body = compressor.decode(body)
+            self._record(compressor.name, "decode", time.perf_counter() - started)
+        started = time.perf_counter()
+        value = serializer.decode(body)
+        self._record(serializer.name, "decode", time.perf_counter() - started)
+        return value
+
+    def _record(self, name: str, operation: str, seconds: float):
+        """코덱별 호출 수/소요 시간 누적"""
+        with self._lock:
+            timing = self._timings.get(name)
+            if timing is None:
+                timing = self._timings[name] = {
+                    "encodes": 0,
+                    "encode_seconds": 0.0,
+                    "decodes": 0,
+                    "decode_seconds": 0.0,
+                }
+            timing[f"{operation}s"] += 1
+            timing[f"{operation}_seconds"] += seconds
+
+    def stats(self) -> Dict[str, Any]:
+        """코덱 설정, 압축률, 코덱별 인코드/디코드 시간 통계"""
+        with self._lock:
+            stats = dict(self._stats)
+            timings = {name: dict(timing) for name, timing in self._timings.items()}
+
+        for timing in timings.values():
+            for operation in ("encode", "decode"):
+                calls = timing[f"{operation}s"]
+                timing[f"avg_{operation}_ms"] = round(timing[f"{operation}_seconds"] / calls * 1000, 4) if calls else 0
+        encoded = stats["encoded_bytes"]
+        return {
+            "version": FORMAT_VERSION,
+            "serializer": self.serializer.name,
+            "compression": self.compressor.name,
+            "compress_threshold": self.compress_threshold,
+            **stats,
+            "compression_ratio": round(stats["stored_bytes"] / encoded, 4) if encoded else 1.0,
+            "codecs": timings,
+        }
+
+
+_default_codec: Optional[CacheCodec] = None
+_default_codec_lock = threading.Lock()
+
+
+def get_default_codec() -> CacheCodec:
+    """CACHE_SETTINGS(CACHE_SERIALIZER/CACHE_COMPRESSION/CACHE_COMPRESS_THRESHOLD)로 만든 공유 코덱"""
+    global _default_codec
+    if _default_codec is None:
+        with _default_codec_lock:
+            if _default_codec is None:
+                _default_codec = CacheCodec(CACHE_SETTINGS["SERIALIZER"], CACHE_SETTINGS["COMPRESSION"])
+    return _default_codec
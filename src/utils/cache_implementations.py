@@ -4,14 +4,15 @@
 UnifiedCacheManager의 구체적 구현 클래스들
 """
 
+import fnmatch
 import os
 import threading
 import time
 from pathlib import Path
-from typing import Any, Dict, Optional
-
-import orjson
+from typing import Any, Dict, List, Optional
 
+from .cache_codec import CacheCodec, get_default_codec
+from .redis_keyspace import KeyRegistry, delete_pattern
 from .unified_cache_manager import CacheBackend
 from .unified_logger import get_logger
 
@@ -98,6 +99,14 @@ class MemoryCacheAdapter(CacheBackend):
         """키 존재 여부 확인"""
         return self.get(key) is not None
 
+    def delete_pattern(self, pattern: str) -> int:
+        """패턴에 맞는 키 삭제"""
+        with self._lock:
+            matched = [key for key in self.cache if fnmatch.fnmatchcase(key, pattern)]
+            for key in matched:
+                self.delete(key)
+            return len(matched)
+
     def _evict_lru(self):
         """LRU 정책으로 가장 오래된 항목 제거"""
         if not self.access_times:
@@ -130,16 +139,18 @@ class MemoryCacheAdapter(CacheBackend):
 class FileCacheAdapter(CacheBackend):
     """파일 기반 캐시 어댑터"""
 
-    def __init__(self, cache_dir: str = None, max_files: int = 10000):
+    def __init__(self, cache_dir: str = None, max_files: int = 10000, codec: Optional[CacheCodec] = None):
         """
         파일 캐시 초기화
 
         Args:
             cache_dir: 캐시 디렉토리 경로
             max_files: 최대 캐시 파일 수
+            codec: 페이로드 코덱 (기본: 공유 코덱)
         """
         self.cache_dir = Path(cache_dir or "/tmp/fortinet_cache")
         self.max_files = max_files
+        self.codec = codec or get_default_codec()
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self._lock = threading.Lock()
 
@@ -158,8 +169,8 @@ class FileCacheAdapter(CacheBackend):
                 if not file_path.exists():
                     return None
 
-                with open(file_path, "r") as f:
-                    data = orjson.loads(f.read())
+                with open(file_path, "rb") as f:
+                    data = self.codec.decode(f.read())
 
                 # TTL 검사
                 if data["ttl"] > 0 and time.time() > data["expires_at"]:
@@ -190,8 +201,8 @@ class FileCacheAdapter(CacheBackend):
 
                 data = {"value": value, "ttl": ttl, "expires_at": expires_at, "created_at": time.time()}
 
-                with open(file_path, "w") as f:
-                    f.write(orjson.dumps(data).decode("utf-8"))
+                with open(file_path, "wb") as f:
+                    f.write(self.codec.encode(data))
 
                 return True
 
@@ -229,6 +240,20 @@ class FileCacheAdapter(CacheBackend):
         """키 존재 여부 확인"""
         return self._get_file_path(key).exists()
 
+    def delete_pattern(self, pattern: str) -> int:
+        """패턴에 맞는 캐시 파일 삭제 (키와 같은 방식으로 변환한 패턴을 파일명에 적용)"""
+        file_pattern = self._get_file_path(pattern).name
+        removed = 0
+        try:
+            with self._lock:
+                for cache_file in self.cache_dir.glob("*.cache"):
+                    if fnmatch.fnmatchcase(cache_file.name, file_pattern):
+                        cache_file.unlink()
+                        removed += 1
+        except Exception as e:
+            logger.error(f"File cache delete pattern error: {e}")
+        return removed
+
     def _evict_oldest(self):
         """가장 오래된 캐시 파일 제거"""
         try:
@@ -255,6 +280,7 @@ class FileCacheAdapter(CacheBackend):
                 "max_files": self.max_files,
                 "total_size_bytes": total_size,
                 "cache_directory": str(self.cache_dir),
+                "codec": self.codec.stats(),
             }
 
         except Exception as e:
@@ -272,6 +298,7 @@ class RedisCacheAdapter(CacheBackend):
         db: int = 0,
         password: str = None,
         connection_pool_size: int = 10,
+        codec: Optional[CacheCodec] = None,
     ):
         """
         Redis 캐시 초기화
@@ -282,7 +309,9 @@ class RedisCacheAdapter(CacheBackend):
             db: Redis 데이터베이스 번호
             password: Redis 비밀번호
             connection_pool_size: 연결 풀 크기
+            codec: 페이로드 코덱 (기본: 공유 코덱)
         """
+        self.codec = codec or get_default_codec()
         try:
             import redis
 
@@ -298,6 +327,8 @@ class RedisCacheAdapter(CacheBackend):
 
             self.redis_client = redis.Redis(connection_pool=pool)
             self.key_prefix = "fortinet_cache:"
+            # 키 수 추적 레지스트리 (접두사 밖에 두어 SCAN 대상에서 제외)
+            self.registry = KeyRegistry(self.redis_client, f"__keys__:{self.key_prefix}")
 
             # 연결 테스트
             self.redis_client.ping()
@@ -326,8 +357,8 @@ class RedisCacheAdapter(CacheBackend):
             if data is None:
                 return None
 
-            # 데이터 역직렬화
-            return orjson.loads(data)
+            # 데이터 역직렬화 (헤더의 코덱/압축 정보 사용)
+            return self.codec.decode(data)
 
         except Exception as e:
             logger.error(f"Redis get error for key {key}: {e}")
@@ -343,14 +374,17 @@ class RedisCacheAdapter(CacheBackend):
         try:
             redis_key = self._get_key(key)
 
-            # 데이터 직렬화
-            serialized_data = orjson.dumps(value)
+            # 데이터 직렬화 (임계값 이상이면 압축)
+            serialized_data = self.codec.encode(value)
 
-            # TTL 설정하여 저장
+            # TTL 설정하여 저장 (키 레지스트리 갱신도 같은 파이프라인으로)
+            pipe = self.redis_client.pipeline(transaction=False)
             if ttl > 0:
-                return self.redis_client.setex(redis_key, ttl, serialized_data)
+                pipe.setex(redis_key, ttl, serialized_data)
             else:
-                return self.redis_client.set(redis_key, serialized_data)
+                pipe.set(redis_key, serialized_data)
+            self.registry.add(pipe, [redis_key], ttl)
+            return bool(pipe.execute()[0])
 
         except Exception as e:
             logger.error(f"Redis set error for key {key}: {e}")
@@ -365,7 +399,10 @@ class RedisCacheAdapter(CacheBackend):
 
         try:
             redis_key = self._get_key(key)
-            return bool(self.redis_client.delete(redis_key))
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.unlink(redis_key)
+            self.registry.remove(pipe, [redis_key])
+            return bool(pipe.execute()[0])
 
         except Exception as e:
             logger.error(f"Redis delete error for key {key}: {e}")
@@ -379,12 +416,11 @@ class RedisCacheAdapter(CacheBackend):
             return self._fallback.clear()
 
         try:
-            # 접두사가 있는 모든 키 삭제
-            pattern = f"{self.key_prefix}*"
-            keys = self.redis_client.keys(pattern)
-
-            if keys:
-                return bool(self.redis_client.delete(*keys))
+            # 접두사가 있는 모든 키를 SCAN + 배치 UNLINK로 삭제
+            delete_pattern(self.redis_client, f"{self.key_prefix}*")
+            pipe = self.redis_client.pipeline(transaction=False)
+            self.registry.clear(pipe)
+            pipe.execute()
             return True
 
         except Exception as e:
@@ -408,6 +444,59 @@ class RedisCacheAdapter(CacheBackend):
                 return self._fallback.exists(key)
             return False
 
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """MGET 한 번으로 여러 값 조회"""
+        if not self.redis_client:
+            return self._fallback.get_many(keys)
+        if not keys:
+            return {}
+
+        try:
+            values = self.redis_client.mget([self._get_key(key) for key in keys])
+            return {key: self.codec.decode(data) for key, data in zip(keys, values) if data is not None}
+
+        except Exception as e:
+            logger.error(f"Redis mget error: {e}")
+            if hasattr(self, "_fallback"):
+                return self._fallback.get_many(keys)
+            return {}
+
+    def set_many(self, mapping: Dict[str, Any], ttl: int = 300) -> bool:
+        """파이프라인 한 번으로 여러 값 저장 (TTL 없으면 MSET)"""
+        if not self.redis_client:
+            return self._fallback.set_many(mapping, ttl)
+        if not mapping:
+            return True
+
+        try:
+            data = {self._get_key(key): self.codec.encode(value) for key, value in mapping.items()}
+            pipe = self.redis_client.pipeline(transaction=False)
+            if ttl > 0:
+                for redis_key, serialized_data in data.items():
+                    pipe.setex(redis_key, ttl, serialized_data)
+            else:
+                pipe.mset(data)
+            self.registry.add(pipe, data.keys(), ttl)
+            return all(pipe.execute())
+
+        except Exception as e:
+            logger.error(f"Redis mset error: {e}")
+            if hasattr(self, "_fallback"):
+                return self._fallback.set_many(mapping, ttl)
+            return False
+
+    def delete_pattern(self, pattern: str) -> int:
+        """패턴에 맞는 키를 SCAN + 배치 UNLINK로 삭제"""
+        if not self.redis_client:
+            return self._fallback.delete_pattern(pattern)
+
+        try:
+            return delete_pattern(self.redis_client, self._get_key(pattern), registry=self.registry)
+
+        except Exception as e:
+            logger.error(f"Redis delete pattern error: {e}")
+            return 0
+
     def get_stats(self) -> Dict[str, Any]:
         """Redis 캐시 통계 반환"""
         if not self.redis_client:
@@ -418,9 +507,8 @@ class RedisCacheAdapter(CacheBackend):
         try:
             info = self.redis_client.info()
 
-            # 접두사가 있는 키 개수 계산
-            pattern = f"{self.key_prefix}*"
-            key_count = len(self.redis_client.keys(pattern))
+            # 접두사가 있는 키 개수 (열거 대신 레지스트리로 집계)
+            key_count = self.registry.count()
 
             return {
                 "type": "redis",
@@ -431,6 +519,7 @@ class RedisCacheAdapter(CacheBackend):
                 "connected_clients": info.get("connected_clients"),
                 "keyspace_hits": info.get("keyspace_hits", 0),
                 "keyspace_misses": info.get("keyspace_misses", 0),
+                "codec": self.codec.stats(),
             }
 
         except Exception as e:
@@ -500,6 +589,28 @@ class HybridCacheAdapter(CacheBackend):
         """키 존재 여부 확인"""
         return self.l1_cache.exists(key) or self.l2_cache.exists(key)
 
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """L1에 없는 키만 L2에서 한 번에 조회"""
+        result = self.l1_cache.get_many(keys)
+        missing = [key for key in keys if key not in result]
+        if missing:
+            found = self.l2_cache.get_many(missing)
+            if found:
+                self.l1_cache.set_many(found, ttl=300)  # L1 캐시 승격 (5분 TTL)
+                result.update(found)
+        return result
+
+    def set_many(self, mapping: Dict[str, Any], ttl: int = 300) -> bool:
+        """두 캐시 모두에 한 번에 저장"""
+        l1_success = self.l1_cache.set_many(mapping, min(ttl, 300))  # L1은 최대 5분
+        l2_success = self.l2_cache.set_many(mapping, ttl)
+
+        return l1_success or l2_success
+
+    def delete_pattern(self, pattern: str) -> int:
+        """두 캐시에서 패턴에 맞는 키 삭제"""
+        return max(self.l1_cache.delete_pattern(pattern), self.l2_cache.delete_pattern(pattern))
+
     def get_stats(self) -> Dict[str, Any]:
         """하이브리드 캐시 통계 반환"""
         l1_stats = self.l1_cache.get_stats()
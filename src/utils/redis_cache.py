@@ -7,7 +7,7 @@ Redis 캐싱 유틸리티 - 통합 캐시 매니저 래퍼
 
 import logging
 from functools import wraps
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from utils.unified_cache_manager import get_cache_manager
 
@@ -37,12 +37,17 @@ class RedisCache:
         """키 존재 여부 확인"""
         return self.cache_manager.exists(key)
 
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """여러 키를 한 번에 조회 (MGET)"""
+        return self.cache_manager.get_many(keys)
+
+    def set_many(self, mapping: Dict[str, Any], ttl: int = 300) -> bool:
+        """여러 값을 한 번에 저장 (파이프라인)"""
+        return self.cache_manager.set_many(mapping, ttl)
+
     def clear_pattern(self, pattern: str) -> int:
-        """패턴에 맞는 모든 키 삭제 (통합 캐시 매니저에서는 전체 클리어)"""
-        # 패턴 매칭은 복잡하므로 전체 클리어로 대체
-        logger.warning(f"패턴 매칭 삭제는 지원되지 않음 ({pattern}). 전체 캐시를 클리어합니다.")
-        self.cache_manager.clear()
-        return 1  # 일관성을 위해 1 반환
+        """패턴에 맞는 모든 키 삭제 (SCAN + 배치 UNLINK)"""
+        return self.cache_manager.delete_pattern(pattern)
 
     def get_stats(self) -> dict:
         """캐시 통계 정보"""
@@ -109,9 +114,9 @@ def redis_cached(ttl: int = 300, key_prefix: str = ""):
 
 
 def invalidate_cache_pattern(pattern: str):
-    """특정 패턴의 캐시 무효화 - 통합 캐시 매니저에서는 전체 클리어"""
+    """특정 패턴의 캐시 무효화"""
     cleared = redis_cache.clear_pattern(pattern)
-    logger.info(f"캐시 무효화: {pattern} (전체 캐시 클리어됨)")
+    logger.info(f"캐시 무효화: {pattern} ({cleared}개 키)")
     return cleared
 
 
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Redis 키 공간 유틸리티
+KEYS 대신 SCAN 순회와 배치 UNLINK 파이프라인으로 키를 조회/삭제하고,
+네임스페이스별 키 수는 정렬 집합 레지스트리로, 캐시 태그는 태그별 Redis 집합으로 추적
+"""
+
+import math
+import time
+import uuid
+from typing import Iterable, Iterator, List, Optional
+
+# SCAN 한 번에 요청할 키 수 (COUNT 힌트)
+SCAN_COUNT = 1000
+# 파이프라인 한 번에 UNLINK할 키 수
+UNLINK_BATCH_SIZE = 500
+
+# 태그 집합에 키를 추가하고, 집합 TTL은 멤버 중 가장 긴 TTL 이상으로 유지 (TTL 없는 멤버가 있으면 영구)
+_TAG_SCRIPT = """
+local existed = redis.call('exists', KEYS[1])
+redis.call('sadd', KEYS[1], ARGV[1])
+local ttl = tonumber(ARGV[2])
+if ttl <= 0 then
+    redis.call('persist', KEYS[1])
+else
+    local current = redis.call('ttl', KEYS[1])
+    if existed == 0 or (current >= 0 and current < ttl) then
+        redis.call('expire', KEYS[1], ttl)
+    end
+end
+return 1
+"""
+
+
+class KeyRegistry:
+    """
+    네임스페이스 키 레지스트리 (member=키, score=만료 시각, TTL 없으면 +inf)
+
+    count()는 만료된 멤버를 ZREMRANGEBYSCORE로 정리한 뒤 ZCARD로 세므로 TTL로 사라진 키는 포함되지 않는다.
+    갱신은 호출자의 파이프라인에 함께 실어 추가 왕복이 없다.
+    """
+
+    def __init__(self, client, name: str):
+        """
+        Args:
+            client: Redis 클라이언트
+            name: 레지스트리 정렬 집합 키 (추적 대상 네임스페이스 패턴에 걸리지 않는 이름)
+        """
+        self.client = client
+        self.name = name
+
+    def add(self, pipe, keys: Iterable, ttl: Optional[float] = None):
+        """키 등록 (같은 키는 만료 시각만 갱신)"""
+        score = time.time() + ttl if ttl and ttl > 0 else math.inf
+        mapping = {key: score for key in keys}
+        if mapping:
+            pipe.zadd(self.name, mapping)
+
+    def remove(self, pipe, keys: List):
+        """키 등록 해제"""
+        if keys:
+            pipe.zrem(self.name, *keys)
+
+    def clear(self, pipe):
+        """레지스트리 삭제"""
+        pipe.unlink(self.name)
+
+    def count(self) -> int:
+        """만료되지 않은 키 수"""
+        pipe = self.client.pipeline(transaction=False)
+        pipe.zremrangebyscore(self.name, "-inf", time.time())
+        pipe.zcard(self.name)
+        return pipe.execute()[1]
+
+
+def scan_keys(client, pattern: str, count: int = SCAN_COUNT) -> Iterator:
+    """SCAN 커서로 패턴에 맞는 키를 점진적으로 순회 (서버를 블로킹하지 않음)"""
+    return client.scan_iter(match=pattern, count=count)
+
+
+def unlink_keys(
+    client, keys: Iterable, batch_size: int = UNLINK_BATCH_SIZE, registry: Optional[KeyRegistry] = None
+) -> int:
+    """
+    키를 배치 단위 UNLINK 파이프라인으로 삭제 (메모리 해제는 서버 백그라운드 스레드에서 수행)
+
+    Args:
+        client: Redis 클라이언트
+        keys: 삭제할 키 (SCAN 이터레이터 가능)
+        batch_size: 파이프라인당 키 수
+        registry: 함께 등록 해제할 KeyRegistry
+
+    Returns:
+        삭제된 키 수
+    """
+    removed = 0
+    batch = []
+    for key in keys:
+        batch.append(key)
+        if len(batch) >= batch_size:
+            removed += _unlink_batch(client, batch, registry)
+            batch = []
+    if batch:
+        removed += _unlink_batch(client, batch, registry)
+    return removed
+
+
+def _unlink_batch(client, batch: List, registry: Optional[KeyRegistry]) -> int:
+    pipe = client.pipeline(transaction=False)
+    pipe.unlink(*batch)
+    if registry is not None:
+        registry.remove(pipe, batch)
+    return pipe.execute()[0]
+
+
+def delete_pattern(
+    client, pattern: str, registry: Optional[KeyRegistry] = None, batch_size: int = UNLINK_BATCH_SIZE
+) -> int:
+    """
+    패턴에 맞는 키를 SCAN + 배치 UNLINK로 삭제
+
+    Args:
+        client: Redis 클라이언트
+        pattern: glob 패턴
+        registry: 함께 등록 해제할 KeyRegistry
+        batch_size: 파이프라인당 키 수
+
+    Returns:
+        삭제된 키 수
+    """
+    return unlink_keys(client, scan_keys(client, pattern, max(batch_size, SCAN_COUNT)), batch_size, registry)
+
+
+def add_tags(pipe, tag_keys: Iterable[str], key, ttl: Optional[float] = None):
+    """
+    키를 태그 집합들에 등록 (호출자의 파이프라인에 추가)
+
+    Args:
+        pipe: Redis 파이프라인
+        tag_keys: 태그 집합 키
+        key: 등록할 캐시 키
+        ttl: 캐시 키 TTL(초), 없거나 0 이하면 무기한
+    """
+    seconds = int(math.ceil(ttl)) if ttl and ttl > 0 else 0
+    for tag_key in tag_keys:
+        pipe.eval(_TAG_SCRIPT, 1, tag_key, key, seconds)
+
+
+def invalidate_tag_sets(
+    client, tag_keys: Iterable[str], registry: Optional[KeyRegistry] = None, batch_size: int = UNLINK_BATCH_SIZE
+) -> int:
+    """
+    태그 집합에 등록된 키를 모두 삭제하고 태그 집합도 제거
+
+    태그 집합은 먼저 RENAME으로 떼어내므로 무효화 도중 새로 태그된 키는 새 집합에 남는다.
+    큰 집합도 SSCAN으로 나눠 읽어 서버를 블로킹하지 않고, 이미 만료된 멤버는 UNLINK 결과에서 빠진다.
+
+    Args:
+        client: Redis 클라이언트
+        tag_keys: 태그 집합 키
+        registry: 함께 등록 해제할 KeyRegistry
+        batch_size: 파이프라인당 키 수
+
+    Returns:
+        삭제된 캐시 키 수
+    """
+    from redis.exceptions import ResponseError
+
+    snapshots = []
+    for tag_key in tag_keys:
+        snapshot = f"{tag_key}:invalidating:{uuid.uuid4().hex}"
+        try:
+            client.rename(tag_key, snapshot)
+        except ResponseError:
+            continue  # 태그된 키가 없음
+        snapshots.append(snapshot)
+
+    members = set()
+    for snapshot in snapshots:
+        members.update(client.sscan_iter(snapshot, count=SCAN_COUNT))
+    removed = unlink_keys(client, members, batch_size, registry)
+    if snapshots:
+        client.unlink(*snapshots)
+    return removed
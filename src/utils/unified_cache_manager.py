@@ -5,6 +5,7 @@
 Redis와 메모리 캐시를 통합한 일관된 캐싱 전략
 """
 
+import fnmatch
 import hashlib
 import json
 import os
@@ -12,10 +13,11 @@ import threading
 import time
 from collections import OrderedDict
 from functools import wraps
-from typing import Any, Callable, Dict, Optional
-
-import orjson
+from typing import Any, Callable, Dict, List, Optional, Set, Union
 
+from config.constants import CACHE_SETTINGS
+from utils.cache_codec import CacheCodec, get_default_codec
+from utils.redis_keyspace import add_tags, delete_pattern, invalidate_tag_sets
 from utils.unified_logger import get_logger
 
 logger = get_logger(__name__)
@@ -83,6 +85,78 @@ class CacheBackend:
         """
         raise NotImplementedError("Subclasses must implement exists method")
 
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        여러 키를 한 번에 조회
+
+        Args:
+            keys: 캐시 키 목록
+
+        Returns:
+            찾은 키와 값의 딕셔너리
+        """
+        result = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                result[key] = value
+        return result
+
+    def set_many(self, mapping: Dict[str, Any], ttl: int = 300) -> bool:
+        """
+        여러 값을 같은 TTL로 한 번에 저장
+
+        Args:
+            mapping: 캐시 키와 값
+            ttl: TTL(초), 0이면 무제한
+
+        Returns:
+            모두 성공했는지 여부
+        """
+        return all([self.set(key, value, ttl) for key, value in mapping.items()])
+
+    def delete_pattern(self, pattern: str) -> int:
+        """
+        패턴에 맞는 키 삭제
+
+        Args:
+            pattern: glob 패턴
+
+        Returns:
+            삭제된 키 수
+        """
+        raise NotImplementedError("Subclasses must implement delete_pattern method")
+
+    def tag(self, key: str, tags: List[str], ttl: int = 300) -> bool:
+        """
+        저장된 키에 태그(의존성) 등록
+
+        Args:
+            key: 캐시 키
+            tags: 태그 목록 (예: "device:FGT-01", "package:root/default")
+            ttl: 키의 TTL(초), 0이면 무제한
+
+        Returns:
+            등록 여부 (태그를 지원하지 않는 백엔드는 False)
+        """
+        return False
+
+    def tags_of(self, key: str) -> List[str]:
+        """키에 등록된 태그 목록 (역색인이 없는 백엔드는 빈 목록)"""
+        return []
+
+    def invalidate_tags(self, tags: List[str]) -> int:
+        """
+        태그 중 하나라도 가진 키를 모두 삭제
+
+        Args:
+            tags: 태그 목록
+
+        Returns:
+            삭제된 키 수
+        """
+        return 0
+
 
 class MemoryCacheBackend(CacheBackend):
     """메모리 기반 캐시 백엔드"""
@@ -92,6 +166,20 @@ class MemoryCacheBackend(CacheBackend):
         self.max_size = max_size
         self.lock = threading.Lock()
         self.expiry = {}
+        # 태그 역색인 (태그 -> 키), 제거 시 정리용 (키 -> 태그)
+        self.tag_index: Dict[str, Set[str]] = {}
+        self.key_tags: Dict[str, Set[str]] = {}
+
+    def _remove(self, key: str):
+        """키와 만료/태그 정보 제거 (lock 보유 상태에서 호출)"""
+        self.cache.pop(key, None)
+        self.expiry.pop(key, None)
+        for tag in self.key_tags.pop(key, ()):
+            keys = self.tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.tag_index[tag]
 
     def get(self, key: str) -> Optional[Any]:
         with self.lock:
@@ -100,8 +188,7 @@ class MemoryCacheBackend(CacheBackend):
 
             # TTL 확인
             if key in self.expiry and time.time() > self.expiry[key]:
-                del self.cache[key]
-                del self.expiry[key]
+                self._remove(key)
                 return None
 
             # LRU 업데이트
@@ -112,31 +199,49 @@ class MemoryCacheBackend(CacheBackend):
         with self.lock:
             # LRU 캐시 크기 관리
             if len(self.cache) >= self.max_size and key not in self.cache:
-                oldest_key = next(iter(self.cache))
-                del self.cache[oldest_key]
-                if oldest_key in self.expiry:
-                    del self.expiry[oldest_key]
+                self._remove(next(iter(self.cache)))
 
+            # 값이 바뀌면 의존성(태그)도 새로 등록
+            self._remove(key)
             self.cache[key] = value
             if ttl > 0:
                 self.expiry[key] = time.time() + ttl
-            elif key in self.expiry:
-                del self.expiry[key]
 
             return True
 
+    def tag(self, key: str, tags: List[str], ttl: int = 300) -> bool:
+        with self.lock:
+            if key not in self.cache:
+                return False
+            self.key_tags.setdefault(key, set()).update(tags)
+            for tag in tags:
+                self.tag_index.setdefault(tag, set()).add(key)
+            return True
+
+    def tags_of(self, key: str) -> List[str]:
+        with self.lock:
+            return sorted(self.key_tags.get(key, ()))
+
+    def invalidate_tags(self, tags: List[str]) -> int:
+        with self.lock:
+            keys = set()
+            for tag in tags:
+                keys.update(self.tag_index.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
     def delete(self, key: str) -> bool:
         with self.lock:
-            if key in self.cache:
-                del self.cache[key]
-            if key in self.expiry:
-                del self.expiry[key]
+            self._remove(key)
             return True
 
     def clear(self) -> bool:
         with self.lock:
             self.cache.clear()
             self.expiry.clear()
+            self.tag_index.clear()
+            self.key_tags.clear()
             return True
 
     def exists(self, key: str) -> bool:
@@ -146,19 +251,26 @@ class MemoryCacheBackend(CacheBackend):
 
             # TTL 확인
             if key in self.expiry and time.time() > self.expiry[key]:
-                del self.cache[key]
-                del self.expiry[key]
+                self._remove(key)
                 return False
 
             return True
 
+    def delete_pattern(self, pattern: str) -> int:
+        with self.lock:
+            matched = [key for key in self.cache if fnmatch.fnmatchcase(key, pattern)]
+            for key in matched:
+                self._remove(key)
+            return len(matched)
+
 
 class RedisCacheBackend(CacheBackend):
     """Redis 기반 캐시 백엔드"""
 
-    def __init__(self, host="localhost", port=6379, db=0, password=None):
+    def __init__(self, host="localhost", port=6379, db=0, password=None, codec: Optional[CacheCodec] = None):
         self.redis_client = None
         self.connected = False
+        self.codec = codec or get_default_codec()
 
         try:
             import redis
@@ -168,7 +280,7 @@ class RedisCacheBackend(CacheBackend):
                 port=port,
                 db=db,
                 password=password,
-                decode_responses=False,  # pickle 사용을 위해 False
+                decode_responses=False,  # 코덱이 바이너리 페이로드를 저장하므로 False
                 socket_connect_timeout=5,
                 socket_timeout=5,
             )
@@ -191,17 +303,47 @@ class RedisCacheBackend(CacheBackend):
             data = self.redis_client.get(key)
             if data is None:
                 return None
-            return json.loads(data.decode() if isinstance(data, bytes) else data)
+            return self.codec.decode(data)
         except Exception as e:
             logger.error(f"Redis GET 오류: {e}")
             return None
 
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        if not self.connected or not self.redis_client or not keys:
+            return {}
+
+        try:
+            values = self.redis_client.mget(keys)
+            return {key: self.codec.decode(data) for key, data in zip(keys, values) if data is not None}
+        except Exception as e:
+            logger.error(f"Redis MGET 오류: {e}")
+            return {}
+
+    def set_many(self, mapping: Dict[str, Any], ttl: int = 300) -> bool:
+        if not self.connected or not self.redis_client:
+            return False
+
+        try:
+            data = {key: self.codec.encode(value) for key, value in mapping.items()}
+            if not data:
+                return True
+            pipe = self.redis_client.pipeline(transaction=False)
+            if ttl > 0:
+                for key, payload in data.items():
+                    pipe.setex(key, ttl, payload)
+            else:
+                pipe.mset(data)
+            return all(pipe.execute())
+        except Exception as e:
+            logger.error(f"Redis MSET 오류: {e}")
+            return False
+
     def set(self, key: str, value: Any, ttl: int = 300) -> bool:
         if not self.connected or not self.redis_client:
             return False
 
         try:
-            data = orjson.dumps(value)
+            data = self.codec.encode(value)
             if ttl > 0:
                 return self.redis_client.setex(key, ttl, data)
             else:
@@ -225,11 +367,49 @@ class RedisCacheBackend(CacheBackend):
             return False
 
         try:
-            return self.redis_client.flushdb()
+            # 키 접두사가 없는 백엔드라 DB 전체를 비우되, 서버를 블로킹하지 않도록 비동기로 해제
+            return self.redis_client.flushdb(asynchronous=True)
         except Exception as e:
             logger.error(f"Redis CLEAR 오류: {e}")
             return False
 
+    def delete_pattern(self, pattern: str) -> int:
+        if not self.connected or not self.redis_client:
+            return 0
+
+        try:
+            return delete_pattern(self.redis_client, pattern)
+        except Exception as e:
+            logger.error(f"Redis 패턴 삭제 오류: {e}")
+            return 0
+
+    @staticmethod
+    def _tag_key(tag: str) -> str:
+        return f"__tags__:{tag}"
+
+    def tag(self, key: str, tags: List[str], ttl: int = 300) -> bool:
+        if not self.connected or not self.redis_client:
+            return False
+
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            add_tags(pipe, [self._tag_key(tag) for tag in tags], key, ttl)
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Redis 태그 등록 오류: {e}")
+            return False
+
+    def invalidate_tags(self, tags: List[str]) -> int:
+        if not self.connected or not self.redis_client:
+            return 0
+
+        try:
+            return invalidate_tag_sets(self.redis_client, [self._tag_key(tag) for tag in tags])
+        except Exception as e:
+            logger.error(f"Redis 태그 무효화 오류: {e}")
+            return 0
+
     def exists(self, key: str) -> bool:
         if not self.connected or not self.redis_client:
             return False
@@ -252,6 +432,7 @@ class UnifiedCacheManager:
             "sets": 0,
             "deletes": 0,
             "evictions": 0,
+            "tag_invalidations": 0,
         }
 
         # 백엔드 초기화
@@ -273,6 +454,11 @@ class UnifiedCacheManager:
                 "db": int(os.getenv("REDIS_DB", "0")),
                 "password": os.getenv("REDIS_PASSWORD"),
             },
+            "codec": {
+                "serializer": CACHE_SETTINGS["SERIALIZER"],
+                "compression": CACHE_SETTINGS["COMPRESSION"],
+                "compress_threshold": CACHE_SETTINGS["COMPRESS_THRESHOLD"],
+            },
             "memory": {
                 "enabled": True,
                 "max_size": int(os.getenv("MEMORY_CACHE_SIZE", "1000")),
@@ -301,6 +487,7 @@ class UnifiedCacheManager:
                 port=self.config["redis"]["port"],
                 db=self.config["redis"]["db"],
                 password=self.config["redis"]["password"],
+                codec=CacheCodec(**self.config["codec"]) if "codec" in self.config else None,
             )
             if redis_backend.connected:
                 self.backends.append(redis_backend)
@@ -323,10 +510,12 @@ class UnifiedCacheManager:
                 if value is not None:
                     self.stats["hits"] += 1
 
-                    # 상위 레벨 캐시에 복사 (cache promotion)
+                    # 상위 레벨 캐시에 복사 (cache promotion), 태그도 함께 옮겨 무효화 대상에서 빠지지 않게 함
+                    tags = backend.tags_of(key) if i else []
                     for j in range(i):
                         try:
-                            self.backends[j].set(key, value, self.config["default_ttl"])
+                            if self.backends[j].set(key, value, self.config["default_ttl"]) and tags:
+                                self.backends[j].tag(key, tags, self.config["default_ttl"])
                         except Exception as e:
                             logger.debug(f"캐시 프로모션 실패: {e}")
 
@@ -337,8 +526,8 @@ class UnifiedCacheManager:
         self.stats["misses"] += 1
         return None
 
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
-        """모든 백엔드에 값 저장"""
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, tags: Optional[List[str]] = None) -> bool:
+        """모든 백엔드에 값 저장 (tags가 있으면 invalidate_tags로 함께 무효화되도록 등록)"""
         if ttl is None:
             ttl = self.config["default_ttl"]
 
@@ -347,6 +536,8 @@ class UnifiedCacheManager:
             try:
                 if backend.set(key, value, ttl):
                     success = True
+                    if tags:
+                        backend.tag(key, tags, ttl)
             except Exception as e:
                 logger.debug(f"캐시 저장 오류 ({backend.__class__.__name__}): {e}")
 
@@ -393,6 +584,80 @@ class UnifiedCacheManager:
 
         return False
 
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """여러 키를 한 번에 조회 (Redis는 MGET 한 번, 상위 캐시에 없는 키만 하위 캐시에서 조회)"""
+        result: Dict[str, Any] = {}
+        remaining = list(keys)
+        for i, backend in enumerate(self.backends):
+            if not remaining:
+                break
+            try:
+                found = backend.get_many(remaining)
+            except Exception as e:
+                logger.debug(f"캐시 일괄 조회 오류 ({backend.__class__.__name__}): {e}")
+                continue
+
+            if found:
+                # 상위 레벨 캐시에 복사 (cache promotion)
+                for j in range(i):
+                    try:
+                        self.backends[j].set_many(found, self.config["default_ttl"])
+                    except Exception as e:
+                        logger.debug(f"캐시 프로모션 실패: {e}")
+                result.update(found)
+                remaining = [key for key in remaining if key not in found]
+
+        self.stats["hits"] += len(result)
+        self.stats["misses"] += len(keys) - len(result)
+        return result
+
+    def set_many(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """여러 값을 모든 백엔드에 한 번에 저장 (Redis는 파이프라인 한 번)"""
+        if ttl is None:
+            ttl = self.config["default_ttl"]
+
+        success = False
+        for backend in self.backends:
+            try:
+                if backend.set_many(mapping, ttl):
+                    success = True
+            except Exception as e:
+                logger.debug(f"캐시 일괄 저장 오류 ({backend.__class__.__name__}): {e}")
+
+        if success:
+            self.stats["sets"] += len(mapping)
+
+        return success
+
+    def delete_pattern(self, pattern: str) -> int:
+        """패턴에 맞는 키를 모든 백엔드에서 삭제 (Redis는 SCAN + 배치 UNLINK)"""
+        removed = 0
+        for backend in self.backends:
+            try:
+                removed = max(removed, backend.delete_pattern(pattern))
+            except Exception as e:
+                logger.debug(f"캐시 패턴 삭제 오류 ({backend.__class__.__name__}): {e}")
+
+        self.stats["deletes"] += removed
+        return removed
+
+    def invalidate_tags(self, tags: List[str]) -> int:
+        """태그 중 하나라도 가진 항목을 모든 백엔드에서 삭제 (장치/정책 변경 후 호출)"""
+        tags = list(tags)
+        if not tags:
+            return 0
+
+        removed = 0
+        for backend in self.backends:
+            try:
+                removed = max(removed, backend.invalidate_tags(tags))
+            except Exception as e:
+                logger.debug(f"캐시 태그 무효화 오류 ({backend.__class__.__name__}): {e}")
+
+        self.stats["deletes"] += removed
+        self.stats["tag_invalidations"] += 1
+        return removed
+
     def get_stats(self) -> Dict:
         """캐시 통계 반환"""
         total_requests = self.stats["hits"] + self.stats["misses"]
@@ -403,6 +668,7 @@ class UnifiedCacheManager:
             "hit_rate": round(hit_rate, 2),
             "backends": len(self.backends),
             "backend_types": [backend.__class__.__name__ for backend in self.backends],
+            "codec": self.redis_cache.codec.stats() if self.redis_cache else None,
         }
 
     def generate_cache_key(self, prefix: str, *args, **kwargs) -> str:
@@ -428,8 +694,72 @@ def get_cache_manager() -> UnifiedCacheManager:
     return _cache_manager
 
 
-def cached(ttl: int = 300, key_prefix: str = "cache"):
-    """캐싱 데코레이터"""
+def device_tag(device: str) -> str:
+    """장치 태그"""
+    return f"device:{device}"
+
+
+def adom_tag(adom: str) -> str:
+    """ADOM 태그"""
+    return f"adom:{adom}"
+
+
+def package_tag(package: str, adom: str = "root") -> str:
+    """정책 패키지 태그 (ADOM 범위)"""
+    return f"package:{adom}/{package}"
+
+
+def object_tag(object_type: str) -> str:
+    """객체 유형 태그 (예: firewall_policy, address)"""
+    return f"object:{object_type}"
+
+
+def cache_tags(
+    device: Optional[str] = None,
+    adom: Optional[str] = None,
+    package: Optional[str] = None,
+    object_type: Optional[str] = None,
+) -> List[str]:
+    """
+    조회 결과가 의존하는 장치/ADOM/정책 패키지/객체 유형 태그 목록
+
+    조회 결과에는 의존하는 태그를 모두 달고, 변경 작업은 바뀐 범위의 태그(device_tag, package_tag 등)만
+    invalidate_tags로 무효화한다. invalidate_tags는 태그 중 하나라도 가진 항목을 지운다.
+
+    Args:
+        device: 장치 이름
+        adom: ADOM 이름 (package 태그의 범위로도 사용, 기본 root)
+        package: 정책 패키지 이름
+        object_type: 객체 유형
+
+    Returns:
+        태그 목록
+    """
+    tags = []
+    if device:
+        tags.append(device_tag(device))
+    if adom:
+        tags.append(adom_tag(adom))
+    if package:
+        tags.append(package_tag(package, adom or "root"))
+    if object_type:
+        tags.append(object_tag(object_type))
+    return tags
+
+
+def cached(
+    ttl: int = 300,
+    key_prefix: str = "cache",
+    tags: Union[List[str], Callable[..., List[str]], None] = None,
+):
+    """
+    캐싱 데코레이터
+
+    Args:
+        ttl: TTL(초)
+        key_prefix: 캐시 키 접두사
+        tags: 결과에 달 태그 목록, 또는 함수 인자를 받아 태그 목록을 돌려주는 함수
+    """
 
     def decorator(func: Callable) -> Callable:
         @wraps(func)
@@ -446,7 +776,8 @@ def cached(ttl: int = 300, key_prefix: str = "cache"):
 
             # 함수 실행 및 캐시 저장
             result = func(*args, **kwargs)
-            cache_manager.set(cache_key, result, ttl)
+            entry_tags = tags(*args, **kwargs) if callable(tags) else tags
+            cache_manager.set(cache_key, result, ttl, tags=entry_tags)
 
             return result
 
@@ -459,12 +790,20 @@ def invalidate_cache(key_prefix: str = None):
     """캐시 무효화"""
     cache_manager = get_cache_manager()
     if key_prefix:
-        # 특정 prefix의 키들만 삭제 (Redis에서는 패턴 매칭 필요)
-        # 여기서는 간단히 전체 클리어
-        logger.info(f"캐시 무효화: {key_prefix}")
+        # cached()가 만든 "{key_prefix}:{함수명}:{해시}" 키만 삭제
+        removed = cache_manager.delete_pattern(f"{key_prefix}:*")
+        logger.info(f"캐시 무효화: {key_prefix} ({removed}개 키)")
+        return
 
     cache_manager.clear()
 
 
+def invalidate_tags(tags: List[str]) -> int:
+    """태그가 달린 캐시 항목 무효화"""
+    removed = get_cache_manager().invalidate_tags(tags)
+    logger.info(f"캐시 태그 무효화: {tags} ({removed}개 키)")
+    return removed
+
+
 # 하위 호환성을 위한 별칭
 cache_manager = get_cache_manager()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+패킷 스니퍼 단위 테스트 공용 패킷 생성기
+"""
+
+from typing import List
+
+from security.packet_sniffer.base_sniffer import PacketInfo
+
+BASE_TIMESTAMP = 1700000000.0
+HTTP_REQUEST = b"GET / HTTP/1.1\r\n\r\n"
+
+
+def make_packet(index: int = 0, **fields) -> PacketInfo:
+    """
+    테스트용 패킷 생성
+
+    패킷 번호(index)에 따라 시각/출발지/출발 포트/크기/페이로드가 달라지는 기본값을 만들고
+    fields로 지정한 필드를 덮어씁니다.
+    """
+    values = {
+        "timestamp": BASE_TIMESTAMP + index,
+        "src_ip": f"192.168.1.{index % 250 + 1}",
+        "dst_ip": "10.0.0.80",
+        "src_port": 40000 + index,
+        "dst_port": 80,
+        "protocol": "TCP",
+        "size": 60 + index,
+        "payload": b"GET / HTTP/1.1\r\n" + bytes([index % 256]),
+    }
+    values.update(fields)
+    return PacketInfo(**values)
+
+
+def make_packets(count: int, **fields) -> List[PacketInfo]:
+    """
+    테스트용 패킷 목록 생성
+
+    필드 값이 호출 가능하면 패킷 번호로 호출한 결과를 사용합니다 (예: src_port=lambda i: 40000 + i % 3).
+    호출 순서는 패킷 번호 순, 한 패킷 안에서는 인자 순서입니다.
+    """
+    return [
+        make_packet(index, **{name: value(index) if callable(value) else value for name, value in fields.items()})
+        for index in range(count)
+    ]
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+고급 필터 슬라이딩 윈도우 통계 단위 테스트
+"""
+
+import random
+import time
+import unittest
+
+import numpy as np
+
+from security.packet_sniffer.filters.advanced_filter import AdvancedFilter
+from security.packet_sniffer.filters.window_stats import RollingStats, TimeWheel
+
+
+class TestWindowPrimitives(unittest.TestCase):
+    """RollingStats / TimeWheel 테스트"""
+
+    def test_rolling_stats_matches_numpy(self):
+        """슬라이딩 평균/분산/백분위수가 numpy 결과와 일치"""
+        rng = random.Random(7)
+        stats = RollingStats(size=50)
+        values = []
+        for _ in range(500):
+            value = rng.choice([rng.gauss(500, 120), float(rng.randint(40, 1500))])
+            stats.add(value)
+            values.append(value)
+            window = values[-50:]
+            self.assertAlmostEqual(stats.mean, np.mean(window), places=6)
+            self.assertAlmostEqual(stats.std, np.std(window), places=4)
+
+        for q in (0, 25, 50, 75, 100):
+            self.assertAlmostEqual(stats.percentile(q), np.percentile(values[-50:], q), places=6)
+
+    def test_time_wheel_counts_recent_events(self):
+        """윈도우를 벗어난 이벤트는 제외"""
+        wheel = TimeWheel(window=10, resolution=1)
+        for t in range(100, 120):
+            wheel.add(float(t))
+
+        self.assertEqual(wheel.count(119.5), 10)
+        self.assertEqual(wheel.count(125.0), 4)
+        self.assertEqual(wheel.count(500.0), 0)
+        wheel.add(50.0)  # 윈도우보다 오래된 이벤트
+        self.assertEqual(wheel.count(500.0), 0)
+
+
+class TestAdvancedFilterWindows(unittest.TestCase):
+    """고급 필터 규칙의 증분 윈도우 사용 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.filter = AdvancedFilter()
+
+    def _packet(self, size=100, src_ip="10.0.0.1", timestamp=None):
+        return {"src_ip": src_ip, "dst_ip": "10.0.0.2", "size": size, "timestamp": timestamp or time.time()}
+
+    def test_outlier_rule(self):
+        """z-score 이상치 탐지"""
+        self.filter.add_statistical_rule("outlier", outlier_detection={"metric": "packet_size", "threshold": 3.0})
+        for i in range(200):
+            self.assertFalse(self.filter.filter_packet(self._packet(size=100 + i % 5))["filtered"])
+
+        self.assertTrue(self.filter.filter_packet(self._packet(size=5000))["filtered"])
+        self.assertEqual(len(self.filter.statistics.get("packet_size")), 201)
+
+    def test_change_rate_rule(self):
+        """최근 평균 대비 변화율"""
+        self.filter.add_rule("change", "statistical", {"change_rate": {"metric": "packet_size", "threshold": 0.5}})
+        for _ in range(20):
+            self.filter.filter_packet(self._packet(size=100))
+
+        self.assertFalse(self.filter.filter_packet(self._packet(size=120))["filtered"])
+        self.assertTrue(self.filter.filter_packet(self._packet(size=1000))["filtered"])
+
+    def test_per_key_burst_rule(self):
+        """키별 버스트 탐지"""
+        self.filter.add_rule(
+            "burst", "time_based", {"burst_detection": {"window_size": 5, "threshold": 10, "key": "src_ip"}}
+        )
+        now = time.time()
+
+        results = [
+            self.filter.filter_packet(self._packet(src_ip="10.9.9.9", timestamp=now))["filtered"] for _ in range(12)
+        ]
+        self.assertEqual(results, [False] * 9 + [True] * 3)
+        self.assertFalse(self.filter.filter_packet(self._packet(src_ip="10.1.1.1", timestamp=now))["filtered"])
+        for _ in range(12):
+            self.filter.filter_packet(self._packet(src_ip="10.2.2.2", timestamp=now - 60))
+        self.assertFalse(self.filter.filter_packet(self._packet(src_ip="10.2.2.2", timestamp=now))["filtered"])
+
+    def test_context_is_not_copied(self):
+        """규칙 컨텍스트는 필터 상태를 그대로 참조"""
+        seen = []
+        self.filter.add_rule("seq", "pattern", {"sequence_pattern": {"pattern": [{"size": 1}, {"size": 2}]}})
+        original = self.filter.rules["seq"].matches
+
+        def spy(packet_info, context=None):
+            seen.append(context)
+            return original(packet_info, context)
+
+        self.filter.rules["seq"].matches = spy
+        self.filter.filter_packet(self._packet(size=1))
+        self.assertTrue(self.filter.filter_packet(self._packet(size=2))["filtered"])
+        self.assertIs(seen[0]["recent_packets"], self.filter.recent_packets)
+        self.assertIs(seen[0]["statistics"], self.filter.statistics)
+
+    def test_reset_statistics(self):
+        """통계 초기화"""
+        self.filter.add_statistical_rule("outlier", outlier_detection={"metric": "packet_size"})
+        self.filter.filter_packet(self._packet())
+        self.filter.reset_statistics()
+        self.assertEqual(len(self.filter.statistics.get("packet_size")), 0)
+        self.assertEqual(sum(self.filter.get_statistics()["hourly_packets"]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
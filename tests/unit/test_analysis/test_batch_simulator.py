@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Batch Traffic Simulator Unit Tests
+"""
+
+import io
+import json
+import unittest
+
+from analysis.batch_simulator import BatchTrafficSimulator, CompiledPathEvaluator, normalize_flow
+from analysis.components.data_loader import DataLoader
+from analysis.fixed_path_analyzer import FixedPathAnalyzer
+
+
+class RecordingAnalyzer:
+    """호출된 플로우를 기록하는 분석기"""
+
+    def __init__(self):
+        self.calls = []
+
+    def analyze_path(self, src_ip, dst_ip, port=None, protocol="tcp"):
+        self.calls.append((src_ip, dst_ip, port, protocol))
+        if src_ip == "boom":
+            raise RuntimeError("analysis failed")
+        return {"allowed": port == 443}
+
+
+def build_loader():
+    """정책/라우팅 데이터가 로드된 DataLoader"""
+    loader = DataLoader()
+    loader._policies["default"] = [
+        {
+            "policyid": 1,
+            "name": "allow-https",
+            "action": "accept",
+            "srcaddr": [{"name": "all"}],
+            "dstaddr": [{"name": "dmz"}],
+            "service": [{"name": "HTTPS"}],
+        }
+    ]
+    loader._addresses["default"] = [{"name": "dmz", "type": "ipmask", "subnet": "172.16.0.0/24"}]
+    loader._services["default"] = [{"name": "HTTPS", "protocol": "tcp", "tcp-portrange": "443"}]
+    loader._routing_tables["default"] = [
+        {"destination": "0.0.0.0/0", "gateway": "203.0.113.1", "interface": "wan1"},
+        {"destination": "172.16.0.0/24", "gateway": "0.0.0.0", "interface": "dmz", "type": "connected"},
+    ]
+    return loader
+
+
+class TestNormalizeFlow(unittest.TestCase):
+    """플로우 정규화 테스트"""
+
+    def test_dict_and_tuple_forms(self):
+        """dict/튜플 플로우를 같은 키로 정규화"""
+        self.assertEqual(
+            normalize_flow({"src": "10.0.0.1", "dst": "10.0.0.2", "port": "443", "protocol": "TCP"}),
+            ("10.0.0.1", "10.0.0.2", 443, "tcp"),
+        )
+        self.assertEqual(normalize_flow(("10.0.0.1", "10.0.0.2")), ("10.0.0.1", "10.0.0.2", None, "tcp"))
+
+    def test_invalid_flow(self):
+        """필수 필드 누락 또는 잘못된 포트"""
+        with self.assertRaises(ValueError):
+            normalize_flow({"src_ip": "10.0.0.1"})
+        with self.assertRaises(ValueError):
+            normalize_flow(("10.0.0.1", "10.0.0.2", "https"))
+
+
+class TestBatchTrafficSimulator(unittest.TestCase):
+    """일괄 트래픽 시뮬레이션 테스트"""
+
+    def test_duplicates_evaluated_once(self):
+        """중복 플로우는 한 번만 평가하고 입력 순서 유지"""
+        analyzer = RecordingAnalyzer()
+        simulator = BatchTrafficSimulator(analyzer, workers=1, chunk_size=2)
+        flows = [
+            ("10.0.0.1", "10.0.0.2", 443),
+            {"src_ip": "10.0.0.1", "dst_ip": "10.0.0.2", "port": 443, "protocol": "tcp"},
+            ("10.0.0.3", "10.0.0.2", 80),
+            ("10.0.0.4",),
+            ("boom", "10.0.0.2", 22),
+        ]
+
+        records = list(simulator.simulate(flows))
+
+        self.assertEqual(len(analyzer.calls), 3)
+        self.assertEqual([r["src_ip"] for r in records], ["10.0.0.1", "10.0.0.3", "boom"])
+        self.assertTrue(records[0]["result"]["allowed"])
+        self.assertIn("error", records[2])
+        summary = simulator.last_summary
+        self.assertEqual(
+            (summary["total"], summary["unique"], summary["duplicates"], summary["invalid"], summary["errors"]),
+            (5, 3, 1, 1, 1),
+        )
+
+    def test_fixed_path_analyzer(self):
+        """FixedPathAnalyzer를 그대로 사용"""
+        simulator = BatchTrafficSimulator(FixedPathAnalyzer(), workers=1)
+        record = next(simulator.simulate([("192.168.1.10", "172.16.10.100", 80, "tcp")]))
+        expected = FixedPathAnalyzer().analyze_path("192.168.1.10", "172.16.10.100", 80, "tcp")
+        self.assertEqual(record["result"]["allowed"], expected["allowed"])
+        self.assertEqual(record["result"]["path"], expected["path"])
+
+    def test_compiled_evaluator(self):
+        """컴파일된 정책/라우팅 인덱스로 평가"""
+        evaluator = CompiledPathEvaluator.from_data_loader(build_loader())
+
+        result = evaluator.analyze_path("10.1.1.1", "172.16.0.10", 443, "tcp")
+        self.assertTrue(result["allowed"])
+        self.assertEqual((result["policy_id"], result["interface"]), (1, "dmz"))
+
+        result = evaluator.analyze_path("10.1.1.1", "8.8.8.8", 443, "tcp")
+        self.assertFalse(result["allowed"])
+        self.assertEqual(result["next_hop"], "203.0.113.1")
+
+    def test_missing_firewall_rejected(self):
+        """선택한 방화벽의 정책/라우팅 데이터가 없으면 모든 플로우를 거부하는 대신 오류"""
+        loader = build_loader()
+        with self.assertRaisesRegex(ValueError, "'fw-branch'.*default"):
+            CompiledPathEvaluator.from_data_loader(loader, "fw-branch")
+
+        del loader._routing_tables["default"]
+        with self.assertRaisesRegex(ValueError, "라우팅 테이블"):
+            CompiledPathEvaluator.from_data_loader(loader)
+
+    def test_process_pool_matches_inline(self):
+        """프로세스 풀 결과가 단일 프로세스 결과와 동일"""
+        evaluator = CompiledPathEvaluator.from_data_loader(build_loader())
+        flows = [(f"10.0.{i % 7}.1", f"172.16.0.{i % 50}", 443 if i % 3 else 80, "tcp") for i in range(300)]
+
+        inline = list(BatchTrafficSimulator(evaluator, workers=1).simulate(flows))
+        pooled = list(BatchTrafficSimulator(evaluator, workers=2, chunk_size=16).simulate(flows))
+
+        self.assertEqual(pooled, inline)
+
+    def test_ndjson_output(self):
+        """NDJSON 스트리밍 및 요약 레코드"""
+        stream = io.StringIO()
+        summary = BatchTrafficSimulator(RecordingAnalyzer(), workers=1).simulate_to_ndjson(
+            [("10.0.0.1", "10.0.0.2", 443), ("10.0.0.1", "10.0.0.2", 443)], stream
+        )
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[0]["port"], 443)
+        self.assertEqual(lines[-1]["summary"]["duplicates"], 1)
+        self.assertEqual(summary["unique"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Data Loader Component Unit Tests
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+
+from analysis.components.data_loader import DataLoader
+
+
+def make_fortimanager_client(adoms):
+    """ADOM별 장치 목록을 가진 FortiManager 클라이언트 모의 객체"""
+    client = Mock()
+    client.get_adoms.return_value = [{"name": name} for name in adoms]
+    client.get_devices.side_effect = lambda adom: [{"name": name} for name in adoms[adom]]
+    client.get_device_info.side_effect = lambda device, adom: {"name": device, "adom": adom}
+    client.get_policy_packages.side_effect = lambda adom: [{"name": f"{adom}-pkg"}]
+    client.get_firewall_policies.side_effect = lambda package, adom: [{"policyid": 1, "action": "accept"}]
+    client.get_firewall_addresses.side_effect = lambda adom: [{"name": f"{adom}-addr"}]
+    client.get_firewall_address_groups.return_value = []
+    client.get_firewall_services.return_value = []
+    client.get_firewall_service_groups.return_value = []
+    client.get_device_routing_table.side_effect = lambda device, adom: [
+        {"destination": "0.0.0.0/0", "gateway": "10.0.0.1", "interface": "wan1"}
+    ]
+    return client
+
+
+class TestParallelLoad(unittest.TestCase):
+    """FortiManager 전체 장치 병렬 로드 테스트"""
+
+    def test_loads_all_devices_with_shared_adom_objects(self):
+        """ADOM 공유 객체는 ADOM당 한 번만 로드"""
+        client = make_fortimanager_client({"root": ["fw1", "fw2", "fw3"], "branch": ["fw4"], "empty": []})
+        loader = DataLoader(fortimanager_client=client)
+        progress = []
+
+        self.assertTrue(
+            loader.load_all_firewalls(progress_callback=lambda done, total, r: progress.append((done, total)))
+        )
+
+        self.assertEqual(client.get_firewall_addresses.call_count, 2)
+        self.assertEqual(client.get_policy_packages.call_count, 2)
+        self.assertEqual(client.get_device_info.call_count, 4)
+        self.assertEqual(loader.get_addresses("fw4"), [{"name": "branch-addr"}])
+        self.assertEqual(loader.get_firewalls("fw2")["adom"], "root")
+        self.assertIsNotNone(loader.get_compiled_ruleset("fw1"))
+
+        report = loader.last_load_report
+        self.assertEqual((report["total"], report["loaded"], report["failed"]), (4, 4, 0))
+        self.assertEqual(report["devices"]["fw4"]["adom"], "branch")
+        self.assertIn("elapsed_ms", report["devices"]["fw1"])
+        self.assertEqual(sorted(progress), [(i, 4) for i in range(1, 5)])
+
+    def test_failed_device_is_reported(self):
+        """장치 정보가 없으면 실패로 기록"""
+        client = make_fortimanager_client({"root": ["fw1", "ghost"]})
+        client.get_device_info.side_effect = lambda device, adom: None if device == "ghost" else {"name": device}
+        loader = DataLoader(fortimanager_client=client)
+
+        self.assertTrue(loader.load_all_firewalls())
+        self.assertFalse(loader.last_load_report["devices"]["ghost"]["success"])
+        self.assertEqual(loader.last_load_report["failed"], 1)
+
+    def test_fortimanager_concurrency_limit(self):
+        """FortiManager 동시 요청 수 제한 준수"""
+        client = make_fortimanager_client({"root": [f"fw{i}" for i in range(12)]})
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def slow_routes(device, adom):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+            return []
+
+        client.get_device_routing_table.side_effect = slow_routes
+        loader = DataLoader(fortimanager_client=client, max_workers=12, fortimanager_concurrency=3)
+
+        self.assertTrue(loader.load_all_firewalls())
+        self.assertLessEqual(state["peak"], 3)
+        self.assertGreater(state["peak"], 1)
+
+    def test_requires_fortimanager_client(self):
+        """FortiManager 클라이언트 없이 호출"""
+        self.assertFalse(DataLoader().load_all_firewalls())
+
+
+class TestIncrementalRefresh(unittest.TestCase):
+    """리비전/내용 해시 기반 증분 동기화 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.client = Mock(
+            spec=[
+                "get_firewall_policies",
+                "get_firewall_addresses",
+                "get_firewall_address_groups",
+                "get_firewall_services",
+                "get_firewall_service_groups",
+                "get_routing_table",
+            ]
+        )
+        self.client.get_firewall_policies.return_value = [{"policyid": 1, "action": "accept"}]
+        self.client.get_firewall_addresses.return_value = [{"name": "a", "type": "ipmask", "subnet": "10.0.0.0/8"}]
+        self.client.get_firewall_address_groups.return_value = []
+        self.client.get_firewall_services.return_value = []
+        self.client.get_firewall_service_groups.return_value = []
+        self.client.get_routing_table.return_value = [{"destination": "0.0.0.0/0", "interface": "wan1"}]
+
+        self.loader = DataLoader(fortigate_client=self.client)
+        self.events = []
+        self.loader.add_invalidation_listener(lambda firewall_id, tables: self.events.append((firewall_id, tables)))
+        self.assertTrue(self.loader.load_firewall_data())
+        self.events.clear()
+
+    def test_unchanged_refresh_is_noop(self):
+        """변경이 없으면 인덱스와 세대가 유지됨"""
+        ruleset = self.loader.get_compiled_ruleset()
+        routing_index = self.loader.get_routing_index()
+        generation = self.loader.get_generation()
+
+        result = self.loader.refresh_firewall_data()
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["changed"], [])
+        self.assertEqual(self.events, [])
+        self.assertIs(ruleset, self.loader.get_compiled_ruleset())
+        self.assertIs(routing_index, self.loader.get_routing_index())
+        self.assertEqual(generation, self.loader.get_generation())
+
+    def test_only_changed_tables_are_invalidated(self):
+        """라우팅 테이블만 바뀌면 정책 인덱스는 유지"""
+        ruleset = self.loader.get_compiled_ruleset()
+        routing_index = self.loader.get_routing_index()
+        self.client.get_routing_table.return_value = [{"destination": "10.0.0.0/8", "interface": "lan"}]
+
+        result = self.loader.refresh_firewall_data()
+
+        self.assertEqual(result["changed"], ["routes"])
+        self.assertEqual(self.events, [("default", ["routes"])])
+        self.assertIs(ruleset, self.loader.get_compiled_ruleset())
+        self.assertIsNot(routing_index, self.loader.get_routing_index())
+        self.assertEqual(self.loader.get_routing_index().best_route("10.1.1.1")["interface"], "lan")
+
+    def test_revision_skips_fetch(self):
+        """리비전이 같은 테이블은 가져오지 않음"""
+        revisions = {
+            table: 1 for table in ("policies", "addresses", "address_groups", "services", "service_groups", "routes")
+        }
+        self.client.get_table_revision = Mock(side_effect=lambda table, firewall_id, adom: revisions[table])
+        self.assertTrue(self.loader.load_firewall_data())
+        self.client.get_firewall_policies.reset_mock()
+        self.client.get_firewall_addresses.reset_mock()
+
+        revisions["addresses"] = 2
+        self.client.get_firewall_addresses.return_value = [{"name": "a", "type": "ipmask", "subnet": "172.16.0.0/12"}]
+        generation = self.loader.get_generation()
+
+        result = self.loader.refresh_firewall_data()
+
+        self.assertEqual(result["fetched"], ["addresses"])
+        self.assertEqual(result["changed"], ["addresses"])
+        self.client.get_firewall_policies.assert_not_called()
+        self.assertGreater(self.loader.get_generation(), generation)
+
+
+if __name__ == "__main__":
+    unittest.main()
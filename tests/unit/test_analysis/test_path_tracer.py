@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Path Tracer / Route Trie Component Unit Tests
+"""
+
+import ipaddress
+import random
+import unittest
+
+from analysis.components.data_loader import DataLoader
+from analysis.components.path_tracer import PathTracer
+from analysis.components.route_trie import RouteTrie
+
+
+ROUTING_TABLE = [
+    {"destination": "0.0.0.0/0", "gateway": "203.0.113.1", "interface": "wan1", "type": "static"},
+    {"destination": "192.168.1.0/24", "interface": "internal", "type": "connected"},
+    {"destination": "10.0.0.0/8", "gateway": "192.168.1.254", "interface": "internal", "type": "static"},
+    {"destination": "10.1.0.0/16", "gateway": "192.168.1.253", "interface": "internal", "type": "bgp"},
+    {"destination": "10.1.2.0/24", "gateway": "192.168.1.252", "interface": "dmz", "type": "bgp"},
+    {"destination": "10.1.2.0/24", "gateway": "192.168.1.251", "interface": "dmz", "type": "bgp"},
+    {"destination": "2001:db8::/32", "gateway": "fe80::1", "interface": "wan6", "type": "static"},
+    {"destination": "not-a-network", "interface": "bad", "type": "static"},
+]
+
+
+class TestRouteTrie(unittest.TestCase):
+    """RouteTrie 최장 프리픽스 매칭 테스트"""
+
+    def test_matches_linear_scan(self):
+        """무작위 라우트에 대해 선형 탐색과 동일한 결과"""
+        rng = random.Random(7)
+        trie = RouteTrie()
+        networks = []
+        for i in range(2000):
+            length = rng.randint(0, 32)
+            network = ipaddress.ip_network((rng.getrandbits(32), length), strict=False)
+            route = {"id": i}
+            networks.append((network, route))
+            trie.insert(network, route)
+
+        for _ in range(2000):
+            address = ipaddress.ip_address(rng.getrandbits(32))
+            expected = None
+            longest = -1
+            for network, route in networks:
+                if address in network and network.prefixlen > longest:
+                    longest = network.prefixlen
+                    expected = route
+            self.assertIs(trie.lookup(address), expected)
+
+    def test_ipv6_and_empty(self):
+        """IPv6 조회 및 매칭 없음"""
+        trie = RouteTrie()
+        trie.insert(ipaddress.ip_network("2001:db8::/32"), {"id": "v6"})
+        self.assertEqual(trie.lookup("2001:db8::1")["id"], "v6")
+        self.assertIsNone(trie.lookup("2001:db9::1"))
+        self.assertIsNone(trie.lookup("10.0.0.1"))
+
+
+class TestPathTracer(unittest.TestCase):
+    """PathTracer 경로 추적 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.loader = DataLoader()
+        self.loader._routing_tables["default"] = ROUTING_TABLE
+        self.tracer = PathTracer(self.loader)
+
+    def test_trace_uses_longest_prefix(self):
+        """가장 긴 프리픽스 라우트 선택 (동일 프리픽스는 먼저 나온 라우트)"""
+        result = self.tracer.trace_packet_path("192.168.1.10", "10.1.2.3")
+        self.assertTrue(result["success"])
+        self.assertEqual(result["src_interface"]["name"], "internal")
+        self.assertEqual(result["src_interface"]["type"], "connected")
+        self.assertEqual(result["next_hop"], "192.168.1.252")
+        self.assertEqual(result["path"][-1]["interface"], "dmz")
+
+    def test_trace_default_route(self):
+        """매칭되는 구체 라우트가 없으면 기본 라우트 사용"""
+        result = self.tracer.trace_packet_path("172.16.0.1", "8.8.8.8")
+        self.assertEqual(result["src_interface"]["type"], "unknown")
+        self.assertEqual(result["next_hop"], "203.0.113.1")
+
+    def test_trace_without_routing_table(self):
+        """라우팅 테이블이 없는 경우"""
+        result = self.tracer.trace_packet_path("1.1.1.1", "2.2.2.2", firewall_id="missing")
+        self.assertFalse(result["success"])
+
+    def test_resolve_routes_batch(self):
+        """여러 목적지 일괄 조회"""
+        results = self.tracer.resolve_routes(["10.1.9.9", "2001:db8::5", "bogus", "10.2.0.1"])
+        self.assertEqual([r["dst_ip"] for r in results], ["10.1.9.9", "2001:db8::5", "bogus", "10.2.0.1"])
+        self.assertEqual(results[0]["next_hop"], "192.168.1.253")
+        self.assertEqual(results[1]["interface"], "wan6")
+        self.assertFalse(results[2]["reachable"])
+        self.assertIn("error", results[2])
+        self.assertEqual(results[3]["next_hop"], "192.168.1.254")
+
+    def test_routing_index_invalidated_on_reload(self):
+        """데이터 재로드 시 라우팅 인덱스 무효화"""
+        index = self.loader.get_routing_index()
+        self.assertIs(index, self.loader.get_routing_index())
+        self.loader.invalidate_compiled("default")
+        self.assertIsNot(index, self.loader.get_routing_index())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Policy Analyzer Component Unit Tests
+"""
+
+import time
+import unittest
+from unittest.mock import Mock
+
+from analysis.components.data_loader import DataLoader
+from analysis.components.policy_analyzer import PolicyAnalyzer
+from analysis.components.rule_validator import RuleValidator
+
+
+def build_firewall_data():
+    """테스트용 방화벽 데이터"""
+    return {
+        "policies": [
+            {
+                "policyid": 20,
+                "name": "allow-web",
+                "action": "accept",
+                "srcaddr": [{"name": "internal"}],
+                "dstaddr": [{"name": "web-servers"}],
+                "service": [{"name": "web"}],
+            },
+            {
+                "policyid": 10,
+                "name": "block-guest",
+                "action": "deny",
+                "srcaddr": [{"name": "guest"}],
+                "dstaddr": [{"name": "all"}],
+                "service": [{"name": "ALL"}],
+            },
+            {
+                "policyid": 30,
+                "name": "disabled-allow",
+                "action": "accept",
+                "status": "disable",
+                "srcaddr": [{"name": "all"}],
+                "dstaddr": [{"name": "all"}],
+                "service": [{"name": "ALL"}],
+            },
+            {
+                "policyid": 40,
+                "name": "dns",
+                "action": "accept",
+                "srcaddr": [{"name": "all"}],
+                "dstaddr": [{"name": "dns-server"}],
+                "service": [{"name": "DNS"}],
+            },
+        ],
+        "addresses": [
+            {"name": "lan", "type": "ipmask", "subnet": "192.168.0.0 255.255.0.0"},
+            {"name": "guest", "type": "iprange", "start-ip": "192.168.100.10", "end-ip": "192.168.100.50"},
+            {"name": "web1", "type": "ipmask", "subnet": "10.0.0.10/32"},
+            {"name": "web2", "type": "ipmask", "subnet": "10.0.0.20/32"},
+            {"name": "dns-server", "type": "ipmask", "subnet": "10.0.1.53/32"},
+        ],
+        "address_groups": [
+            {"name": "internal", "member": [{"name": "lan"}]},
+            {"name": "web-servers", "member": [{"name": "web1"}, {"name": "web2"}]},
+        ],
+        "services": [
+            {"name": "HTTP", "protocol": "tcp", "tcp-portrange": "80"},
+            {"name": "HTTPS", "protocol": "tcp", "tcp-portrange": "443"},
+            {"name": "ALT", "tcp-portrange": "8000-8080"},
+            {"name": "DNS", "protocol": "udp", "udp-portrange": "53"},
+        ],
+        "service_groups": [
+            {"name": "web", "member": [{"name": "HTTP"}, {"name": "HTTPS"}, {"name": "ALT"}]},
+        ],
+    }
+
+
+def make_fortigate_client(data):
+    """테스트 데이터를 반환하는 FortiGate 클라이언트 모의 객체"""
+    client = Mock()
+    client.get_firewall_policies.return_value = data["policies"]
+    client.get_firewall_addresses.return_value = data["addresses"]
+    client.get_firewall_address_groups.return_value = data["address_groups"]
+    client.get_firewall_services.return_value = data["services"]
+    client.get_firewall_service_groups.return_value = data["service_groups"]
+    client.get_routing_table.return_value = []
+    return client
+
+
+class TestCompiledPolicyMatching(unittest.TestCase):
+    """컴파일된 정책 인덱스 기반 트래픽 분석 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.data = build_firewall_data()
+        self.client = make_fortigate_client(self.data)
+        self.loader = DataLoader(fortigate_client=self.client)
+        self.assertTrue(self.loader.load_firewall_data())
+        self.analyzer = PolicyAnalyzer(self.loader, RuleValidator(self.loader))
+
+    def test_first_match_follows_policyid_order(self):
+        """policyid 순서대로 첫 번째 매치 정책 선택"""
+        result = self.analyzer.analyze_traffic("192.168.100.20", "10.0.0.10", 80)
+        self.assertFalse(result["allowed"])
+        self.assertEqual(result["policy_id"], 10)
+
+        result = self.analyzer.analyze_traffic("192.168.1.5", "10.0.0.20", 443)
+        self.assertTrue(result["allowed"])
+        self.assertEqual(result["policy_id"], 20)
+        self.assertEqual(result["matched_policies"][0]["name"], "allow-web")
+
+    def test_port_range_and_protocol(self):
+        """포트 범위 및 프로토콜 매칭"""
+        self.assertEqual(self.analyzer.analyze_traffic("192.168.1.5", "10.0.0.10", 8080)["policy_id"], 20)
+        self.assertIsNone(self.analyzer.analyze_traffic("192.168.1.5", "10.0.0.10", 8081)["policy_id"])
+        self.assertIsNone(self.analyzer.analyze_traffic("192.168.1.5", "10.0.0.10", 80, "udp")["policy_id"])
+        self.assertEqual(self.analyzer.analyze_traffic("172.16.0.1", "10.0.1.53", 53, "udp")["policy_id"], 40)
+
+    def test_disabled_policy_is_skipped(self):
+        """비활성화된 정책은 매치되지 않음"""
+        result = self.analyzer.analyze_traffic("172.16.0.1", "8.8.8.8", 22)
+        self.assertFalse(result["allowed"])
+        self.assertIsNone(result["policy_id"])
+
+    def test_invalid_ip_only_matches_any_policies(self):
+        """잘못된 IP는 'all' 주소 정책에만 매치"""
+        matches = self.analyzer.get_all_matching_policies("not-an-ip", "10.0.1.53", 53, "udp")
+        self.assertEqual([m["policy_id"] for m in matches], [40])
+
+    def test_all_matches_keep_original_order(self):
+        """모든 매치 정책은 원래 정책 목록 순서로 반환"""
+        matches = self.analyzer.get_all_matching_policies("192.168.100.20", "10.0.0.10", 80)
+        self.assertEqual([m["policy_id"] for m in matches], [20, 10])
+
+    def test_no_data_loaded(self):
+        """데이터가 없는 방화벽"""
+        result = self.analyzer.analyze_traffic("1.1.1.1", "2.2.2.2", 80, firewall_id="missing")
+        self.assertFalse(result["allowed"])
+        self.assertEqual(self.analyzer.get_all_matching_policies("1.1.1.1", "2.2.2.2", 80, firewall_id="missing"), [])
+
+    def test_reload_invalidates_compiled_ruleset(self):
+        """데이터 재로드 시 컴파일된 인덱스가 다시 생성됨"""
+        first = self.loader.get_compiled_ruleset()
+        self.assertIs(first, self.loader.get_compiled_ruleset())
+
+        self.data["policies"] = [dict(self.data["policies"][0], action="deny")]
+        self.client.get_firewall_policies.return_value = self.data["policies"]
+        self.assertTrue(self.loader.load_firewall_data())
+
+        self.assertIsNot(first, self.loader.get_compiled_ruleset())
+        result = self.analyzer.analyze_traffic("192.168.1.5", "10.0.0.10", 80)
+        self.assertFalse(result["allowed"])
+        self.assertEqual(result["policy_id"], 20)
+
+    def test_large_ruleset_lookup(self):
+        """대규모 정책에서도 조회가 빠르게 수행됨"""
+        policies = []
+        addresses = []
+        for i in range(5000):
+            addresses.append({"name": f"net{i}", "type": "ipmask", "subnet": f"10.{i // 256}.{i % 256}.0/24"})
+            policies.append(
+                {
+                    "policyid": i + 1,
+                    "action": "accept",
+                    "srcaddr": [{"name": "all"}],
+                    "dstaddr": [{"name": f"net{i}"}],
+                    "service": [{"name": "ALL"}],
+                }
+            )
+        self.loader._policies["big"] = policies
+        self.loader._addresses["big"] = addresses
+
+        self.assertEqual(
+            self.analyzer.analyze_traffic("1.1.1.1", "10.19.135.7", 80, firewall_id="big")["policy_id"], 5000
+        )
+
+        started = time.perf_counter()
+        for _ in range(100):
+            self.analyzer.analyze_traffic("1.1.1.1", "10.19.135.7", 80, firewall_id="big")
+        self.assertLess((time.perf_counter() - started) / 100, 0.005)
+
+
+class TestPolicyConflicts(unittest.TestCase):
+    """구간 기반 정책 충돌 분석 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.loader = DataLoader()
+        self.loader._addresses["default"] = [
+            {"name": "lan", "type": "ipmask", "subnet": "192.168.0.0/16"},
+            {"name": "lan-sub", "type": "ipmask", "subnet": "192.168.10.0/24"},
+            {"name": "lan-edge", "type": "iprange", "start-ip": "192.168.255.0", "end-ip": "192.169.0.255"},
+            {"name": "dmz", "type": "ipmask", "subnet": "172.16.0.0/24"},
+            {"name": "other", "type": "ipmask", "subnet": "10.99.0.0/16"},
+        ]
+        self.loader._services["default"] = [
+            {"name": "HTTP", "protocol": "tcp", "tcp-portrange": "80"},
+            {"name": "SSH", "protocol": "tcp", "tcp-portrange": "22"},
+        ]
+        self.analyzer = PolicyAnalyzer(self.loader, RuleValidator(self.loader))
+
+    def _policy(self, policyid, action, src, dst="all", service="ALL", **extra):
+        policy = {
+            "policyid": policyid,
+            "name": f"p{policyid}",
+            "action": action,
+            "srcaddr": [{"name": src}],
+            "dstaddr": [{"name": dst}],
+            "service": [{"name": service}],
+        }
+        policy.update(extra)
+        return policy
+
+    def _conflict_types(self, policies):
+        self.loader._policies["default"] = policies
+        self.loader.invalidate_compiled("default")
+        result = self.analyzer.analyze_policy_conflicts()
+        return {(c["policy1"]["id"], c["policy2"]["id"]): c["conflict_type"] for c in result["conflicts"]}, result
+
+    def test_conflict_classification(self):
+        """섀도잉/중복/일반화/상관 분류"""
+        conflicts, result = self._conflict_types(
+            [
+                self._policy(1, "deny", "lan", "dmz"),
+                self._policy(2, "accept", "lan-sub", "dmz", "HTTP"),
+                self._policy(3, "deny", "lan-sub", "dmz", "SSH"),
+                self._policy(4, "accept", "lan-edge", "dmz"),
+                self._policy(5, "accept", "other", "dmz"),
+                self._policy(6, "deny", "all", "dmz"),
+                self._policy(7, "accept", "lan", "dmz", status="disable"),
+            ]
+        )
+
+        self.assertEqual(conflicts[(1, 2)], "shadow")
+        self.assertEqual(conflicts[(1, 3)], "redundancy")
+        self.assertEqual(conflicts[(1, 4)], "correlation")
+        self.assertEqual(conflicts[(4, 6)], "generalization")
+        self.assertEqual(conflicts[(5, 6)], "generalization")
+        self.assertNotIn((2, 3), conflicts)  # 서비스가 겹치지 않음
+        self.assertNotIn((1, 6), conflicts)  # 같은 동작의 일반화는 보고하지 않음
+        self.assertNotIn((1, 5), conflicts)  # 소스가 겹치지 않음
+        self.assertFalse(any(7 in pair for pair in conflicts))
+        self.assertEqual(result["summary"]["shadow"], 1)
+        self.assertEqual(result["analyzed_policies"], 6)
+        self.assertIn("elapsed_ms", result)
+
+    def test_disjoint_rules_have_no_conflicts(self):
+        """서로 겹치지 않는 대규모 정책은 충돌 없음"""
+        addresses = [
+            {"name": f"n{i}", "type": "ipmask", "subnet": f"10.{i // 256}.{i % 256}.0/24"} for i in range(3000)
+        ]
+        self.loader._addresses["default"] = addresses
+        conflicts, result = self._conflict_types(
+            [self._policy(i + 1, "accept" if i % 2 else "deny", f"n{i}") for i in range(3000)]
+        )
+        self.assertEqual(conflicts, {})
+        self.assertEqual(result["total_policies"], 3000)
+
+    def test_all_source_rules_sweep_selective_dimension(self):
+        """srcaddr "all" 정책이 많아도 목적지가 갈리면 후보 쌍 없이 분석"""
+        self.loader._addresses["default"] = [
+            {"name": f"h{i}", "type": "ipmask", "subnet": f"10.{i // 256}.{i % 256}.1/32"} for i in range(4000)
+        ] + [{"name": "h0-net", "type": "ipmask", "subnet": "10.0.0.0/30"}]
+        policies = [self._policy(i + 1, "accept" if i % 2 else "deny", "all", f"h{i}") for i in range(4000)]
+        policies.append(self._policy(4001, "accept", "all", "h0-net"))
+        conflicts, result = self._conflict_types(policies)
+
+        self.assertEqual(result["sweep_dimension"], "dst")
+        self.assertEqual(result["candidate_pairs"], 1)
+        self.assertEqual(conflicts, {(1, 4001): "generalization"})
+        self.assertLess(result["elapsed_ms"], 5000)
+
+    def test_no_policies(self):
+        """정책이 없는 경우"""
+        result = self.analyzer.analyze_policy_conflicts("missing")
+        self.assertEqual(result["conflicts"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
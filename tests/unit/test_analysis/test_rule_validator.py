@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Rule Validator / Group Resolver Component Unit Tests
+"""
+
+import unittest
+
+from analysis.components.data_loader import DataLoader
+from analysis.components.group_resolver import IntervalSet
+from analysis.components.rule_validator import RuleValidator
+
+
+class TestIntervalSet(unittest.TestCase):
+    """IntervalSet 병합 및 멤버십 테스트"""
+
+    def test_merge_and_contains(self):
+        """겹치거나 인접한 구간 병합"""
+        interval_set = IntervalSet([(10, 20), (21, 30), (15, 18), (50, 60)])
+        self.assertEqual(interval_set.intervals(), [(10, 30), (50, 60)])
+        self.assertIn(10, interval_set)
+        self.assertIn(30, interval_set)
+        self.assertNotIn(31, interval_set)
+        self.assertNotIn(9, interval_set)
+        self.assertIn(55, interval_set)
+
+
+class TestGroupResolution(unittest.TestCase):
+    """중첩 그룹 해석 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.loader = DataLoader()
+        self.loader._addresses["default"] = [
+            {"name": "net-a", "type": "ipmask", "subnet": "10.0.0.0 255.255.255.0"},
+            {"name": "net-b", "type": "iprange", "start-ip": "10.0.1.10", "end-ip": "10.0.1.20"},
+            {"name": "fqdn", "type": "fqdn", "fqdn": "example.com"},
+        ]
+        self.loader._address_groups["default"] = [
+            {"name": "inner", "member": [{"name": "net-b"}, {"name": "fqdn"}]},
+            {"name": "outer", "member": [{"name": "net-a"}, {"name": "inner"}]},
+            {"name": "loop-a", "member": [{"name": "loop-b"}, {"name": "net-a"}]},
+            {"name": "loop-b", "member": [{"name": "loop-a"}]},
+        ]
+        self.loader._services["default"] = [
+            {"name": "HTTP", "protocol": "tcp", "tcp-portrange": "80"},
+            {"name": "HIGH", "tcp-portrange": "8000-8100", "udp-portrange": "9000-9001"},
+        ]
+        self.loader._service_groups["default"] = [
+            {"name": "web", "member": [{"name": "HTTP"}, {"name": "nested"}]},
+            {"name": "nested", "member": [{"name": "HIGH"}, {"name": "web"}]},
+        ]
+        self.validator = RuleValidator(self.loader)
+
+    def test_nested_address_group(self):
+        """중첩 주소 그룹 멤버십"""
+        self.assertTrue(self.validator.is_ip_in_address_group("10.0.0.200", "outer"))
+        self.assertTrue(self.validator.is_ip_in_address_group("10.0.1.15", "outer"))
+        self.assertFalse(self.validator.is_ip_in_address_group("10.0.1.21", "outer"))
+        self.assertFalse(self.validator.is_ip_in_address_group("10.0.0.1", "inner"))
+        self.assertFalse(self.validator.is_ip_in_address_group("invalid", "outer"))
+        self.assertFalse(self.validator.is_ip_in_address_group("10.0.0.1", "missing"))
+
+    def test_cyclic_groups_do_not_recurse_forever(self):
+        """순환 참조 그룹도 안전하게 해석"""
+        self.assertTrue(self.validator.is_ip_in_address_group("10.0.0.5", "loop-b"))
+        self.assertTrue(self.validator.is_port_in_service_group(8050, "tcp", "web"))
+        self.assertTrue(self.validator.is_port_in_service_group(9001, "udp", "web"))
+        self.assertFalse(self.validator.is_port_in_service_group(80, "udp", "web"))
+        self.assertFalse(self.validator.is_port_in_service_group(80, "icmp", "web"))
+
+    def test_object_lookup_by_name(self):
+        """이름으로 객체 조회"""
+        self.assertEqual(self.validator._find_address_object("net-a", "default")["type"], "ipmask")
+        self.assertIsNone(self.validator._find_service_object("missing", "default"))
+
+    def test_resolution_cached_per_generation(self):
+        """데이터 세대가 바뀌면 해석 결과를 다시 생성"""
+        self.assertTrue(self.validator.is_ip_in_address_group("10.0.0.5", "outer"))
+        resolved = self.validator.group_resolver.get("default")
+        self.assertIs(resolved, self.validator.group_resolver.get("default"))
+
+        self.loader._addresses["default"][0]["subnet"] = "172.16.0.0/16"
+        self.assertTrue(self.validator.is_ip_in_address_group("10.0.0.5", "outer"))
+
+        self.loader.invalidate_compiled("default")
+        self.assertIsNot(resolved, self.validator.group_resolver.get("default"))
+        self.assertFalse(self.validator.is_ip_in_address_group("10.0.0.5", "outer"))
+        self.assertTrue(self.validator.is_ip_in_address_group("172.16.3.4", "outer"))
+
+
+if __name__ == "__main__":
+    unittest.main()
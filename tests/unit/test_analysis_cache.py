@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+DPI 분석 결과 캐시 단위 테스트
+"""
+
+import unittest
+
+from security.packet_sniffer.analyzers.analysis_cache import AnalysisCache, analysis_cache_key, payload_digest
+from security.packet_sniffer.analyzers.protocol_analyzer import ProtocolAnalyzer
+from tests.fixtures.packets import HTTP_REQUEST, make_packet
+
+
+class TestAnalysisCacheKey(unittest.TestCase):
+    """캐시 키 테스트"""
+
+    def test_full_payload_digest(self):
+        """앞부분이 같은 페이로드도 다른 키"""
+        prefix = b"A" * 100
+        self.assertNotEqual(
+            analysis_cache_key(make_packet(payload=prefix + b"one")),
+            analysis_cache_key(make_packet(payload=prefix + b"two")),
+        )
+        self.assertEqual(analysis_cache_key(make_packet()), analysis_cache_key(make_packet()))
+        self.assertNotEqual(analysis_cache_key(make_packet()), analysis_cache_key(make_packet(dst_port=8080)))
+
+    def test_digest_is_stable(self):
+        """128비트 다이제스트, bytes-like 입력 타입과 무관"""
+        self.assertEqual(len(payload_digest(b"payload")), 16)
+        self.assertEqual(payload_digest(b"payload"), payload_digest(bytearray(b"payload")))
+
+
+class TestAnalysisCache(unittest.TestCase):
+    """LRU/TTL/공유 계층 테스트"""
+
+    def test_lru_eviction(self):
+        """조회된 항목은 유지되고 가장 오래 사용되지 않은 항목이 제거됨"""
+        cache = AnalysisCache(max_size=2, ttl=None)
+        cache.store("a", 1)
+        cache.store("b", 2)
+        self.assertEqual(cache.lookup("a"), 1)
+
+        cache.store("c", 3)
+
+        self.assertEqual(list(cache), ["a", "c"])
+        self.assertIsNone(cache.lookup("b"))
+        stats = cache.get_statistics()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (1, 1, 1))
+        self.assertEqual(stats["hit_rate"], 50.0)
+
+    def test_ttl_expiration(self):
+        """TTL이 지난 항목은 미스로 처리"""
+        cache = AnalysisCache(ttl=10)
+        cache.store("a", 1, now=100.0)
+        cache.store("b", 2, now=105.0)
+
+        self.assertEqual(cache.lookup("a", now=109.0), 1)
+        self.assertIsNone(cache.lookup("a", now=110.0))
+        self.assertEqual(cache.purge_expired(now=120.0), 1)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.get_statistics()["expirations"], 2)
+
+    def test_shared_tier(self):
+        """다른 워커가 게시한 결과를 공유 계층에서 재사용"""
+        shared = {}
+        producer = AnalysisCache(shared=shared)
+        consumer = AnalysisCache(shared=shared)
+
+        producer.store("key", "result", now=100.0)
+
+        self.assertEqual(consumer.lookup("key", now=101.0), "result")
+        self.assertIn("key", consumer)
+        self.assertEqual(consumer.get_statistics()["shared_hits"], 1)
+        # 만료된 공유 항목은 제거
+        self.assertIsNone(AnalysisCache(ttl=10, shared=shared).lookup("key", now=200.0))
+        self.assertNotIn("key", shared)
+
+    def test_shared_tier_evicts_when_full(self):
+        """공유 매핑이 가득 차면 만료/오래된 항목을 제거하고 새 결과를 계속 게시"""
+        shared = {}
+        cache = AnalysisCache(ttl=10, shared=shared, shared_max_size=10)
+        for i in range(10):
+            cache.store(f"old{i}", i, now=100.0 + i * 0.1)
+
+        cache.store("fresh", "a", now=105.0)
+        self.assertIn("fresh", shared)
+        self.assertLessEqual(len(shared), 10)
+        self.assertNotIn("old0", shared)
+        self.assertIn("old9", shared)
+
+        for i in range(10):
+            cache.store(f"new{i}", i, now=120.0)
+        self.assertEqual(len(shared), 10)
+        self.assertTrue(all(key.startswith("new") for key in shared))
+        self.assertGreater(cache.get_statistics()["shared_evictions"], 0)
+
+    def test_shared_tier_failures_fall_back_to_local(self):
+        """공유 계층 오류는 로컬 캐시 동작에 영향 없음"""
+
+        class BrokenMapping(dict):
+            def get(self, key, default=None):
+                raise EOFError("manager gone")
+
+            def __len__(self):
+                raise EOFError("manager gone")
+
+        cache = AnalysisCache(shared=BrokenMapping())
+        cache.store("a", 1)
+
+        self.assertEqual(cache.lookup("a"), 1)
+        self.assertIsNone(cache.lookup("b"))
+        self.assertEqual(cache.get_statistics()["shared_errors"], 2)
+
+
+class TestProtocolAnalyzerCache(unittest.TestCase):
+    """ProtocolAnalyzer 캐시 사용 테스트"""
+
+    def test_repeated_payload_hits_cache(self):
+        """같은 패킷은 캐시에서 반환"""
+        analyzer = ProtocolAnalyzer(cache_max_size=10)
+        packet = make_packet(payload=HTTP_REQUEST)
+
+        first = analyzer.perform_deep_packet_inspection(packet)
+        second = analyzer.perform_deep_packet_inspection(packet)
+
+        self.assertEqual(first, second)
+        stats = analyzer.get_analyzer_stats()
+        self.assertEqual(stats["cache_hits"], 1)
+        self.assertEqual(stats["cache"]["misses"], 1)
+
+    def test_shared_cache_between_analyzers(self):
+        """워커 간 공유 캐시"""
+        shared = {}
+        ProtocolAnalyzer(shared_cache=shared).perform_deep_packet_inspection(make_packet(payload=HTTP_REQUEST))
+        other = ProtocolAnalyzer(shared_cache=shared)
+
+        other.perform_deep_packet_inspection(make_packet(payload=HTTP_REQUEST))
+
+        self.assertEqual(other.get_analyzer_stats()["cache"]["shared_hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
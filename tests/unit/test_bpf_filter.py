@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+BPF 필터 컴파일 단위 테스트
+"""
+
+import unittest
+
+from security.packet_sniffer.filters.bpf_filter import BPFFilter
+from tests.fixtures.packets import make_packet
+
+
+def packet_dict(**fields):
+    """BPF 필터 입력용 패킷 딕셔너리 (8.8.8.8:443 으로 가는 200바이트 TCP 패킷)"""
+    values = {"src_ip": "192.168.1.10", "dst_ip": "8.8.8.8", "src_port": 50000, "dst_port": 443, "size": 200}
+    values.update(fields)
+    return make_packet(**values).to_dict()
+
+
+class TestBPFFilter(unittest.TestCase):
+    """BPF 필터 파싱 및 클로저 평가 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.bpf = BPFFilter()
+
+    def assertMatches(self, expression, packet, expected=True):
+        self.assertTrue(self.bpf.set_filter(expression), expression)
+        self.assertEqual(self.bpf.matches(packet), expected, expression)
+
+    def test_primitives(self):
+        """기본 조건"""
+        packet = packet_dict()
+        self.assertMatches("tcp", packet)
+        self.assertMatches("udp", packet, False)
+        self.assertMatches("host 8.8.8.8", packet)
+        self.assertMatches("src host 8.8.8.8", packet, False)
+        self.assertMatches("dst port 443", packet)
+        self.assertMatches("src port 443", packet, False)
+        self.assertMatches("port 400-500", packet)
+        self.assertMatches("src net 192.168.0.0/16", packet)
+        self.assertMatches("dst net 192.168.0.0/16", packet, False)
+        self.assertMatches("net 8.8.8.8", packet)
+        self.assertMatches("greater 100", packet)
+        self.assertMatches("less 100", packet, False)
+
+    def test_operator_precedence_and_parentheses(self):
+        """not > and > or 우선순위 및 괄호"""
+        packet = packet_dict(dst_port=80, protocol="TCP")
+        self.assertMatches("port 80 or port 53 and udp", packet)
+        self.assertMatches("(port 80 or port 53) and udp", packet, False)
+        self.assertMatches("not (net 192.168.0.0/16 or net 10.0.0.0/8)", packet, False)
+        self.assertMatches("tcp && ! host 1.1.1.1", packet)
+
+    def test_invalid_syntax(self):
+        """잘못된 문법은 컴파일 실패"""
+        self.assertFalse(self.bpf.set_filter("(tcp or udp"))
+        self.assertFalse(self.bpf.set_filter("tcp and"))
+        self.assertFalse(self.bpf.set_filter("net 300.0.0.0/8"))
+        self.assertEqual(self.bpf.get_statistics()["compilation_errors"], 3)
+
+        valid, _ = self.bpf.validate_syntax("tcp or")
+        self.assertFalse(valid)
+
+    def test_matches_batch(self):
+        """일괄 매칭과 통계"""
+        self.assertTrue(self.bpf.set_filter("tcp and not src net 10.0.0.0/8"))
+        packets = [
+            packet_dict(),
+            packet_dict(src_ip="10.1.2.3"),
+            packet_dict(protocol="UDP"),
+            packet_dict(src_ip="2001:db8::1"),
+            packet_dict(src_ip=None),
+        ]
+
+        self.assertEqual(self.bpf.matches_batch(packets), [True, False, False, True, True])
+        self.assertEqual([self.bpf.matches(p) for p in packets], [True, False, False, True, True])
+        stats = self.bpf.get_statistics()
+        self.assertEqual((stats["total_packets"], stats["matched_packets"]), (10, 6))
+
+    def test_empty_filter_matches_all(self):
+        """빈 필터는 모든 패킷 통과"""
+        self.assertTrue(self.bpf.set_filter(""))
+        self.assertEqual(self.bpf.matches_batch([packet_dict(), {}]), [True, True])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+캡처 역색인 단위 테스트
+"""
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from security.packet_sniffer.capture_index import CaptureIndex
+from security.packet_sniffer.capture_spool import CaptureSpool
+from security.packet_sniffer.session_manager import CaptureSession, SessionConfig, SessionManager
+from tests.fixtures.packets import BASE_TIMESTAMP, make_packets
+
+
+def random_packets(count, seed=7):
+    """무작위 호스트/포트/프로토콜 테스트 패킷 (1.5초 간격)"""
+    rng = random.Random(seed)
+    return make_packets(
+        count,
+        timestamp=lambda i: BASE_TIMESTAMP + i * 1.5,
+        src_ip=lambda i: "10.0.0.%d" % rng.randrange(5),
+        dst_ip=lambda i: "10.0.1.%d" % rng.randrange(3),
+        src_port=lambda i: rng.choice([40000, 40001, 53]),
+        dst_port=lambda i: rng.choice([80, 443, 53]),
+        protocol=lambda i: rng.choice(["TCP", "UDP"]),
+        size=lambda i: 60 + rng.randrange(3),
+        payload=lambda i: b"p%d" % i,
+    )
+
+
+def linear_filter(packets, criteria, start_time=None, end_time=None):
+    """선형 스캔 기준 결과"""
+    result = []
+    for number, packet in enumerate(packets):
+        values = packet.to_dict()
+        if "ip" in criteria and criteria["ip"] not in (packet.src_ip, packet.dst_ip):
+            continue
+        if "port" in criteria and criteria["port"] not in (packet.src_port, packet.dst_port):
+            continue
+        if any(key in values and values[key] != value for key, value in criteria.items()):
+            continue
+        if start_time is not None and packet.timestamp < start_time:
+            continue
+        if end_time is not None and packet.timestamp >= end_time:
+            continue
+        result.append(number)
+    return result
+
+
+class TestCaptureIndex(unittest.TestCase):
+    """역색인 교집합 조회 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.packets = random_packets(500)
+        self.index = CaptureIndex(time_bucket=60.0)
+        for number, packet in enumerate(self.packets):
+            self.index.add(number, packet)
+
+    def test_query_matches_linear_scan(self):
+        """색인 조회 결과는 선형 필터와 동일"""
+        start = self.packets[0].timestamp
+        cases = [
+            ({"src_ip": "10.0.0.1"}, None, None),
+            ({"src_ip": "10.0.0.1", "dst_port": 443, "protocol": "TCP"}, None, None),
+            ({"ip": "10.0.1.2", "port": 53}, None, None),
+            ({"dst_ip": "10.0.1.0"}, start + 100.5, start + 400.0),
+            ({}, start + 30.0, start + 31.6),
+            ({"src_ip": "192.0.2.1"}, None, None),
+        ]
+        for criteria, start_time, end_time in cases:
+            with self.subTest(criteria=criteria, start_time=start_time):
+                self.assertEqual(
+                    self.index.query(criteria, start_time, end_time),
+                    linear_filter(self.packets, criteria, start_time, end_time),
+                )
+        self.assertEqual(
+            len(self.index.query({"src_ip": ["10.0.0.1", "10.0.0.2"]})),
+            len(self.index.query({"src_ip": "10.0.0.1"})) + len(self.index.query({"src_ip": "10.0.0.2"})),
+        )
+
+    def test_discard_and_order(self):
+        """삭제된 구간은 제외되고 번호는 연속적으로만 추가"""
+        self.index.discard_before(400)
+        self.assertEqual(len(self.index), 100)
+        self.assertEqual(
+            self.index.query({"src_ip": "10.0.0.1"}),
+            [n for n in linear_filter(self.packets, {"src_ip": "10.0.0.1"}) if n >= 400],
+        )
+        self.assertIsNone(self.index.flow_of(10))
+        with self.assertRaises(ValueError):
+            self.index.add(1000, self.packets[0])
+
+
+class TestSessionQuery(unittest.TestCase):
+    """세션 색인 조회/스풀 복구 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.packets = random_packets(300)
+
+    def tearDown(self):
+        """테스트 정리"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def make_session(self, session_id="index-session", **kwargs):
+        session = CaptureSession(session_id, SessionConfig(max_packets=100000, **kwargs))
+        session.start()
+        return session
+
+    def test_memory_session_query_and_flow(self):
+        """메모리 세션: 페이지 단위 조회, 비색인 조건, 플로우 조회"""
+        session = self.make_session()
+        for packet in self.packets:
+            session.add_packet(packet)
+
+        expected = linear_filter(self.packets, {"protocol": "UDP", "size": 61})
+        page = session.query_packets({"protocol": "UDP", "size": 61}, offset=5, limit=10)
+        self.assertEqual(page["total"], len(expected))
+        self.assertEqual(page["packet_numbers"], expected[5:15])
+        self.assertEqual([p.payload for p in page["packets"]], [self.packets[n].payload for n in expected[5:15]])
+
+        flow = session.get_flow_packets(0)
+        first = self.packets[0]
+        for number in flow["packet_numbers"]:
+            packet = self.packets[number]
+            self.assertEqual(packet.protocol, first.protocol)
+            self.assertEqual(
+                {(packet.src_ip, packet.src_port), (packet.dst_ip, packet.dst_port)},
+                {(first.src_ip, first.src_port), (first.dst_ip, first.dst_port)},
+            )
+        session.stop()
+
+    def test_spooled_index_survives_restart(self):
+        """스풀 세션: 세그먼트 체크포인트와 미완료 세그먼트 재색인으로 재시작 후 같은 결과"""
+        config = {"spool_dir": self.temp_dir, "segment_max_bytes": 4096, "hot_window": 40}
+        session = self.make_session(**config)
+        for packet in self.packets:
+            session.add_packet(packet)
+
+        criteria = {"ip": "10.0.0.3", "dst_port": 80}
+        expected = linear_filter(self.packets, criteria)
+        result = session.query_packets(criteria)
+        self.assertEqual(result["packet_numbers"], expected)
+        self.assertEqual([p.payload for p in result["packets"]], [self.packets[n].payload for n in expected])
+
+        # 마지막 세그먼트는 체크포인트 없이 종료된 상태에서 복구
+        session.spool.flush()
+        spool_dir = os.path.join(self.temp_dir, "index-session")
+        self.assertTrue(any(name.endswith(".postings") for name in os.listdir(spool_dir)))
+
+        manager = SessionManager()
+        try:
+            restored = manager.restore_session("index-session", SessionConfig(**config))
+            self.assertEqual(restored.get_packet_count(), 300)
+            self.assertEqual(restored.query_packets(criteria)["packet_numbers"], expected)
+            self.assertEqual(
+                [p.payload for p in restored.query_packets(criteria, offset=2, limit=3)["packets"]],
+                [self.packets[n].payload for n in expected[2:5]],
+            )
+        finally:
+            manager.shutdown()
+        session.stop()
+
+    def test_ring_spool_index(self):
+        """링 회전으로 삭제된 세그먼트의 패킷은 조회되지 않음"""
+        index = CaptureIndex()
+        spool = CaptureSpool(
+            self.temp_dir, segment_max_bytes=2048, segment_max_duration=None, max_segments=3, index=index
+        )
+        for packet in self.packets:
+            spool.append(packet)
+
+        numbers = index.query({"protocol": "TCP"})
+        self.assertTrue(numbers)
+        self.assertGreaterEqual(numbers[0], spool.first_retained)
+        self.assertEqual(
+            numbers, [n for n in linear_filter(self.packets, {"protocol": "TCP"}) if n >= spool.first_retained]
+        )
+        self.assertEqual(
+            [p.payload for _, p in spool.read_numbers(numbers)], [self.packets[n].payload for n in numbers]
+        )
+        spool.close()
+
+    def test_closed_segments_kept_on_disk(self):
+        """닫힌 세그먼트의 역색인은 메모리에 남지 않고, 요약으로 걸러지지 않은 세그먼트만 읽음"""
+        index = CaptureIndex(cached_segments=1)
+        spool = CaptureSpool(self.temp_dir, segment_max_bytes=2048, segment_max_duration=None, index=index)
+        for packet in self.packets:
+            spool.append(packet)
+
+        stats = index.get_statistics()
+        self.assertGreater(stats["segments"], 5)
+        self.assertLess(stats["active_packets"], 300 // stats["segments"] + 1)
+        self.assertLessEqual(stats["cached_segments"], 1)
+
+        index._loaded.clear()
+        self.assertEqual(index.query({"src_ip": "192.0.2.1"}), [])
+        self.assertEqual(index.query({}, 0.0, 1.0), [])
+        self.assertEqual(len(index._loaded), 0)
+
+        start = self.packets[0].timestamp
+        for criteria, start_time in (({"ip": "10.0.0.2", "port": 443}, None), ({}, start + 100.0)):
+            self.assertEqual(
+                index.query(criteria, start_time), linear_filter(self.packets, criteria, start_time=start_time)
+            )
+        number = index.query({"protocol": "UDP"})[0]
+        self.assertIn(number, index.query({"flow_id": index.flow_of(number)}))
+        spool.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
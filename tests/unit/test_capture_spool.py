@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+캡처 스풀 단위 테스트
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from security.packet_sniffer.base_sniffer import PacketInfo
+from security.packet_sniffer.capture_spool import CaptureSpool
+from security.packet_sniffer.exporters.pcap_io import PcapReader
+from security.packet_sniffer.packet_store import PacketView
+from security.packet_sniffer.session_manager import CaptureSession, SessionConfig, SessionManager
+from tests.fixtures.packets import BASE_TIMESTAMP, make_packets
+
+
+def three_flow_packets(count):
+    """세 개의 플로우가 섞인 테스트 패킷 (0.5초 간격)"""
+    return make_packets(
+        count,
+        timestamp=lambda i: BASE_TIMESTAMP + i * 0.5,
+        src_ip=lambda i: "192.168.1.%d" % (i % 3),
+        src_port=lambda i: 40000 + i % 3,
+        dst_port=443,
+        size=lambda i: 100 + i,
+        payload=lambda i: b"payload-%d" % i,
+        flags=lambda i: {"ACK": True},
+    )
+
+
+class TestCaptureSpool(unittest.TestCase):
+    """세그먼트 회전/조회 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """테스트 정리"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_rotation_and_lazy_read(self):
+        """크기/기간 기준 회전 후 임의 구간을 순서대로 읽음"""
+        spool = CaptureSpool(self.temp_dir, segment_max_bytes=2048, segment_max_duration=20)
+        packets = three_flow_packets(200)
+        for packet in packets:
+            spool.append(packet)
+
+        stats = spool.get_statistics()
+        self.assertGreater(stats["segments"], 5)
+        self.assertEqual(len(spool), 200)
+        self.assertEqual([p.to_dict() for p in spool.read()], [p.to_dict() for p in packets])
+        self.assertEqual([p.payload for p in spool.read(offset=57, limit=70)], [p.payload for p in packets[57:127]])
+        self.assertTrue(all(s["last_timestamp"] - s["first_timestamp"] < 20 for s in spool.get_segments()))
+
+    def test_ring_eviction(self):
+        """보존 세그먼트 수를 넘으면 가장 오래된 세그먼트 삭제"""
+        spool = CaptureSpool(self.temp_dir, segment_max_bytes=1024, segment_max_duration=None, max_segments=3)
+        packets = three_flow_packets(100)
+        for packet in packets:
+            spool.append(packet)
+
+        stats = spool.get_statistics()
+        self.assertEqual(stats["segments"], 3)
+        self.assertEqual(len(spool) + stats["dropped_packets"], 100)
+        self.assertEqual([p.payload for p in spool.read()], [p.payload for p in packets[-len(spool) :]])
+        self.assertEqual(len([name for name in os.listdir(self.temp_dir) if name.endswith(".pcap")]), 3)
+
+    def test_index_queries(self):
+        """사이드카 인덱스 기반 시간 구간/플로우 조회"""
+        spool = CaptureSpool(self.temp_dir, segment_max_bytes=2048)
+        packets = three_flow_packets(90)
+        for packet in packets:
+            spool.append(packet)
+
+        in_range = list(spool.iter_range(packets[10].timestamp, packets[40].timestamp))
+        self.assertEqual([p.payload for p in in_range], [p.payload for p in packets[10:40]])
+
+        reply = PacketInfo(0.0, "10.0.0.80", "192.168.1.1", 443, 40001, "TCP", 60)  # 역방향도 같은 플로우
+        self.assertEqual([p.payload for p in spool.iter_flow(reply)], [p.payload for p in packets[1::3]])
+
+        output = os.path.join(self.temp_dir, "export.pcap")
+        self.assertEqual(spool.export_pcap(output)["exported_count"], 90)
+        with PcapReader(output) as reader:
+            self.assertEqual(sum(1 for _ in reader), 90)
+
+
+class TestSpooledCaptureSession(unittest.TestCase):
+    """스풀 모드 세션 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.temp_dir = tempfile.mkdtemp()
+        config = SessionConfig(max_packets=100000, spool_dir=self.temp_dir, segment_max_bytes=4096, hot_window=20)
+        self.session = CaptureSession("spool-session", config)
+        self.session.start()
+        self.packets = three_flow_packets(150)
+        for packet in self.packets:
+            self.session.add_packet(packet)
+
+    def tearDown(self):
+        """테스트 정리"""
+        self.session.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_hot_window_bounded(self):
+        """메모리에는 핫 윈도우만 유지하고 이전 구간은 세그먼트에서 읽음"""
+        self.assertLessEqual(len(self.session.packets) + len(self.session._hot_previous), 20)
+        self.assertEqual(self.session.get_packet_count(), 150)
+
+        recent = self.session.get_packets(limit=5, offset=145)
+        self.assertIsInstance(recent[0], PacketView)
+        self.assertEqual([p.payload for p in recent], [p.payload for p in self.packets[145:]])
+
+        older = self.session.get_packets(limit=10, offset=30)
+        self.assertEqual([p.to_dict() for p in older], [p.to_dict() for p in self.packets[30:40]])
+        self.assertEqual(len(self.session.get_payload_statistics(limit=50, offset=100)), 50)
+
+    def test_page_ending_in_previous_hot_store(self):
+        """이전 핫 저장소 안에서 끝나는 페이지는 limit만큼만 반환"""
+        previous = len(self.session._hot_previous)
+        self.assertGreater(previous, 2)
+        hot_start = 150 - previous - len(self.session.packets)
+
+        page = self.session.get_packets(limit=2, offset=hot_start + 1)
+        self.assertEqual([p.payload for p in page], [p.payload for p in self.packets[hot_start + 1 : hot_start + 3]])
+        self.assertEqual(len(self.session.get_packets(limit=previous, offset=hot_start)), previous)
+        self.assertEqual(len(self.session.get_payload_statistics(limit=2, offset=hot_start)), 2)
+        self.assertEqual(self.session.get_packets(limit=0, offset=hot_start), [])
+
+    def test_export_page_cap_only_in_spool_mode(self):
+        """페이지 상한은 스풀 모드에만 적용되고 메모리 세션은 limit 없이 전체 내보내기"""
+        memory = CaptureSession("memory-session", SessionConfig(max_packets=1000))
+        memory.start()
+        try:
+            for packet in self.packets:
+                memory.add_packet(packet)
+            with patch("security.packet_sniffer.session_manager.EXPORT_PAGE_SIZE", 64):
+                spooled = self.session.export_data()
+                whole = memory.export_data()
+        finally:
+            memory.stop()
+
+        self.assertEqual((len(spooled["packets"]), spooled["next_offset"]), (64, 64))
+        self.assertEqual((len(whole["packets"]), whole["next_offset"]), (150, None))
+
+    def test_export_and_delete(self):
+        """내보내기는 세그먼트에서 읽고 세션 삭제 시 스풀도 삭제"""
+        manager = SessionManager()
+        try:
+            manager.sessions[self.session.session_id] = self.session
+            exported = manager.export_session_data(self.session.session_id)
+            self.assertEqual(len(exported["packets"]), 150)
+            self.assertEqual(exported["spool"]["retained_packets"], 150)
+            self.assertIsNone(exported["next_offset"])
+
+            # 페이지 단위 내보내기: next_offset으로 이어 읽은 결과는 전체와 같음
+            pages, offset = [], 0
+            while offset is not None:
+                page = manager.export_session_data(self.session.session_id, offset=offset, limit=64)
+                self.assertLessEqual(len(page["packets"]), 64)
+                pages.extend(page["packets"])
+                offset = page["next_offset"]
+            self.assertEqual(pages, exported["packets"])
+
+            output = os.path.join(self.temp_dir, "session.pcap")
+            self.assertEqual(manager.export_session_pcap(self.session.session_id, output)["exported_count"], 150)
+
+            manager.delete_session(self.session.session_id)
+            self.assertFalse(os.path.exists(os.path.join(self.temp_dir, self.session.session_id)))
+        finally:
+            manager.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Cache Bulk / Pattern Operation Unit Tests
+"""
+
+import unittest
+
+from src.core.cache_manager import CacheBackend, CacheManager, RedisCacheBackend
+
+
+class TestCacheManagerBulkOperations(unittest.TestCase):
+    """CacheManager 일괄 조회/저장/패턴 삭제 테스트 (메모리 백엔드)"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.manager = CacheManager(backends=[CacheBackend.MEMORY])
+
+    def test_get_many_and_set_many(self):
+        """일괄 저장 후 찾은 키만 반환"""
+        self.assertTrue(self.manager.set_many({"a": 1, "b": {"x": 2}, "c": [3]}, ttl=60))
+        self.assertEqual(self.manager.get_many(["a", "b", "missing"]), {"a": 1, "b": {"x": 2}})
+        self.assertEqual(self.manager.get_many([]), {})
+        self.assertEqual(self.manager.delete_many(["a", "c", "missing"]), 2)
+        self.assertEqual(self.manager.keys(), ["b"])
+
+    def test_delete_pattern(self):
+        """패턴에 맞는 키만 삭제"""
+        self.manager.set_many({f"fortigate:10.0.0.1:443:GET:{i}": i for i in range(20)})
+        self.manager.set_many({f"fortigate:10.0.0.2:443:GET:{i}": i for i in range(5)})
+
+        self.assertEqual(self.manager.delete_pattern("fortigate:10.0.0.1:*"), 20)
+        self.assertEqual(len(self.manager.keys("fortigate:*")), 5)
+
+
+class TestRedisBulkOperations(unittest.TestCase):
+    """Redis 백엔드 SCAN/UNLINK/MGET 테스트 (Redis 서버가 있을 때만)"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.backend = RedisCacheBackend(prefix="nextrade-test-bulk:")
+        if not self.backend.connected:
+            self.skipTest("Redis server not available")
+        self.backend.clear()
+
+    def tearDown(self):
+        """테스트 정리"""
+        if self.backend.connected:
+            self.backend.clear()
+
+    def test_bulk_and_key_count(self):
+        """MGET/파이프라인 저장, SCAN 삭제와 레지스트리 키 수"""
+        self.assertTrue(self.backend.set_many({f"k{i}": i for i in range(1200)}))
+        self.assertTrue(self.backend.set_many({"ttl": 1}, ttl=60))
+        self.assertEqual(self.backend.get_many(["k1", "k1199", "nope"]), {"k1": 1, "k1199": 1199})
+        self.assertEqual(self.backend.stats()["keys"], 1201)
+
+        self.assertEqual(self.backend.delete_pattern("k1*"), 311)  # k1, k10-19, k100-199, k1000-1199
+        self.assertEqual(self.backend.stats()["keys"], 890)
+        self.assertEqual(len(self.backend.keys()), 890)
+
+        self.assertTrue(self.backend.clear())
+        self.assertEqual((self.backend.stats()["keys"], self.backend.keys()), (0, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
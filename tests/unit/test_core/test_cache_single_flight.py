@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Cache Single-Flight / Stale-While-Revalidate Unit Tests
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from src.core.base_client import APIResponse, ClientType, UnifiedAPIClient
+from src.core.cache_manager import CacheBackend, CacheManager
+
+
+def run_concurrently(target, count):
+    """count개의 스레드에서 target을 동시에 시작하고 결과를 모은다"""
+    barrier = threading.Barrier(count)
+    results, errors = [], []
+
+    def worker():
+        barrier.wait()
+        try:
+            results.append(target())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def wait_idle(manager, timeout=5.0):
+    """백그라운드 갱신이 끝날 때까지 대기"""
+    deadline = time.time() + timeout
+    while manager.stats()["single_flight"]["in_flight"] and time.time() < deadline:
+        time.sleep(0.01)
+
+
+class TestCacheSingleFlight(unittest.TestCase):
+    """CacheManager.get_or_compute 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.manager = CacheManager(backends=[CacheBackend.MEMORY])
+        self.calls = 0
+
+    def slow_compute(self, value="v"):
+        self.calls += 1
+        time.sleep(0.1)
+        return value
+
+    def test_concurrent_misses_compute_once(self):
+        """동시에 미스난 호출은 한 번만 계산하고 결과를 공유"""
+
+        @self.manager.cached(ttl=60)
+        def dashboard(device):
+            return self.slow_compute(f"dashboard:{device}")
+
+        results, errors = run_concurrently(lambda: dashboard("fw1"), 16)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(results, ["dashboard:fw1"] * 16)
+        self.assertEqual(self.calls, 1)
+        stats = self.manager.stats()["single_flight"]
+        self.assertEqual((stats["computes"], stats["coalesced"]), (1, 15))
+        self.assertEqual(dashboard("fw1"), "dashboard:fw1")
+        self.assertEqual(self.calls, 1)
+
+    def test_errors_reach_waiters_and_are_not_cached(self):
+        """리더의 예외는 대기 중인 호출에도 전달되고 캐시되지 않음"""
+
+        def failing():
+            self.calls += 1
+            time.sleep(0.1)
+            raise ConnectionError("device unreachable")
+
+        results, errors = run_concurrently(lambda: self.manager.get_or_compute("k", failing, ttl=60), 6)
+
+        self.assertEqual(results, [])
+        self.assertEqual(len(errors), 6)
+        self.assertTrue(all(isinstance(e, ConnectionError) for e in errors))
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.manager.get_or_compute("k", lambda: "ok", ttl=60), "ok")
+
+    def test_stale_while_revalidate(self):
+        """만료된 항목은 즉시 반환하고 백그라운드에서 한 번만 갱신"""
+        self.manager.get_or_compute("k", lambda: "old", ttl=0, stale_ttl=60, beta=0)
+
+        results, _ = run_concurrently(
+            lambda: self.manager.get_or_compute("k", lambda: self.slow_compute("new"), ttl=60, beta=0), 8
+        )
+        self.assertEqual(results, ["old"] * 8)
+
+        wait_idle(self.manager)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.manager.get_or_compute("k", lambda: "unused", ttl=60, beta=0), "new")
+        stats = self.manager.stats()["single_flight"]
+        self.assertEqual((stats["stale_served"], stats["background_refreshes"]), (8, 1))
+
+    def test_stale_window_ends(self):
+        """stale_ttl이 지나면 다시 동기 계산"""
+        self.manager.get_or_compute("k", lambda: "old", ttl=0, stale_ttl=0, beta=0)
+        self.assertEqual(self.manager.get_or_compute("k", lambda: "new", ttl=60, beta=0), "new")
+
+    def test_probabilistic_early_expiration(self):
+        """만료가 가까울수록, 계산 시간이 길수록 일찍 만료될 확률이 높음"""
+        now = time.time()
+        entry = {"expires_at": now + 1.0, "delta": 10.0}
+        fresh = sum(CacheManager._is_fresh(entry, now, 1.0) for _ in range(4000))
+        # P(fresh) = P(U > e^-0.1) ≈ 0.095
+        self.assertAlmostEqual(fresh / 4000, 0.095, delta=0.03)
+
+        self.assertTrue(CacheManager._is_fresh({"expires_at": now + 1000.0, "delta": 0.01}, now, 1.0))
+        self.assertTrue(CacheManager._is_fresh({"expires_at": now + 1.0, "delta": 10.0}, now, 0))
+        self.assertFalse(CacheManager._is_fresh({"expires_at": now - 1.0, "delta": 0.0}, now, 1.0))
+
+
+class TestAPIClientCoalescing(unittest.TestCase):
+    """UnifiedAPIClient.request 요청 병합 테스트"""
+
+    def test_concurrent_gets_share_one_request(self):
+        """같은 GET 요청이 동시에 들어오면 장비에는 한 번만 요청"""
+        client = UnifiedAPIClient(
+            ClientType.FORTIGATE, "192.0.2.1", cache_manager=CacheManager(backends=[CacheBackend.MEMORY])
+        )
+        sent = []
+
+        def send(method, endpoint, data=None, params=None, headers=None):
+            sent.append(endpoint)
+            time.sleep(0.1)
+            return APIResponse(success=True, data={"results": [1, 2]}, status_code=200)
+
+        with patch.object(client, "_send", side_effect=send):
+            results, errors = run_concurrently(lambda: client.request("GET", "/monitor/system/status"), 8)
+            posted = client.request("POST", "/monitor/system/status")
+
+        self.assertEqual(errors, [])
+        self.assertEqual(sent, ["/monitor/system/status"] * 2)
+        self.assertTrue(all(r.data == {"results": [1, 2]} for r in results))
+        self.assertEqual(sorted(r.cached for r in results), [False] + [True] * 7)
+        self.assertFalse(posted.cached)
+        self.assertEqual(client._stats["requests_cached"], 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
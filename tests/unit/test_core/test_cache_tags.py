@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Cache Tag Invalidation Unit Tests
+"""
+
+import unittest
+
+from src.core.cache_manager import CacheBackend, CacheManager, MemoryCacheBackend, RedisCacheBackend
+
+
+class TestCacheManagerTags(unittest.TestCase):
+    """CacheManager 태그 무효화 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.manager = CacheManager(backends=[CacheBackend.MEMORY])
+
+    def test_invalidate_tags_evicts_exactly_tagged_entries(self):
+        """태그 중 하나라도 가진 항목만 삭제"""
+        self.manager.set("fw1:policies", [1, 2], ttl=60, tags=["device:fw1", "object:firewall_policy"])
+        self.manager.set("fw1:status", {"up": True}, ttl=60, tags=["device:fw1"])
+        self.manager.set("fw2:policies", [3], ttl=60, tags=["device:fw2", "object:firewall_policy"])
+        self.manager.set("untagged", "x", ttl=60)
+
+        self.assertEqual(self.manager.get("fw1:policies"), [1, 2])
+        self.assertEqual(self.manager.get_many(["fw1:status"]), {"fw1:status": {"up": True}})
+
+        self.assertEqual(self.manager.invalidate_tags(["device:fw1"]), 2)
+        self.assertEqual(sorted(self.manager.keys()), ["fw2:policies", "untagged"])
+        self.assertEqual(self.manager.invalidate_tags(["device:fw1", "unknown"]), 0)
+        self.assertEqual(self.manager.invalidate_tags(["object:firewall_policy"]), 1)
+
+    def test_decorator_and_get_or_compute_tags(self):
+        """cached의 태그 함수와 get_or_compute 태그"""
+        calls = []
+
+        @self.manager.cached(ttl=60, tags=lambda device: [f"device:{device}"])
+        def interfaces(device):
+            calls.append(device)
+            return [f"{device}-port1"]
+
+        self.assertEqual(interfaces("fw1"), ["fw1-port1"])
+        self.assertEqual(interfaces("fw1"), ["fw1-port1"])
+        self.assertEqual(interfaces("fw2"), ["fw2-port1"])
+        self.manager.invalidate_tags(["device:fw1"])
+        interfaces("fw1")
+        interfaces("fw2")
+        self.assertEqual(calls, ["fw1", "fw2", "fw1"])
+
+    def test_index_follows_eviction_and_overwrite(self):
+        """LRU 제거/덮어쓰기 시 태그 역색인도 정리"""
+        backend = MemoryCacheBackend(max_size=2, shards=1)
+        for key in ("a", "b", "c"):
+            backend.set(key, key)
+            backend.tag(key, ["t"])
+        shard = backend._shards[0]
+        self.assertEqual(shard.tag_index, {"t": {"b", "c"}})
+
+        backend.set("b", "new")  # 값이 바뀌면 태그도 다시 등록해야 함
+        self.assertEqual(shard.tag_index, {"t": {"c"}})
+        self.assertEqual(backend.invalidate_tags(["t"]), 1)
+        self.assertEqual((shard.tag_index, sorted(backend.keys())), ({}, ["b"]))
+
+
+class TestRedisTags(unittest.TestCase):
+    """Redis 태그 집합 테스트 (Redis 서버가 있을 때만)"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.manager = CacheManager(
+            backends=[CacheBackend.MEMORY, CacheBackend.REDIS], redis_config={"prefix": "nextrade-test-tags:"}
+        )
+        self.redis = self.manager._backends[CacheBackend.REDIS]
+        if not self.redis.connected:
+            self.skipTest("Redis server not available")
+        self.manager.clear()
+
+    def tearDown(self):
+        """테스트 정리"""
+        if isinstance(self.redis, RedisCacheBackend) and self.redis.connected:
+            self.manager.clear()
+
+    def test_promoted_copies_stay_tagged(self):
+        """Redis에서 메모리로 승격된 항목도 태그 무효화 대상"""
+        self.manager.set("pkg", {"rules": 10}, ttl=60, backends=[CacheBackend.REDIS], tags=["package:root/default"])
+        self.assertEqual(self.manager.get("pkg"), {"rules": 10})  # 메모리로 승격
+        self.assertTrue(self.manager._backends[CacheBackend.MEMORY].exists("pkg"))
+
+        self.assertEqual(self.manager.invalidate_tags(["package:root/default"]), 1)
+        self.assertIsNone(self.manager.get("pkg"))
+        self.assertEqual(self.redis.stats()["keys"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
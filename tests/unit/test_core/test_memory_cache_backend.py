@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Memory Cache Backend Unit Tests
+"""
+
+import threading
+import unittest
+
+from src.core.cache_manager import MemoryCacheBackend
+
+
+class TestMemoryCacheBackend(unittest.TestCase):
+    """MemoryCacheBackend LRU/TTL 테스트"""
+
+    def test_lru_eviction_order(self):
+        """가득 찬 상태에서는 가장 오래 사용되지 않은 키부터 제거"""
+        cache = MemoryCacheBackend(max_size=3)
+        for key in ("a", "b", "c"):
+            cache.set(key, key.upper())
+        self.assertEqual(cache.get("a"), "A")  # a를 최근 사용으로 갱신
+
+        cache.set("d", "D")
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(sorted(cache.keys()), ["a", "c", "d"])
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+        cache.set("a", "A2")  # 기존 키 갱신은 제거를 일으키지 않음
+        self.assertEqual((cache.get("a"), cache.stats()["size"]), ("A2", 3))
+
+    def test_ttl_expiry_from_heap(self):
+        """만료된 항목은 조회 시 또는 다음 set에서 힙으로 정리"""
+        cache = MemoryCacheBackend(max_size=100)
+        cache.set("expired", 1, ttl=0)
+        cache.set("fresh", 2, ttl=3600)
+        cache.set("forever", 3)
+
+        self.assertFalse(cache.exists("expired"))
+        cache.set("other", 4, ttl=0)
+        cache.set("trigger", 5)
+
+        stats = cache.stats()
+        self.assertEqual(stats["expirations"], 2)
+        self.assertEqual(sorted(cache.keys()), ["forever", "fresh", "trigger"])
+
+        cache.set("fresh", 6)  # TTL 없이 덮어쓰면 이전 힙 항목은 무시됨
+        cache._cleanup_expired()
+        self.assertEqual(cache.get("fresh"), 6)
+
+    def test_byte_limit(self):
+        """max_bytes를 넘으면 크기 기준으로도 제거"""
+        cache = MemoryCacheBackend(max_size=100, max_bytes=1000, shards=1)
+        for i in range(5):
+            cache.set(f"k{i}", b"x" * 300)
+
+        stats = cache.stats()
+        self.assertEqual((stats["size"], stats["bytes"]), (3, 900))
+        self.assertEqual(sorted(cache.keys()), ["k2", "k3", "k4"])
+        self.assertFalse(cache.set("huge", b"x" * 2000))
+
+    def test_concurrent_access(self):
+        """여러 스레드에서 동시에 사용해도 크기 제한과 통계가 일관됨"""
+        cache = MemoryCacheBackend(max_size=2000)
+        self.assertGreater(cache.stats()["shards"], 1)
+        errors = []
+
+        def worker(worker_id):
+            try:
+                for i in range(3000):
+                    key = f"{worker_id}:{i % 700}"
+                    cache.set(key, i, ttl=60)
+                    cache.get(key)
+                    if i % 10 == 0:
+                        cache.delete(key)
+            except Exception as e:  # pragma: no cover - 실패 시 원인 보고용
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.stats()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(stats["size"], 2000)
+        self.assertEqual(stats["sets"], 8 * 3000)
+        self.assertEqual(stats["size"], len(cache.keys()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+병렬 DPI 파이프라인 단위 테스트
+"""
+
+import asyncio
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from security.ai_threat_detector import AIThreatDetector
+from security.packet_sniffer.analyzers.protocol_analyzer import ProtocolAnalyzer
+from security.packet_sniffer.dpi_pipeline import DPIPipeline, flow_partition_key
+from tests.fixtures.packets import make_packet
+
+
+class FlowRecorder:
+    """워커에서 본 플로우와 패킷 순번을 기록하는 테스트용 분석기"""
+
+    def __init__(self):
+        self.seen = {}
+
+    def analyze(self, packet):
+        key = flow_partition_key(packet)
+        self.seen.setdefault(key, []).append(packet.timestamp)
+        return {"pid": os.getpid(), "key": key, "history": list(self.seen[key]), "payload": packet.payload}
+
+    def explode(self, packet):
+        if packet.src_port % 2:
+            raise ValueError("bad packet")
+        return packet.src_port
+
+
+def bidirectional_packets(count=200):
+    """여러 플로우가 섞인 양방향 패킷 생성"""
+    packets = []
+    for i in range(count):
+        client = ("192.168.1.%d" % (i % 5), 40000 + i % 7)
+        server = ("10.0.0.80", 80)
+        (src_ip, src_port), (dst_ip, dst_port) = (client, server) if i % 3 else (server, client)
+        payload = b"GET /%d HTTP/1.1\r\nHost: example.com\r\n\r\n" % i if i % 4 else b""
+        packets.append(
+            make_packet(
+                i,
+                src_ip=src_ip,
+                dst_ip=dst_ip,
+                src_port=src_port,
+                dst_port=dst_port,
+                size=len(payload) + 54,
+                payload=payload,
+            )
+        )
+    return packets
+
+
+class TestDPIPipeline(unittest.TestCase):
+    """파이프라인 순서/파티션/오류 처리 테스트"""
+
+    def test_capture_order_and_flow_affinity(self):
+        """결과는 캡처 순서이고 같은 플로우(양방향)는 한 워커에서 순서대로 분석"""
+        packets = bidirectional_packets()
+
+        with DPIPipeline(FlowRecorder, "analyze", workers=3, batch_size=16) as pipeline:
+            results = pipeline.analyze_batch(packets)
+            stats = pipeline.get_statistics()
+
+        self.assertEqual([result["payload"] for result in results], [packet.payload for packet in packets])
+        owners = {}
+        for packet, result in zip(packets, results):
+            owners.setdefault(result["key"], set()).add(result["pid"])
+            self.assertEqual(result["history"][-1], packet.timestamp)
+            self.assertEqual(result["history"], sorted(result["history"]))
+        self.assertTrue(all(len(pids) == 1 for pids in owners.values()))
+        self.assertEqual(stats["packets"], len(packets))
+        self.assertEqual(stats["batches"], 13)
+        self.assertEqual(sum(stats["worker_packets"]), len(packets))
+
+    def test_handler_errors_and_inline_mode(self):
+        """분석기 예외는 패킷별 오류 결과, 워커 1개는 현재 프로세스에서 분석"""
+        packets = bidirectional_packets(20)
+        expected = [{"error": "bad packet"} if p.src_port % 2 else p.src_port for p in packets]
+
+        with DPIPipeline(FlowRecorder, "explode", workers=2, batch_size=8) as pipeline:
+            self.assertEqual(pipeline.analyze_batch(packets), expected)
+        with DPIPipeline(FlowRecorder, "explode", workers=1) as pipeline:
+            self.assertEqual(pipeline.analyze_batch(packets), expected)
+            self.assertEqual(pipeline.get_statistics()["worker_packets"], [20])
+
+    def test_protocol_analyzer_parallel_batch(self):
+        """병렬 배치 분석 결과는 순차 분석과 같음"""
+        packets = bidirectional_packets(60)
+        ignored = ("timestamp", "analysis_time")
+
+        sequential = ProtocolAnalyzer().analyze_packet_batch(packets)
+        parallel = ProtocolAnalyzer().analyze_packet_batch(packets, workers=2)
+
+        strip = lambda result: {k: v for k, v in result.items() if k not in ignored}  # noqa: E731
+        self.assertEqual([strip(r) for r in parallel], [strip(r) for r in sequential])
+
+    def test_threat_detector_parallel(self):
+        """출발지 IP 파티션으로 포트 스캔 탐지가 병렬 분석에서도 유지"""
+        packets = [
+            {
+                "id": i,
+                "src_ip": "10.9.9.9" if i % 2 else "10.0.0.%d" % i,
+                "dst_ip": "10.0.0.1",
+                "dst_port": 1000 + i,
+                "protocol": "TCP",
+                "size": 60,
+                "flags": {"SYN": True},
+                "payload": "",
+            }
+            for i in range(80)
+        ]
+
+        sequential = asyncio.run(AIThreatDetector().analyze_traffic(packets))
+        detector = AIThreatDetector(workers=2)
+        try:
+            parallel = asyncio.run(detector.analyze_traffic(packets))
+        finally:
+            detector.close()
+
+        self.assertEqual(parallel["statistics"], sequential["statistics"])
+        self.assertEqual(parallel["threats_detected"], sequential["threats_detected"])
+
+    def test_threat_detector_concurrent_and_single_packet_calls(self):
+        """동시 호출 결과가 섞이지 않고, 단일 패킷 호출도 워커의 출발지 이력으로 분석"""
+        scan = [
+            {"id": i, "src_ip": "10.9.9.9", "dst_ip": "10.0.0.1", "dst_port": 1000 + i, "protocol": "TCP", "size": 60}
+            for i in range(22)
+        ]
+        batches = [
+            [{"id": f"{n}-{i}", "src_ip": "10.0.%d.%d" % (n, i), "dst_port": 80, "protocol": "TCP"} for i in range(40)]
+            for n in range(6)
+        ]
+
+        detector = AIThreatDetector(workers=2)
+        try:
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                results = list(executor.map(lambda packets: asyncio.run(detector.analyze_traffic(packets)), batches))
+            self.assertEqual(len(results), len(batches))
+            self.assertEqual(detector.statistics["packets_analyzed"], 240)
+
+            asyncio.run(detector.analyze_traffic(scan[:-1]))
+            self.assertEqual(detector.statistics["suspicious_packets"], 0)
+            asyncio.run(detector.analyze_traffic(scan[-1:]))  # 22번째 포트: 같은 워커의 이력으로 포트 스캔 탐지
+            self.assertEqual(detector.statistics["suspicious_packets"], 1)
+            self.assertIn("port_scanning", detector._analyze_parallel(scan[-1:])[0]["anomalies"])
+        finally:
+            detector.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+NetworkAnalyzer 플로우 테이블 단위 테스트
+"""
+
+import struct
+import unittest
+
+from security.packet_sniffer.analyzers.flow_table import FlowTable, flow_key
+from security.packet_sniffer.analyzers.network_analyzer import NetworkAnalyzer
+
+SYN, ACK, FIN, RST = 0x02, 0x10, 0x01, 0x04
+
+
+def make_tcp_packet(src_port, dst_port, flags, payload=b""):
+    """IPv4 + TCP 원시 패킷 생성"""
+    ip_header = bytes([0x45]) + bytes(19)
+    tcp_header = struct.pack(">HHIIHHHH", src_port, dst_port, 1, 0, (5 << 12) | flags, 65535, 0, 0)
+    return ip_header + tcp_header + payload
+
+
+def make_info(src_ip, dst_ip, src_port, dst_port, timestamp):
+    """패킷 기본 정보"""
+    return {
+        "src_ip": src_ip,
+        "dst_ip": dst_ip,
+        "src_port": src_port,
+        "dst_port": dst_port,
+        "protocol": "TCP",
+        "timestamp": timestamp,
+    }
+
+
+class TestFlowTable(unittest.TestCase):
+    """플로우 테이블 테스트"""
+
+    def send(self, analyzer, src, dst, flags, timestamp, payload=b""):
+        (src_ip, src_port), (dst_ip, dst_port) = src, dst
+        return analyzer.analyze(
+            make_tcp_packet(src_port, dst_port, flags, payload),
+            make_info(src_ip, dst_ip, src_port, dst_port, timestamp),
+        )
+
+    def test_key_is_direction_normalized(self):
+        """양방향 패킷이 같은 키를 사용"""
+        forward, forward_first = flow_key("TCP", "10.0.0.1", 5000, "10.0.0.2", 80)
+        reverse, reverse_first = flow_key("TCP", "10.0.0.2", 80, "10.0.0.1", 5000)
+        self.assertEqual(forward, reverse)
+        self.assertNotEqual(forward_first, reverse_first)
+        self.assertTrue(all(isinstance(part, int) for part in forward))
+
+    def test_handshake_and_direction(self):
+        """3-way 핸드셰이크 상태 및 방향"""
+        analyzer = NetworkAnalyzer()
+        client, server = ("10.0.0.1", 5000), ("10.0.0.2", 80)
+
+        self.assertEqual(self.send(analyzer, client, server, SYN, 100.0)["connection_state"]["state"], "SYN_SENT")
+        state = self.send(analyzer, server, client, SYN | ACK, 100.1)["connection_state"]
+        self.assertEqual((state["state"], state["direction"]), ("SYN_RECEIVED", "reverse"))
+        state = self.send(analyzer, client, server, ACK, 100.5, b"hello")["connection_state"]
+        self.assertEqual(
+            (state["state"], state["direction"], state["packets"], state["bytes"]), ("ESTABLISHED", "forward", 3, 5)
+        )
+        self.assertAlmostEqual(state["duration"], 0.5)
+        self.assertEqual(len(analyzer.connections), 1)
+
+    def test_capacity_eviction(self):
+        """용량 초과 시 가장 오래 사용되지 않은 플로우 제거"""
+        analyzer = NetworkAnalyzer(max_flows=100)
+        for i in range(1000):
+            self.send(analyzer, (f"10.1.{i // 256}.{i % 256}", 40000), ("10.0.0.2", 80), SYN, 100.0 + i * 0.001)
+
+        stats = analyzer._get_current_statistics()["flow_table"]
+        self.assertEqual(len(analyzer.connections), 100)
+        self.assertEqual(stats["evicted_capacity"], 900)
+        self.assertEqual(stats["peak"], 100)
+        records = analyzer.export_expired_flows()
+        self.assertEqual(len(records), 900)
+        self.assertEqual(records[0]["src_ip"], "10.1.0.0")
+        self.assertEqual(records[0]["reason"], "capacity")
+        self.assertEqual(analyzer.export_expired_flows(), [])
+
+    def test_idle_and_closed_expiry(self):
+        """유휴 플로우와 종료 플로우 만료"""
+        expired = []
+        analyzer = NetworkAnalyzer(idle_timeout=60, close_linger=5, on_flow_expire=expired.append)
+        client, server, idle = ("10.0.0.1", 5000), ("10.0.0.2", 80), ("10.0.0.3", 6000)
+
+        self.send(analyzer, idle, server, SYN, 0.0)
+        self.send(analyzer, client, server, SYN, 1.0)
+        self.send(analyzer, server, client, SYN | ACK, 1.1)
+        self.send(analyzer, client, server, ACK, 1.2)
+        self.send(analyzer, client, server, RST, 2.0)
+
+        self.assertEqual(analyzer.expire_flows(4.0), 0)
+        self.assertEqual(analyzer.expire_flows(7.5), 1)
+        self.assertEqual(expired[0]["reason"], "closed")
+        self.assertEqual(expired[0]["state"], "RESET")
+        self.assertEqual(expired[0]["packets"], 4)
+
+        self.assertEqual(analyzer.expire_flows(61.0), 1)
+        self.assertEqual(expired[1]["reason"], "idle")
+        self.assertEqual(len(analyzer.connections), 0)
+        self.assertEqual(analyzer._get_current_statistics()["flow_table"]["evicted_idle"], 1)
+
+    def test_flow_statistics_bounded(self):
+        """플로우 통계는 양방향을 한 항목으로 합산하고 용량/유휴 만료를 따름"""
+        analyzer = NetworkAnalyzer(max_flows=50, idle_timeout=60)
+        client, server = ("10.0.0.1", 5000), ("10.0.0.2", 80)
+        self.send(analyzer, client, server, SYN, 1.0)
+        stats = self.send(analyzer, server, client, SYN | ACK, 1.1)["statistics"]
+        self.assertEqual(stats["total_flows"], 1)
+        self.assertEqual(stats["top_flows"][0]["flow"], "10.0.0.1:5000-10.0.0.2:80/TCP")
+        self.assertEqual(stats["top_flows"][0]["packets"], 2)
+
+        for i in range(500):
+            self.send(analyzer, (f"10.1.{i // 256}.{i % 256}", 40000), server, SYN, 2.0 + i * 0.001)
+        self.assertEqual(analyzer._get_current_statistics()["total_flows"], 50)
+
+        analyzer.expire_flows(100.0)
+        self.assertEqual(analyzer._get_current_statistics()["total_flows"], 0)
+
+    def test_late_packet_extends_linger(self):
+        """종료 후 추가 패킷이 오면 linger 연장"""
+        table = FlowTable(close_linger=5)
+        entry, _ = table.touch(make_info("10.0.0.1", "10.0.0.2", 1, 2, 10.0), 1, 2)
+        table.mark_closed(entry)
+        table.touch(make_info("10.0.0.2", "10.0.0.1", 2, 1, 13.0), 2, 1)
+
+        self.assertEqual(table.expire(16.0), 0)
+        self.assertEqual(table.expire(18.0), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+패킷 캡처 순환 버퍼 단위 테스트
+"""
+
+import threading
+import unittest
+from datetime import datetime
+
+from security.packet_sniffer.packet_capturer import PacketBuffer
+from tests.fixtures.packets import make_packet
+
+
+class TestPacketBuffer(unittest.TestCase):
+    """PacketBuffer 순환 버퍼 테스트"""
+
+    def test_wraparound_keeps_newest(self):
+        """가득 차면 가장 오래된 패킷부터 덮어씀"""
+        buffer = PacketBuffer(max_size=5)
+        for i in range(12):
+            buffer.add_packet(make_packet(i, timestamp=1000.0 + i))
+
+        self.assertEqual(len(buffer), 5)
+        self.assertEqual([p.timestamp for p in buffer.get_packets()], [1011.0, 1010.0, 1009.0, 1008.0, 1007.0])
+        self.assertEqual([p.timestamp for p in buffer.get_packets(limit=2)], [1011.0, 1010.0])
+        self.assertEqual(buffer.get_latest_packet().timestamp, 1011.0)
+        self.assertEqual(buffer.get_stats()["total_packets"], 12)
+
+    def test_since_across_wrap(self):
+        """한 바퀴 돈 버퍼에서도 시각 기준 조회"""
+        buffer = PacketBuffer(max_size=8)
+        for i in range(13):
+            buffer.add_packet(make_packet(i, timestamp=2000.0 + i))
+
+        for cutoff in range(2000, 2015):
+            packets = buffer.get_packets(since=datetime.fromtimestamp(cutoff))
+            expected = [float(t) for t in range(2012, 2004, -1) if t >= cutoff]
+            self.assertEqual([p.timestamp for p in packets], expected)
+
+        packets = buffer.get_packets(limit=2, since=datetime.fromtimestamp(2006))
+        self.assertEqual([p.timestamp for p in packets], [2012.0, 2011.0])
+
+    def test_out_of_order_timestamps(self):
+        """늦게 도착한 패킷은 시각 조건으로 걸러짐"""
+        buffer = PacketBuffer(max_size=10)
+        for timestamp in (10.0, 20.0, 15.0, 30.0, 25.0):
+            buffer.add_packet(make_packet(timestamp=timestamp))
+
+        packets = buffer.get_packets(since=datetime.fromtimestamp(18))
+        self.assertEqual([p.timestamp for p in packets], [25.0, 30.0, 20.0])
+        self.assertEqual(buffer.get_latest_packet().timestamp, 25.0)
+
+    def test_clear_and_empty(self):
+        """빈 버퍼 조회"""
+        buffer = PacketBuffer(max_size=3)
+        self.assertIsNone(buffer.get_latest_packet())
+        buffer.add_packet(make_packet(timestamp=1.0))
+        buffer.clear()
+        self.assertEqual(buffer.get_packets(), [])
+        self.assertEqual(buffer.get_stats()["current_size"], 0)
+
+    def test_concurrent_ingest_and_reads(self):
+        """수집 중 조회해도 일관된 스냅샷 반환"""
+        buffer = PacketBuffer(max_size=256)
+        done = threading.Event()
+
+        def ingest():
+            for i in range(20000):
+                buffer.add_packet(make_packet(i, timestamp=float(i)))
+            done.set()
+
+        writer = threading.Thread(target=ingest)
+        writer.start()
+        while not done.is_set():
+            timestamps = [p.timestamp for p in buffer.get_packets(limit=50)]
+            self.assertEqual(timestamps, sorted(timestamps, reverse=True))
+        writer.join()
+
+        self.assertEqual(buffer.get_latest_packet().timestamp, 19999.0)
+        self.assertEqual(len(buffer.get_packets()), 256)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+열 기반 패킷 저장소 단위 테스트
+"""
+
+import sys
+import unittest
+
+from security.packet_sniffer.filters.bpf_filter import BPFFilter
+from security.packet_sniffer.packet_store import PacketStore
+from security.packet_sniffer.session_manager import CaptureSession, SessionConfig
+from tests.fixtures.packets import make_packet
+
+
+class TestPacketStore(unittest.TestCase):
+    """PacketStore / PacketView 테스트"""
+
+    def test_round_trip(self):
+        """저장한 패킷을 같은 값으로 복원"""
+        store = PacketStore(arena_chunk_size=64)
+        packets = [make_packet(i) for i in range(20)]
+        packets.append(make_packet(20, src_ip="2001:db8::1", dst_port=70000, protocol="UDP", flags={"mock": True}))
+        packets.append(make_packet(21, payload=b"x" * 200))
+        for packet in packets:
+            store.append(packet)
+
+        self.assertEqual(len(store), len(packets))
+        for packet, view in zip(packets, store):
+            self.assertEqual(view.to_packet(), packet)
+            self.assertEqual(view.to_dict(), packet.to_dict())
+
+        self.assertEqual(store[-2].src_ip, "2001:db8::1")
+        self.assertEqual(store[-2].dst_port, 70000)
+        self.assertEqual(store[-2].flags, {"mock": True})
+        self.assertEqual(store[0].flags, {})
+
+    def test_payload_view_is_zero_copy(self):
+        """페이로드 뷰는 읽기 전용 memoryview이며 추가 저장 중에도 유효"""
+        store = PacketStore(arena_chunk_size=32)
+        store.append(make_packet(0))
+        view = store[0].payload_view
+        for i in range(1, 50):
+            store.append(make_packet(i))
+
+        self.assertIsInstance(view, memoryview)
+        self.assertTrue(view.readonly)
+        self.assertEqual(bytes(view), make_packet(0).payload)
+
+    def test_zero_limit_is_empty(self):
+        """limit=0은 빈 구간, None은 끝까지"""
+        store = PacketStore()
+        for i in range(3):
+            store.append(make_packet(i))
+
+        self.assertEqual(store.slice(1, 0), [])
+        self.assertEqual(store.payload_statistics(0, 0), [])
+        self.assertEqual([view.row for view in store.slice(1, None)], [1, 2])
+
+    def test_clear_invalidates_views(self):
+        """clear() 이후 기존 뷰는 새로 추가된 패킷을 읽지 않고 오류"""
+        store = PacketStore()
+        store.append(make_packet(1))
+        view = store[0]
+        payload = view.payload_view
+
+        store.clear()
+        store.append(make_packet(2))
+
+        self.assertFalse(view.is_valid)
+        with self.assertRaises(RuntimeError):
+            view.src_port
+        self.assertEqual(repr(view), "PacketView(row=0, stale)")
+        self.assertEqual(bytes(payload), make_packet(1).payload)
+        self.assertEqual(store[0].src_port, 40002)
+
+    def test_view_works_as_filter_input(self):
+        """PacketView를 딕셔너리 기반 필터에 그대로 전달"""
+        store = PacketStore()
+        store.append(make_packet(1))
+        store.append(make_packet(2, dst_port=443))
+
+        bpf = BPFFilter()
+        self.assertTrue(bpf.set_filter("tcp and port 443"))
+        self.assertEqual([view.row for view in store if bpf.matches(view)], [1])
+        self.assertEqual(store[0].get("dst_ip"), "10.0.0.80")
+        self.assertIsNone(store[0].get("unknown"))
+
+    def test_smaller_than_objects(self):
+        """패킷 객체보다 메모리 사용량이 작음"""
+        store = PacketStore()
+        packets = [make_packet(i, payload=b"") for i in range(1000)]
+        for packet in packets:
+            store.append(packet)
+
+        object_bytes = sum(sys.getsizeof(p) + sys.getsizeof(p.src_ip) + sys.getsizeof(p.flags) for p in packets)
+        self.assertLess(store.memory_usage() - store.arena_chunk_size, object_bytes / 4)
+
+
+class TestCaptureSessionStore(unittest.TestCase):
+    """CaptureSession 저장소 연동 테스트"""
+
+    def test_session_packets(self):
+        """세션 패킷 조회/내보내기"""
+        session = CaptureSession("session-test-0001", SessionConfig())
+        session.start()
+        try:
+            for i in range(5):
+                self.assertTrue(session.add_packet(make_packet(i)))
+
+            self.assertEqual(session.get_packet_count(), 5)
+            self.assertEqual([p.src_port for p in session.get_packets(limit=2, offset=1)], [40001, 40002])
+            self.assertEqual(session.export_data()["packets"][4], make_packet(4).to_dict())
+            self.assertEqual(session.info.total_bytes, sum(60 + i for i in range(5)))
+
+            session.clear_packets()
+            self.assertEqual(session.get_packets(), [])
+        finally:
+            session.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
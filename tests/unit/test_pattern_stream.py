@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+스트리밍 패턴 탐지 단위 테스트
+"""
+
+import unittest
+
+from security.packet_sniffer.analyzers.pattern_detector import PatternDetector
+from security.packet_sniffer.analyzers.pattern_stream import DistinctSketch, HyperLogLog, SlidingDistinct, stable_hash
+from security.packet_sniffer.base_sniffer import PacketInfo
+
+
+def packet(timestamp, src_ip="10.0.0.1", dst_ip="10.0.0.2", dst_port=80, protocol="TCP", size=60, flags=None):
+    return {
+        "timestamp": timestamp,
+        "src_ip": src_ip,
+        "dst_ip": dst_ip,
+        "src_port": 40000,
+        "dst_port": dst_port,
+        "protocol": protocol,
+        "size": size,
+        "flags": flags or [],
+    }
+
+
+class TestSketches(unittest.TestCase):
+    """고유값 스케치 테스트"""
+
+    def test_sparse_then_hyperloglog(self):
+        """작은 집합은 정확, 큰 집합은 HyperLogLog 오차 범위 안"""
+        sketch = DistinctSketch(precision=12, sparse_limit=64)
+        for value in range(50):
+            sketch.add_hash(stable_hash(value))
+            sketch.add_hash(stable_hash(value))
+        self.assertEqual(sketch.count(), 50)
+        self.assertIsNone(sketch.hll)
+
+        for value in range(20000):
+            sketch.add_hash(stable_hash(value))
+        self.assertIsNotNone(sketch.hll)
+        self.assertAlmostEqual(sketch.count() / 20000, 1.0, delta=0.06)
+
+    def test_sliding_window_expiry(self):
+        """윈도우 밖 슬롯의 값은 제외"""
+        ports = SlidingDistinct(window_seconds=10.0, slots=10)
+        for second in range(5):
+            ports.add(stable_hash(second), float(second))
+        self.assertEqual(ports.count(), 5)
+        ports.add(stable_hash(100), 12.5)
+        self.assertEqual(ports.count(), 3)  # 3, 4, 100
+
+    def test_sliding_running_union(self):
+        """누적 합집합은 HyperLogLog 전환과 슬롯 만료 후에도 슬롯별 스케치의 합집합과 같음"""
+        values = SlidingDistinct(window_seconds=10.0, slots=10, precision=12, sparse_limit=64)
+        for second in range(5):
+            values.add(stable_hash(("same", 0)), float(second))
+        self.assertEqual(values.count(), 1)
+
+        for i in range(3000):
+            values.add(stable_hash(i), i * 0.005)  # 0~15초
+        self.assertIsNotNone(values.merged)
+        union = HyperLogLog.union([sketch for _, sketch in values.buckets], 12)
+        self.assertEqual(values.merged.registers, union.registers)
+        self.assertEqual(values.count(), round(union.count()))
+        self.assertAlmostEqual(values.count() / 2000, 1.0, delta=0.06)  # 5~15초 구간
+
+        values.add(stable_hash("late"), 40.0)  # 이전 슬롯이 모두 만료되면 정확 모드로 복귀
+        self.assertIsNone(values.merged)
+        self.assertEqual(values.count(), 1)
+
+
+class TestStreamingDetection(unittest.TestCase):
+    """온라인 탐지 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.detector = PatternDetector()
+
+    def test_port_scan_emitted_once_on_crossing(self):
+        """포트 수가 임계값을 넘는 패킷에서 한 번만 탐지, 윈도우가 지나면 다시 탐지"""
+        emitted = []
+        for i in range(20):
+            result = self.detector.push(packet(100.0 + i * 0.1, dst_port=1000 + i, flags=["SYN"]))
+            emitted.append([d for d in result if d["type"] == "port_scan"])
+
+        first = next(i for i, found in enumerate(emitted) if found)
+        self.assertEqual(first, self.detector.thresholds["scan_min_ports"] - 1)
+        self.assertEqual(sum(len(found) for found in emitted), 1)
+        scan = emitted[first][0]
+        self.assertEqual((scan["scan_type"], scan["category"], scan["port_count"]), ("syn_scan", "scan", 5))
+
+        later = self.detector.push_many(packet(200.0 + i * 0.1, dst_port=2000 + i, flags=["SYN"]) for i in range(6))
+        self.assertEqual(len([d for d in later if d["type"] == "port_scan"]), 1)
+        self.assertEqual(self.detector.get_statistics()["scan_patterns"], 2)
+
+    def test_burst_host_scan_and_periodic(self):
+        """버스트, 호스트 스캔, 주기성 탐지 (PacketInfo 입력)"""
+        burst = self.detector.push_many(
+            PacketInfo(10.0 + i * 0.05, "10.0.0.9", "10.0.0.10", 5000, 443, "TCP", 100) for i in range(12)
+        )
+        self.assertEqual([d["packet_count"] for d in burst if d["type"] == "burst"], [5])
+
+        hosts = self.detector.push_many(packet(50.0 + i, src_ip="10.0.0.7", dst_ip=f"10.0.1.{i}") for i in range(8))
+        self.assertEqual(len([d for d in hosts if d["type"] == "host_scan"]), 1)
+
+        beacon = self.detector.push_many(
+            packet(1000.0 + i * 30.0, src_ip="10.0.0.5", dst_ip="203.0.113.9", protocol="HTTPS") for i in range(6)
+        )
+        periodic = [d for d in beacon if d["type"] == "periodic"]
+        self.assertEqual(len(periodic), 1)
+        self.assertAlmostEqual(periodic[0]["avg_interval"], 30.0)
+        self.assertEqual(periodic[0]["interval_histogram"], {"<32768ms": 2})
+
+    def test_packet_anomalies(self):
+        """새 비정상 프로토콜/플래그 조합/큰 패킷은 즉시 탐지"""
+        results = self.detector.push(packet(1.0, protocol="GRE", size=9000))
+        self.assertEqual({d["type"] for d in results}, {"unusual_protocols", "large_packets"})
+        self.assertEqual(self.detector.push(packet(1.1, protocol="GRE", size=9000)), [])
+        flags = self.detector.push(packet(1.2, flags={"SYN": True, "FIN": True}))
+        self.assertEqual([d["anomaly"] for d in flags], ["SYN+FIN"])
+
+    def test_memory_bounded_by_max_keys(self):
+        """키 수 상한을 넘으면 오래된 키 제거"""
+        detector = PatternDetector(max_keys=50)
+        for i in range(500):
+            detector.push(packet(float(i), src_ip=f"10.1.{i // 250}.{i % 250}", dst_ip=f"10.2.0.{i % 7}"))
+        stats = detector.get_stream_statistics()
+        self.assertEqual(stats["packets_processed"], 500)
+        self.assertTrue(all(count <= 50 for count in stats["tracked_keys"].values()))
+        self.assertGreater(stats["evicted_keys"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+페이로드 통계 커널 단위 테스트
+"""
+
+import math
+import os
+import unittest
+from collections import Counter
+from unittest.mock import patch
+
+from security.packet_sniffer import payload_stats
+from security.packet_sniffer.analyzers.application_analyzer import ApplicationAnalyzer
+from security.packet_sniffer.base_sniffer import PacketInfo
+from security.packet_sniffer.inspectors.deep_inspector import DeepInspector
+from security.packet_sniffer.packet_store import PacketStore
+from security.packet_sniffer.payload_stats import batch_payload_statistics, payload_statistics, printable_ratio
+
+
+def reference_entropy(data):
+    """Counter 기반 섀넌 엔트로피"""
+    return -sum(count / len(data) * math.log2(count / len(data)) for count in Counter(data).values()) if data else 0.0
+
+
+class TestPayloadStatistics(unittest.TestCase):
+    """단일/일괄 페이로드 통계 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.payloads = [
+            b"",
+            b"a",
+            b"aabb",
+            b"GET / HTTP/1.1\r\nHost: example.com\r\n\r\n",
+            b"\x00\x00\x01\xff" * 10,
+            os.urandom(1460),
+            bytes(range(256)) * 300,  # 조회 테이블 범위를 넘는 크기
+        ]
+
+    def assertStats(self, stats, data):
+        self.assertEqual(stats.size, len(data))
+        self.assertAlmostEqual(stats.entropy, reference_entropy(data), places=9)
+        self.assertAlmostEqual(stats.printable_ratio, printable_ratio(data), places=12)
+        self.assertEqual(stats.null_bytes, data.count(0))
+
+    def test_single_matches_reference(self):
+        """단일 페이로드 통계"""
+        for data in self.payloads:
+            self.assertStats(payload_statistics(data), data)
+
+        self.assertEqual(payload_statistics(b"aabb").entropy, 1.0)
+        self.assertEqual(payload_statistics(bytes(range(256))).entropy, 8.0)
+        self.assertEqual(payload_statistics("héllo").size, 6)
+
+    def test_batch_matches_single(self):
+        """일괄 계산 결과는 단일 계산과 같음 (청크 경계 포함)"""
+        payloads = self.payloads * 10
+        batch = batch_payload_statistics([memoryview(data) for data in payloads], histogram=True)
+
+        self.assertEqual(len(batch), len(payloads))
+        for stats, data in zip(batch, payloads):
+            self.assertStats(stats, data)
+            self.assertEqual(stats.histogram, payload_statistics(data, histogram=True).histogram)
+        self.assertEqual(batch_payload_statistics([]), [])
+
+    def test_without_numpy(self):
+        """NumPy가 없어도 같은 결과"""
+        with patch.object(payload_stats, "HAS_NUMPY", False):
+            for data in self.payloads[:6]:
+                self.assertStats(payload_statistics(data), data)
+            self.assertEqual(len(batch_payload_statistics(self.payloads)), len(self.payloads))
+            self.assertEqual(payload_stats.byte_histogram(b"aab")[ord("a")], 2)
+
+
+class TestAnalyzerPayloadStatistics(unittest.TestCase):
+    """분석기와 세션 저장소의 통계 커널 사용 테스트"""
+
+    def test_application_analyzer_entropy(self):
+        """암호화 추정은 올바른 엔트로피 사용"""
+        analyzer = ApplicationAnalyzer()
+
+        self.assertAlmostEqual(analyzer._calculate_entropy(b"aabb"), 1.0)
+        self.assertTrue(analyzer._detect_encryption(bytes(range(256)) * 6))
+        self.assertFalse(analyzer._detect_encryption(b"GET / HTTP/1.1\r\n" * 50))
+
+        analysis = analyzer._analyze_generic(b"hello world\n", {}, "UNKNOWN")
+        self.assertFalse(analysis["is_encrypted"])
+        self.assertEqual(analysis["printable_ratio"], 11 / 12)
+
+    def test_deep_inspector_batch(self):
+        """일괄 페이로드 분석은 단일 분석과 같은 결과"""
+        inspector = DeepInspector()
+        payloads = [b"%PDF-1.7 data", b"", b"\x00" * 8, os.urandom(512)]
+
+        for batch, payload in zip(inspector.analyze_payloads(payloads), payloads):
+            single = inspector._analyze_payload(payload)
+            self.assertAlmostEqual(batch.pop("entropy"), single.pop("entropy"), places=12)
+            self.assertEqual(batch, single)
+        self.assertEqual(inspector._analyze_payload(b"%PDF-1.7 data")["file_signatures"], ["PDF Document"])
+        self.assertAlmostEqual(inspector._calculate_entropy("abcd"), 2.0)
+
+    def test_packet_store_payload_statistics(self):
+        """세션 저장소의 페이로드 통계"""
+        store = PacketStore(arena_chunk_size=64)
+        packets = [
+            PacketInfo(
+                timestamp=1700000000.0 + i,
+                src_ip="192.168.1.10",
+                dst_ip="10.0.0.80",
+                src_port=40000 + i,
+                dst_port=443,
+                protocol="TCP",
+                size=60 + i * 10,
+                payload=os.urandom(i * 10),
+            )
+            for i in range(10)
+        ]
+        for packet in packets:
+            store.append(packet)
+
+        stats = store.payload_statistics(offset=2, limit=5)
+
+        self.assertEqual(len(stats), 5)
+        for item, packet in zip(stats, packets[2:7]):
+            self.assertEqual(item.size, len(packet.payload))
+            self.assertAlmostEqual(item.entropy, reference_entropy(packet.payload), places=9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+스트리밍 PCAP 입출력 단위 테스트
+"""
+
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+from security.packet_sniffer.exporters.pcap_exporter import PCAPExporter
+from security.packet_sniffer.exporters.pcap_io import (
+    PcapReader,
+    PcapWriter,
+    decode_packet,
+    merge_pcap,
+    read_packets,
+)
+
+
+def make_frame(payload=b"hello", src_port=1234, dst_port=80, tcp_flags=0x18):
+    """이더넷 + IPv4 + TCP 프레임 (이더넷 패딩 포함)"""
+    eth = b"\x00" * 12 + b"\x08\x00"
+    ip = struct.pack(
+        ">BBHHHBBH4s4s", 0x45, 0, 40 + len(payload), 0, 0, 64, 6, 0, bytes([10, 0, 0, 1]), bytes([10, 0, 0, 2])
+    )
+    tcp = struct.pack(">HHIIBBHHH", src_port, dst_port, 0, 0, 0x50, tcp_flags, 8192, 0, 0)
+    return eth + ip + tcp + payload + b"\x00" * 6
+
+
+def pcapng_block(block_type, body, byte_order="<"):
+    body += b"\x00" * (-len(body) % 4)
+    length = len(body) + 12
+    return struct.pack(byte_order + "II", block_type, length) + body + struct.pack(byte_order + "I", length)
+
+
+class TestPcapIO(unittest.TestCase):
+    """리더/라이터/병합 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """테스트 정리"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def path(self, name):
+        return os.path.join(self.temp_dir, name)
+
+    def test_round_trip_and_truncation(self):
+        """마이크로초/나노초 라운드트립, 잘린 마지막 레코드는 건너뜀"""
+        frame = make_frame()
+        for nanosecond, expected_ns in ((False, 1_700_000_000_123_456_000), (True, 1_700_000_000_123_456_789)):
+            path = self.path(f"rt_{nanosecond}.pcap")
+            with PcapWriter(path, nanosecond=nanosecond, buffer_size=64) as writer:
+                writer.write(frame, timestamp_ns=1_700_000_000_123_456_789)
+                writer.write(frame * 2, timestamp=1.5)
+
+            with PcapReader(path) as reader:
+                records = [(record.timestamp_ns, bytes(record.data), record.orig_len) for record in reader]
+            self.assertEqual(records, [(expected_ns, frame, len(frame)), (1_500_000_000, frame * 2, len(frame) * 2)])
+
+        with open(path, "ab") as f:
+            f.write(struct.pack("<IIII", 2, 0, 100, 100) + b"short")
+        with PcapReader(path) as reader:
+            self.assertEqual(len(list(reader)), 2)
+            self.assertTrue(reader.truncated)
+
+    def test_big_endian_and_pcapng(self):
+        """빅 엔디언 나노초 pcap과 pcapng(if_tsresol) 읽기"""
+        frame = make_frame()
+        big = self.path("big.pcap")
+        with open(big, "wb") as f:
+            f.write(struct.pack(">IHHiIII", 0xA1B23C4D, 2, 4, 0, 0, 65535, 1))
+            f.write(struct.pack(">IIII", 3, 7, len(frame), len(frame)) + frame)
+
+        ng = self.path("capture.pcapng")
+        timestamp = 5 * 1_000_000_000 + 11  # 나노초 해상도 인터페이스
+        with open(ng, "wb") as f:
+            f.write(pcapng_block(0x0A0D0D0A, struct.pack("<IHHq", 0x1A2B3C4D, 1, 0, -1)))
+            f.write(pcapng_block(0x00000002, b"\x00" * 20))  # 알 수 없는 블록은 건너뜀
+            options = struct.pack("<HH", 9, 1) + b"\x09\x00\x00\x00" + struct.pack("<HH", 0, 0)
+            f.write(pcapng_block(1, struct.pack("<HHI", 1, 0, 65535) + options))
+            epb = struct.pack("<IIIII", 0, timestamp >> 32, timestamp & 0xFFFFFFFF, len(frame), len(frame) + 4)
+            f.write(pcapng_block(6, epb + frame))
+
+        with PcapReader(big) as reader:
+            self.assertEqual([(r.timestamp_ns, bytes(r.data)) for r in reader], [(3_000_000_007, frame)])
+        with PcapReader(ng) as reader:
+            self.assertEqual(reader.format, "pcapng")
+            self.assertEqual([(r.timestamp_ns, r.orig_len) for r in reader], [(timestamp, len(frame) + 4)])
+
+        with open(self.path("bad.pcap"), "wb") as f:
+            f.write(b"not a capture file")
+        with self.assertRaises(ValueError):
+            PcapReader(self.path("bad.pcap"))
+
+    def test_merge_orders_by_timestamp(self):
+        """k-way 병합은 입력 형식과 무관하게 시간순"""
+        inputs = []
+        for index, nanosecond in enumerate((False, True, False)):
+            path = self.path(f"in{index}.pcap")
+            with PcapWriter(path, nanosecond=nanosecond) as writer:
+                for second in range(index, 12, 3):
+                    writer.write(make_frame(b"%d" % second), timestamp=float(second))
+            inputs.append(path)
+
+        result = merge_pcap(inputs, self.path("merged.pcap"))
+
+        self.assertEqual(result["total_packets"], 12)
+        with PcapReader(self.path("merged.pcap")) as reader:
+            self.assertTrue(reader.nanosecond)
+            self.assertEqual([record.timestamp for record in reader], [float(second) for second in range(12)])
+
+    def test_decode_packet(self):
+        """TCP 프레임 디코딩 (이더넷 패딩 제외)"""
+        path = self.path("decode.pcap")
+        with PcapWriter(path) as writer:
+            writer.write(make_frame(b"GET / HTTP/1.1\r\n", tcp_flags=0x12), timestamp=10.0)
+            writer.write(b"\x00" * 12 + b"\x08\x06" + b"\x00" * 28, timestamp=11.0)  # ARP
+
+        packets = list(read_packets(path))
+
+        self.assertEqual(len(packets), 1)
+        packet = packets[0]
+        self.assertEqual(
+            (packet.src_ip, packet.dst_ip, packet.src_port, packet.dst_port), ("10.0.0.1", "10.0.0.2", 1234, 80)
+        )
+        self.assertEqual((packet.protocol, packet.payload, packet.timestamp), ("TCP", b"GET / HTTP/1.1\r\n", 10.0))
+        self.assertEqual(packet.flags, {"SYN": True, "ACK": True})
+        with PcapReader(path) as reader:
+            self.assertIsNone(decode_packet(list(reader)[1]))
+
+
+class TestPCAPExporterStreaming(unittest.TestCase):
+    """PCAPExporter 스트리밍 사용 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.exporter = PCAPExporter(buffer_size=256)
+
+    def tearDown(self):
+        """테스트 정리"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_export_from_generator(self):
+        """이터레이터 입력도 한 번의 순회로 내보내기와 메타데이터 작성"""
+        output = os.path.join(self.temp_dir, "out.pcap")
+        packets = (
+            {"timestamp": "2024-01-01T00:00:%02d" % i, "protocol": "UDP", "src_ip": "10.0.0.%d" % i, "payload": b"x"}
+            for i in range(50)
+        )
+
+        result = self.exporter.export_packets(packets, output, include_metadata=True)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["exported_count"], 50)
+        self.assertTrue(os.path.exists(output + ".meta"))
+        self.assertEqual(len(list(self.exporter.read_packets(output))), 50)
+
+        empty = self.exporter.export_packets(iter([]), os.path.join(self.temp_dir, "empty.pcap"))
+        self.assertFalse(empty["success"])
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "empty.pcap")))
+
+    def test_merge_pcap_files(self):
+        """누락된 입력은 건너뛰고 시간순 병합"""
+        first, second = os.path.join(self.temp_dir, "a.pcap"), os.path.join(self.temp_dir, "b.pcap")
+        with PcapWriter(first) as writer:
+            writer.write(make_frame(), timestamp=2.0)
+        with PcapWriter(second) as writer:
+            writer.write(make_frame(), timestamp=1.0)
+        output = os.path.join(self.temp_dir, "merged.pcap")
+
+        result = self.exporter.merge_pcap_files([first, os.path.join(self.temp_dir, "missing.pcap"), second], output)
+
+        self.assertTrue(result["success"])
+        self.assertEqual((result["merged_files"], result["total_packets"]), (2, 2))
+        self.assertEqual([packet.timestamp for packet in self.exporter.read_packets(output)], [1.0, 2.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
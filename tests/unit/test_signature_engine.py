@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+다중 패턴 시그니처 엔진 단위 테스트
+"""
+
+import re
+import unittest
+
+from security.packet_sniffer.analyzers.http_analyzer import SENSITIVE_DATA_SIGNATURE_SET, HttpAnalyzer
+from security.packet_sniffer.analyzers.web_analyzer import WebAnalyzer
+from security.packet_sniffer.inspectors.deep_inspector import DeepInspector
+from security.packet_sniffer.signature_engine import Signature, SignatureEngine, SignatureSet, get_signature_engine
+
+
+class TestSignatureSet(unittest.TestCase):
+    """시그니처 집합 검사 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.signatures = SignatureSet(
+            "test",
+            [
+                Signature("passwd", "file", "passwd", ignore_case=True),
+                Signature("shadow", "file", "shadow"),
+                Signature("union", "sql", r"union.*select", regex=True, ignore_case=True),
+                Signature("drop", "sql", r"drop\s+table", regex=True),
+                Signature("digits", "number", r"\d{3}", regex=True),
+            ],
+        )
+
+    def test_scan_returns_all_hits_in_order(self):
+        """리터럴(겹침 포함)과 정규식 일치를 위치 순으로 반환"""
+        hits = self.signatures.scan("GET /etc/PASSWD?q=UNION SELECT 1234567 shadow")
+
+        self.assertEqual(
+            [(hit.category, hit.name, hit.value) for hit in hits],
+            [
+                ("file", "passwd", "PASSWD"),
+                ("sql", "union", "UNION SELECT"),
+                ("number", "digits", "123"),
+                ("number", "digits", "456"),
+                ("file", "shadow", "shadow"),
+            ],
+        )
+
+    def test_single_signature_category_matches_findall(self):
+        """시그니처가 하나인 카테고리의 일치 수는 re.findall과 같음"""
+        text = "a 12345 b 999 c 1234567890"
+        count = sum(1 for hit in self.signatures.scan(text) if hit.category == "number")
+        self.assertEqual(count, len(re.findall(r"\d{3}", text)))
+
+    def test_match_categories(self):
+        """카테고리 탐지"""
+        self.assertEqual(self.signatures.match_categories("x drop  table y"), {"sql"})
+        self.assertEqual(self.signatures.match_categories("Drop table"), set())
+        self.assertEqual(self.signatures.match_categories("Shadow"), set())
+        self.assertEqual(self.signatures.match_names("passwd shadow"), {"passwd", "shadow"})
+
+    def test_global_inline_flag_is_scoped(self):
+        """패턴 앞의 (?i)는 해당 시그니처에만 적용"""
+        signatures = SignatureSet(
+            "flags",
+            [
+                Signature("key", "secret", r"(?i)(api[_-]?key)\s*=\s*(\w+)", regex=True),
+                Signature("upper", "secret", r"TOKEN", regex=True),
+            ],
+        )
+        self.assertEqual([hit.name for hit in signatures.scan("API_KEY=abc token TOKEN")], ["key", "upper"])
+
+    def test_anchored_bytes_signatures(self):
+        """바이트 패턴과 시작 위치 고정 시그니처"""
+        signatures = SignatureSet("magic", [Signature("PDF", "PDF", b"%PDF", anchored=True)])
+        self.assertEqual([hit.category for hit in signatures.scan(b"%PDF-1.7")], ["PDF"])
+        self.assertEqual(signatures.scan(b"xx%PDF"), [])
+
+    def test_invalid_sets_are_rejected(self):
+        """잘못된 정규식, 명명 그룹, str/bytes 혼합은 ValueError"""
+        with self.assertRaises(ValueError):
+            SignatureSet("bad", [Signature("bad", "x", "(", regex=True)])
+        with self.assertRaises(ValueError):
+            SignatureSet("named", [Signature("named", "x", "(?P<n>a)", regex=True)])
+        with self.assertRaises(ValueError):
+            SignatureSet("mixed", [Signature("a", "x", "a"), Signature("b", "x", b"b")])
+
+    def test_throughput_statistics(self):
+        """검사량과 처리량 집계"""
+        self.signatures.scan("passwd" * 100)
+        self.signatures.match_categories("shadow")
+
+        stats = self.signatures.get_statistics()
+        self.assertEqual(stats["scans"], 2)
+        self.assertEqual(stats["bytes_scanned"], 606)
+        self.assertEqual(stats["hits"], 101)
+        self.assertEqual(stats["regex_groups"], 2)
+        self.assertGreater(stats["throughput_mbps"], 0)
+
+
+class TestSignatureEngine(unittest.TestCase):
+    """시그니처 엔진 핫 리로드 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.engine = SignatureEngine()
+        self.engine.load("web", [Signature("passwd", "file", "passwd")])
+
+    def test_hot_reload_replaces_set(self):
+        """리로드 시 새 집합으로 교체되고 버전 증가"""
+        old = self.engine.get("web")
+        new = self.engine.load("web", [Signature("shadow", "file", "shadow")])
+
+        self.assertIsNot(old, new)
+        self.assertEqual(new.version, 2)
+        self.assertEqual(self.engine.match_categories("web", "passwd"), set())
+        self.assertEqual(self.engine.match_categories("web", "shadow"), {"file"})
+        # 교체 전에 가져간 집합은 그대로 동작
+        self.assertEqual(old.match_categories("passwd"), {"file"})
+
+    def test_failed_reload_keeps_current_set(self):
+        """컴파일에 실패하면 기존 집합 유지"""
+        with self.assertRaises(ValueError):
+            self.engine.load("web", [Signature("bad", "x", "(", regex=True)])
+        self.assertEqual(self.engine.match_names("web", "passwd"), {"passwd"})
+
+    def test_register_does_not_override(self):
+        """register는 기존 집합을 덮어쓰지 않음"""
+        self.engine.register("web", [Signature("shadow", "file", "shadow")])
+        self.assertEqual(self.engine.get("web").version, 1)
+        self.assertEqual(self.engine.match_names("web", "shadow"), set())
+
+    def test_unknown_set(self):
+        """없는 집합 검사는 KeyError"""
+        with self.assertRaises(KeyError):
+            self.engine.scan("missing", "data")
+        self.assertIn("web", self.engine.get_statistics())
+
+
+class TestAnalyzerSignatures(unittest.TestCase):
+    """분석기의 공유 시그니처 사용 테스트"""
+
+    def test_web_security_issues(self):
+        """웹 보안 이슈를 한 번의 검사로 탐지"""
+        payload = "GET /../../etc/passwd?id=1' OR '1'='1 HTTP/1.1\r\n\r\n<SCRIPT>alert(1)</script>"
+        issues = WebAnalyzer()._check_web_security(payload, {"method": "TRACE"})
+
+        self.assertEqual(
+            issues,
+            [
+                "sql_injection_attempt",
+                "xss_attempt",
+                "directory_traversal",
+                "sensitive_file_access",
+                "unusual_http_method",
+            ],
+        )
+
+    def test_http_sensitive_data_counts(self):
+        """민감한 정보 유형별 발생 횟수"""
+        content = "mail a@example.com, b@example.org; Password: hunter2"
+        self.assertEqual(
+            HttpAnalyzer()._detect_sensitive_data(content), ["email: 2 occurrences", "password: 1 occurrences"]
+        )
+
+    def test_http_sensitive_data_reload(self):
+        """핫 리로드로 추가된 민감한 정보 유형도 보고"""
+        analyzer = HttpAnalyzer()
+        engine = get_signature_engine()
+        original = engine.get(SENSITIVE_DATA_SIGNATURE_SET).signatures
+        self.addCleanup(engine.load, SENSITIVE_DATA_SIGNATURE_SET, original)
+
+        engine.load(
+            SENSITIVE_DATA_SIGNATURE_SET,
+            original + [Signature("internal_host", "internal_host", r"\bcorp\.internal\b", regex=True)],
+        )
+        self.assertEqual(
+            analyzer._detect_sensitive_data("db.corp.internal pwd=x"),
+            ["password: 1 occurrences", "internal_host: 1 occurrences"],
+        )
+
+    def test_deep_inspector_patterns(self):
+        """Base64/16진수/단축 URL 및 파일 시그니처"""
+        inspector = DeepInspector()
+        payload = ("A" * 60 + " " + "ab" * 60 + " see https://bit.ly/abc and https://example.com").encode()
+        types = [pattern["type"] for pattern in inspector._detect_suspicious_patterns({}, payload)]
+
+        self.assertEqual(types, ["base64_data", "hex_data", "suspicious_url"])
+        self.assertEqual(inspector._detect_file_signatures(b"\x7fELF\x02\x01"), ["ELF Executable"])
+        self.assertEqual(inspector._detect_file_signatures(b"text"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Cache Payload Codec Unit Tests
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "src"))
+from core.base_client import APIResponse
+from utils.cache_codec import FORMAT_VERSION, MAGIC, MSGPACK_AVAILABLE, CacheCodec, CodecError
+from utils.cache_implementations import FileCacheAdapter
+
+POLICY_PACKAGE = {
+    "package": "default",
+    "policies": [
+        {"policyid": i, "name": f"allow-{i}", "srcaddr": ["all"], "dstaddr": [f"net-{i % 10}"], "action": "accept"}
+        for i in range(200)
+    ],
+}
+
+
+class TestCacheCodec(unittest.TestCase):
+    """CacheCodec 테스트"""
+
+    def test_header_and_threshold(self):
+        """작은 값은 압축하지 않고, 임계값 이상은 압축해 저장"""
+        codec = CacheCodec("orjson", "zlib", compress_threshold=1024)
+
+        small = codec.encode({"status": "up"})
+        self.assertEqual(small[:6], MAGIC + bytes([FORMAT_VERSION, 1, 0]))
+        self.assertEqual(codec.decode(small), {"status": "up"})
+
+        large = codec.encode(POLICY_PACKAGE)
+        self.assertEqual(large[5], 1)  # zlib
+        self.assertEqual(codec.decode(large), POLICY_PACKAGE)
+
+        stats = codec.stats()
+        self.assertEqual((stats["serializer"], stats["compression"], stats["compressed"]), ("orjson", "zlib", 1))
+        self.assertLess(stats["compression_ratio"], 0.5)
+        self.assertEqual(stats["codecs"]["orjson"]["encodes"], 2)
+        self.assertEqual(stats["codecs"]["zlib"]["decodes"], 1)
+
+    def test_legacy_and_invalid_payloads(self):
+        """헤더 없는 이전 JSON은 그대로 읽고, 새 버전/모르는 코덱은 CodecError"""
+        codec = CacheCodec("orjson", "none")
+        self.assertEqual(codec.decode(b'{"a": [1, 2]}'), {"a": [1, 2]})
+        self.assertEqual(codec.decode('"text"'), "text")
+        self.assertEqual(codec.stats()["legacy_decodes"], 2)
+
+        with self.assertRaises(CodecError):
+            codec.decode(MAGIC + bytes([FORMAT_VERSION + 1, 1, 0]) + b"{}")
+        with self.assertRaises(CodecError):
+            codec.decode(MAGIC + bytes([FORMAT_VERSION, 99, 0]) + b"{}")
+
+    def test_fallback_and_dataclass(self):
+        """설치되지 않은 코덱은 대체하고, dataclass(APIResponse)는 dict로 저장"""
+        codec = CacheCodec("no-such-serializer", "no-such-compressor")
+        self.assertEqual(codec.serializer.name, "msgpack" if MSGPACK_AVAILABLE else "orjson")
+        self.assertNotEqual(codec.compressor.name, "none")
+
+        response = APIResponse(success=True, data=POLICY_PACKAGE, status_code=200, headers={"x": "1"})
+        decoded = codec.decode(codec.encode(response))
+        self.assertEqual(APIResponse(**decoded), response)
+
+        # 읽기는 헤더를 따르므로 설정이 다른 코덱끼리도 호환
+        self.assertEqual(CacheCodec("orjson", "none").decode(codec.encode(POLICY_PACKAGE)), POLICY_PACKAGE)
+
+    @unittest.skipUnless(MSGPACK_AVAILABLE, "msgpack not installed")
+    def test_msgpack_is_smaller_than_json(self):
+        """msgpack 직렬화는 JSON보다 작음"""
+        packed = CacheCodec("msgpack", "none").encode(POLICY_PACKAGE)
+        self.assertLess(len(packed), len(CacheCodec("orjson", "none").encode(POLICY_PACKAGE)))
+
+
+class TestFileCacheCodec(unittest.TestCase):
+    """파일 캐시 코덱 적용 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+
+    def test_compressed_files_and_legacy_files(self):
+        """큰 값은 압축된 파일로 저장되고, 이전 JSON 파일도 읽힘"""
+        cache = FileCacheAdapter(self.cache_dir, codec=CacheCodec("orjson", "zlib", compress_threshold=256))
+        self.assertTrue(cache.set("pkg", POLICY_PACKAGE, ttl=60))
+        self.assertEqual(cache.get("pkg"), POLICY_PACKAGE)
+        self.assertEqual(cache.get_stats()["codec"]["compressed"], 1)
+
+        with open(os.path.join(self.cache_dir, "old.cache"), "w") as f:
+            f.write('{"value": [1, 2], "ttl": 0, "expires_at": 0, "created_at": 0}')
+        self.assertEqual(cache.get("old"), [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
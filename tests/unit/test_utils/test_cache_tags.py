@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Cache Tag Invalidation Unit Tests (UnifiedCacheManager / FortiManager mutations)
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "src"))
+from api.clients.fortimanager.package_management import PackageManagementMixin
+from api.clients.fortimanager.policy_management import PolicyManagementMixin
+from api.clients.fortimanager.task_management import TaskManagementMixin
+from routes.fortimanager.device_routes import device_bp
+from utils.unified_cache_manager import MemoryCacheBackend, UnifiedCacheManager, cache_tags, cached
+
+
+class FakeFortiManager(PolicyManagementMixin, PackageManagementMixin, TaskManagementMixin):
+    """성공 응답만 돌려주는 FortiManager 클라이언트 (조회 요청 URL 기록)"""
+
+    host = "fmg.test"
+
+    def __init__(self):
+        self.reads = []
+
+    def _make_api_request(self, method, url, data=None, params=None):
+        if method == "get":
+            self.reads.append(url)
+            return {"status": {"code": 0}, "data": [{"name": "default", "policyid": 1}]}
+        return {"status": {"code": 0}, "data": {"task": 1}}
+
+
+class TestUnifiedCacheTags(unittest.TestCase):
+    """UnifiedCacheManager 태그 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.manager = UnifiedCacheManager(
+            {"redis": {"enabled": False}, "memory": {"enabled": True, "max_size": 100}, "default_ttl": 300}
+        )
+        patcher = patch("utils.unified_cache_manager.get_cache_manager", return_value=self.manager)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def seed(self):
+        self.manager.set("fw1:info", 1, tags=cache_tags(device="fw1"))
+        self.manager.set("fw2:info", 2, tags=cache_tags(device="fw2"))
+        self.manager.set("pkg:default", 3, tags=cache_tags(adom="root", package="default"))
+        self.manager.set("pkg:branch", 4, tags=cache_tags(adom="root", package="branch"))
+
+    def test_cache_tags(self):
+        """차원별 태그 생성"""
+        self.assertEqual(
+            cache_tags(device="fw1", adom="corp", package="default", object_type="address"),
+            ["device:fw1", "adom:corp", "package:corp/default", "object:address"],
+        )
+        self.assertEqual(cache_tags(package="default"), ["package:root/default"])
+
+    def test_invalidate_and_decorator(self):
+        """태그 무효화는 해당 항목만, 데코레이터 태그 함수는 인자로 태그 생성"""
+        self.seed()
+        self.assertEqual(self.manager.invalidate_tags(["adom:root"]), 2)
+        self.assertEqual(self.manager.get("fw1:info"), 1)
+        self.assertIsNone(self.manager.get("pkg:default"))
+
+        calls = []
+
+        @cached(ttl=60, key_prefix="test", tags=lambda device_id: cache_tags(device=device_id))
+        def device_info(device_id):
+            calls.append(device_id)
+            return {"name": device_id}
+
+        device_info(device_id="fw9")
+        device_info(device_id="fw9")
+        self.manager.invalidate_tags(["device:fw9"])
+        device_info(device_id="fw9")
+        self.assertEqual(calls, ["fw9", "fw9"])
+
+    def test_promoted_copies_keep_tags(self):
+        """하위 백엔드에서 상위 백엔드로 승격된 복사본도 태그로 무효화"""
+        self.seed()
+        upper = MemoryCacheBackend()
+        self.manager.backends.insert(0, upper)
+        self.assertEqual(self.manager.get("pkg:default"), 3)
+        self.assertEqual(upper.tags_of("pkg:default"), ["adom:root", "package:root/default"])
+
+        self.manager.invalidate_tags(["package:root/default"])
+        self.assertIsNone(self.manager.get("pkg:default"))
+
+    def test_fortimanager_mutations_invalidate(self):
+        """정책 생성/패키지 수정/설치가 관련 캐시만 무효화"""
+        client = FakeFortiManager()
+
+        self.seed()
+        self.assertEqual(client.create_firewall_policy("fw1", {"name": "p"})["status"], "success")
+        self.assertEqual([self.manager.get(k) for k in ("fw1:info", "fw2:info")], [None, 2])
+
+        self.assertEqual(client.update_package("default", {"comments": "x"})["status"], "success")
+        self.assertEqual([self.manager.get(k) for k in ("pkg:default", "pkg:branch")], [None, 4])
+
+        self.seed()
+        self.assertEqual(client.install_policy_package("branch", ["fw2"])["status"], "success")
+        remaining = {k: self.manager.get(k) for k in ("fw1:info", "fw2:info", "pkg:default", "pkg:branch")}
+        self.assertEqual(remaining, {"fw1:info": 1, "fw2:info": None, "pkg:default": 3, "pkg:branch": None})
+
+    def test_cached_reads_evicted_by_mutations(self):
+        """정책/패키지 조회는 캐시되고, 변경 작업은 의존하는 조회 결과만 무효화"""
+        client = FakeFortiManager()
+
+        def read_all():
+            client.get_package_policies("default")
+            client.get_package_policies("branch")
+            client.get_packages()
+            client.get_firewall_policies("fw1")
+
+        read_all()
+        read_all()
+        self.assertEqual(len(client.reads), 4)
+
+        client.add_policy_to_package("default", {"name": "p"})
+        read_all()
+        self.assertEqual(client.reads[4:], ["/pm/config/adom/root/pkg/default/firewall/policy"])
+
+        client.create_package("new", ["fw1"])
+        read_all()
+        self.assertEqual(client.reads[5:], ["/pm/pkg/adom/root"])
+
+        client.update_firewall_policy("fw1", 1, {"action": "deny"})
+        read_all()
+        self.assertEqual(client.reads[6:], ["/pm/config/device/fw1/vdom/root/firewall/policy"])
+
+    def test_device_list_route_evicted_by_device_change(self):
+        """장치 목록 라우트 캐시는 장치 변경 작업 후 다시 조회"""
+        app = Flask(__name__)
+        app.register_blueprint(device_bp)
+        fm_client = MagicMock()
+        fm_client.get_devices.return_value = [{"name": "fw1"}]
+
+        with patch("routes.fortimanager.device_routes.get_api_manager") as get_api_manager:
+            get_api_manager.return_value.get_fortimanager_client.return_value = fm_client
+            http = app.test_client()
+            http.get("/devices/")
+            http.get("/devices/")
+            self.assertEqual(fm_client.get_devices.call_count, 1)
+
+            FakeFortiManager().create_firewall_policy("fw1", {"name": "p"})
+            self.assertEqual(http.get("/devices/").get_json()["total"], 1)
+            self.assertEqual(fm_client.get_devices.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Redis Keyspace / Bulk Cache Unit Tests
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "src"))
+from utils.cache_implementations import FileCacheAdapter, HybridCacheAdapter, MemoryCacheAdapter
+from utils.redis_keyspace import KeyRegistry, delete_pattern, scan_keys
+from utils.unified_cache_manager import UnifiedCacheManager
+
+
+def redis_client():
+    """테스트용 Redis 클라이언트 (서버가 없으면 None)"""
+    try:
+        import redis
+
+        client = redis.Redis(host=os.getenv("REDIS_HOST", "localhost"), socket_connect_timeout=1)
+        client.ping()
+        return client
+    except Exception:
+        return None
+
+
+class TestUnifiedCacheBulk(unittest.TestCase):
+    """UnifiedCacheManager 일괄 API와 패턴 삭제 테스트 (메모리 백엔드)"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.manager = UnifiedCacheManager(
+            {"redis": {"enabled": False}, "memory": {"enabled": True, "max_size": 100}, "default_ttl": 300}
+        )
+
+    def test_many_and_pattern(self):
+        """일괄 저장/조회, 패턴 삭제는 해당 접두사만 제거"""
+        self.assertTrue(self.manager.set_many({"dash:a": 1, "dash:b": 2, "other:c": 3}))
+        self.assertEqual(self.manager.get_many(["dash:a", "other:c", "x"]), {"dash:a": 1, "other:c": 3})
+        self.assertEqual(self.manager.delete_pattern("dash:*"), 2)
+        self.assertEqual(self.manager.get_many(["dash:a", "dash:b", "other:c"]), {"other:c": 3})
+
+
+class TestAdapterPatternDelete(unittest.TestCase):
+    """캐시 어댑터 패턴 삭제 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """테스트 정리"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_memory_and_file_adapters(self):
+        """메모리/파일 어댑터는 패턴에 맞는 키만 삭제"""
+        for adapter in (MemoryCacheAdapter(), FileCacheAdapter(cache_dir=self.temp_dir)):
+            with self.subTest(adapter=type(adapter).__name__):
+                adapter.set_many({"policy:fw1": 1, "policy:fw2": 2, "route:fw1": 3}, ttl=60)
+                self.assertEqual(adapter.delete_pattern("policy:*"), 2)
+                self.assertEqual(adapter.get_many(["policy:fw1", "route:fw1"]), {"route:fw1": 3})
+
+
+class TestRedisKeyspace(unittest.TestCase):
+    """SCAN/UNLINK/키 레지스트리 테스트 (Redis 서버가 있을 때만)"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.client = redis_client()
+        if self.client is None:
+            self.skipTest("Redis server not available")
+        self.registry = KeyRegistry(self.client, "__keys__:keyspace-test:")
+        self._cleanup()
+
+    def tearDown(self):
+        """테스트 정리"""
+        if self.client is not None:
+            self._cleanup()
+
+    def _cleanup(self):
+        delete_pattern(self.client, "keyspace-test:*")
+        self.client.delete(self.registry.name)
+
+    def test_scan_unlink_and_registry(self):
+        """배치 경계를 넘는 삭제, TTL 만료 키는 레지스트리 집계에서 제외"""
+        pipe = self.client.pipeline(transaction=False)
+        keys = [f"keyspace-test:{i}" for i in range(1234)]
+        pipe.mset({key: b"1" for key in keys})
+        self.registry.add(pipe, keys)
+        self.registry.add(pipe, ["keyspace-test:gone"], ttl=-1)  # 음수 TTL은 무기한으로 취급
+        pipe.execute()
+        self.assertEqual(self.registry.count(), 1235)
+
+        self.client.zadd(self.registry.name, {"keyspace-test:expired": 0})  # 이미 만료된 항목
+        self.assertEqual(self.registry.count(), 1235)
+
+        self.assertEqual(delete_pattern(self.client, "keyspace-test:1*", self.registry, batch_size=100), 345)
+        self.assertEqual(len(list(scan_keys(self.client, "keyspace-test:*"))), 889)
+        self.assertEqual(self.registry.count(), 890)
+
+
+class TestHybridAdapterBulk(unittest.TestCase):
+    """하이브리드 어댑터 일괄 조회 (Redis 없으면 메모리 폴백)"""
+
+    def test_get_many_promotes_to_l1(self):
+        """L2에서 찾은 값은 L1으로 승격"""
+        adapter = HybridCacheAdapter(redis_config={"host": "127.0.0.1", "port": 1})
+        adapter.l2_cache.set_many({"a": 1, "b": 2}, ttl=60)
+        self.assertEqual(adapter.get_many(["a", "b", "c"]), {"a": 1, "b": 2})
+        self.assertEqual(adapter.l1_cache.get_many(["a", "b"]), {"a": 1, "b": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()